@@ -383,24 +383,17 @@ class SaveOutputEveryIteration(SaveEveryIteration):
 
         phi_s, phi_x, phi_y, phi_z = 0, 0, 0, 0
         for reg in self.reg.objfcts:
-            phi_s += (
-                reg.objfcts[0](self.invProb.model) * reg.alpha_s
-            )
-            phi_x += (
-                reg.objfcts[1](self.invProb.model) * reg.alpha_x
-            )
+            # values of the terms times their alphas, from the residuals
+            # already computed by the regularization for this model
+            phi = reg.componentValues(self.invProb.model)
+            phi_s += phi[0]
+            phi_x += phi[1]
 
             if reg.regmesh.dim == 2:
-                phi_y += (
-                    reg.objfcts[2](self.invProb.model) * reg.alpha_y
-                )
+                phi_y += phi[2]
             elif reg.regmesh.dim == 3:
-                phi_y += (
-                    reg.objfcts[2](self.invProb.model) * reg.alpha_y
-                )
-                phi_z += (
-                    reg.objfcts[3](self.invProb.model) * reg.alpha_z
-                )
+                phi_y += phi[2]
+                phi_z += phi[3]
 
         self.beta.append(self.invProb.beta)
         self.phi_d.append(self.invProb.phi_d)
@@ -706,7 +699,10 @@ class Update_IRLS(InversionDirective):
 
         for reg in self.reg.objfcts:
             for comp in reg.objfcts:
-                self.f_old += np.sum(comp.f_m**2. / (comp.f_m**2. + comp.epsilon**2.)**(1 - comp.norm/2.))
+                f_m = comp.f_m
+                self.f_old += np.sum(
+                    f_m**2. / (f_m**2. + comp.epsilon**2.)**(1 - comp.norm/2.)
+                )
 
         self.phi_dm = []
         self.phi_dmx = []
@@ -758,9 +754,10 @@ class Update_IRLS(InversionDirective):
         phim_new = 0
         for reg in self.reg.objfcts:
             for comp in reg.objfcts:
+                f_m = comp.f_m
                 phim_new += np.sum(
-                    comp.f_m**2. /
-                    (comp.f_m**2. + comp.epsilon**2.)**(1 - comp.norm/2.)
+                    f_m**2. /
+                    (f_m**2. + comp.epsilon**2.)**(1 - comp.norm/2.)
                 )
 
         # Update the model used by the regularization
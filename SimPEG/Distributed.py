@@ -0,0 +1,470 @@
+from __future__ import print_function
+from __future__ import division
+
+import os
+import multiprocessing
+import threading
+import traceback
+from multiprocessing.connection import Listener, Client
+
+import numpy as np
+
+from . import Utils
+from . import Problem
+from . import Survey
+from . import DataMisfit
+from . import ObjectiveFunction
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # python 2 without the futures backport
+    ThreadPoolExecutor = None
+
+__all__ = [
+    'SimulationServer', 'ProcessTransport', 'SocketTransport', 'Worker',
+    'RemoteProblem', 'RemoteSurvey', 'DistributedDataMisfit'
+]
+
+
+class SimulationServer(object):
+    """
+        Serves the predicted data and the sensitivity products of a problem
+        (paired to its survey) to a :class:`Worker`.
+
+        The server lives in the worker, with the mesh, the problem and its
+        factorizations. The fields of the last model are kept, so that
+        :code:`dpred`, :code:`Jvec` and :code:`Jtvec` for that model do not
+        solve the forward problem again.
+    """
+
+    def __init__(self, prob):
+        assert prob.ispaired, 'The problem must be paired to a survey.'
+        self.prob = prob
+        self.survey = prob.survey
+        self._m = None
+        self._f = None
+
+    def fields(self, m):
+        if self._m is None or not np.array_equal(self._m, m):
+            self._f = None
+            self._f = self.prob.fields(m)
+            self._m = np.array(m, copy=True)
+        return self._f
+
+    def info(self):
+        return {'nD': int(self.survey.nD)}
+
+    def computeFields(self, m):
+        self.fields(m)
+
+    def dpred(self, m):
+        return self.survey.dpred(m, f=self.fields(m))
+
+    def Jvec(self, m, v):
+        return self.prob.Jvec(m, v, f=self.fields(m))
+
+    def Jtvec(self, m, v):
+        return self.prob.Jtvec(m, v, f=self.fields(m))
+
+    def Jvec_approx(self, m, v):
+        return self.prob.Jvec_approx(m, v, f=self.fields(m))
+
+    def Jtvec_approx(self, m, v):
+        return self.prob.Jtvec_approx(m, v, f=self.fields(m))
+
+    def serve(self, conn):
+        """
+            Answer the requests :code:`(method, args)` received on the
+            connection until :code:`('close', ())`.
+        """
+        while True:
+            try:
+                method, args = conn.recv()
+            except EOFError:  # the client is gone
+                break
+            if method == 'close':
+                break
+            try:
+                conn.send(('ok', getattr(self, method)(*args)))
+            except Exception:
+                conn.send(('error', traceback.format_exc()))
+        conn.close()
+
+
+def _runServer(conn, setup, args):
+    """
+        Worker entry point: build the problem with :code:`setup(*args)` and
+        serve it on the connection.
+    """
+    try:
+        server = SimulationServer(setup(*args))
+        conn.send(('ok', server.info()))
+    except Exception:
+        conn.send(('error', traceback.format_exc()))
+        conn.close()
+        return
+    server.serve(conn)
+
+
+def _connect(address, authkey, target, args):
+    target(Client(address, authkey=authkey), *args)
+
+
+class ProcessTransport(object):
+    """
+        Workers in local processes, the messages go through pipes.
+
+        :param str startMethod: multiprocessing start method ('fork',
+            'spawn', 'forkserver'), the default of the platform if None. With
+            'spawn' the setup function and its arguments are pickled.
+    """
+
+    def __init__(self, startMethod=None):
+        self.startMethod = startMethod
+
+    @property
+    def context(self):
+        if self.startMethod is None:
+            return multiprocessing
+        return multiprocessing.get_context(self.startMethod)
+
+    def start(self, target, args):
+        """
+            Start :code:`target(conn, *args)` in a worker, return the
+            connection to the worker and the worker (process or thread).
+        """
+        ctx = self.context
+        conn, childConn = ctx.Pipe()
+        process = ctx.Process(target=target, args=(childConn,) + tuple(args))
+        process.daemon = True
+        process.start()
+        childConn.close()
+        return conn, process
+
+
+class SocketTransport(object):
+    """
+        The messages go through a socket. The worker connects back to a
+        listener of the client, so it can run in a thread (the default, a
+        cheap stand-in for a remote server in the tests) or in a process.
+
+        :param tuple address: (host, port) of the listener, any free port on
+            the local host by default
+        :param bytes authkey: key used to authenticate the worker, a fresh
+            random key of the transport by default (it is passed to the
+            workers with their arguments). The messages are pickles, so a
+            worker on another host must share a secret key with the client,
+            never a well known one.
+        :param bool process: run the workers in processes instead of threads
+    """
+
+    def __init__(
+        self, address=('localhost', 0), authkey=None, process=False
+    ):
+        self.address = address
+        if authkey is None:
+            authkey = os.urandom(32)
+        self.authkey = authkey
+        self.process = process
+
+    def start(self, target, args):
+        """
+            Start :code:`target(conn, *args)` in a worker, return the
+            connection to the worker and the worker (process or thread).
+        """
+        listener = Listener(self.address, authkey=self.authkey)
+        try:
+            workerArgs = (listener.address, self.authkey, target, tuple(args))
+            if self.process:
+                worker = multiprocessing.Process(
+                    target=_connect, args=workerArgs
+                )
+            else:
+                worker = threading.Thread(
+                    target=_connect, args=workerArgs
+                )
+            worker.daemon = True
+            worker.start()
+            conn = listener.accept()
+        finally:
+            listener.close()
+        return conn, worker
+
+
+class Worker(object):
+    """
+        Client of a :class:`SimulationServer` started with the transport.
+
+        :param callable setup: :code:`setup(*args)` returns the problem
+            (paired to its survey) served by the worker, it is called in the
+            worker
+        :param tuple args: arguments of setup
+        :param transport: :class:`ProcessTransport` (default) or
+            :class:`SocketTransport`
+    """
+
+    def __init__(self, setup, args=(), transport=None):
+        if transport is None:
+            transport = ProcessTransport()
+        self.transport = transport
+        self._lock = threading.Lock()
+        self.conn, self.process = transport.start(_runServer, (setup, args))
+        self.info = self._receive()
+
+    def _receive(self):
+        try:
+            status, result = self.conn.recv()
+        except EOFError:
+            raise Exception('The worker stopped unexpectedly.')
+        if status == 'error':
+            raise Exception('Error in the worker:\n{}'.format(result))
+        return result
+
+    def request(self, method, *args):
+        """
+            Call :code:`method(*args)` of the server and return the result.
+        """
+        with self._lock:
+            if self.conn is None:
+                raise RuntimeError('The worker is closed.')
+            self.conn.send((method, args))
+            return self._receive()
+
+    @property
+    def nD(self):
+        return self.info['nD']
+
+    def close(self):
+        """
+            Stop the worker.
+        """
+        if getattr(self, 'conn', None) is None:
+            return
+        with self._lock:
+            try:
+                self.conn.send(('close', ()))
+            except (IOError, OSError):
+                pass
+            self.conn.close()
+            self.conn = None
+        self.process.join(5.)
+
+
+class RemoteSurvey(Survey.BaseSurvey):
+    """
+        Sources and observed data of a part of a survey, the predicted data
+        are computed by the :class:`RemoteProblem` it is paired to.
+    """
+
+    def __init__(self, srcList, **kwargs):
+        self.srcList = srcList
+        Survey.BaseSurvey.__init__(self, **kwargs)
+
+    @property
+    def nD(self):
+        if self.ispaired:
+            return self.prob.worker.nD
+        return super(RemoteSurvey, self).nD
+
+    @Utils.count
+    @Utils.requires('prob')
+    def dpred(self, m=None, f=None):
+        return self.prob.dpred(m)
+
+
+class RemoteProblem(Problem.BaseProblem):
+    """
+        Stand-in for the problem of a :class:`Worker`. The fields stay in the
+        worker, :meth:`fields` returns the model they were computed for.
+    """
+
+    surveyPair = RemoteSurvey
+
+    def __init__(self, worker, **kwargs):
+        # the mesh is in the worker
+        super(Problem.BaseProblem, self).__init__(**kwargs)
+        self.worker = worker
+
+    def fields(self, m):
+        self.model = m
+        self.worker.request('computeFields', m)
+        return self.model
+
+    def dpred(self, m):
+        return self.worker.request('dpred', m)
+
+    def Jvec(self, m, v, f=None):
+        return self.worker.request('Jvec', m, v)
+
+    def Jtvec(self, m, v, f=None):
+        return self.worker.request('Jtvec', m, v)
+
+    def Jvec_approx(self, m, v, f=None):
+        return self.worker.request('Jvec_approx', m, v)
+
+    def Jtvec_approx(self, m, v, f=None):
+        return self.worker.request('Jtvec_approx', m, v)
+
+
+class DistributedDataMisfit(ObjectiveFunction.ComboObjectiveFunction):
+    """
+        l2 data misfit of a survey split between workers.
+
+        The sources of the survey are split in groups (e.g. by line or by
+        tile), each group is served by a long-lived :class:`Worker` that
+        builds and keeps its own mesh, problem and factorizations with
+        :code:`setup(srcList)`. The data misfit of each group is a
+        :class:`SimPEG.DataMisfit.l2_DataMisfit` of a :class:`RemoteSurvey`,
+        only the models, vectors and predicted data go through the transport.
+
+        .. code:: python
+
+            def setup(srcList):
+                # called in the worker
+                mesh = Mesh.TensorMesh(...)
+                prob = DC.Problem3D_CC(mesh, sigmaMap=Maps.ExpMap(mesh))
+                prob.pair(DC.Survey(srcList))
+                return prob
+
+            dmis = DistributedDataMisfit(survey, setup, groups=4)
+            invProb = InvProblem.BaseInvProblem(dmis, reg, opt)
+            ...
+            dmis.close()
+
+        The workers are called concurrently (:attr:`executor`), the terms are
+        added and the predicted data concatenated in the order of the groups,
+        so the results do not depend on the order the workers answer in.
+
+        :param SimPEG.Survey.BaseSurvey survey: survey with the observed data
+        :param callable setup: builds the problem of a group of sources
+        :param groups: number of groups of consecutive sources, or a list of
+            lists of source indices
+        :param transport: :class:`ProcessTransport` (default) or
+            :class:`SocketTransport`
+        :param float std: standard deviation, the survey std if None
+        :param float eps: noise floor, the survey eps if None
+    """
+
+    eps_factor = 1e-5  #: floor relative to the norm of the data if no eps
+    closed = False  #: True once the workers are stopped (:meth:`close`)
+
+    def __init__(
+        self, survey, setup, groups=1, transport=None, std=None, eps=None,
+        **kwargs
+    ):
+        assert survey.dobs is not None, 'The survey must have observed data.'
+        dobs = Utils.mkvc(survey.dobs)
+
+        if std is None:
+            std = survey.std if survey.std is not None else 0.05
+        if eps is None:
+            if survey.eps is not None:
+                eps = survey.eps
+            else:
+                eps = np.linalg.norm(dobs, 2)*self.eps_factor
+
+        if np.isscalar(groups):
+            groups = np.array_split(np.arange(survey.nSrc), groups)
+        groups = [list(group) for group in groups if len(group) > 0]
+
+        dataInds = np.r_[0, np.cumsum(survey.vnD)]
+
+        self.workers = []
+        objfcts = []
+        try:
+            for group in groups:
+                srcList = [survey.srcList[i] for i in group]
+                inds = np.hstack([
+                    np.arange(dataInds[i], dataInds[i+1]) for i in group
+                ])
+                worker = Worker(setup, (srcList,), transport=transport)
+                self.workers.append(worker)
+
+                remoteSurvey = RemoteSurvey(
+                    srcList, dobs=dobs[inds],
+                    std=std[inds] if np.size(std) > 1 else std, eps=eps
+                )
+                remoteSurvey.pair(RemoteProblem(worker))
+                assert remoteSurvey.nD == len(inds), (
+                    'The survey of the worker has {} data, not {}'.format(
+                        remoteSurvey.nD, len(inds)
+                    )
+                )
+                objfcts.append(DataMisfit.l2_DataMisfit(remoteSurvey))
+        except Exception:
+            self.close()
+            raise
+
+        super(DistributedDataMisfit, self).__init__(objfcts, **kwargs)
+
+        if self.executor is None and ThreadPoolExecutor is not None:
+            # the threads wait for the workers
+            self.executor = ThreadPoolExecutor(max_workers=len(objfcts))
+
+    def _checkOpen(self):
+        if self.closed:
+            raise RuntimeError('The misfit is closed, its workers are stopped.')
+
+    def _map(self, fun, items):
+        self._checkOpen()
+        if self.executor is None or len(items) < 2:
+            return [fun(item) for item in items]
+        return list(self.executor.map(fun, items))
+
+    def _mapTerms(self, fun):
+        self._checkOpen()
+        return super(DistributedDataMisfit, self)._mapTerms(fun)
+
+    @property
+    def nD(self):
+        return sum(objfct.survey.nD for objfct in self.objfcts)
+
+    def dpred(self, m):
+        """
+            Predicted data of the whole survey
+        """
+        return np.hstack(self._map(
+            lambda objfct: objfct.survey.dpred(m), self.objfcts
+        ))
+
+    def Jvec(self, m, v):
+        """
+            Sensitivity of the whole survey times a vector
+        """
+        return np.hstack(self._map(
+            lambda objfct: objfct.prob.Jvec(m, v), self.objfcts
+        ))
+
+    def Jtvec(self, m, v):
+        """
+            Adjoint of the sensitivity of the whole survey times a vector of
+            the size of the data
+        """
+        inds = np.r_[0, np.cumsum([objfct.survey.nD for objfct in self.objfcts])]
+        parts = self._map(
+            lambda i: self.objfcts[i].prob.Jtvec(m, v[inds[i]:inds[i+1]]),
+            list(range(len(self.objfcts)))
+        )
+        Jtv = 0.
+        for part in parts:
+            Jtv = Jtv + part
+        return Jtv
+
+    def close(self):
+        """
+            Stop the workers and the executor, the misfit cannot be used
+            afterwards. Closing twice does nothing.
+        """
+        for worker in getattr(self, 'workers', []):
+            worker.close()
+        self.workers = []
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
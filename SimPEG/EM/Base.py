@@ -6,16 +6,22 @@ from __future__ import unicode_literals
 import properties
 from scipy.constants import mu_0
 import numpy as np
+import scipy.sparse as sp
+from scipy.spatial import cKDTree
 
 from SimPEG import Survey
 from SimPEG import Problem
 from SimPEG import Utils
 from SimPEG import Maps
 from SimPEG import Props
+from SimPEG import Mesh
+from SimPEG import ObjectiveFunction
 from SimPEG import Solver as SimpegSolver
 
 
-__all__ = ['BaseEMProblem', 'BaseEMSurvey', 'BaseEMSrc']
+__all__ = [
+    'BaseEMProblem', 'BaseStitched1DProblem', 'BaseEMSurvey', 'BaseEMSrc'
+]
 
 
 
@@ -58,6 +64,10 @@ class BaseEMProblem(Problem.BaseProblem):
     verbose = False
     storeInnerProduct = True
 
+    #: Reuse the sparsity pattern of the mass matrices of inverted physical
+    #: properties, see :class:`SimPEG.Utils.InnerProductAssembler`
+    cacheInnerProducts = True
+
     ####################################################
     # Make A Symmetric
     ####################################################
@@ -163,6 +173,31 @@ class BaseEMProblem(Problem.BaseProblem):
             if hasattr(self, mat):
                 delattr(self, mat)
 
+    def _innerProductAssembler(self, projType):
+        """
+            Inner product assembler for edges ('E') or faces ('F'). These only
+            depend on the mesh, so they are kept on a model update.
+        """
+        if getattr(self, '_innerProductAssemblers', None) is None:
+            self._innerProductAssemblers = {}
+        if projType not in self._innerProductAssemblers:
+            self._innerProductAssemblers[projType] = (
+                Utils.InnerProductAssembler(self.mesh, projType)
+            )
+        return self._innerProductAssemblers[projType]
+
+    def _getInnerProduct(self, projType, prop, propMap, invMat=False):
+        """
+            Inner product matrix for a physical property. If the property is
+            mapped from the model, the matrix is assembled on the cached
+            sparsity pattern, so a model update only recomputes its values.
+        """
+        if self.cacheInnerProducts and propMap is not None:
+            return self._innerProductAssembler(projType)(prop, invMat=invMat)
+        if projType == 'E':
+            return self.mesh.getEdgeInnerProduct(prop, invMat=invMat)
+        return self.mesh.getFaceInnerProduct(prop, invMat=invMat)
+
     @property
     def Me(self):
         """
@@ -215,7 +250,9 @@ class BaseEMProblem(Problem.BaseProblem):
         Used in the E-B formulation
         """
         if getattr(self, '_MfMui', None) is None:
-            self._MfMui = self.mesh.getFaceInnerProduct(self.mui)
+            self._MfMui = self._getInnerProduct(
+                'F', self.mui, getattr(self, 'muiMap', None)
+            )
         return self._MfMui
 
     def MfMuiDeriv(self, u, v=None, adjoint=False):
@@ -226,9 +263,9 @@ class BaseEMProblem(Problem.BaseProblem):
             return Utils.Zero()
 
         if getattr(self, '_MfMuiDeriv', None) is None:
-            self._MfMuiDeriv = self.mesh.getFaceInnerProductDeriv(
-                np.ones(self.mesh.nC)
-            )(np.ones(self.mesh.nF)) * self.muiDeriv
+            self._MfMuiDeriv = (
+                self._innerProductAssembler('F').deriv * self.muiDeriv
+            )
 
         if v is not None:
             if adjoint is True:
@@ -245,7 +282,9 @@ class BaseEMProblem(Problem.BaseProblem):
         Inverse of :code:`MfMui`.
         """
         if getattr(self, '_MfMuiI', None) is None:
-            self._MfMuiI = self.mesh.getFaceInnerProduct(self.mui, invMat=True)
+            self._MfMuiI = self._getInnerProduct(
+                'F', self.mui, getattr(self, 'muiMap', None), invMat=True
+            )
         return self._MfMuiI
 
     def MfMuiIDeriv(self, u, v=None, adjoint=False):
@@ -277,7 +316,9 @@ class BaseEMProblem(Problem.BaseProblem):
         Used in the H-J formulation
         """
         if getattr(self, '_MeMu', None) is None:
-            self._MeMu = self.mesh.getEdgeInnerProduct(self.mu)
+            self._MeMu = self._getInnerProduct(
+                'E', self.mu, getattr(self, 'muMap', None)
+            )
         return self._MeMu
 
     def MeMuDeriv(self, u, v=None, adjoint=False):
@@ -288,9 +329,9 @@ class BaseEMProblem(Problem.BaseProblem):
             return Utils.Zero()
 
         if getattr(self, '_MeMuDeriv', None) is None:
-            self._MeMuDeriv = self.mesh.getEdgeInnerProductDeriv(
-                np.ones(self.mesh.nC)
-            )(np.ones(self.mesh.nE)) * self.muDeriv
+            self._MeMuDeriv = (
+                self._innerProductAssembler('E').deriv * self.muDeriv
+            )
 
         if v is not None:
             if adjoint:
@@ -307,7 +348,9 @@ class BaseEMProblem(Problem.BaseProblem):
         Inverse of :code:`MeMu`
         """
         if getattr(self, '_MeMuI', None) is None:
-            self._MeMuI = self.mesh.getEdgeInnerProduct(self.mu, invMat=True)
+            self._MeMuI = self._getInnerProduct(
+                'E', self.mu, getattr(self, 'muMap', None), invMat=True
+            )
         return self._MeMuI
 
     def MeMuIDeriv(self, u, v=None, adjoint=False):
@@ -342,7 +385,9 @@ class BaseEMProblem(Problem.BaseProblem):
         Used in the E-B formulation
         """
         if getattr(self, '_MeSigma', None) is None:
-            self._MeSigma = self.mesh.getEdgeInnerProduct(self.sigma)
+            self._MeSigma = self._getInnerProduct(
+                'E', self.sigma, self.sigmaMap
+            )
         return self._MeSigma
 
     def MeSigmaDeriv(self, u, v=None, adjoint=False):
@@ -353,9 +398,9 @@ class BaseEMProblem(Problem.BaseProblem):
             return Utils.Zero()
 
         if getattr(self, '_MeSigmaDeriv', None) is None:
-            self._MeSigmaDeriv = self.mesh.getEdgeInnerProductDeriv(
-                np.ones(self.mesh.nC)
-            )(np.ones(self.mesh.nE)) * self.sigmaDeriv
+            self._MeSigmaDeriv = (
+                self._innerProductAssembler('E').deriv * self.sigmaDeriv
+            )
 
         if v is not None:
             if adjoint:
@@ -372,8 +417,8 @@ class BaseEMProblem(Problem.BaseProblem):
         Inverse of the edge inner product matrix for \\(\\sigma\\).
         """
         if getattr(self, '_MeSigmaI', None) is None:
-            self._MeSigmaI = self.mesh.getEdgeInnerProduct(
-                self.sigma, invMat=True
+            self._MeSigmaI = self._getInnerProduct(
+                'E', self.sigma, self.sigmaMap, invMat=True
             )
         return self._MeSigmaI
 
@@ -405,7 +450,7 @@ class BaseEMProblem(Problem.BaseProblem):
         formulation
         """
         if getattr(self, '_MfRho', None) is None:
-            self._MfRho = self.mesh.getFaceInnerProduct(self.rho)
+            self._MfRho = self._getInnerProduct('F', self.rho, self.rhoMap)
         return self._MfRho
 
     def MfRhoDeriv(self, u, v=None, adjoint=False):
@@ -416,9 +461,9 @@ class BaseEMProblem(Problem.BaseProblem):
             return Utils.Zero()
 
         if getattr(self, '_MfRhoDeriv', None) is None:
-            self._MfRhoDeriv = self.mesh.getFaceInnerProductDeriv(
-                np.ones(self.mesh.nC)
-            )(np.ones(self.mesh.nF)) * self.rhoDeriv
+            self._MfRhoDeriv = (
+                self._innerProductAssembler('F').deriv * self.rhoDeriv
+            )
 
         if v is not None:
             if adjoint is True:
@@ -435,7 +480,9 @@ class BaseEMProblem(Problem.BaseProblem):
         Inverse of :code:`MfRho`
         """
         if getattr(self, '_MfRhoI', None) is None:
-            self._MfRhoI = self.mesh.getFaceInnerProduct(self.rho, invMat=True)
+            self._MfRhoI = self._getInnerProduct(
+                'F', self.rho, self.rhoMap, invMat=True
+            )
         return self._MfRhoI
 
     def MfRhoIDeriv(self, u, v=None, adjoint=False):
@@ -460,6 +507,179 @@ class BaseEMProblem(Problem.BaseProblem):
             return dMfRhoI_dI * self.MfRhoDeriv(u, v=v)
 
 
+###############################################################################
+#                                                                             #
+#                         Base Stitched 1D Problem                            #
+#                                                                             #
+###############################################################################
+
+class BaseStitched1DProblem(Problem.BaseProblem):
+    """
+    Base class of the stitched 1D problems: a layered earth under each
+    station of the survey, all with the layers of the 1D mesh (the deepest
+    layer first, it also is the halfspace below the mesh).
+
+    The conductivity is the stack of the layered models of the stations
+    (nStation x mesh.nC, the layers of a station are consecutive). The data
+    of a station only depend on its layers, so the sensitivity is block
+    diagonal: subclasses implement :meth:`_sensitivityBlocks`.
+
+    The survey has the locations of the stations (:code:`locs`) and the
+    data are ordered by station.
+    """
+
+    sigma, sigmaMap, sigmaDeriv = Props.Invertible(
+        "Electrical conductivity (S/m) of the layers of all the stations"
+    )
+
+    deleteTheseOnModelUpdate = ['_Jblocks']
+
+    @property
+    def sigmaStations(self):
+        """
+        Conductivities of the layers of each station (nStation x mesh.nC)
+        """
+        return self.sigma.reshape(self.survey.nStation, self.mesh.nC)
+
+    def _sensitivityBlocks(self):
+        """
+        Derivatives of the data of each station with respect to the
+        conductivities of its layers (nStation x nD/nStation x mesh.nC)
+        """
+        raise NotImplementedError(
+            '_sensitivityBlocks has not been implemented for {}'.format(
+                self.__class__.__name__
+            )
+        )
+
+    @property
+    def Jblocks(self):
+        """
+        Stored sensitivity blocks of the stations (see
+        :meth:`_sensitivityBlocks`)
+        """
+        if getattr(self, '_Jblocks', None) is None:
+            self._Jblocks = self._sensitivityBlocks()
+        return self._Jblocks
+
+    def Jvec(self, m, v, f=None):
+        """
+        Sensitivity times a vector
+
+        :param numpy.ndarray m: model
+        :param numpy.ndarray v: vector (nP,)
+        :param f: fields (not used, the sensitivities are stored)
+        :rtype: numpy.ndarray
+        :return: Jv (nD,)
+        """
+        self.model = m
+        dsig = (self.sigmaDeriv * v).reshape(
+            self.survey.nStation, self.mesh.nC
+        )
+        return np.einsum('sdc,sc->sd', self.Jblocks, dsig).ravel()
+
+    def Jtvec(self, m, v, f=None):
+        """
+        Adjoint sensitivity times a vector
+
+        :param numpy.ndarray m: model
+        :param numpy.ndarray v: vector (nD,)
+        :param f: fields (not used, the sensitivities are stored)
+        :rtype: numpy.ndarray
+        :return: Jtv (nP,)
+        """
+        self.model = m
+        blocks = self.Jblocks
+        dsig = np.einsum('sdc,sd->sc', blocks, v.reshape(blocks.shape[:2]))
+        return self.sigmaDeriv.T * dsig.ravel()
+
+    def getJ(self, m, f=None):
+        """
+        Sparse sensitivity matrix, block diagonal in the conductivities
+
+        :param numpy.ndarray m: model
+        :rtype: scipy.sparse.csr_matrix
+        :return: J (nD x nP)
+        """
+        self.model = m
+        blocks = self.Jblocks
+        nS, nDs, nC = blocks.shape
+        rows = np.arange(nS * nDs).reshape(nS, nDs)
+        cols = np.arange(nS * nC).reshape(nS, nC)
+        J = sp.csr_matrix((
+            blocks.ravel(),
+            (
+                np.repeat(rows, nC, axis=1).ravel(),
+                np.tile(cols, (1, nDs)).ravel()
+            )
+        ), shape=(nS * nDs, nS * nC))
+        return J * self.sigmaDeriv
+
+    def getJtJdiag(self, m, W=None):
+        """
+        Diagonal of JtJ (of WJ if the data weights W are given)
+        """
+        J = self.getJ(m)
+        if W is not None:
+            J = W * J
+        return np.asarray(J.power(2).sum(axis=0)).ravel()
+
+    @property
+    def regularizationMesh(self):
+        """
+        2D mesh of the stitched model for the regularization: the layers
+        along x and the stations along y (smoothness along y only makes
+        sense if the stations are in order along a line, see
+        :meth:`lateralSmoothness` otherwise).
+        """
+        return Mesh.TensorMesh(
+            [self.mesh.hx, np.ones(self.survey.nStation)],
+            x0=[self.mesh.x0[0], 0.]
+        )
+
+    def lateralSmoothness(self, nNeighbours=4, **kwargs):
+        """
+        Objective function coupling the layers of neighbouring stations
+
+        .. math::
+
+            \phi = \\frac{1}{2} \sum_{(i, j)} \sum_{l}
+                \\left(\\frac{m_{i, l} - m_{j, l}}{d_{ij}}\\right)^2
+
+        for the pairs (i, j) of a station i and its nNeighbours nearest
+        stations, at a distance d_ij.
+
+        :param int nNeighbours: number of neighbours of each station
+        :rtype: SimPEG.ObjectiveFunction.L2ObjectiveFunction
+        """
+        locs = self.survey.locs
+        nS, nC = self.survey.nStation, self.mesh.nC
+        nNeighbours = min(nNeighbours, nS - 1)
+        if nNeighbours > 0:
+            _, inds = cKDTree(locs).query(locs, k=nNeighbours + 1)
+            pairs = np.sort(np.c_[
+                np.repeat(np.arange(nS), nNeighbours), inds[:, 1:].ravel()
+            ], axis=1)
+            pairs = np.unique(pairs[pairs[:, 0] != pairs[:, 1]], axis=0)
+        else:
+            pairs = np.zeros((0, 2), dtype=int)
+        dist = np.linalg.norm(locs[pairs[:, 0]] - locs[pairs[:, 1]], axis=1)
+
+        # one row per pair and layer
+        nPair = pairs.shape[0]
+        rows = np.repeat(np.arange(nPair * nC), 2)
+        cols = (
+            pairs[:, None, :] * nC + np.arange(nC)[None, :, None]
+        ).ravel()
+        vals = np.tile(np.r_[1., -1.], nPair * nC) * np.repeat(
+            1. / dist, 2 * nC
+        )
+        W = sp.csr_matrix(
+            (vals, (rows, cols)), shape=(nPair * nC, nS * nC)
+        )
+        return ObjectiveFunction.L2ObjectiveFunction(W=W, **kwargs)
+
+
 ###############################################################################
 #                                                                             #
 #                             Base EM Survey                                  #
@@ -0,0 +1,240 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+from scipy.constants import mu_0
+
+from ..Base import BaseStitched1DProblem
+from .SurveyEM1D import BaseSurveyEM1D, SurveyFDEM1D, SurveyTDEM1D
+from .Transforms import hankelFilter
+
+
+def reflectionTE(mesh, sigma, freqs, lam, returnDeriv=False):
+    """
+    TE reflection coefficients of layered earths at the surface
+
+    .. math::
+
+        r_{TE} = \\frac{\lambda - \hat{Y}}{\lambda + \hat{Y}}
+
+    with the (normalized) admittance of the ground given by the recursion
+
+    .. math::
+
+        \hat{Y}_j = u_j \\frac{\hat{Y}_{j-1} + u_j \\tanh(u_j h_j)}
+            {u_j + \hat{Y}_{j-1} \\tanh(u_j h_j)}, \quad
+        u_j = \sqrt{\lambda^2 + i \omega \mu_0 \sigma_j}
+
+    from the halfspace below the mesh (quasi-static, in free space
+    magnetic permeability), vectorized over the soundings, the frequencies
+    and the wavenumbers.
+
+    :param discretize.TensorMesh mesh: 1D mesh of the layers (the deepest
+        layer first, it also is the halfspace)
+    :param numpy.ndarray sigma: conductivities (nSounding x mesh.nC)
+    :param numpy.ndarray freqs: frequencies (nFreq,)
+    :param numpy.ndarray lam: wavenumbers (nLambda,)
+    :param bool returnDeriv: also return the derivatives
+    :rtype: numpy.ndarray
+    :return: reflection coefficients (nSounding x nFreq x nLambda), and their
+        derivatives with respect to the conductivities
+        (nSounding x nFreq x nLambda x mesh.nC) if returnDeriv
+    """
+    sigma = np.atleast_2d(sigma)
+    omega = 2 * np.pi * np.asarray(freqs, dtype=float)
+    lam = lam[None, None, :]
+    iwm = 1j * omega[None, :, None] * mu_0
+
+    def admittance(sig):
+        u = np.sqrt(lam**2 + iwm * sig[:, None, None])
+        return u, iwm / (2 * u)
+
+    Y, dY0 = admittance(sigma[:, 0])
+    dRdY, dRds = [], []
+
+    for j, h in enumerate(mesh.hx):
+        u, duds = admittance(sigma[:, j])
+        t = np.tanh(u * h)
+        num = Y + u * t
+        den = u + Y * t
+
+        if returnDeriv:
+            # partial derivatives of the recursion
+            dRdY.append(u**2 * (1 - t**2) / den**2)
+            dRdu = num / den + u * (t * den - num) / den**2
+            dRdt = u * (u**2 - Y**2) / den**2
+            dRds.append(dRdu * duds + dRdt * (1 - t**2) * h * duds)
+
+        Y = u * num / den
+
+    rTE = (lam - Y) / (lam + Y)
+    if not returnDeriv:
+        return rTE
+
+    # chain rule through the recursion: the derivative with respect to a
+    # layer is propagated by the products of dR/dY of the layers above it
+    dRdY = np.stack(dRdY, axis=-1)
+    above = np.ones_like(dRdY)
+    above[..., :-1] = np.cumprod(dRdY[..., :0:-1], axis=-1)[..., ::-1]
+    dY = np.stack(dRds, axis=-1) * above
+    dY[..., 0] += dY0 * dRdY[..., 0] * above[..., 0]
+    return rTE, (-2 * lam / (lam + Y)**2)[..., None] * dY
+
+
+class BaseProblemEM1D(BaseStitched1DProblem):
+    """
+    Base class of the stitched 1D EM problems: the secondary magnetic flux
+    density of the layered earth of each station, as a Hankel transform of
+    the TE reflection coefficient (:func:`reflectionTE`) computed with the
+    digital filter of :func:`SimPEG.EM.EM1D.Transforms.hankelFilter`.
+
+    The stations are processed in chunks, so that the arrays of derivatives
+    have at most maxChunkSize entries. The wavenumbers at which the kernel
+    of all the stations of a chunk is negligible (high wavenumbers for
+    sources above the ground) are skipped.
+    """
+
+    surveyPair = BaseSurveyEM1D
+
+    #: Maximum number of entries of the arrays of a chunk of stations
+    maxChunkSize = 2e6
+
+    #: Relative size of the negligible terms of the Hankel transforms
+    hankelTol = 1e-12
+
+    deleteTheseOnModelUpdate = ['_Jblocks', '_response']
+
+    def __init__(self, mesh, **kwargs):
+        BaseStitched1DProblem.__init__(self, mesh, **kwargs)
+
+    def frequencyResponse(self, freqs, returnDeriv=False):
+        """
+        Secondary magnetic flux density of the stations
+
+        :param numpy.ndarray freqs: frequencies
+        :param bool returnDeriv: also return the derivatives
+        :rtype: numpy.ndarray
+        :return: secondary fields (nStation x nFreq), and their derivatives
+            with respect to the conductivities of the layers of their
+            station (nStation x nFreq x mesh.nC) if returnDeriv
+        """
+        survey = self.survey
+        order, r, p, factor = survey.hankelKernel
+        base, weights = hankelFilter(order)
+        lam = base / r
+
+        # the weights of the filter with the decay with the heights
+        W = (factor / r) * (weights * lam**p)[None, :] * np.exp(
+            -lam[None, :] * survey.heights[:, None]
+        )
+
+        sigma = self.sigmaStations
+        nS, nF = survey.nStation, len(freqs)
+        nC = self.mesh.nC
+        chunk = max(1, int(
+            self.maxChunkSize // (nF * len(lam) * (nC if returnDeriv else 1))
+        ))
+
+        B = np.empty((nS, nF), dtype=complex)
+        if returnDeriv:
+            dB = np.empty((nS, nF, nC), dtype=complex)
+        for start in range(0, nS, chunk):
+            inds = slice(start, min(start + chunk, nS))
+            Wc = W[inds]
+            keep = np.abs(Wc).max(axis=0) > self.hankelTol * np.abs(Wc).max()
+            Wc = Wc[:, keep]
+            if returnDeriv:
+                rTE, drTE = reflectionTE(
+                    self.mesh, sigma[inds], freqs, lam[keep], returnDeriv=True
+                )
+                dB[inds] = np.einsum('sn,sfnc->sfc', Wc, drTE)
+            else:
+                rTE = reflectionTE(self.mesh, sigma[inds], freqs, lam[keep])
+            B[inds] = np.einsum('sn,sfn->sf', Wc, rTE)
+
+        if returnDeriv:
+            return B, dB
+        return B
+
+    def fields(self, m=None):
+        """
+        Responses of the stations
+
+        :param numpy.ndarray m: model
+        :rtype: numpy.ndarray
+        :return: responses (nStation x nD/nStation)
+        """
+        if m is not None:
+            self.model = m
+        if getattr(self, '_response', None) is None:
+            self._response = self._responses(
+                self.frequencyResponse(self.survey.freqs)
+            )
+        return self._response
+
+    def _responses(self, B):
+        """
+        Responses of the stations from their frequency domain responses
+        """
+        raise NotImplementedError
+
+    def _responsesDeriv(self, dB):
+        """
+        Sensitivity blocks of the stations from the derivatives of their
+        frequency domain responses
+        """
+        raise NotImplementedError
+
+    def _sensitivityBlocks(self):
+        B, dB = self.frequencyResponse(self.survey.freqs, returnDeriv=True)
+        self._response = self._responses(B)
+        return self._responsesDeriv(dB)
+
+
+class ProblemFDEM1D(BaseProblemEM1D):
+    """
+    Frequency domain stitched 1D EM problem, the secondary magnetic flux
+    density of the layered earth of each station of a
+    :class:`SimPEG.EM.EM1D.SurveyFDEM1D`.
+
+    .. code:: python
+
+        survey = EM.EM1D.SurveyFDEM1D(
+            locs, freqs, srcHeight=30., offset=7.86
+        )
+        prob = EM.EM1D.ProblemFDEM1D(
+            layers, sigmaMap=Maps.ExpMap(nP=survey.nStation*layers.nC)
+        )
+        prob.pair(survey)
+    """
+
+    surveyPair = SurveyFDEM1D
+
+    def _responses(self, B):
+        return B
+
+    def _responsesDeriv(self, dB):
+        blocks = np.stack(
+            [getattr(dB, comp) for comp in self.survey.components], axis=2
+        )
+        return blocks.reshape(self.survey.nStation, -1, self.mesh.nC)
+
+
+class ProblemTDEM1D(BaseProblemEM1D):
+    """
+    Time domain stitched 1D EM problem, the secondary magnetic flux density
+    (or its time derivative) of the layered earth of each station of a
+    :class:`SimPEG.EM.EM1D.SurveyTDEM1D`, after the switch off of the
+    current.
+
+    The time domain responses are linear transforms of the frequency domain
+    responses (see :func:`SimPEG.EM.EM1D.Transforms.frequencyToTime`).
+    """
+
+    surveyPair = SurveyTDEM1D
+
+    def _responses(self, B):
+        return B.imag.dot(self.survey.transform.T)
+
+    def _responsesDeriv(self, dB):
+        return np.einsum('tf,sfc->stc', self.survey.transform, dB.imag)
@@ -0,0 +1,237 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+from scipy.constants import mu_0
+
+from SimPEG import Survey
+from .Transforms import frequencyToTime
+
+
+class BaseSurveyEM1D(Survey.BaseSurvey):
+    """
+    Base class of the surveys of stitched 1D EM soundings: the same system
+    at every station, only the heights of the source and of the receiver
+    may change from a station to the next.
+
+    The sources are vertical magnetic dipoles ('VMD') with a receiver at a
+    horizontal offset, or horizontal circular loops ('CircularLoop') with
+    the receiver at their center. The receivers measure the secondary
+    magnetic flux density, along z or, for a dipole, along the offset
+    ('r').
+
+    **Requried**
+    :param numpy.ndarray locs: Locations of the stations (nStation x dim)
+
+    **Optional**
+    :param srcHeight: Height(s) of the source above the ground
+    :param rxHeight: Height(s) of the receiver (the source height if None)
+    :param str srcType: 'VMD' or 'CircularLoop'
+    :param float moment: Dipole moment (A m^2) or current of the loop (A)
+    :param float offset: Horizontal offset of the receiver (VMD)
+    :param float radius: Radius of the loop (CircularLoop)
+    :param str rxOrientation: 'z' or 'r'
+    """
+
+    srcType = 'VMD'
+    moment = 1.
+    offset = None
+    radius = None
+    rxOrientation = 'z'
+
+    def __init__(self, locs, srcHeight=0., rxHeight=None, **kwargs):
+        self.locs = np.atleast_2d(locs)
+        self.srcHeight = srcHeight
+        self.rxHeight = srcHeight if rxHeight is None else rxHeight
+        Survey.BaseSurvey.__init__(self, **kwargs)
+
+        assert self.srcType in ['VMD', 'CircularLoop'], (
+            "srcType must be 'VMD' or 'CircularLoop', not {}".format(
+                self.srcType
+            )
+        )
+        assert self.rxOrientation in ['z', 'r'], (
+            "rxOrientation must be 'z' or 'r', not {}".format(
+                self.rxOrientation
+            )
+        )
+        if self.srcType == 'VMD':
+            assert self.offset is not None and self.offset > 0, (
+                'The offset of the receiver of a VMD must be positive'
+            )
+        else:
+            assert self.radius is not None and self.radius > 0, (
+                'The radius of the CircularLoop must be positive'
+            )
+            assert self.rxOrientation == 'z', (
+                'The receiver at the center of a loop measures bz'
+            )
+
+    @property
+    def nStation(self):
+        """Number of stations"""
+        return self.locs.shape[0]
+
+    @property
+    def heights(self):
+        """
+        Sum of the heights of the source and of the receiver of the
+        stations (nStation,)
+        """
+        return (
+            np.ones(self.nStation) * self.srcHeight +
+            np.ones(self.nStation) * self.rxHeight
+        )
+
+    @property
+    def nDStation(self):
+        """Number of data of a station"""
+        raise NotImplementedError
+
+    @property
+    def nD(self):
+        """Number of data"""
+        return self.nStation * self.nDStation
+
+    @property
+    def vnD(self):
+        """Vector number of data (of each station)"""
+        return self.nDStation * np.ones(self.nStation, dtype=int)
+
+    @property
+    def hankelKernel(self):
+        """
+        Hankel transform of the secondary field,
+
+        .. math::
+
+            b = \\text{factor} \int_0^\infty r_{TE}(\lambda)
+                e^{-\lambda (h_s + h_r)} \lambda^p J_\\nu(\lambda r)
+                d\lambda
+
+        :rtype: tuple
+        :return: order, r, p, factor
+        """
+        if self.srcType == 'VMD':
+            order = 0 if self.rxOrientation == 'z' else 1
+            return order, self.offset, 2, mu_0 * self.moment / (4 * np.pi)
+        return 1, self.radius, 1, mu_0 * self.moment * self.radius / 2.
+
+
+class SurveyFDEM1D(BaseSurveyEM1D):
+    """
+    Frequency domain stitched 1D EM survey, the data are ordered by
+    station, then by frequency and then by component.
+
+    **Requried**
+    :param numpy.ndarray locs: Locations of the stations (nStation x dim)
+    :param numpy.ndarray freqs: Frequencies
+
+    **Optional**
+    :param list components: 'real' and/or 'imag'
+    """
+
+    components = ['real', 'imag']
+
+    def __init__(self, locs, freqs, **kwargs):
+        self.freqs = np.asarray(freqs, dtype=float)
+        BaseSurveyEM1D.__init__(self, locs, **kwargs)
+        for comp in self.components:
+            assert comp in ['real', 'imag'], (
+                "{} is not a valid component, use 'real' or 'imag'".format(
+                    comp
+                )
+            )
+
+    @property
+    def nFreq(self):
+        """Number of frequencies"""
+        return len(self.freqs)
+
+    @property
+    def nDStation(self):
+        """Number of data of a station"""
+        return self.nFreq * len(self.components)
+
+    def eval(self, f):
+        """
+        Evaluate the data from the secondary fields
+
+        :param numpy.ndarray f: secondary fields (nStation x nFreq)
+        :rtype: numpy.ndarray
+        :return: data (nD,)
+        """
+        return np.stack(
+            [getattr(f, comp) for comp in self.components], axis=2
+        ).ravel()
+
+
+class SurveyTDEM1D(BaseSurveyEM1D):
+    """
+    Time domain stitched 1D EM survey, the data are ordered by station and
+    then by time.
+
+    The current is switched off at t = 0, all the times are after the
+    switch off. The waveform is a step off, or piecewise linear (it starts
+    and ends with no current, at t = 0).
+
+    **Requried**
+    :param numpy.ndarray locs: Locations of the stations (nStation x dim)
+    :param numpy.ndarray times: Times of the channels
+
+    **Optional**
+    :param str rxType: 'b' or 'dbdt'
+    :param numpy.ndarray waveformTimes: Times of the nodes of the waveform
+    :param numpy.ndarray waveformCurrent: Normalized current at the nodes
+    """
+
+    rxType = 'b'
+    waveformTimes = None
+    waveformCurrent = None
+
+    def __init__(self, locs, times, **kwargs):
+        self.times = np.asarray(times, dtype=float)
+        BaseSurveyEM1D.__init__(self, locs, **kwargs)
+
+    @property
+    def nTime(self):
+        """Number of times"""
+        return len(self.times)
+
+    @property
+    def nDStation(self):
+        """Number of data of a station"""
+        return self.nTime
+
+    @property
+    def freqs(self):
+        """
+        Frequencies of the frequency domain responses
+        """
+        if getattr(self, '_freqs', None) is None:
+            self._freqs, self._transform = frequencyToTime(
+                self.times, rxType=self.rxType,
+                waveformTimes=self.waveformTimes,
+                waveformCurrent=self.waveformCurrent
+            )
+        return self._freqs
+
+    @property
+    def transform(self):
+        """
+        Transform of the imaginary part of the frequency domain responses
+        to the data of a station (nTime x nFreq)
+        """
+        if getattr(self, '_transform', None) is None:
+            self.freqs
+        return self._transform
+
+    def eval(self, f):
+        """
+        Evaluate the data from the time domain responses
+
+        :param numpy.ndarray f: responses (nStation x nTime)
+        :rtype: numpy.ndarray
+        :return: data (nD,)
+        """
+        return f.ravel()
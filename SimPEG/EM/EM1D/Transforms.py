@@ -0,0 +1,187 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+from scipy.special import loggamma
+
+#: Designed filters, by (order, spacing, uMin, uMax)
+_filters = {}
+
+
+def hankelFilter(order, spacing=0.1, uMin=-20., uMax=12.):
+    """
+    Digital filter of the Hankel transform of order *order*
+
+    .. math::
+
+        \int_0^\infty K(\lambda) J_\\nu(\lambda r) d\lambda
+            \\approx \\frac{1}{r} \sum_n K\\left(\\frac{b_n}{r}\\right) w_n
+
+    The abscissae :math:`b_n = e^{u_n}` are equally spaced in
+    :math:`u \in [u_{min}, u_{max}]`. The weights are the sinc interpolation
+    weights of the kernel in u, computed from the Mellin transform of the
+    Bessel function (a ratio of gamma functions, of modulus 1 on the line
+    used here) with a smooth taper near the Nyquist wavenumber. The filter
+    is exact for kernels that are band limited in u; it is accurate to
+    about 1e-6 for the smooth kernels of layered earths.
+
+    The orders -1/2 and 1/2 give the cosine and sine transforms (see
+    :func:`fourierFilter`).
+
+    :param float order: order of the Bessel function
+    :param float spacing: spacing of the abscissae in u
+    :param float uMin: smallest u
+    :param float uMax: largest u
+    :rtype: tuple
+    :return: abscissae, weights
+    """
+    key = (order, spacing, uMin, uMax)
+    if key not in _filters:
+        u = np.arange(uMin, uMax + spacing / 2., spacing)
+        kMax = np.pi / spacing
+        k = np.linspace(0., kMax, 20001)
+        a = order + 1.
+        G = np.exp(
+            -1j * k * np.log(2.) + loggamma((a - 1j * k) / 2.) -
+            loggamma((a + 1j * k) / 2.)
+        )
+        # smooth taper of the band, on its outer 40 percent
+        x = np.clip((k / kMax - 0.6) / 0.4, 1e-12, 1. - 1e-12)
+        with np.errstate(over='ignore'):
+            taper = 1. / (1. + np.exp(1. / (1. - x) - 1. / x))
+        taper[k < 0.6 * kMax] = 1.
+        taper[-1] = 0.
+        integrand = np.real(
+            (G * taper)[None, :] * np.exp(1j * k[None, :] * u[:, None])
+        )
+        weights = spacing / np.pi * np.trapz(integrand, k, axis=1)
+        _filters[key] = (np.exp(u), weights)
+    return _filters[key]
+
+
+def fourierFilter(kind):
+    """
+    Digital filter of the cosine or sine transform
+
+    .. math::
+
+        \int_0^\infty K(\omega) \cos(\omega t) d\omega
+            \\approx \\frac{1}{t} \sum_n K\\left(\\frac{b_n}{t}\\right) w_n
+
+    from the Hankel filters of order -1/2 and 1/2, with
+    :math:`\cos(x) = \sqrt{\pi x / 2} J_{-1/2}(x)`.
+
+    :param str kind: 'cos' or 'sin'
+    :rtype: tuple
+    :return: abscissae, weights
+    """
+    assert kind in ['cos', 'sin'], "kind must be 'cos' or 'sin'"
+    base, weights = hankelFilter(-0.5 if kind == 'cos' else 0.5)
+    return base, weights * np.sqrt(np.pi * base / 2.)
+
+
+def frequencyToTime(
+    times, rxType='b', waveformTimes=None, waveformCurrent=None,
+    nPerDecade=15, nQuadrature=8
+):
+    """
+    Linear transform of the imaginary part of a frequency domain response
+    (of a unit magnetic moment) to the time domain response, after the
+    current is switched off at t = 0.
+
+    For a step off, the response is
+
+    .. math::
+
+        b(t) = -\\frac{2}{\pi} \int_0^\infty
+            \\frac{\\text{Im}(B(\omega))}{\omega} \cos(\omega t) d\omega
+
+    computed with the cosine filter of :func:`fourierFilter` and a cubic
+    spline of the response in :math:`\log \omega`. The time derivative is
+    the derivative of this sum with respect to t (through the abscissae
+    :math:`b_n / t`), which is more accurate at late times than the sine
+    transform of the response. For a piecewise linear waveform I (zero at
+    its first time and at t = 0), the response is the convolution
+
+    .. math::
+
+        b_I(t) = -\int I'(\\tau) b(t - \\tau) d\\tau
+
+    integrated with Gauss-Legendre quadratures in :math:`\log(t - \\tau)`.
+
+    :param numpy.ndarray times: times of the channels (> 0)
+    :param str rxType: 'b' or 'dbdt'
+    :param numpy.ndarray waveformTimes: times of the nodes of the waveform
+        (the last one is 0), step off if None
+    :param numpy.ndarray waveformCurrent: normalized current at the nodes
+    :param int nPerDecade: number of frequencies per decade
+    :param int nQuadrature: number of quadrature points per segment of the
+        waveform
+    :rtype: tuple
+    :return: frequencies (nFreq,), transform (nTime x nFreq)
+    """
+    assert rxType in ['b', 'dbdt'], "rxType must be 'b' or 'dbdt'"
+    times = np.asarray(times, dtype=float)
+    assert np.all(times > 0), 'The times must be after the switch off (> 0)'
+
+    # times at which the step off response is needed and the matrix that
+    # gives the channels from them
+    if waveformTimes is None:
+        tq = times
+        Q = np.eye(len(times))
+    else:
+        waveformTimes = np.asarray(waveformTimes, dtype=float)
+        waveformCurrent = np.asarray(waveformCurrent, dtype=float)
+        assert waveformTimes[-1] == 0. and waveformCurrent[-1] == 0., (
+            'The waveform must end at t = 0, with no current'
+        )
+        x, w = np.polynomial.legendre.leggauss(nQuadrature)
+        slopes = np.diff(waveformCurrent) / np.diff(waveformTimes)
+        tq, cols = [], []
+        for i, t in enumerate(times):
+            for t0, t1, slope in zip(
+                waveformTimes[:-1], waveformTimes[1:], slopes
+            ):
+                # log(t - tau) from log(t - t1) to log(t - t0)
+                s0, s1 = np.log(t - t1), np.log(t - t0)
+                s = (s1 - s0) / 2. * x + (s1 + s0) / 2.
+                tq.append(np.exp(s))
+                cols.append(
+                    (i, -slope * (s1 - s0) / 2. * w * np.exp(s))
+                )
+        Q = np.zeros((len(times), len(tq) * nQuadrature))
+        for j, (i, weights) in enumerate(cols):
+            Q[i, j * nQuadrature:(j + 1) * nQuadrature] = weights
+        tq = np.hstack(tq)
+
+    base, weights = fourierFilter('cos')
+
+    # frequencies of the spline, from 1e-4 / max(t) to 1e4 / min(t): below
+    # them Im(B) is extended linearly, above them it is neglected
+    logOmega = np.log(base[None, :] / tq[:, None])
+    logMin = max(logOmega.min(), np.log(2 * np.pi * 1e-4 / tq.max()))
+    logMax = min(logOmega.max(), np.log(2 * np.pi * 1e4 / tq.min()))
+    nFreq = int(np.ceil(
+        (logMax - logMin) / np.log(10.) * nPerDecade
+    )) + 1
+    logGrid = np.linspace(logMin, logMax, nFreq)
+    spline = CubicSpline(logGrid, np.eye(nFreq))
+    if rxType == 'dbdt':
+        spline = spline.derivative()
+
+    T = np.zeros((len(tq), nFreq))
+    for i, t in enumerate(tq):
+        # rows of Im(B)/omega (or of its derivative in log(omega), over
+        # omega) at the abscissae, from the spline of Im(B)
+        x = logOmega[i]
+        S = spline(x)
+        S[x < logMin] = 0.
+        S[x < logMin, 0] = np.exp(x[x < logMin] - logMin)
+        S[x > logMax] = 0.
+        S /= np.exp(x)[:, None]
+        T[i] = -2. / np.pi / t * weights.dot(S)
+        if rxType == 'dbdt':
+            T[i] /= -t
+
+    return np.exp(logGrid) / (2 * np.pi), Q.dot(T)
@@ -0,0 +1,13 @@
+""" module SimPEG.EM.EM1D
+
+Layered earth (1D) frequency and time domain EM soundings, computed
+semi-analytically with digital filters, for stitched 1D inversions.
+
+"""
+from __future__ import absolute_import
+
+from . import Transforms
+from .SurveyEM1D import BaseSurveyEM1D, SurveyFDEM1D, SurveyTDEM1D
+from .ProblemEM1D import (
+    reflectionTE, BaseProblemEM1D, ProblemFDEM1D, ProblemTDEM1D
+)
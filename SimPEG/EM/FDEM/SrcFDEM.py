@@ -575,6 +575,76 @@ class PrimSecSigma(BaseFDEMSrc):
         return prob.MeSigmaDeriv(self.ePrimary(prob), v, adjoint)
 
 
+class _PrimaryCache(object):
+    """
+    Primary fields and factorizations of a primary problem for the last
+    model, and the projections from its mesh, shared by the
+    PrimSecMappedSigma sources using that primary problem.
+    """
+
+    def __init__(self, primaryProblem):
+        self.primaryProblem = primaryProblem
+        self.model = None
+        self.fields = None
+        self.Ainv = {}
+        self.ATinv = {}
+        self.projections = {}
+
+    def clean(self):
+        for solvers in [self.Ainv, self.ATinv]:
+            for Ainv in solvers.values():
+                Ainv.clean()
+            solvers.clear()
+        self.model = None
+        self.fields = None
+
+    def _setModel(self):
+        # the primary problem may have been used for another model, the
+        # fields and the factorizations are for this one
+        if not np.array_equal(self.primaryProblem.model, self.model):
+            self.primaryProblem.model = self.model
+
+    def getFields(self, m):
+        if self.model is None or not np.array_equal(self.model, m):
+            self.clean()
+            self.fields = self.primaryProblem.fields(m)
+            self.model = np.array(m, copy=True)
+        else:
+            self._setModel()
+        return self.fields
+
+    def _factor(self, solvers, freq, adjoint):
+        prob = self.primaryProblem
+        if solvers.get(freq, None) is None:
+            self._setModel()
+            A = prob.getA(freq)
+            solvers[freq] = prob.Solver(
+                A.T if adjoint else A, **prob.solverOpts
+            )
+        return solvers[freq]
+
+    def getAinv(self, freq):
+        return self._factor(self.Ainv, freq, False)
+
+    def getATinv(self, freq):
+        return self._factor(self.ATinv, freq, True)
+
+    def getProjection(self, mesh, locType, locTypeTo):
+        key = (id(mesh), locType, locTypeTo)
+        if key not in self.projections or self.projections[key][0] is not mesh:
+            primaryMesh = self.primaryProblem.mesh
+            if primaryMesh._meshType == 'CYL':
+                P = primaryMesh.getInterpolationMatCartMesh(
+                    mesh, locType=locType, locTypeTo=locTypeTo
+                )
+            else:
+                P = primaryMesh.getInterploationMat(
+                    mesh, locType=locType, locTypeTo=locTypeTo
+                )
+            self.projections[key] = (mesh, P)
+        return self.projections[key][1]
+
+
 class PrimSecMappedSigma(BaseFDEMSrc):
 
     """
@@ -591,6 +661,11 @@ class PrimSecMappedSigma(BaseFDEMSrc):
     **Optional**
     :param Mapping map2meshSecondary: mapping current model to act as primary
     model on the secondary mesh
+
+    The primary fields and the factorizations of the primary problem are
+    kept for the last model, and the projections from the primary mesh for
+    each secondary mesh. They are shared by all the PrimSecMappedSigma
+    sources with the same primary problem.
     """
 
     def __init__(self, rxList, freq, primaryProblem, primarySurvey,
@@ -606,10 +681,15 @@ class PrimSecMappedSigma(BaseFDEMSrc):
 
         BaseFDEMSrc.__init__(self, rxList, freq=freq, **kwargs)
 
-    def _ProjPrimary(self, prob, locType, locTypeTo):
-        # TODO: if meshes have not changed, store the projection
-        # if getattr(self, '__ProjPrimary', None) is None:
+    @property
+    def _primaryCache(self):
+        cache = getattr(self.primaryProblem, '_primSecCache', None)
+        if cache is None:
+            cache = _PrimaryCache(self.primaryProblem)
+            self.primaryProblem._primSecCache = cache
+        return cache
 
+    def _ProjPrimary(self, prob, locType, locTypeTo):
         # TODO: implement for HJ formulation
         if prob._formulation == 'EB':
             pass
@@ -633,21 +713,15 @@ class PrimSecMappedSigma(BaseFDEMSrc):
         #     locType = 'F'
 
         # get interpolation mat from primary mesh to secondary mesh
-        if self.primaryProblem.mesh._meshType == 'CYL':
-            return self.primaryProblem.mesh.getInterpolationMatCartMesh(
-                prob.mesh, locType=locType, locTypeTo=locTypeTo
-            )
-        return self.primaryProblem.mesh.getInterploationMat(
-            prob.mesh, locType=locType, locTypeTo=locTypeTo
-        )
-
-        # return self.__ProjPrimary
+        return self._primaryCache.getProjection(prob.mesh, locType, locTypeTo)
 
     def _primaryFields(self, prob, fieldType=None, f=None):
-        # TODO: cache and check if prob.curModel has changed
 
         if f is None:
-            f = self.primaryProblem.fields(prob.model)
+            if prob.model is None:
+                f = self.primaryProblem.fields(prob.model)
+            else:
+                f = self._primaryCache.getFields(prob.model)
 
         if fieldType is not None:
             return f[:, fieldType]
@@ -662,19 +736,16 @@ class PrimSecMappedSigma(BaseFDEMSrc):
         # Ainv = self.primaryProblem.Solver(A, **self.primaryProblem.solverOpts) # create the concept of Ainv (actually a solve)
 
         if f is None:
-            f = self._primaryFields(prob.sigma, f=f)
+            f = self._primaryFields(prob)
 
         freq = self.freq
 
-        A = self.primaryProblem.getA(freq)
         src = self.primarySurvey.srcList[0]
         u_src = Utils.mkvc(f[src, self.primaryProblem._solutionType])
 
         if adjoint is True:
             Jtv = np.zeros(prob.sigmaMap.nP, dtype=complex)
-            ATinv = self.primaryProblem.Solver(
-                A.T, **self.primaryProblem.solverOpts
-            )
+            ATinv = self._primaryCache.getATinv(freq)
             df_duTFun = getattr(
                 f, '_{0}Deriv'.format(
                     'e' if self.primaryProblem._formulation == 'EB' else 'j'
@@ -696,12 +767,10 @@ class PrimSecMappedSigma(BaseFDEMSrc):
 
             Jtv += df_dmT + du_dmT
 
-            ATinv.clean()
-
             return Utils.mkvc(Jtv)
 
         # create the concept of Ainv (actually a solve)
-        Ainv = self.primaryProblem.Solver(A, **self.primaryProblem.solverOpts)
+        Ainv = self._primaryCache.getAinv(freq)
 
         # for src in self.survey.getSrcByFreq(freq):
         dA_dm_v = self.primaryProblem.getADeriv(freq, u_src, v)
@@ -719,7 +788,6 @@ class PrimSecMappedSigma(BaseFDEMSrc):
         #     df_dmFun = getattr(f, '_{0}Deriv'.format('j'), None)
         df_dm_v = df_dmFun(src, du_dm_v, v, adjoint=False)
         # Jv[src, rx] = rx.evalDeriv(src, self.mesh, f, df_dm_v)
-        Ainv.clean()
 
         return df_dm_v
 
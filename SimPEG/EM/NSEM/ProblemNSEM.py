@@ -9,8 +9,10 @@ import numpy as np
 
 from SimPEG.EM.Utils.EMUtils import omega, mu_0
 from SimPEG import SolverLU as SimpegSolver, Utils, mkvc
+from ..Base import BaseStitched1DProblem
 from ..FDEM.ProblemFDEM import BaseFDEMProblem
-from .SurveyNSEM import Survey, Data
+from .SurveyNSEM import Survey, Survey1D_Stitched, Data
+from .Utils.MT1Danalytic import getImpedances
 from .FieldsNSEM import BaseNSEMFields, Fields1D_ePrimSec, Fields3D_ePrimSec
 
 
@@ -74,6 +76,14 @@ class BaseNSEMProblem(BaseFDEMProblem):
                 # Calculate du/dm*v
                 du_dm_v = Ainv * ( - dA_dm_v + dRHS_dm_v)
                 # Calculate the projection derivatives
+                batch = self.survey.getRxBatch(src)
+                if batch is not None:
+                    Jv_src = batch.evalDeriv(
+                        src, self.mesh, f, mkvc(du_dm_v)
+                    )
+                    for rx, Jv_rx in zip(src.rxList, Jv_src):
+                        Jv[src, rx] = Jv_rx
+                    continue
                 for rx in src.rxList:
                     # Calculate dP/du*du/dm*v
                     Jv[src, rx] = rx.evalDeriv(src, self.mesh, f, mkvc(du_dm_v)) # wrt uPDeriv_u(mkvc(du_dm))
@@ -112,6 +122,21 @@ class BaseNSEMProblem(BaseFDEMProblem):
                 # u_src needs to have both polarizations
                 u_src = f[src, :]
 
+                batch = self.survey.getRxBatch(src)
+                if batch is not None:
+                    # The adjoint of the projections of all the receivers,
+                    # with the imaginary components already accounted for:
+                    # a single solve for the source
+                    PTv = batch.evalDeriv(
+                        src, self.mesh, f, v[src], adjoint=True
+                    )
+                    dA_duIT = mkvc(ATinv * PTv)
+                    dA_dmT = self.getADeriv(freq, u_src, dA_duIT, adjoint=True)
+                    dRHS_dmT = self.getRHSDeriv(freq, dA_duIT, adjoint=True)
+                    du_dmT = -dA_dmT + dRHS_dmT
+                    Jtv += np.array(du_dmT, dtype=complex).real
+                    continue
+
                 for rx in src.rxList:
                     # Get the adjoint evalDeriv
                     # PTv needs to be nE,2
@@ -476,3 +501,117 @@ class Problem3D_ePrimSec(BaseNSEMProblem):
                 sys.stdout.flush()
             Ainv.clean()
         return F
+
+
+class Problem1D_Stitched(BaseStitched1DProblem):
+    """
+    Stitched 1D NSEM problem: a layered earth under each station of a
+    :class:`SimPEG.EM.NSEM.Survey1D_Stitched`.
+
+    The impedances of all the stations and frequencies are computed at once
+    with the analytic layer recursion
+    (:func:`SimPEG.EM.NSEM.Utils.MT1Danalytic.getImpedances`), no system is
+    built or solved.
+
+    The mesh holds the layers of the stations (as for
+    :func:`SimPEG.EM.NSEM.Utils.MT1Danalytic.getImpedance`, the deepest layer
+    first), see :class:`SimPEG.EM.Base.BaseStitched1DProblem`.
+
+    .. code:: python
+
+        prob = NSEM.Problem1D_Stitched(
+            layers, sigmaMap=Maps.ExpMap(nP=nStation*layers.nC)
+        )
+        prob.pair(survey)
+        reg = (
+            Regularization.Simple(prob.regularizationMesh, alpha_y=0.) +
+            prob.lateralSmoothness()
+        )
+
+    """
+
+    surveyPair = Survey1D_Stitched
+
+    deleteTheseOnModelUpdate = [
+        '_Jblocks', '_impedances', '_impedancesDeriv'
+    ]
+
+    def __init__(self, mesh, **kwargs):
+        BaseStitched1DProblem.__init__(self, mesh, **kwargs)
+
+    @property
+    def impedances(self):
+        """
+        Impedances of the stations (nStation x nFreq)
+        """
+        if getattr(self, '_impedances', None) is None:
+            self._impedances = getImpedances(
+                self.mesh, self.sigmaStations, self.survey.freqs
+            )
+        return self._impedances
+
+    @property
+    def impedancesDeriv(self):
+        """
+        Derivatives of the impedances with respect to the conductivities of
+        the layers of their station (nStation x nFreq x mesh.nC)
+        """
+        if getattr(self, '_impedancesDeriv', None) is None:
+            self._impedances, self._impedancesDeriv = getImpedances(
+                self.mesh, self.sigmaStations, self.survey.freqs,
+                returnDeriv=True
+            )
+        return self._impedancesDeriv
+
+    def fields(self, m=None):
+        """
+        Impedances of the stations
+
+        :param numpy.ndarray m: model
+        :rtype: numpy.ndarray
+        :return: impedances (nStation x nFreq)
+        """
+        if m is not None:
+            self.model = m
+        return self.impedances
+
+    def _sensitivityBlocks(self):
+        coeffs = self.survey.evalDeriv(self.impedances)
+        blocks = np.real(
+            coeffs[:, :, :, None] * self.impedancesDeriv[:, :, None, :]
+        )
+        return blocks.reshape(self.survey.nStation, -1, self.mesh.nC)
+
+    def Jvec(self, m, v, f=None):
+        """
+        Sensitivity times a vector
+
+        :param numpy.ndarray m: model
+        :param numpy.ndarray v: vector (nP,)
+        :param numpy.ndarray f: impedances (not used, they are stored)
+        :rtype: numpy.ndarray
+        :return: Jv (nD,)
+        """
+        self.model = m
+        dsig = (self.sigmaDeriv * v).reshape(
+            self.survey.nStation, self.mesh.nC
+        )
+        dZ = np.einsum('sfc,sc->sf', self.impedancesDeriv, dsig)
+        coeffs = self.survey.evalDeriv(self.impedances)
+        return np.real(coeffs * dZ[:, :, None]).ravel()
+
+    def Jtvec(self, m, v, f=None):
+        """
+        Adjoint sensitivity times a vector
+
+        :param numpy.ndarray m: model
+        :param numpy.ndarray v: vector (nD,)
+        :param numpy.ndarray f: impedances (not used, they are stored)
+        :rtype: numpy.ndarray
+        :return: Jtv (nP,)
+        """
+        self.model = m
+        coeffs = self.survey.evalDeriv(self.impedances)
+        w = (coeffs * v.reshape(coeffs.shape)).sum(axis=2)
+        dsig = np.real(np.einsum('sfc,sf->sc', self.impedancesDeriv, w))
+        return self.sigmaDeriv.T * dsig.ravel()
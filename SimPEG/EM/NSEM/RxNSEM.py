@@ -755,3 +755,224 @@ class Point_tipper3D(BaseRxNSEM_Point):
             )
 
         return rx_deriv_component
+
+
+class Point3D_batch(object):
+    """
+    Natural source 3D point receivers (:class:`Point_impedance3D` and
+    :class:`Point_tipper3D`) of a source, evaluated together.
+
+    The fields of both polarizations are projected once to the locations of
+    all the receivers. Every impedance and tipper component is
+
+    .. math::
+
+        \\frac{s (a_{px} b_{py} - a_{py} b_{px})}
+            {h_{x,px} h_{y,py} - h_{x,py} h_{y,px}}
+
+    with a one of :math:`e_x, e_y, h_z` and b one of :math:`h_x, h_y`
+    (see :attr:`numerators`), so the data and their derivatives are
+    computed with array arithmetic, for all the receivers at once.
+
+    :param list rxList: receivers (Point_impedance3D or Point_tipper3D)
+    :param discretize.BaseMesh mesh: mesh of the fields
+    """
+
+    #: fields (a, b) and sign of the numerator of each orientation
+    numerators = {
+        'xx': ('ex', 'hy', 1.), 'xy': ('ex', 'hx', -1.),
+        'yx': ('ey', 'hy', 1.), 'yy': ('ey', 'hx', -1.),
+        'zx': ('hz', 'hy', 1.), 'zy': ('hz', 'hx', -1.),
+    }
+
+    def __init__(self, rxList, mesh):
+        for rx in rxList:
+            assert isinstance(rx, BaseRxNSEM_Point), (
+                '{} can not be evaluated in a batch'.format(rx)
+            )
+        self.rxList = rxList
+        self.mesh = mesh
+
+        # Rows of the data of each receiver
+        nLocs = [rx._locs_e().shape[0] for rx in rxList]
+        self.inds = np.r_[0, np.cumsum(nLocs)]
+
+        # Numerators of the rows
+        a = np.hstack([
+            [self.numerators[rx.orientation][0]] * n
+            for rx, n in zip(rxList, nLocs)
+        ])
+        b = np.hstack([
+            [self.numerators[rx.orientation][1]] * n
+            for rx, n in zip(rxList, nLocs)
+        ])
+        self.sign = np.hstack([
+            self.numerators[rx.orientation][2] * np.ones(n)
+            for rx, n in zip(rxList, nLocs)
+        ])
+        self._a = dict((comp, (a == comp).astype(float)) for comp in set(a))
+        self._b = dict((comp, (b == comp).astype(float)) for comp in set(b))
+
+    @property
+    def Pe(self):
+        """
+        Projections of the electric fields to the locations of the
+        receivers
+        """
+        if getattr(self, '_Pe', None) is None:
+            locs = np.vstack([rx._locs_e() for rx in self.rxList])
+            self._Pe = {
+                'ex': self.mesh.getInterpolationMat(locs, 'Ex'),
+                'ey': self.mesh.getInterpolationMat(locs, 'Ey'),
+            }
+        return self._Pe
+
+    @property
+    def Pb(self):
+        """
+        Projections of the magnetic fluxes to the locations of the
+        receivers
+        """
+        if getattr(self, '_Pb', None) is None:
+            locs = np.vstack([rx._locs_b() for rx in self.rxList])
+            self._Pb = {
+                'hx': self.mesh.getInterpolationMat(locs, 'Fx'),
+                'hy': self.mesh.getInterpolationMat(locs, 'Fy'),
+                'hz': self.mesh.getInterpolationMat(
+                    np.vstack([rx._locs_e() for rx in self.rxList]), 'Fz'
+                ),
+            }
+        return self._Pb
+
+    def _project(self, e, b):
+        """
+        Fields of a polarization at the receivers, from the electric field
+        e and the magnetic flux b
+        """
+        fields = dict(
+            (comp, P * mkvc(e)) for comp, P in self.Pe.items()
+        )
+        fields.update(
+            (comp, P * mkvc(b) / mu_0) for comp, P in self.Pb.items()
+        )
+        return fields
+
+    def _projectAdjoint(self, fields):
+        """
+        Adjoint of :meth:`_project`
+        """
+        e = sum(P.T * fields[comp] for comp, P in self.Pe.items())
+        b = sum(P.T * fields[comp] for comp, P in self.Pb.items()) / mu_0
+        return e, b
+
+    def _ab(self, fields):
+        """
+        Fields a and b of the numerators of the rows
+        """
+        return (
+            sum(mask * fields[comp] for comp, mask in self._a.items()),
+            sum(mask * fields[comp] for comp, mask in self._b.items())
+        )
+
+    def _fields(self, src, f):
+        """
+        Fields of both polarizations at the receivers, the fields of the
+        numerators, the denominator and the complex data
+        """
+        px = self._project(f[src, 'e_px'], f[src, 'b_px'])
+        py = self._project(f[src, 'e_py'], f[src, 'b_py'])
+        a_px, b_px = self._ab(px)
+        a_py, b_py = self._ab(py)
+        D = px['hx'] * py['hy'] - py['hx'] * px['hy']
+        Z = self.sign * (a_px * b_py - a_py * b_px) / D
+        return px, py, a_px, b_px, a_py, b_py, D, Z
+
+    def _split(self, d):
+        return [
+            getattr(d[i0:i1], rx.component)
+            for rx, i0, i1 in zip(self.rxList, self.inds[:-1], self.inds[1:])
+        ]
+
+    def eval(self, src, mesh, f, return_complex=False):
+        """
+        Project the fields to natural source data.
+
+        :param SrcNSEM src: The source of the fields to project
+        :param discretize.TensorMesh mesh: topological mesh corresponding to the fields
+        :param FieldsNSEM f: Natural source fields object to project
+        :param bool (optional) return_complex: Flag for return the complex evaluation
+        :rtype: list
+        :return: data of the receivers (the complex impedances and tippers
+            of all the receivers if return_complex)
+        """
+        Z = self._fields(src, f)[-1]
+        if return_complex:
+            return Z
+        return self._split(Z)
+
+    def evalDeriv(self, src, mesh, f, v, adjoint=False):
+        """
+        The derivative of the projection wrt u
+
+        :param SimPEG.EM.NSEM.SrcNSEM src: NSEM source
+        :param discretize.TensorMesh mesh: Mesh defining the topology of the problem
+        :param SimPEG.EM.NSEM.FieldsNSEM f: NSEM fields object of the source
+        :param numpy.ndarray v: vector of size (nU,) (adjoint=False) and size (nD,) (adjoint=True)
+        :rtype: list or numpy.ndarray
+        :return: derivatives of the data of the receivers (adjoint=False);
+            (nE, 2) for both polarizations (adjoint=True), the sum over the
+            receivers, with the derivatives of the imaginary components
+            multiplied by -1, such that the real part of the sensitivities
+            is the sensitivity of the data
+        """
+        px, py, a_px, b_px, a_py, b_py, D, Z = self._fields(src, f)
+
+        if adjoint:
+            v = mkvc(v).astype(complex)
+            # The sensitivity of Im(Z) is the real part of that of -1j*Z
+            for rx, i0, i1 in zip(self.rxList, self.inds[:-1], self.inds[1:]):
+                if rx.component == 'imag':
+                    v[i0:i1] *= -1j
+            gN = self.sign * v / D
+            gD = -Z * v / D
+
+            # Adjoint of the numerators and of the denominator
+            dpx = dict((comp, np.zeros_like(v)) for comp in px)
+            dpy = dict((comp, np.zeros_like(v)) for comp in py)
+            for comp, mask in self._a.items():
+                dpx[comp] += mask * gN * b_py
+                dpy[comp] -= mask * gN * b_px
+            for comp, mask in self._b.items():
+                dpx[comp] -= mask * gN * a_py
+                dpy[comp] += mask * gN * a_px
+            dpx['hx'] += gD * py['hy']
+            dpy['hy'] += gD * px['hx']
+            dpx['hy'] -= gD * py['hx']
+            dpy['hx'] -= gD * px['hy']
+
+            e_px, b_px = self._projectAdjoint(dpx)
+            e_py, b_py = self._projectAdjoint(dpy)
+            PTv = (
+                f._e_pxDeriv_u(src, e_px, adjoint=True) +
+                f._b_pxDeriv_u(src, b_px, adjoint=True) +
+                f._e_pyDeriv_u(src, e_py, adjoint=True) +
+                f._b_pyDeriv_u(src, b_py, adjoint=True)
+            )
+            return PTv.reshape((2, self.mesh.nE)).T
+
+        dpx = self._project(
+            f._e_pxDeriv_u(src, v), f._b_pxDeriv_u(src, v)
+        )
+        dpy = self._project(
+            f._e_pyDeriv_u(src, v), f._b_pyDeriv_u(src, v)
+        )
+        da_px, db_px = self._ab(dpx)
+        da_py, db_py = self._ab(dpy)
+        dN = self.sign * (
+            da_px * b_py + a_px * db_py - da_py * b_px - a_py * db_px
+        )
+        dD = (
+            dpx['hx'] * py['hy'] + px['hx'] * dpy['hy'] -
+            dpy['hx'] * px['hy'] - py['hx'] * dpx['hy']
+        )
+        return self._split((dN - Z * dD) / D)
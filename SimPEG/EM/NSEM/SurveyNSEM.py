@@ -5,10 +5,13 @@ from __future__ import division
 import sys
 import numpy as np
 from numpy.lib import recfunctions as recFunc
+from scipy.constants import mu_0
 
 from SimPEG import Survey as SimPEGsurvey, mkvc
 from .SrcNSEM import BaseNSEMSrc, Planewave_xy_1Dprimary, Planewave_xy_1DhomotD
-from .RxNSEM import Point_impedance3D, Point_tipper3D
+from .RxNSEM import (
+    BaseRxNSEM_Point, Point_impedance3D, Point_tipper3D, Point3D_batch
+)
 from .Utils.plotUtils import DataNSEMPlotMethods
 
 #########
@@ -68,13 +71,137 @@ class Survey(SimPEGsurvey.BaseSurvey):
         data = Data(self)
         for src in self.srcList:
             sys.stdout.flush()
+            batch = self.getRxBatch(src)
+            if batch is not None:
+                for rx, d in zip(src.rxList, batch.eval(src, self.mesh, f)):
+                    data[src, rx] = d
+                continue
             for rx in src.rxList:
                 data[src, rx] = rx.eval(src, self.mesh, f)
         return data
 
+    def getRxBatch(self, src):
+        """
+        Returns the receivers of a source evaluated together, a
+        :class:`SimPEG.EM.NSEM.RxNSEM.Point3D_batch` (None if they are not
+        all 3D point receivers).
+
+        :param SimPEG.EM.NSEM.SrcNSEM src: NSEM source
+        """
+        if getattr(self, '_rxBatches', None) is None:
+            self._rxBatches = {}
+        srcBatch, batch = self._rxBatches.get(id(src), (None, None))
+        if (
+            srcBatch is not src or batch is None or
+            batch.mesh is not self.mesh or batch.rxList != src.rxList
+        ):
+            if all(isinstance(rx, BaseRxNSEM_Point) for rx in src.rxList):
+                batch = Point3D_batch(list(src.rxList), self.mesh)
+            else:
+                batch = None
+            self._rxBatches[id(src)] = (src, batch)
+        return batch
+
     def evalDeriv(self, f):
         raise Exception('Use Sources to project fields deriv.')
 
+
+class Survey1D_Stitched(SimPEGsurvey.BaseSurvey):
+    """
+    Survey of stitched 1D NSEM soundings: the same frequencies and data
+    components are measured at every station.
+
+    The data are ordered by station, then by frequency and then by
+    component, so that the data of a station are consecutive.
+
+    **Requried**
+    :param numpy.ndarray locs: Locations of the stations (nStation x dim)
+    :param numpy.ndarray freqs: Frequencies
+
+    **Optional**
+    :param list components: Components of the impedance, 'real', 'imag',
+        'app_res' (apparent resistivity) and/or 'phase' (in degrees)
+    """
+
+    components = ['real', 'imag']
+
+    def __init__(self, locs, freqs, **kwargs):
+        self.locs = np.atleast_2d(locs)
+        self.freqs = np.asarray(freqs, dtype=float)
+        SimPEGsurvey.BaseSurvey.__init__(self, **kwargs)
+        for comp in self.components:
+            assert comp in ['real', 'imag', 'app_res', 'phase'], (
+                "{} is not a valid component, use 'real', 'imag', 'app_res' "
+                "or 'phase'".format(comp)
+            )
+
+    @property
+    def nStation(self):
+        """Number of stations"""
+        return self.locs.shape[0]
+
+    @property
+    def nFreq(self):
+        """Number of frequencies"""
+        return len(self.freqs)
+
+    @property
+    def nD(self):
+        """Number of data"""
+        return self.nStation * self.nFreq * len(self.components)
+
+    @property
+    def vnD(self):
+        """Vector number of data (of each station)"""
+        return self.nFreq * len(self.components) * np.ones(
+            self.nStation, dtype=int
+        )
+
+    def eval(self, f):
+        """
+        Evaluate the data from the impedances
+
+        :param numpy.ndarray f: impedances (nStation x nFreq)
+        :rtype: numpy.ndarray
+        :return: data (nD,)
+        """
+        omega = 2 * np.pi * self.freqs
+        data = []
+        for comp in self.components:
+            if comp == 'real':
+                data.append(f.real)
+            elif comp == 'imag':
+                data.append(f.imag)
+            elif comp == 'app_res':
+                data.append(np.abs(f)**2 / (omega * mu_0))
+            elif comp == 'phase':
+                data.append(np.arctan2(f.imag, f.real) * (180 / np.pi))
+        return np.stack(data, axis=2).ravel()
+
+    def evalDeriv(self, f):
+        """
+        Derivatives of the data with respect to the impedances, the
+        derivative of a datum is the real part of its coefficient times the
+        derivative of the impedance.
+
+        :param numpy.ndarray f: impedances (nStation x nFreq)
+        :rtype: numpy.ndarray
+        :return: complex coefficients (nStation x nFreq x nComponent)
+        """
+        omega = 2 * np.pi * self.freqs
+        coeffs = []
+        for comp in self.components:
+            if comp == 'real':
+                coeffs.append(np.ones_like(f))
+            elif comp == 'imag':
+                coeffs.append(-1j * np.ones_like(f))
+            elif comp == 'app_res':
+                coeffs.append(2 * f.conj() / (omega * mu_0))
+            elif comp == 'phase':
+                coeffs.append(-1j / f * (180 / np.pi))
+        return np.stack(coeffs, axis=2)
+
+
 #########
 # Data
 #########
@@ -237,4 +364,6 @@ def _rec_to_ndarr(rec_arr, data_type=float):
     """
     Function to transform a numpy record array to a nd array.
     """
-    return rec_arr.view((data_type, len(rec_arr.dtype.names)))
+    return np.column_stack(
+        [rec_arr[name] for name in rec_arr.dtype.names]
+    ).astype(data_type)
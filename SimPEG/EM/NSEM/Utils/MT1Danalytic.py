@@ -114,3 +114,59 @@ def getImpedance(m1d,sigma,freq):
         Z1d[nrFr] = Zall[-1]
 
     return Z1d
+
+
+def getImpedances(m1d, sigma, freq, returnDeriv=False):
+    """Analytic solution for many MT 1D layered earths at once. Returns the
+    impedances at the surface.
+
+    The layer recursion of :func:`getImpedance` is vectorized over the
+    soundings and the frequencies (the loop is over the layers only).
+
+    :param SimPEG.mesh, object m1d: Mesh object with the 1D spatial information (the layers of all the soundings).
+    :param numpy.array sigma: Conductivities of the soundings (nSounding x m1d.nC).
+    :param numpy.array, vector freq: Frequencies to calculate data at.
+    :param boolean, returnDeriv: also return the derivatives of the impedances with respect to the conductivities.
+
+    :rtype: numpy.array
+    :return: impedances (nSounding x nFreq), and their derivatives (nSounding x nFreq x m1d.nC) if returnDeriv
+
+    """
+    sigma = np.atleast_2d(sigma)
+    h = m1d.hx
+    om = 2*np.pi*np.asarray(freq, dtype=float)[None, :]
+
+    def impedance(sig):
+        # wave number and impedance of a layer, and their derivatives
+        k = np.sqrt(mu_0*eps_0*om**2 - 1j*mu_0*sig[:, None]*om)
+        dkds = -1j*mu_0*om/(2*k)
+        Z = (mu_0*om)/k
+        return k, Z, -Z/k*dkds, dkds
+
+    # Calculate the impedance for the bottom layer
+    _, Zall, dZds, _ = impedance(sigma[:, 0])
+    if returnDeriv:
+        dZall = np.zeros(Zall.shape + (len(h),), dtype='complex')
+        dZall[:, :, 0] = dZds
+
+    for nr, hi in enumerate(h):
+        k, Z, dZds, dkds = impedance(sigma[:, nr])
+        t = np.tanh(1j*k*hi)
+        num = Zall + Z*t
+        den = Z + Zall*t
+        Znew = Z*num/den
+
+        if returnDeriv:
+            dtds = (1 - t**2)*1j*hi*dkds
+            # partial derivatives of the recursion
+            dRdZall = Z**2*(1 - t**2)/den**2
+            dRdZ = num/den + Z*(t*den - num)/den**2
+            dRdt = Z*(Z**2 - Zall**2)/den**2
+            dZall[:, :, :nr+1] *= dRdZall[:, :, None]
+            dZall[:, :, nr] += dRdZ*dZds + dRdt*dtds
+
+        Zall = Znew
+
+    if returnDeriv:
+        return Zall, dZall
+    return Zall
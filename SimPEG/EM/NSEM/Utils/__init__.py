@@ -8,7 +8,7 @@ NOTE: These utilities are not well test, use with care
 from __future__ import absolute_import
 
 from .MT1Dsolutions import get1DEfields  # Add the names of the functions
-from .MT1Danalytic import getEHfields, getImpedance
+from .MT1Danalytic import getEHfields, getImpedance, getImpedances
 from .dataUtils import (appResPhs, rec_to_ndarr, rotate_data,
                         skindepth, makeAnalyticSolution, plotMT1DModelData,
                         plotImpAppRes, printTime, convert3Dto1Dobject,
@@ -1,12 +1,11 @@
 from __future__ import print_function
 # Functions to import and export MT EDI files.
-from SimPEG import mkvc
 from scipy.constants import mu_0
-from numpy.lib import recfunctions as recFunc
-from .dataUtils import rec_to_ndarr
 
 # Import modules
 import numpy as np
+import functools
+import multiprocessing
 import os, sys, re
 
 
@@ -53,17 +52,31 @@ class EDIimporter:
 
         return self._data[comps]
 
-    def importFiles(self):
+    def importFiles(self, nProcesses=1, cacheFile=None):
         """
         Function to import EDI files into a object.
 
+        The files are read in a single pass each (in parallel if nProcesses
+        is larger than 1) and the data are written in an array sized for all
+        the files.
 
-        """
+        :param int nProcesses: number of processes reading the files
+        :param str cacheFile: file (.npz) where the imported data are saved,
+            they are loaded from it as long as the files, their modification
+            times and the components are the same
 
-        # Constants that are needed for convertion of units
+        """
 
-        # Temp lists
-        tmpStaList = []
+        # Load the data from the cache
+        cacheKey = self._cacheKey()
+        if cacheFile is not None and os.path.isfile(cacheFile):
+            with np.load(cacheFile) as cache:
+                if str(cache['key']) == cacheKey:
+                    self._outEPSG = int(cache['outEPSG']) or None
+                    self._data = np.ma.MaskedArray(
+                        cache['data'], mask=cache['mask']
+                    )
+                    return
 
         tmpCompList = ['freq', 'x', 'y', 'z']
         tmpCompList.extend(self.comps)
@@ -72,54 +85,84 @@ class EDIimporter:
         # Make the outarray
         dtRI = [(compS.lower().replace('.', ''), float)
                 for compS in tmpCompList]
-        # Loop through all the files
-        for nrEDI, EDIfile in enumerate(self.filesList):
-            # Read the file into a list of the lines
-            with open(EDIfile, 'r') as fid:
-                EDIlines = fid.readlines()
-            # Find the location
-            latD, longD, elevM = _findLatLong(EDIlines)
+        # Columns of the components, rotated since EDI x is *north, y *east
+        # but Simpeg uses x *east, y *north (* means internal reference
+        # frame), and the convertion of units of the impedance tensor
+        names = [name for name, _ in dtRI]
+        cols = [
+            names.index([
+                comp.lower().replace('.', '').replace(s, t)
+                for s, t in shift_list if s in comp.lower()
+            ][0]) for comp in self.comps
+        ]
+        unitConvert = np.array([
+            self._impUnitEDI2SI if 'Z' in comp else 1. for comp in self.comps
+        ])
+
+        # Read the files
+        if nProcesses > 1:
+            pool = multiprocessing.Pool(nProcesses)
+            try:
+                EDIdata = pool.map(
+                    functools.partial(_readEDIfile, comps=self.comps),
+                    self.filesList
+                )
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            EDIdata = [
+                _readEDIfile(EDIfile, self.comps)
+                for EDIfile in self.filesList
+            ]
+
+        # Fill the columns of the data of all files
+        nFreq = np.array([len(freq) for _, _, _, freq, _ in EDIdata])
+        inds = np.r_[0, np.cumsum(nFreq)]
+        arr = np.nan * np.ones((inds[-1], len(dtRI)))
+        for nrEDI, (latD, longD, elevM, freq, compData) in enumerate(EDIdata):
             # Transfrom coordinates
             transCoord = self._transfromPoints(longD, latD)
-            # Extract the name of the file (station)
-            EDIname = EDIfile.split(os.sep)[-1].split('.')[0]
-            # Arrange the data
-            staList = [
-                EDIname, EDIfile, transCoord[0], transCoord[1], elevM[0]]
-            # Add to the station list
-            tmpStaList.extend(staList)
-
-            # Read the frequency data
-            freq = _findEDIcomp('>FREQ', EDIlines)
-            # Make the temporary rec array.
-            tArrRec = (np.nan * np.ones((len(freq), len(dtRI)))).view(dtRI)
-            tArrRec['freq'] = mkvc(freq, 2)
-            tArrRec['x'] = mkvc(np.ones((len(freq), 1)) * transCoord[0], 2)
-            tArrRec['y'] = mkvc(np.ones((len(freq), 1)) * transCoord[1], 2)
-            tArrRec['z'] = mkvc(np.ones((len(freq), 1)) * elevM[0], 2)
-            for comp in self.comps:
-                # Deal with converting units of the impedance tensor
-                if 'Z' in comp:
-                    unitConvert = self._impUnitEDI2SI
-                else:
-                    unitConvert = 1
-                # Rotate the data since EDI x is *north, y *east but Simpeg
-                # uses x *east, y *north (* means internal reference frame)
-                key = [comp.lower().replace('.', '').replace(s, t)
-                       for s, t in shift_list if s in comp.lower()][0]
-                tArrRec[key] = mkvc(
-                    unitConvert * _findEDIcomp('>' + comp, EDIlines), 2)
-            # Make a masked array
-            mArrRec = np.ma.MaskedArray(
-                rec_to_ndarr(tArrRec),
-                mask=np.isnan(rec_to_ndarr(tArrRec))).view(dtype=tArrRec.dtype)
-            try:
-                outTemp = recFunc.stack_arrays((outTemp, mArrRec))
-            except NameError:
-                outTemp = mArrRec
+            rows = slice(inds[nrEDI], inds[nrEDI + 1])
+            arr[rows, 0] = freq
+            arr[rows, 1] = transCoord[0]
+            arr[rows, 2] = transCoord[1]
+            arr[rows, 3] = elevM[0]
+            arr[rows, cols] = compData.T * unitConvert
 
-        # Assign the data
-        self._data = outTemp
+        # Make a masked array
+        self._data = np.ma.MaskedArray(
+            arr.view(dtRI)[:, 0], mask=np.isnan(arr).view(
+                [(name, bool) for name, _ in dtRI]
+            )[:, 0]
+        )
+
+        # Save the cache
+        if cacheFile is not None:
+            np.savez(
+                cacheFile, key=cacheKey, outEPSG=self._outEPSG or 0,
+                data=self._data.data, mask=self._data.mask
+            )
+
+    def toData(self, srcType='primary'):
+        """
+        Make a NSEM Data object (and its survey) from the imported data.
+
+        :param string srcType: The type of SimPEG.EM.NSEM.SrcNSEM to be used
+        :rtype: SimPEG.EM.NSEM.Data
+        """
+        from ..SurveyNSEM import Data
+        return Data.fromRecArray(self._data.filled(np.nan), srcType=srcType)
+
+    def _cacheKey(self):
+        """
+        Key of the cache of the imported data: the files, their modification
+        times and the components.
+        """
+        return repr([
+            (os.path.abspath(EDIfile), os.path.getmtime(EDIfile))
+            for EDIfile in self.filesList
+        ] + [self.comps, self._outEPSG])
 
     # % Assign the data to the obj
     # nOutData=length(obj.data);
@@ -188,6 +231,57 @@ def _findLine(comp, fileLines):
     # Return the found indices
     return found
 
+def _readEDIfile(EDIfile, comps):
+    """
+    Read the location, the frequencies and the components of an EDI file, in
+    a single pass through its lines.
+
+    Returns the latitude, the longitude, the elevation, the frequencies and
+    the data of the components (len(comps) x nFreq, nan where missing).
+    """
+    wanted = ['FREQ'] + list(comps)
+    header = {}
+    blocks = {}
+    name = None
+    with open(EDIfile, 'r') as fid:
+        for line in fid:
+            # Lines of the data of a component
+            if name is not None:
+                blocks[name].extend(line.split())
+                if len(blocks[name]) >= nrVec:
+                    name = None
+                continue
+            for key in ['LAT', 'LONG', 'ELEV']:
+                if key not in header and key + '=' in line:
+                    header[key] = line.split('=')[1].split()[0]
+            # Head line of a component
+            words = line[1:].split() if line.startswith('>') else None
+            if (
+                words and words[0] in wanted and words[0] not in blocks and
+                '//' in line
+            ):
+                nrVec = int(line.split('//')[-1])
+                if nrVec > 0:
+                    name = words[0]
+                    blocks[name] = []
+
+    # Convert to D.ddddd values
+    latDMS = np.array(header['LAT'].split(':'), float)
+    longDMS = np.array(header['LONG'].split(':'), float)
+    latS = np.sign(latDMS[0])
+    longS = np.sign(longDMS[0])
+    latD = latDMS[0] + latS * latDMS[1] / 60 + latS * latDMS[2] / 3600
+    longD = longDMS[0] + longS * longDMS[1] / 60 + longS * longDMS[2] / 3600
+    elevM = np.array([header['ELEV']], float)
+
+    freq = np.array(blocks['FREQ'], float)
+    compData = np.nan * np.ones((len(comps), len(freq)))
+    for i, comp in enumerate(comps):
+        if comp in blocks:
+            compData[i] = np.array(blocks[comp], float)
+    return latD, longD, elevM, freq, compData
+
+
 def _findEDIcomp(comp, fileLines, dt=float):
     """
     Extract the data vector.
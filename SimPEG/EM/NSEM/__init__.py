@@ -11,6 +11,8 @@ from __future__ import absolute_import
 from . import Utils
 from . import SrcNSEM as Src
 from . import RxNSEM as Rx
-from .SurveyNSEM import Survey, Data
+from .SurveyNSEM import Survey, Survey1D_Stitched, Data
 from .FieldsNSEM import Fields1D_ePrimSec, Fields3D_ePrimSec
-from .ProblemNSEM import Problem1D_ePrimSec, Problem3D_ePrimSec
+from .ProblemNSEM import (
+    Problem1D_ePrimSec, Problem3D_ePrimSec, Problem1D_Stitched
+)
@@ -22,6 +22,10 @@ class BaseDCProblem(BaseEMProblem):
     Ainv = None
     storeJ = False
     _Jmatrix = None
+    fix_Jmatrix = False
+    storeJOnDisk = False  #: store J in a memory mapped file (float32)
+    JDirectory = None  #: directory of the file of J, temporary by default
+    JThreads = 1  #: number of threads for the products with J on disk
 
     def fields(self, m=None):
         if m is not None:
@@ -53,16 +57,39 @@ class BaseDCProblem(BaseEMProblem):
             self.model = m
             if f is None:
                 f = self.fields(m)
-            self._Jmatrix = (self._Jtvec(m, v=None, f=f)).T
+            self._Jmatrix = self._Jtvec(m, v=None, f=f)
         return self._Jmatrix
 
+    def _allocateJ(self, nD, nP):
+        """
+            Empty sensitivity matrix (nD x nP), in memory or in a memory
+            mapped file if storeJOnDisk is True
+        """
+        if self.storeJOnDisk:
+            return Utils.DiskMatrix(
+                (nD, nP), directory=self.JDirectory, nThreads=self.JThreads
+            )
+        return np.zeros((nD, nP))
+
+    def getJtJdiag(self, m, W=None):
+        """
+            Diagonal of :code:`J.T * W.T * W * J` from the stored sensitivity
+        """
+        J = self.getJ(m)
+        w = None if W is None else Utils.mkvc(W.diagonal())
+        if isinstance(J, Utils.DiskMatrix):
+            return J.columnNorms(w)
+        if w is not None:
+            J = Utils.sdiag(w) * J
+        return Utils.mkvc(np.sum(J**2, axis=0))
+
     def Jvec(self, m, v, f=None):
         """
             Compute sensitivity matrix (J) and vector (v) product.
         """
         if self.storeJ:
             J = self.getJ(m, f=f)
-            Jv = Utils.mkvc(np.dot(J, v))
+            Jv = Utils.mkvc(J.dot(v))
             return Jv
 
         self.model = m
@@ -90,7 +117,7 @@ class BaseDCProblem(BaseEMProblem):
         """
         if self.storeJ:
             J = self.getJ(m, f=f)
-            Jtv = Utils.mkvc(np.dot(J.T, v))
+            Jtv = Utils.mkvc(J.T.dot(v))
             return Jtv
 
         self.model = m
@@ -103,7 +130,7 @@ class BaseDCProblem(BaseEMProblem):
     def _Jtvec(self, m, v=None, f=None):
         """
             Compute adjoint sensitivity matrix (J^T) and vector (v) product.
-            Full J matrix can be computed by inputing v=None
+            Full J matrix (nD x nP) can be computed by inputing v=None
         """
 
         if v is not None:
@@ -113,7 +140,7 @@ class BaseDCProblem(BaseEMProblem):
             Jtv = np.zeros(m.size)
         else:
             # This is for forming full sensitivity matrix
-            Jtv = np.zeros((self.model.size, self.survey.nD), order='F')
+            J = self._allocateJ(self.survey.nD, self.model.size)
             istrt = int(0)
             iend = int(0)
 
@@ -142,16 +169,15 @@ class BaseDCProblem(BaseEMProblem):
                 else:
                     iend = istrt + rx.nD
                     if rx.nD == 1:
-                        Jtv[:, istrt] = (df_dmT + du_dmT)
+                        J[istrt] = Utils.mkvc(df_dmT + du_dmT)
                     else:
-                        Jtv[:, istrt:iend] = (df_dmT + du_dmT)
+                        J[istrt:iend] = (df_dmT + du_dmT).T
                     istrt += rx.nD
 
         if v is not None:
             return Utils.mkvc(Jtv)
         else:
-            # return np.hstack(Jtv)
-            return Jtv
+            return J
 
     def getSourceTerm(self):
         """
@@ -178,6 +204,9 @@ class BaseDCProblem(BaseEMProblem):
     @property
     def deleteTheseOnModelUpdate(self):
         toDelete = super(BaseDCProblem, self).deleteTheseOnModelUpdate
+        if self.fix_Jmatrix:
+            return toDelete
+
         if self._Jmatrix is not None:
             toDelete += ['_Jmatrix']
         return toDelete
@@ -69,7 +69,7 @@ class BaseIPProblem(BaseEMProblem):
 
             if f is None:
                 f = self.fields(m)
-            self._Jmatrix = (self._Jtvec(m, v=None, f=f)).T
+            self._Jmatrix = self._Jtvec(m, v=None, f=f)
 
             # delete fields after computing sensitivity
             del f
@@ -89,7 +89,7 @@ class BaseIPProblem(BaseEMProblem):
         # When sensitivity matrix J is stored
         if self.storeJ:
             J = self.getJ(m, f=f)
-            Jv = Utils.mkvc(np.dot(J, v))
+            Jv = Utils.mkvc(J.dot(v))
             return self.sign * Jv
 
         else:
@@ -123,7 +123,7 @@ class BaseIPProblem(BaseEMProblem):
         # When sensitivity matrix J is stored
         if self.storeJ:
             J = self.getJ(m, f=f)
-            Jtv = Utils.mkvc(np.dot(J.T, v))
+            Jtv = Utils.mkvc(J.T.dot(v))
             return self.sign * Jtv
 
         else:
@@ -136,7 +136,7 @@ class BaseIPProblem(BaseEMProblem):
     def _Jtvec(self, m, v=None, f=None):
         """
             Compute adjoint sensitivity matrix (J^T) and vector (v) product.
-            Full J matrix can be computed by inputing v=None
+            Full J matrix (nD x nP) can be computed by inputing v=None
         """
 
         if v is not None:
@@ -146,7 +146,7 @@ class BaseIPProblem(BaseEMProblem):
             Jtv = np.zeros(m.size)
         else:
             # This is for forming full sensitivity matrix
-            Jtv = np.zeros((self.model.size, self.survey.nD), order='F')
+            J = self._allocateJ(self.survey.nD, self.model.size)
             istrt = int(0)
             iend = int(0)
 
@@ -182,9 +182,9 @@ class BaseIPProblem(BaseEMProblem):
 
                     iend = istrt + rx.nD
                     if rx.nD == 1:
-                        Jtv[:, istrt] = dA_dmT
+                        J[istrt] = Utils.mkvc(dA_dmT)
                     else:
-                        Jtv[:, istrt:iend] = dA_dmT
+                        J[istrt:iend] = dA_dmT.T
                     istrt += rx.nD
 
         # Conductivity ((d u / d log sigma).T) - EB form
@@ -193,8 +193,7 @@ class BaseIPProblem(BaseEMProblem):
         if v is not None:
             return self.sign*Utils.mkvc(Jtv)
         else:
-            return Jtv
-        return
+            return J
 
     def getSourceTerm(self):
         """
@@ -124,9 +124,8 @@ class BaseSIPProblem(BaseEMProblem):
             if f is None:
                 f = self.fields(m)
 
-            Jt = np.zeros(
-                (self.actMap.nP, int(self.survey.nD/self.survey.times.size)),
-                order='F'
+            J = self._allocateJ(
+                int(self.survey.nD/self.survey.times.size), self.actMap.nP
             )
             istrt = int(0)
             iend = int(0)
@@ -144,12 +143,12 @@ class BaseSIPProblem(BaseEMProblem):
                     dA_dmT = self.getADeriv(u_src, ATinvdf_duT, adjoint=True)
                     iend = istrt + rx.nD
                     if rx.nD == 1:
-                        Jt[:, istrt] = dA_dmT
+                        J[istrt] = Utils.mkvc(dA_dmT)
                     else:
-                        Jt[:, istrt:iend] = dA_dmT
+                        J[istrt:iend] = dA_dmT.T
                     istrt += rx.nD
 
-            self._Jmatrix = Jt.T
+            self._Jmatrix = J
             if self.verbose:
                 collected = gc.collect()
                 print (
@@ -166,24 +165,52 @@ class BaseSIPProblem(BaseEMProblem):
 
             return self._Jmatrix
 
+    def getJtJdiag(self, m, W=None):
+        """
+            Diagonal of :code:`J.T * W.T * W * J` from the stored sensitivity,
+            exact if each model parameter only changes one cell
+        """
+        self.model = m
+        J = self.getJ(m)
+        ntime = len(self.survey.times)
+
+        if W is None:
+            w = np.ones(J.shape[0] * ntime)
+        else:
+            w = Utils.mkvc(W.diagonal())
+        w = w.reshape((J.shape[0], ntime), order='F')
+
+        # weighted column norms of J for all the time channels
+        if isinstance(J, Utils.DiskMatrix):
+            norms = J.columnNorms(w)
+        else:
+            norms = (J**2).T.dot(w**2)
+
+        JtJdiag = np.zeros(m.size)
+        for tind, t in enumerate(self.survey.times):
+            sqrtNorms = np.sqrt(self.actMap.P * norms[:, tind])
+            for PetaDeriv in [
+                self.PetaEtaDeriv, self.PetaTauiDeriv, self.PetaCDeriv
+            ]:
+                JtJdiag += (
+                    Utils.mkvc(PetaDeriv(t, sqrtNorms, adjoint=True))**2
+                )
+        return JtJdiag
+
     def forward(self, m, f=None):
 
         self.model = m
-        Jv = []
 
         # When sensitivity matrix is stored
         if self.storeJ:
             J = self.getJ(m, f=f)
 
-            ntime = len(self.survey.times)
-
             self.model = m
-            for tind in range(ntime):
-                Jv.append(
-                    J.dot(
-                        self.actMap.P.T*self.getPeta(self.survey.times[tind]))
-                    )
-            return self.sign * np.hstack(Jv)
+            # all the time channels in one pass over J
+            PTv = np.vstack([
+                self.actMap.P.T*self.getPeta(t) for t in self.survey.times
+            ]).T
+            return self.sign * Utils.mkvc(J.dot(PTv))
 
         # Do not store sensitivity matrix (memory-wise efficient)
         else:
@@ -191,27 +218,9 @@ class BaseSIPProblem(BaseEMProblem):
             if f is None:
                 f = self.fields(m)
 
-            # A = self.getA()
-            for tind in range(len(self.survey.times)):
-                # Pseudo-chareability
-                t = self.survey.times[tind]
-                v = self.getPeta(t)
-                for src in self.survey.srcList:
-                    u_src = f[src, self._solutionType]  # solution vector
-                    dA_dm_v = self.getADeriv(u_src, v)
-                    dRHS_dm_v = self.getRHSDeriv(src, v)
-                    du_dm_v = self.Ainv * (- dA_dm_v + dRHS_dm_v)
-                    for rx in src.rxList:
-                        timeindex = rx.getTimeP(self.survey.times)
-                        if timeindex[tind]:
-                            df_dmFun = getattr(
-                                f, '_{0!s}Deriv'.format(rx.projField),
-                                None
-                                )
-                            df_dm_v = df_dmFun(src, du_dm_v, v, adjoint=False)
-                            Jv.append(
-                                rx.evalDeriv(src, self.mesh, f, df_dm_v)
-                                )
+            # Pseudo-chareability
+            vs = [self.getPeta(t) for t in self.survey.times]
+            Jv = self._linearizedData(f, vs, fieldsDeriv=True)
 
             return self.sign*np.hstack(Jv)
 
@@ -219,23 +228,19 @@ class BaseSIPProblem(BaseEMProblem):
 
         self.model = m
 
-        Jv = []
-
         # When sensitivity matrix is stored
         if self.storeJ:
             J = self.getJ(m, f=f)
-            ntime = len(self.survey.times)
 
-            for tind in range(ntime):
-
-                t = self.survey.times[tind]
+            PTv = []
+            for t in self.survey.times:
                 v0 = self.PetaEtaDeriv(t, v)
                 v1 = self.PetaTauiDeriv(t, v)
                 v2 = self.PetaCDeriv(t, v)
-                PTv = self.actMap.P.T*(v0+v1+v2)
-                Jv.append(J.dot(PTv))
+                PTv.append(self.actMap.P.T*(v0+v1+v2))
 
-            return self.sign * np.hstack(Jv)
+            # all the time channels in one pass over J
+            return self.sign * Utils.mkvc(J.dot(np.vstack(PTv).T))
 
         # Do not store sensitivity matrix (memory-wise efficient)
         else:
@@ -243,31 +248,12 @@ class BaseSIPProblem(BaseEMProblem):
             if f is None:
                 f = self.fields(m)
 
-            for tind in range(len(self.survey.times)):
-
-                t = self.survey.times[tind]
-                v0 = self.PetaEtaDeriv(t, v)
-                v1 = self.PetaTauiDeriv(t, v)
-                v2 = self.PetaCDeriv(t, v)
-
-                for src in self.survey.srcList:
-                    u_src = f[src, self._solutionType]  # solution vector
-                    dA_dm_v = self.getADeriv(u_src, v0+v1+v2)
-                    dRHS_dm_v = self.getRHSDeriv(src, v0+v1+v2)
-                    du_dm_v = self.Ainv * (
-                        - dA_dm_v + dRHS_dm_v
-                        )
-
-                    for rx in src.rxList:
-                        timeindex = rx.getTimeP(self.survey.times)
-                        if timeindex[tind]:
-                            Jv_temp = (
-                                rx.evalDeriv(src, self.mesh, f, du_dm_v)
-                                )
-                            if rx.nD == 1:
-                                Jv_temp = Jv_temp.reshape([-1, 1])
-
-                            Jv.append(Jv_temp)
+            vs = [
+                self.PetaEtaDeriv(t, v) + self.PetaTauiDeriv(t, v) +
+                self.PetaCDeriv(t, v)
+                for t in self.survey.times
+            ]
+            Jv = self._linearizedData(f, vs)
 
             return self.sign*np.hstack(Jv)
 
@@ -282,9 +268,12 @@ class BaseSIPProblem(BaseEMProblem):
             Jtvec = np.zeros(m.size)
             v = v.reshape((int(self.survey.nD/ntime), ntime), order="F")
 
+            # all the time channels in one pass over J
+            JtV = J.T.dot(v)
+
             for tind in range(ntime):
                 t = self.survey.times[tind]
-                Jtv = self.actMap.P*J.T.dot(v[:, tind])
+                Jtv = self.actMap.P*JtV[:, tind]
                 Jtvec += (
                     self.PetaEtaDeriv(t, Jtv, adjoint=True) +
                     self.PetaTauiDeriv(t, Jtv, adjoint=True) +
@@ -303,14 +292,22 @@ class BaseSIPProblem(BaseEMProblem):
             if not isinstance(v, self.dataPair):
                 v = self.dataPair(self.survey, v)
 
-            Jtv = np.zeros(m.size)
+            times = self.survey.times
 
-            for tind in range(len(self.survey.times)):
-                t = self.survey.times[tind]
-                for src in self.survey.srcList:
-                    u_src = f[src, self._solutionType]
+            # adjoint model perturbation of each time channel, summed over
+            # the sources
+            du_dmT = [None] * len(times)
+
+            for src in self.survey.srcList:
+                u_src = f[src, self._solutionType]
+
+                # sum the receivers of each time channel, and solve once for
+                # all the time channels of the source
+                tinds, df_duT = [], []
+                for tind, t in enumerate(times):
+                    df_duT_t = None
                     for rx in src.rxList:
-                        timeindex = rx.getTimeP(self.survey.times)
+                        timeindex = rx.getTimeP(times)
                         if timeindex[tind]:
                             # wrt f, need possibility wrt m
                             PTv = rx.evalDeriv(
@@ -319,34 +316,115 @@ class BaseSIPProblem(BaseEMProblem):
                             df_duTFun = getattr(
                                 f, '_{0!s}Deriv'.format(rx.projField), None
                             )
-                            df_duT, _ = df_duTFun(
+                            df_duT_rx, _ = df_duTFun(
                                 src, None, PTv, adjoint=True
                             )
-                            ATinvdf_duT = self.Ainv * df_duT
-                            dA_dmT = self.getADeriv(
-                                u_src, ATinvdf_duT, adjoint=True
-                            )
-                            dRHS_dmT = self.getRHSDeriv(
-                                src, ATinvdf_duT, adjoint=True
-                            )
-                            du_dmT = -dA_dmT + dRHS_dmT
-                            Jtv += (
-                                self.PetaEtaDeriv(
-                                    self.survey.times[tind], du_dmT,
-                                    adjoint=True
-                                ) +
-                                self.PetaTauiDeriv(
-                                    self.survey.times[tind], du_dmT,
-                                    adjoint=True
-                                ) +
-                                self.PetaCDeriv(
-                                    self.survey.times[tind], du_dmT,
-                                    adjoint=True
-                                )
-                            )
+                            if df_duT_t is None:
+                                df_duT_t = Utils.mkvc(df_duT_rx)
+                            else:
+                                df_duT_t = df_duT_t + Utils.mkvc(df_duT_rx)
+                    if df_duT_t is not None:
+                        tinds.append(tind)
+                        df_duT.append(df_duT_t)
+
+                if len(tinds) == 0:
+                    continue
+
+                df_duT = np.vstack(df_duT).T
+                ATinvdf_duT = np.reshape(
+                    self.Ainv * df_duT, df_duT.shape, order='F'
+                )
+
+                for k, tind in enumerate(tinds):
+                    dA_dmT = self.getADeriv(
+                        u_src, ATinvdf_duT[:, k], adjoint=True
+                    )
+                    dRHS_dmT = self.getRHSDeriv(
+                        src, ATinvdf_duT[:, k], adjoint=True
+                    )
+                    if du_dmT[tind] is None:
+                        du_dmT[tind] = -dA_dmT + dRHS_dmT
+                    else:
+                        du_dmT[tind] += -dA_dmT + dRHS_dmT
+
+            Jtv = np.zeros(m.size)
+            for tind, t in enumerate(times):
+                if du_dmT[tind] is None:
+                    continue
+                Jtv += (
+                    self.PetaEtaDeriv(t, du_dmT[tind], adjoint=True) +
+                    self.PetaTauiDeriv(t, du_dmT[tind], adjoint=True) +
+                    self.PetaCDeriv(t, du_dmT[tind], adjoint=True)
+                )
 
             return self.sign*Jtv
 
+    def _linearizedData(self, f, vs, fieldsDeriv=False):
+        """
+            Data of the DC problem linearized about the fields f, for the
+            model perturbations vs (one per time channel), in the order of the
+            data: time channels, then sources, then receivers.
+
+            The DC operator does not depend on time, so the system is solved
+            once per source with one right hand side per time channel.
+
+            :param SimPEG.EM.Static.DC.FieldsDC f: DC fields
+            :param list vs: model perturbation of each time channel
+            :param bool fieldsDeriv: include the derivative of the fields
+                with respect to the model
+            :rtype: list
+            :return: data of each time channel, source and receiver
+        """
+        times = self.survey.times
+        data = {}
+
+        for isrc, src in enumerate(self.survey.srcList):
+            u_src = f[src, self._solutionType]  # solution vector
+            timeindex = [rx.getTimeP(times) for rx in src.rxList]
+            tinds = [
+                tind for tind in range(len(times))
+                if any(tindex[tind] for tindex in timeindex)
+            ]
+            if len(tinds) == 0:
+                continue
+
+            RHS = np.vstack([
+                Utils.mkvc(
+                    - self.getADeriv(u_src, vs[tind]) +
+                    self.getRHSDeriv(src, vs[tind])
+                )
+                for tind in tinds
+            ]).T
+            du_dm_v = np.reshape(self.Ainv * RHS, RHS.shape, order='F')
+
+            for k, tind in enumerate(tinds):
+                for irx, rx in enumerate(src.rxList):
+                    if not timeindex[irx][tind]:
+                        continue
+                    if fieldsDeriv:
+                        df_dmFun = getattr(
+                            f, '_{0!s}Deriv'.format(rx.projField), None
+                        )
+                        df_dm_v = df_dmFun(
+                            src, du_dm_v[:, k], vs[tind], adjoint=False
+                        )
+                        Jv_temp = rx.evalDeriv(src, self.mesh, f, df_dm_v)
+                    else:
+                        Jv_temp = rx.evalDeriv(
+                            src, self.mesh, f, du_dm_v[:, k]
+                        )
+                        if rx.nD == 1:
+                            Jv_temp = Jv_temp.reshape([-1, 1])
+                    data[tind, isrc, irx] = Jv_temp
+
+        Jv = []
+        for tind in range(len(times)):
+            for isrc, src in enumerate(self.survey.srcList):
+                for irx in range(len(src.rxList)):
+                    if (tind, isrc, irx) in data:
+                        Jv.append(data[tind, isrc, irx])
+        return Jv
+
     def getSourceTerm(self):
         """
         takes concept of source and turns it into a matrix
@@ -17,11 +17,34 @@ class BaseTDEMProblem(Problem.BaseTimeProblem, BaseEMProblem):
     We start with the first order form of Maxwell's equations, eliminate and
     solve the second order form. For the time discretization, we use backward
     Euler.
+
+    If stepResponse is True, the sources are simulated as step offs (at the
+    start of the time mesh), and the data of any waveform are convolutions
+    of these step off responses (see
+    :meth:`SimPEG.EM.TDEM.Src.BaseWaveform.convolution`): the waveforms
+    of all the sources and receivers come from one time stepping. The time
+    mesh starts at the switch off and must span the longest lag of the
+    convolutions, from the start of a waveform to the latest time of its
+    receivers (e.g. the on-time of a VTEM waveform plus the late gates),
+    an error is raised otherwise. The times of the receivers are in the
+    time frame of their waveform.
+
+    .. code:: python
+
+        prob = EM.TDEM.Problem3D_b(mesh, sigmaMap=mapping, stepResponse=True)
+        prob.timeSteps = [(1e-6, 10), (1e-5, 10), (1e-4, 10), (1e-3, 10)]
+        src = EM.TDEM.Src.MagDipole(
+            [rxLow, rxHigh], waveform=EM.TDEM.Src.TrapezoidWaveform(
+                ramp_on=np.r_[-1e-2, -9e-3], ramp_off=np.r_[-1e-4, 0.]
+            )
+        )
+        rxHigh.waveform = EM.TDEM.Src.VTEMWaveform()
     """
     surveyPair = SurveyTDEM  #: A SimPEG.EM.TDEM.SurveyTDEM Class
     fieldsPair = FieldsTDEM  #: A SimPEG.EM.TDEM.FieldsTDEM Class
     clean_on_model_update = ['_Adcinv']  #: clear DC matrix factors on any model updates
     dt_threshold = 1e-8
+    stepResponse = False  #: convolve step off responses with the waveforms
 
     def __init__(self, mesh, **kwargs):
         BaseEMProblem.__init__(self, mesh, **kwargs)
@@ -1,6 +1,8 @@
+import numpy as np
+import scipy.sparse as sp
+
 import SimPEG
 from SimPEG import Utils
-import scipy.sparse as sp
 
 
 class BaseRx(SimPEG.Survey.BaseTimeRx):
@@ -10,8 +12,16 @@ class BaseRx(SimPEG.Survey.BaseTimeRx):
     :param numpy.ndarray locs: receiver locations (ie. :code:`np.r_[x,y,z]`)
     :param numpy.ndarray times: times
     :param string orientation: receiver orientation 'x', 'y' or 'z'
+
+    When the problem computes step responses (see
+    :attr:`SimPEG.EM.TDEM.BaseTDEMProblem.stepResponse`), the data are the
+    convolutions of the step off responses with the waveform of the
+    receiver, or of its source if it is None (e.g. the low and high moments
+    of a dual moment system are two receivers of one source).
     """
 
+    waveform = None  #: waveform of the data of step responses
+
     def __init__(self, locs, times, orientation=None):
         assert(orientation in ['x', 'y', 'z']), (
             "Orientation {0!s} not known. Orientation must be in "
@@ -39,17 +49,7 @@ class BaseRx(SimPEG.Survey.BaseTimeRx):
         """
         return mesh.getInterpolationMat(self.locs, self.projGLoc(f))
 
-    def getTimeP(self, timeMesh, f):
-        """
-            Returns the time projection matrix.
-
-            .. note::
-
-                This is not stored in memory, but is created on demand.
-        """
-        return timeMesh.getInterpolationMat(self.times, self.projTLoc(f))
-
-    def getP(self, mesh, timeMesh, f):
+    def getP(self, mesh, timeMesh, f, src=None):
         """
             Returns the projection matrices as a
             list for all components collected by
@@ -59,15 +59,25 @@ class BaseRx(SimPEG.Survey.BaseTimeRx):
 
                 Projection matrices are stored as a dictionary (mesh, timeMesh) if storeProjections is True
         """
-        if (mesh, timeMesh) in self._Ps:
-            return self._Ps[(mesh, timeMesh)]
+        waveform = None
+        if getattr(f.survey.prob, 'stepResponse', False):
+            waveform = self.waveform
+            if waveform is None:
+                waveform = src.waveform
+        key = (mesh, timeMesh, waveform)
+
+        if key in self._Ps:
+            return self._Ps[key]
 
         Ps = self.getSpatialP(mesh, f)
-        Pt = self.getTimeP(timeMesh, f)
+        if waveform is None:
+            Pt = self.getTimeP(timeMesh, f)
+        else:
+            Pt = self.getConvolutionP(timeMesh, f, waveform)
         P = sp.kron(Pt, Ps)
 
         if self.storeProjections:
-            self._Ps[(mesh, timeMesh)] = P
+            self._Ps[key] = P
 
         return P
 
@@ -86,6 +96,48 @@ class BaseRx(SimPEG.Survey.BaseTimeRx):
         # else:
         return timeMesh.getInterpolationMat(self.times, self.projTLoc(f))
 
+    def getStepP(self, timeMesh, f, lags):
+        """
+            Returns the interpolation matrix of the step off responses at
+            lags after the switch off (at the start of the time mesh), they
+            are zero after the end of the time mesh (see
+            :meth:`getConvolutionP`).
+        """
+        return timeMesh.getInterpolationMat(
+            timeMesh.x0[0] + lags, self.projTLoc(f), zerosOutside=True
+        )
+
+    def getConvolutionP(self, timeMesh, f, waveform):
+        """
+            Returns the time projection matrix of the convolution of the
+            step off responses with a waveform (see
+            :meth:`SimPEG.EM.TDEM.Src.BaseWaveform.convolution`). The time
+            mesh must span the lags, from the start of the waveform to the
+            latest time of the receiver.
+        """
+        lags, weights, initial = waveform.convolution(self.times)
+        nT, nL = lags.shape
+        extent = timeMesh.vectorNx[-1] - timeMesh.x0[0]
+        if lags.max() > extent:
+            raise ValueError(
+                'The time mesh ({:e} s) is shorter than the lags of the '
+                'convolution with the waveform ({:e} s): it must span the '
+                'waveform and the times of the receiver'.format(
+                    extent, lags.max()
+                )
+            )
+        W = sp.csr_matrix(
+            (
+                weights.ravel(),
+                (np.repeat(np.arange(nT), nL), np.arange(nT*nL))
+            ), shape=(nT, nT*nL)
+        )
+        P0 = sp.kron(
+            Utils.mkvc(initial + weights.sum(axis=1), 2),
+            self.getStepP(timeMesh, f, np.r_[0.])
+        )
+        return (P0 - W * self.getStepP(timeMesh, f, lags.ravel())).tocsr()
+
     def eval(self, src, mesh, timeMesh, f):
         """
         Project fields to receivers to get data.
@@ -97,7 +149,7 @@ class BaseRx(SimPEG.Survey.BaseTimeRx):
         :return: fields projected to recievers
         """
 
-        P = self.getP(mesh, timeMesh, f)
+        P = self.getP(mesh, timeMesh, f, src)
         f_part = Utils.mkvc(f[src, self.projField, :])
         return P*f_part
 
@@ -114,7 +166,7 @@ class BaseRx(SimPEG.Survey.BaseTimeRx):
         :return: fields projected to recievers
         """
 
-        P = self.getP(mesh, timeMesh, f)
+        P = self.getP(mesh, timeMesh, f, src)
         if not adjoint:
             return P * v # Utils.mkvc(v[src, self.projField+'Deriv', :])
         elif adjoint:
@@ -169,7 +221,7 @@ class Point_dbdt(BaseRx):
         if self.projField in f.aliasFields:
             return super(Point_dbdt, self).eval(src, mesh, timeMesh, f)
 
-        P = self.getP(mesh, timeMesh, f)
+        P = self.getP(mesh, timeMesh, f, src)
         f_part = Utils.mkvc(f[src, 'b', :])
         return P*f_part
 
@@ -194,6 +246,15 @@ class Point_dbdt(BaseRx):
             self.times, 'CC'
         )*timeMesh.faceDiv
 
+    def getStepP(self, timeMesh, f, lags):
+        if self.projField in f.aliasFields:
+            return super(Point_dbdt, self).getStepP(timeMesh, f, lags)
+
+        # no time derivative before the switch off
+        return Utils.sdiag(lags > 0.) * timeMesh.getInterpolationMat(
+            timeMesh.x0[0] + lags, 'CC', zerosOutside=True
+        )*timeMesh.faceDiv
+
 
 class Point_h(BaseRx):
     """
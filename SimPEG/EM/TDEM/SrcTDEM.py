@@ -51,6 +51,86 @@ class BaseWaveform(properties.HasProperties):
     def evalDeriv(self, time):
         raise NotImplementedError  # needed for E-formulation
 
+    def piecewiseLinear(self, nRamp=20):
+        """
+        Piecewise linear approximation of the waveform, from the start of
+        its on-time to the end of its off ramp. Waveforms with initial
+        fields start from a current of 1 (on since t = -inf). A time
+        repeated twice is a jump of the current.
+
+        :param int nRamp: number of segments of the non-linear ramps
+        :rtype: tuple
+        :return: times, currents
+        """
+        raise NotImplementedError(
+            'The piecewise linear approximation of {} is not '
+            'implemented'.format(self.__class__.__name__)
+        )
+
+    def convolution(self, times, nQuadrature=8, nRamp=20):
+        """
+        Quadrature of the convolution of the waveform with the step off
+        response g of a linear system (its response to a unit current that
+        is switched off at t = 0, after being on since t = -inf)
+
+        .. math::
+
+            d(t) = I(-\\infty) g(0) + \\int (g(0) - g(t - \\tau)) dI(\\tau)
+
+        .. math::
+
+            d(t) \\approx \\left(I(-\\infty) + \\sum_q w_q\\right) g(0) -
+                \\sum_q w_q g(l_q)
+
+        The quadratures of the segments of the waveform are Gauss-Legendre
+        quadratures in :math:`\\log(t - \\tau)` (in :math:`\\tau` for the
+        segment in progress at t), the step off responses are sampled at
+        lags :math:`l_q \\geq 0`.
+
+        :param numpy.ndarray times: times of the data
+        :param int nQuadrature: number of quadrature points per segment
+        :param int nRamp: number of segments of the non-linear ramps
+        :rtype: tuple
+        :return: lags (nTime x nLag), weights (nTime x nLag),
+            initial current
+        """
+        wTimes, wCurrents = self.piecewiseLinear(nRamp=nRamp)
+        wTimes = np.asarray(wTimes, dtype=float)
+        wCurrents = np.asarray(wCurrents, dtype=float)
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        x, w = np.polynomial.legendre.leggauss(nQuadrature)
+
+        nSeg = len(wTimes) - 1
+        lags = np.zeros((len(times), nSeg, nQuadrature))
+        weights = np.zeros((len(times), nSeg, nQuadrature))
+        for k in range(nSeg):
+            t0, t1 = wTimes[k], wTimes[k+1]
+            dI = wCurrents[k+1] - wCurrents[k]
+            for i, t in enumerate(times):
+                if t0 > t or dI == 0.:
+                    continue
+                elif t1 == t0:
+                    # jump of the current
+                    lags[i, k, 0] = t - t0
+                    weights[i, k, 0] = dI
+                elif t1 < t:
+                    s0, s1 = np.log(t - t1), np.log(t - t0)
+                    s = (s1 - s0) / 2. * x + (s1 + s0) / 2.
+                    lags[i, k] = np.exp(s)
+                    weights[i, k] = dI / (t1 - t0) * (s1 - s0) / 2. * w * (
+                        np.exp(s)
+                    )
+                else:
+                    tau = (t - t0) / 2. * x + (t + t0) / 2.
+                    lags[i, k] = t - tau
+                    weights[i, k] = dI / (t1 - t0) * (t - t0) / 2. * w
+
+        initial = wCurrents[0] if self.hasInitialFields else 0.
+        return (
+            lags.reshape(len(times), -1), weights.reshape(len(times), -1),
+            initial
+        )
+
 
 class StepOffWaveform(BaseWaveform):
 
@@ -63,6 +143,9 @@ class StepOffWaveform(BaseWaveform):
         else:
             return 0.
 
+    def piecewiseLinear(self, nRamp=20):
+        return np.r_[0., 0.], np.r_[1., 0.]
+
 
 class RampOffWaveform(BaseWaveform):
 
@@ -77,6 +160,9 @@ class RampOffWaveform(BaseWaveform):
         else:
             return 0.
 
+    def piecewiseLinear(self, nRamp=20):
+        return np.r_[0., self.offTime], np.r_[1., 0.]
+
 
 class RawWaveform(BaseWaveform):
 
@@ -126,6 +212,10 @@ class VTEMWaveform(BaseWaveform):
         else:
             return 0.
 
+    def piecewiseLinear(self, nRamp=20):
+        times = np.r_[np.linspace(0., self.peakTime, nRamp+1), self.offTime]
+        return times, np.array([self.eval(t) for t in times])
+
 
 class TrapezoidWaveform(BaseWaveform):
     """
@@ -170,6 +260,11 @@ class TrapezoidWaveform(BaseWaveform):
         else:
             return 0
 
+    def piecewiseLinear(self, nRamp=20):
+        return (
+            np.r_[self.ramp_on, self.ramp_off], np.r_[0., 1., 1., 0.]
+        )
+
 
 class QuarterSineRampOnWaveform(BaseWaveform):
     """
@@ -210,6 +305,13 @@ class QuarterSineRampOnWaveform(BaseWaveform):
         else:
             return 0
 
+    def piecewiseLinear(self, nRamp=20):
+        times = np.r_[
+            np.linspace(self.ramp_on[0], self.ramp_on[1], nRamp+1),
+            self.ramp_off
+        ]
+        return times, np.array([self.eval(t) for t in times])
+
 
 ###############################################################################
 #                                                                             #
@@ -248,6 +350,18 @@ class BaseTDEMSrc(BaseEMSrc):
         self.waveform = waveform
         BaseEMSrc.__init__(self, rxList, **kwargs)
 
+    def getWaveform(self, prob):
+        """
+        Waveform simulated by the problem: the waveform of the source, or a
+        step off if the problem computes step responses (see
+        :attr:`SimPEG.EM.TDEM.BaseTDEMProblem.stepResponse`)
+        """
+        if getattr(prob, 'stepResponse', False):
+            if getattr(self, '_stepOffWaveform', None) is None:
+                self._stepOffWaveform = StepOffWaveform()
+            return self._stepOffWaveform
+        return self.waveform
+
     def bInitial(self, prob):
         return Zero()
 
@@ -410,7 +524,7 @@ class MagDipole(BaseTDEMSrc):
 
     def bInitial(self, prob):
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
 
         if np.all(prob.mu == self.mu):
@@ -426,7 +540,7 @@ class MagDipole(BaseTDEMSrc):
 
     def hInitial(self, prob):
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
         # if prob._formulation == 'EB':
         #     return prob.MfMui * self.bInitial(prob)
@@ -435,38 +549,39 @@ class MagDipole(BaseTDEMSrc):
         return 1./self.mu * self.bInitial(prob)
 
     def s_m(self, prob, time):
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
         return Zero()
 
     def s_e(self, prob, time):
         C = prob.mesh.edgeCurl
         b = self._bSrc(prob)
+        waveform = self.getWaveform(prob)
 
         if prob._formulation == 'EB':
             MfMui = prob.mesh.getFaceInnerProduct(1./self.mu)
 
-            if self.waveform.hasInitialFields is True and time < prob.timeSteps[1]:
+            if waveform.hasInitialFields is True and time < prob.timeSteps[1]:
                 if prob._fieldType == 'b':
                     return Zero()
                 elif prob._fieldType == 'e':
                     # Compute s_e from vector potential
                     return C.T * (MfMui * b)
             else:
-                return C.T * (MfMui * b) * self.waveform.eval(time)
+                return C.T * (MfMui * b) * waveform.eval(time)
 
         elif prob._formulation == 'HJ':
 
             h = 1./self.mu * b
 
-            if self.waveform.hasInitialFields is True and time < prob.timeSteps[1]:
+            if waveform.hasInitialFields is True and time < prob.timeSteps[1]:
                 if prob._fieldType == 'h':
                     return Zero()
                 elif prob._fieldType == 'j':
                     # Compute s_e from vector potential
                     return C * h
             else:
-                return C * h * self.waveform.eval(time)
+                return C * h * waveform.eval(time)
 
 
 class CircularLoop(MagDipole):
@@ -545,13 +660,13 @@ class LineCurrent(BaseTDEMSrc):
     # TODO: Need to implement solving MMR for this when
     # StepOffwaveform is used.
     def bInitial(self, prob):
-        if self.waveform.eval(0) == 1.:
+        if self.getWaveform(prob).eval(0) == 1.:
             raise Exception("Not implemetned for computing b!")
         else:
             return Zero()
 
     def eInitial(self, prob):
-        if self.waveform.hasInitialFields:
+        if self.getWaveform(prob).hasInitialFields:
             RHSdc = self.getRHSdc(prob)
             soldc = prob.Adcinv * RHSdc
             return - prob.mesh.nodalGrad * soldc
@@ -565,7 +680,7 @@ class LineCurrent(BaseTDEMSrc):
         raise NotImplementedError
 
     def eInitialDeriv(self, prob, v=None, adjoint=False, f=None):
-        if self.waveform.hasInitialFields:
+        if self.getWaveform(prob).hasInitialFields:
             edc = f[self, 'e', 0]
             Grad = prob.mesh.nodalGrad
             if adjoint is False:
@@ -583,7 +698,7 @@ class LineCurrent(BaseTDEMSrc):
         return Zero()
 
     def s_e(self, prob, time):
-        return self.Mejs(prob) * self.waveform.eval(time)
+        return self.Mejs(prob) * self.getWaveform(prob).eval(time)
 
 
 # TODO: this should be generalized and plugged into getting the Line current
@@ -605,14 +720,14 @@ class RawVec_Grounded(BaseTDEMSrc):
         return Utils.sdiag(prob.mesh.vol) * prob.mesh.faceDiv * self._s_e
 
     def phiInitial(self, prob):
-        if self.waveform.hasInitialFields:
+        if self.getWaveform(prob).hasInitialFields:
             RHSdc = self.getRHSdc(prob)
             return prob.Adcinv * RHSdc
         else:
             return Zero()
 
     def _phiInitialDeriv(self, prob, v, adjoint=False):
-        if self.waveform.hasInitialFields:
+        if self.getWaveform(prob).hasInitialFields:
             phi = self.phiInitial(prob)
 
             if adjoint is True:
@@ -628,7 +743,7 @@ class RawVec_Grounded(BaseTDEMSrc):
         if prob._fieldType not in ['j', 'h']:
             raise NotImplementedError
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
 
         phi = self.phiInitial(prob)
@@ -639,7 +754,7 @@ class RawVec_Grounded(BaseTDEMSrc):
         if prob._fieldType not in ['j', 'h']:
             raise NotImplementedError
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
 
         phi = self.phiInitial(prob)
@@ -684,7 +799,7 @@ class RawVec_Grounded(BaseTDEMSrc):
         if prob._fieldType not in ['j', 'h']:
             raise NotImplementedError
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
 
         b = self.bInitial(prob)
@@ -694,7 +809,7 @@ class RawVec_Grounded(BaseTDEMSrc):
         if prob._fieldType not in ['j', 'h']:
             raise NotImplementedError
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
 
         if adjoint is True:
@@ -705,7 +820,7 @@ class RawVec_Grounded(BaseTDEMSrc):
         if prob._fieldType not in ['j', 'h']:
             raise NotImplementedError
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
 
         a = self._aInitial(prob)
@@ -715,7 +830,7 @@ class RawVec_Grounded(BaseTDEMSrc):
         if prob._fieldType not in ['j', 'h']:
             raise NotImplementedError
 
-        if self.waveform.hasInitialFields is False:
+        if self.getWaveform(prob).hasInitialFields is False:
             return Zero()
 
         if adjoint is True:
@@ -724,8 +839,8 @@ class RawVec_Grounded(BaseTDEMSrc):
 
     def s_e(self, prob, time):
         # if prob._fieldType == 'h':
-        #     return prob.Mf * self._s_e * self.waveform.eval(time)
-        return self._s_e * self.waveform.eval(time)
+        #     return prob.Mf * self._s_e * self.getWaveform(prob).eval(time)
+        return self._s_e * self.getWaveform(prob).eval(time)
 
 
 
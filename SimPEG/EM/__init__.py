@@ -5,6 +5,7 @@ from scipy.constants import mu_0, epsilon_0
 from . import TDEM
 from . import FDEM
 from . import NSEM
+from . import EM1D
 from . import Static
 from . import Base
 from . import Analytics
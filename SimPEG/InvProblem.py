@@ -139,14 +139,26 @@ class BaseInvProblem(Props.BaseSimPEG):
 
         if f is None:
             if isinstance(self.dmisfit, DataMisfit.BaseDataMisfit):
-                f = self.dmisfit.prob.fields(m)
+                prob = self.dmisfit.prob
+                with Utils.traceSpan(prob.__class__.__name__+'.fields'):
+                    f = prob.fields(m)
             elif isinstance(self.dmisfit, ObjectiveFunction.BaseObjectiveFunction):
-                f = []
-                for objfct in self.dmisfit.objfcts:
-                    if hasattr(objfct, 'prob'):
-                        f += [objfct.prob.fields(m)]
-                    else:
-                        f += []
+                probs = [
+                    objfct.prob for objfct in self.dmisfit.objfcts
+                    if hasattr(objfct, 'prob')
+                ]
+
+                def fields(prob):
+                    with Utils.traceSpan(prob.__class__.__name__+'.fields'):
+                        return prob.fields(m)
+
+                # the problems are independent, the executor of the data
+                # misfit computes their fields concurrently
+                executor = getattr(self.dmisfit, 'executor', None)
+                if executor is None or len(probs) < 2:
+                    f = [fields(prob) for prob in probs]
+                else:
+                    f = list(executor.map(fields, probs))
 
         if deleteWarmstart:
             self.warmstart = []
@@ -167,6 +179,29 @@ class BaseInvProblem(Props.BaseSimPEG):
                     dpred += []
             return dpred
 
+    def _evalReg(self, m, return_g, return_H):
+        """
+        Value, gradient and Hessian-vector product function of the
+        regularization (None if not requested). The regularizations that
+        provide evalFunction (e.g. the combo regularizations) evaluate their
+        terms together.
+        """
+        if hasattr(self.reg, 'evalFunction'):
+            out = self.reg.evalFunction(
+                m, return_g=return_g, return_H=return_H
+            )
+            if not (return_g or return_H):
+                return out, None, None
+            out = list(out)
+            phi_m = out.pop(0)
+            g = out.pop(0) if return_g else None
+            H = out.pop(0).matvec if return_H else None
+            return phi_m, g, H
+
+        g = self.reg.deriv(m) if return_g else None
+        H = (lambda v: self.reg.deriv2(m, v=v)) if return_H else None
+        return self.reg(m), g, H
+
     @Utils.timeIt
     def evalFunction(self, m, return_g=True, return_H=True):
         """evalFunction(m, return_g=True, return_H=True)
@@ -182,7 +217,7 @@ class BaseInvProblem(Props.BaseSimPEG):
         phi_d = self.dmisfit(m, f=f)
         self.dpred = self.get_dpred(m, f=f)
 
-        phi_m = self.reg(m)
+        phi_m, phi_mDeriv, phi_m2Deriv = self._evalReg(m, return_g, return_H)
 
         self.phi_d, self.phi_d_last = phi_d, self.phi_d
         self.phi_m, self.phi_m_last = phi_m, self.phi_m
@@ -192,7 +227,6 @@ class BaseInvProblem(Props.BaseSimPEG):
         out = (phi,)
         if return_g:
             phi_dDeriv = self.dmisfit.deriv(m, f=f)
-            phi_mDeriv = self.reg.deriv(m)
 
             g = phi_dDeriv + self.beta * phi_mDeriv
             out += (g,)
@@ -200,9 +234,8 @@ class BaseInvProblem(Props.BaseSimPEG):
         if return_H:
             def H_fun(v):
                 phi_d2Deriv = self.dmisfit.deriv2(m, v, f=f)
-                phi_m2Deriv = self.reg.deriv2(m, v=v)
 
-                return phi_d2Deriv + self.beta * phi_m2Deriv
+                return phi_d2Deriv + self.beta * phi_m2Deriv(v)
 
             H = sp.linalg.LinearOperator( (m.size, m.size), H_fun, dtype=m.dtype )
             out += (H,)
@@ -1,9 +1,14 @@
 from __future__ import print_function
+import time
 import scipy.sparse as sp
 import numpy as np
+from scipy.spatial import cKDTree
 from . import Utils
 from .Optimization import Remember, IterationPrinters, StoppingCriteria
 from . import Directives
+from . import Maps
+from . import ObjectiveFunction
+from . import Regularization
 
 
 class BaseInversion(object):
@@ -71,3 +76,211 @@ class BaseInversion(object):
 
     def _optCallback(self, xt):
         self.directiveList.call('endIter')
+
+
+def prolongation(fineMesh, coarseMesh, fineActive=None, coarseActive=None):
+    """
+        Interpolation of a model on the active cells of a coarse mesh to the
+        active cells of a fine mesh (see :class:`SimPEG.Maps.Mesh2Mesh`).
+
+        Only the active coarse cells are interpolated: the weights of each
+        fine cell are normalized over them, and a fine cell that is only
+        surrounded by inactive coarse cells takes the value of the nearest
+        active one.
+
+        :param discretize.BaseMesh fineMesh: fine mesh
+        :param discretize.BaseMesh coarseMesh: coarse mesh
+        :param numpy.ndarray fineActive: active cells of the fine mesh
+        :param numpy.ndarray coarseActive: active cells of the coarse mesh
+        :rtype: scipy.sparse.csr_matrix
+        :return: prolongation (nActiveFine x nActiveCoarse)
+    """
+    if fineActive is None:
+        fineActive = np.ones(fineMesh.nC, dtype=bool)
+    if coarseActive is None:
+        coarseActive = np.ones(coarseMesh.nC, dtype=bool)
+    fineActive = Utils.mkvc(fineActive)
+    coarseActive = Utils.mkvc(coarseActive)
+    if fineActive.dtype != bool:
+        fineActive = np.in1d(np.arange(fineMesh.nC), fineActive)
+    if coarseActive.dtype != bool:
+        coarseActive = np.in1d(np.arange(coarseMesh.nC), coarseActive)
+
+    P = Maps.Mesh2Mesh(
+        [fineMesh, coarseMesh], indActive=fineActive
+    ).P.tocsc()[:, coarseActive].tocsr()
+    w = Utils.mkvc(np.asarray(P.sum(axis=1)))
+
+    missing = w < 1e-6
+    if np.any(missing):
+        gridCoarse = coarseMesh.gridCC.reshape((coarseMesh.nC, -1))
+        gridFine = fineMesh.gridCC.reshape((fineMesh.nC, -1))
+        nearest = cKDTree(gridCoarse[coarseActive]).query(
+            gridFine[fineActive][missing]
+        )[1]
+        w[missing] = 1.
+        P = Utils.sdiag(~missing / w) * P + sp.csr_matrix(
+            (np.ones(missing.sum()), (np.where(missing)[0], nearest)),
+            shape=P.shape
+        )
+    else:
+        P = Utils.sdiag(1. / w) * P
+    return P.tocsr()
+
+
+class MultilevelInversion(object):
+    """
+        Coarse to fine inversion: the first Gauss-Newton iterations are run
+        on coarsened meshes (see :func:`SimPEG.Utils.coarsenMesh`), where
+        they only shape the long wavelengths of the model, and the model is
+        prolonged to the next finer mesh (see :func:`prolongation`).
+
+        The inversion of each level is built by :code:`setup(mesh)`, which
+        returns its inverse problem and its directives (a problem, a data
+        misfit, a :class:`SimPEG.Regularization.Simple` or
+        :class:`SimPEG.Regularization.Sparse` regularization and an
+        optimization on that mesh)::
+
+            def setup(mesh):
+                ...
+                return invProb, [
+                    Directives.BetaEstimate_ByEig(), Directives.Update_IRLS()
+                ]
+
+            meshes = [Utils.coarsenMesh(mesh, 2), Utils.coarsenMesh(mesh), mesh]
+            inv = Inversion.MultilevelInversion(meshes, setup, maxIter=[5, 3])
+            mrec = inv.run(m0)  # m0 on the coarsest mesh
+
+        The models are defined on the active cells of the mesh of the
+        regularization (several models may be stacked, e.g. the components
+        of a vector model). From a level to the next, the model, the
+        reference model and the l2 model of the IRLS are prolonged, the
+        trade-off parameter beta and the state of the IRLS (mode, number of
+        IRLS iterations and thresholds of the norms) are carried over, and
+        :class:`SimPEG.Directives.BetaEstimate_ByEig` is only used at the
+        coarsest level.
+
+        :param list meshes: meshes, from the coarsest to the finest
+        :param callable setup: builds the (invProb, directiveList) of a mesh
+        :param list maxIter: maximum number of iterations of the levels (the
+            optimization of the setup if None)
+    """
+
+    #: Maximum number of iterations of each level
+    maxIter = None
+
+    def __init__(self, meshes, setup, **kwargs):
+        assert len(meshes) > 0, 'At least one mesh is needed'
+        self.meshes = meshes
+        self.setup = setup
+        Utils.setKwargs(self, **kwargs)
+
+    @Utils.timeIt
+    def run(self, m0):
+        """run(m0)
+
+            Runs the inversions of the levels, from a model on the coarsest
+            mesh, and returns the model on the finest mesh.
+        """
+        self.levelTimes = []
+        self.inversions = []
+        m = m0
+
+        for level, mesh in enumerate(self.meshes):
+            tic = time.time()
+            invProb, directiveList = self.setup(mesh)
+            if self.maxIter is not None and level < len(self.maxIter):
+                invProb.opt.maxIter = self.maxIter[level]
+
+            if level > 0:
+                previous = self.inversions[-1]
+                P = self._prolongation(previous.invProb.reg, invProb.reg)
+                m = P * m
+                invProb.beta = previous.invProb.beta
+                directiveList = [
+                    directive for directive in directiveList
+                    if not isinstance(directive, Directives.BetaEstimate_ByEig)
+                ]
+                for regPrevious, reg in zip(
+                    _regularizations(previous.invProb.reg),
+                    _regularizations(invProb.reg)
+                ):
+                    if regPrevious.mref is not None:
+                        reg.mref = P * regPrevious.mref
+
+            inv = BaseInversion(invProb, directiveList=directiveList)
+            if level > 0:
+                self._carryIRLS(previous, inv, P)
+
+            m = inv.run(m)
+            self.inversions.append(inv)
+            self.levelTimes.append(time.time() - tic)
+            print(
+                'Level {0:d}: {1:d} cells, {2:.2f} s'.format(
+                    level, mesh.nC, self.levelTimes[-1]
+                )
+            )
+
+        return m
+
+    def _prolongation(self, regCoarse, regFine):
+        """
+            Prolongation of the models of a level to the next, from the
+            meshes and the active cells of their regularizations
+        """
+        regCoarse = _regularizations(regCoarse)[0]
+        regFine = _regularizations(regFine)[0]
+        P = prolongation(
+            regFine.regmesh.mesh, regCoarse.regmesh.mesh,
+            fineActive=regFine.regmesh.indActive,
+            coarseActive=regCoarse.regmesh.indActive
+        )
+        nModels = regCoarse.nP // P.shape[1]
+        if nModels > 1:
+            P = sp.block_diag([P]*nModels, format='csr')
+        return P
+
+    def _carryIRLS(self, previous, inv, P):
+        """
+            Start the IRLS of a level where it stopped at the previous level
+        """
+        def irls(inversion):
+            for directive in inversion.directiveList.dList:
+                if isinstance(directive, Directives.Update_IRLS):
+                    return directive
+
+        irlsPrevious, irlsNew = irls(previous), irls(inv)
+        if irlsPrevious is None or irlsNew is None or irlsPrevious.mode == 1:
+            return
+
+        irlsNew.mode = irlsPrevious.mode
+        irlsNew.IRLSiter = irlsPrevious.IRLSiter
+        irlsNew.updateBeta = irlsPrevious.updateBeta
+        for regPrevious, reg in zip(
+            _regularizations(previous.invProb.reg),
+            _regularizations(inv.invProb.reg)
+        ):
+            if getattr(regPrevious, 'eps_p', None) is not None:
+                reg.eps_p = regPrevious.eps_p
+                reg.eps_q = regPrevious.eps_q
+        if getattr(previous.invProb, 'l2model', None) is not None:
+            inv.invProb.l2model = P * previous.invProb.l2model
+
+
+def _regularizations(reg):
+    """
+        Regularizations (Simple, Sparse, ...) of a regularization or of a
+        combination of regularizations
+    """
+    if isinstance(reg, ObjectiveFunction.ComboObjectiveFunction) and not (
+        isinstance(reg, Regularization.BaseComboRegularization)
+    ):
+        return [
+            objfct for objfct in reg.objfcts if isinstance(
+                objfct, (
+                    Regularization.BaseComboRegularization,
+                    Regularization.BaseRegularization
+                )
+            )
+        ]
+    return [reg]
@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 from six import integer_types
 from six import string_types
 from collections import namedtuple
+import inspect
 import warnings
 
 import numpy as np
@@ -230,8 +231,21 @@ class ComboMap(IdentityMap):
         Remember, any time that you make your own combination of mappings
         be sure to test that the derivative is correct.
 
+        The derivative times a vector, :code:`deriv(m, v)`, is applied one
+        map at a time from right to left, without multiplying the
+        derivatives of the maps together. If :code:`lazyDeriv` is True,
+        :code:`deriv(m)` returns a
+        :class:`scipy.sparse.linalg.LinearOperator` that does the same for
+        :code:`deriv(m) * v` and :code:`deriv(m).T * v` (left to right).
+        The models in between the maps are stored for the last model.
+
     """
 
+    lazyDeriv = properties.Bool(
+        "return a LinearOperator as the derivative of the combination",
+        default=False
+    )
+
     def __init__(self, maps, **kwargs):
         IdentityMap.__init__(self, None, **kwargs)
 
@@ -285,17 +299,59 @@ class ComboMap(IdentityMap):
             m = map_i * m
         return m
 
+    def _intermediateModels(self, m):
+        """
+            Input model of each map, from the last to the first map, followed
+            by the output of the combination. These are stored for the last
+            model, so the forward transforms are not repeated for each
+            derivative.
+        """
+        cache = getattr(self, '_intermediateCache', None)
+        if (
+            cache is None or cache['m'].shape != np.shape(m) or
+            not np.array_equal(cache['m'], m)
+        ):
+            models = [m]
+            for map_i in reversed(self.maps):
+                models.append(map_i * models[-1])
+            cache = {'m': np.array(m, copy=True), 'models': models}
+            self._intermediateCache = cache
+        return cache['models']
+
     def deriv(self, m, v=None):
 
+        models = self._intermediateModels(m)
+        mapsModels = list(zip(reversed(self.maps), models))
+
         if v is not None:
-            deriv = v
-        else:
-            deriv = 1
+            for map_i, mi in mapsModels:
+                v = _derivTimesVec(map_i, mi, v)
+            return v
 
-        mi = m
-        for map_i in reversed(self.maps):
+        if self.lazyDeriv:
+            derivs = {}
+
+            def factor(ii):
+                if ii not in derivs:
+                    derivs[ii] = mapsModels[ii][0].deriv(mapsModels[ii][1])
+                return derivs[ii]
+
+            def matvec(x):
+                for map_i, mi in mapsModels:
+                    x = _derivTimesVec(map_i, mi, x)
+                return x
+
+            def rmatvec(x):
+                for ii in reversed(range(len(mapsModels))):
+                    x = factor(ii).T * x
+                return x
+
+            shape = (np.size(models[-1]), np.size(models[0]))
+            return LinearOperator(shape, matvec=matvec, rmatvec=rmatvec)
+
+        deriv = 1
+        for map_i, mi in mapsModels:
             deriv = map_i.deriv(mi) * deriv
-            mi = map_i * mi
         return deriv
 
     def __str__(self):
@@ -309,6 +365,30 @@ class ComboMap(IdentityMap):
         return len(self.maps)
 
 
+#: If the deriv functions (of the map classes) take v, see _derivTimesVec
+_derivTakesV = {}
+
+
+def _derivTimesVec(mapping, m, v):
+    """
+        mapping.deriv(m) * v, using the v argument of the derivative if the
+        map has one. The signature of each deriv function is only inspected
+        once.
+    """
+    deriv = mapping.deriv
+    func = getattr(deriv, '__func__', deriv)
+    takesV = _derivTakesV.get(func)
+    if takesV is None:
+        try:
+            args = inspect.getfullargspec(deriv).args
+        except AttributeError:  # python 2
+            args = inspect.getargspec(deriv).args
+        takesV = _derivTakesV[func] = 'v' in args
+    if takesV:
+        return deriv(m, v=v)
+    return deriv(m) * v
+
+
 class Projection(IdentityMap):
     """
         A map to rearrange / select parameters
@@ -1409,7 +1489,7 @@ class Mesh2Mesh(IdentityMap):
     def P(self):
         if getattr(self, '_P', None) is None:
             self._P = self.mesh2.getInterpolationMat(
-                self.mesh.gridCC[self.indActive, :] if
+                self.mesh.gridCC[self.indActive] if
                 self.indActive is not None else self.mesh.gridCC,
                 'CC',
                 zerosOutside=True
@@ -1437,6 +1517,150 @@ class Mesh2Mesh(IdentityMap):
         return self.P
 
 
+def _insideMesh(mesh, locs):
+    """
+        True for the locations inside the mesh
+    """
+    x0 = np.asarray(mesh.x0)
+    x1 = x0 + np.r_[[h.sum() for h in mesh.h]]
+    return np.all((locs >= x0) & (locs <= x1), axis=1)
+
+
+def _cellIndexes(mesh, locs):
+    """
+        Indexes of the cells of a TreeMesh or TensorMesh containing the
+        locations
+    """
+    if hasattr(mesh, 'point2index'):
+        return np.asarray(mesh.point2index(locs), dtype=int)
+    inds = [
+        np.clip(
+            np.searchsorted(x, locs[:, i], side='right') - 1, 0, len(x) - 2
+        )
+        for i, x in enumerate(
+            [mesh.vectorNx, mesh.vectorNy, mesh.vectorNz][:mesh.dim]
+        )
+    ]
+    return np.ravel_multi_index(inds, mesh.vnC, order='F')
+
+
+class TileMap(IdentityMap):
+    """
+        Takes a model of the active cells of a (global) mesh to the cells of
+        a local mesh, e.g. the coarse-far/fine-near mesh of a tile of
+        receivers. The value of a local cell is the volume average of the
+        global cells it contains:
+
+        .. math::
+
+            m^{local}_i = \sum_j \\frac{V_{ij}}{V_i} m_j
+
+        where :math:`V_{ij}` is the volume of the global cell j inside the
+        local cell i (inactive global cells count as zeros, the mass of the
+        active cells is preserved). The projection is exact when the cells of
+        the meshes are nested (e.g. TreeMeshes sharing their smallest cells,
+        see :func:`SimPEG.PF.Tiling.createLocalMesh`), otherwise the cells
+        are matched by their centers.
+
+        The local cells containing active global cells are
+        :attr:`localActive`, the map returns the model of those cells.
+
+        :param discretize.BaseMesh mesh: global mesh
+        :param numpy.ndarray indActive: active cells of the global mesh
+        :param discretize.BaseMesh localMesh: local mesh, covering the global
+            mesh
+    """
+
+    def __init__(self, mesh, indActive, localMesh, **kwargs):
+        Utils.setKwargs(self, **kwargs)
+
+        assert mesh.dim == localMesh.dim, (
+            "The two meshes must be the same dimension"
+        )
+
+        if indActive is None:
+            indActive = np.ones(mesh.nC, dtype=bool)
+        elif indActive.dtype != bool:
+            z = np.zeros(mesh.nC, dtype=bool)
+            z[indActive] = True
+            indActive = z
+
+        self.mesh = mesh
+        self.localMesh = localMesh
+        self.indActive = indActive
+
+    def _computeProjection(self):
+        mesh, localMesh = self.mesh, self.localMesh
+        active = np.where(self.indActive)[0]
+        activeIndex = -np.ones(mesh.nC, dtype=int)
+        activeIndex[active] = np.arange(len(active))
+
+        # global cells inside the local cell containing their center
+        inside = np.where(_insideMesh(localMesh, mesh.gridCC[active]))[0]
+        local = _cellIndexes(localMesh, mesh.gridCC[active[inside]])
+        nested = np.all(
+            mesh.h_gridded[active[inside]] <=
+            localMesh.h_gridded[local] * (1. + 1e-8),
+            axis=1
+        )
+        rows = [local[nested]]
+        cols = [inside[nested]]
+        vals = [
+            mesh.vol[active[inside[nested]]] / localMesh.vol[local[nested]]
+        ]
+
+        # local cells inside a larger global cell
+        hasCells = np.zeros(localMesh.nC, dtype=bool)
+        hasCells[rows[0]] = True
+        inside = np.where(
+            _insideMesh(mesh, localMesh.gridCC) & ~hasCells
+        )[0]
+        cells = _cellIndexes(mesh, localMesh.gridCC[inside])
+        inCell = activeIndex[cells] >= 0
+        rows += [inside[inCell]]
+        cols += [activeIndex[cells[inCell]]]
+        vals += [np.ones(inCell.sum())]
+
+        P = sp.csr_matrix(
+            (np.hstack(vals), (np.hstack(rows), np.hstack(cols))),
+            shape=(localMesh.nC, len(active))
+        )
+        self._localActive = np.diff(P.indptr) > 0
+        self._P = P[self._localActive]
+
+    @property
+    def P(self):
+        if getattr(self, '_P', None) is None:
+            self._computeProjection()
+        return self._P
+
+    @property
+    def localActive(self):
+        """
+            Local cells containing active global cells
+        """
+        if getattr(self, '_localActive', None) is None:
+            self._computeProjection()
+        return self._localActive
+
+    @property
+    def shape(self):
+        return self.P.shape
+
+    @property
+    def nP(self):
+        """Number of parameters in the model."""
+        return int(self.indActive.sum())
+
+    def _transform(self, m):
+        return self.P * m
+
+    def deriv(self, m, v=None):
+        if v is not None:
+            return self.P * v
+        return self.P
+
+
 class InjectActiveCells(IdentityMap):
     """
         Active model parameters.
@@ -231,10 +231,26 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
                 [phi1, phi2], [2, 3]
             )
 
+    The objective functions are independent, so they can be evaluated
+    concurrently (e.g. the data misfits of a joint inversion, each with its
+    own problem) by setting an executor:
+
+        .. code::python
+
+            from concurrent.futures import ThreadPoolExecutor
+            dmis = dmis_grav + dmis_mag + dmis_dc
+            dmis.executor = ThreadPoolExecutor(max_workers=3)
+
+    The terms are still added in order, so the results do not change.
+
     """
     _multiplier_types = (float, None, Utils.Zero, np.float64) + integer_types # Directive
     _multipliers = None
 
+    #: concurrent.futures.Executor used to evaluate the objective functions
+    #: concurrently, they are evaluated one after another if None
+    executor = None
+
     def __init__(self, objfcts=[], multipliers=None, **kwargs):
 
         if multipliers is None:
@@ -317,18 +333,37 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
 
         self._multipliers = value
 
-    def __call__(self, m, f=None):
-
-        fct = 0.
+    def _mapTerms(self, fun):
+        """
+        Evaluate fun(i, objfct) for the objective functions with a non-zero
+        multiplier (concurrently if an executor is set) and return the
+        (multiplier, value) pairs in order.
+        """
+        terms = []
         for i, phi in enumerate(self):
             multiplier, objfct = phi
             if multiplier == 0.: # don't evaluate the fct
                 continue
-            else:
-                if f is not None and objfct._hasFields:
-                    fct += multiplier * objfct(m, f=f[i])
-                else:
-                    fct += multiplier * objfct(m)
+            terms.append((i, multiplier, objfct))
+
+        if self.executor is None or len(terms) < 2:
+            values = [fun(i, objfct) for i, _, objfct in terms]
+        else:
+            values = list(self.executor.map(
+                lambda term: fun(term[0], term[2]), terms
+            ))
+        return [(term[1], value) for term, value in zip(terms, values)]
+
+    def __call__(self, m, f=None):
+
+        def evaluate(i, objfct):
+            if f is not None and objfct._hasFields:
+                return objfct(m, f=f[i])
+            return objfct(m)
+
+        fct = 0.
+        for multiplier, value in self._mapTerms(evaluate):
+            fct += multiplier * value
         return fct
 
     def deriv(self, m, f=None):
@@ -340,16 +375,15 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
         :param numpy.ndarray m: model
         :param SimPEG.Fields f: Fields object (if applicable)
         """
+
+        def evaluate(i, objfct):
+            if f is not None and objfct._hasFields:
+                return objfct.deriv(m, f=f[i])
+            return objfct.deriv(m)
+
         g = Utils.Zero()
-        for i, phi in enumerate(self):
-            multiplier, objfct = phi
-            if multiplier == 0.: # don't evaluate the fct
-                continue
-            else:
-                if f is not None and objfct._hasFields:
-                    g += multiplier * objfct.deriv(m, f=f[i])
-                else:
-                    g += multiplier * objfct.deriv(m)
+        for multiplier, value in self._mapTerms(evaluate):
+            g += multiplier * value
         return g
 
     def deriv2(self, m, v=None, f=None):
@@ -362,17 +396,15 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
         :param numpy.ndarray v: vector we are multiplying by
         :param SimPEG.Fields f: Fields object (if applicable)
         """
+
+        def evaluate(i, objfct):
+            if f is not None and objfct._hasFields:
+                return objfct.deriv2(m, v, f=f[i])
+            return objfct.deriv2(m, v)
+
         H = Utils.Zero()
-        for i, phi in enumerate(self):
-            multiplier, objfct = phi
-            if multiplier == 0.: # don't evaluate the fct
-                continue
-            else:
-                if f is not None and objfct._hasFields:
-                    objfct_H = objfct.deriv2(m, v, f=f[i])
-                else:
-                    objfct_H = objfct.deriv2(m, v)
-                H = H + multiplier * objfct_H
+        for multiplier, objfct_H in self._mapTerms(evaluate):
+            H = H + multiplier * objfct_H
         return H
 
     # This assumes all objective functions have a W.
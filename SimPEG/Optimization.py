@@ -276,24 +276,27 @@ class Minimize(object):
         self.printInit()
         print('x0 has any nan: {:b}'.format(np.any(np.isnan(x0))))
         while True:
-            self.doStartIteration()
-            self.f, self.g, self.H = evalFunction(
-                self.xc, return_g=True, return_H=True
-            )
-            self.printIter()
-            if self.stoppingCriteria():
-                break
-            self.searchDirection = self.findSearchDirection()
-            del self.H #: Doing this saves memory, as it is not needed in the rest of the computations.
-            p = self.scaleSearchDirection(self.searchDirection)
-            xt, passLS = self.modifySearchDirection(p)
-            if not passLS:
-                xt, caught = self.modifySearchDirectionBreak(p)
-                if not caught:
-                    return self.xc
-            self.doEndIteration(xt)
-            if self.stopNextIteration:
-                break
+            with Utils.traceSpan(
+                self.__class__.__name__+'.iteration', iteration=self.iter
+            ):
+                self.doStartIteration()
+                self.f, self.g, self.H = evalFunction(
+                    self.xc, return_g=True, return_H=True
+                )
+                self.printIter()
+                if self.stoppingCriteria():
+                    break
+                self.searchDirection = self.findSearchDirection()
+                del self.H #: Doing this saves memory, as it is not needed in the rest of the computations.
+                p = self.scaleSearchDirection(self.searchDirection)
+                xt, passLS = self.modifySearchDirection(p)
+                if not passLS:
+                    xt, caught = self.modifySearchDirectionBreak(p)
+                    if not caught:
+                        return self.xc
+                self.doEndIteration(xt)
+                if self.stopNextIteration:
+                    break
 
         self.printDone()
         self.finish()
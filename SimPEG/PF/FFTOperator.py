@@ -0,0 +1,256 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG.Utils import mkvc
+
+
+class FFTOperator(object):
+    """
+        Linear forward operator of an integral potential field problem for
+        receivers on a regular grid, at a constant height, above a tensor
+        mesh that is uniform in x and y.
+
+        In that case the response of a cell only depends on its horizontal
+        offset to the receiver, so the (nD x nC) sensitivity is block
+        Toeplitz: one kernel is computed per mesh layer and the products
+        :code:`G * m` and :code:`G.T * v` are 2D convolutions evaluated
+        with FFTs. The dense G is never formed, the memory is O(nC) and a
+        product costs O(nC log(nCx nCy)).
+
+        The receivers must lie on the lattice of the horizontal cell
+        centers shifted by a constant offset, i.e. the receiver spacing is
+        a multiple of the cell size.
+
+        :param discretize.TensorMesh mesh: 3D tensor mesh
+        :param numpy.ndarray rxLoc: receiver locations (nRx x 3)
+        :param kernel: function kernel(Xn, Yn, Zn, xyzLoc) returning the
+            (nOut x nIn*nK) rows of the forward operator for a receiver at
+            xyzLoc and nK prisms with corners Xn, Yn, Zn (nK x 2)
+        :param int nIn: number of model components per cell
+        :param int nOut: number of data per receiver
+        :param numpy.ndarray actInd: active cells (bool or indices)
+    """
+
+    def __init__(self, mesh, rxLoc, kernel, nIn=1, nOut=1, actInd=None):
+        self.mesh = mesh
+        self.rxLoc = np.atleast_2d(rxLoc)
+        self.nIn = nIn
+        self.nOut = nOut
+
+        if actInd is None:
+            actInd = np.arange(mesh.nC)
+        elif actInd.dtype == 'bool':
+            actInd = np.where(actInd)[0]
+        self.actInd = actInd
+
+        self._setGrid()
+        self._setKernel(kernel)
+
+    @staticmethod
+    def isGridded(mesh, rxLoc, tol=1e-6):
+        """
+            Check if the receivers and the mesh allow the FFT operator.
+
+            :rtype: bool
+        """
+        if getattr(mesh, '_meshType', None) != 'TENSOR' or mesh.dim != 3:
+            return False
+        rxLoc = np.atleast_2d(rxLoc)
+        for h, loc in zip(mesh.h[:2], rxLoc.T[:2]):
+            if not np.allclose(h, h[0], rtol=tol):
+                return False
+            offset = (loc - loc.min()) / h[0]
+            if not np.allclose(offset, np.round(offset), atol=tol):
+                return False
+        return np.allclose(
+            rxLoc[:, 2], rxLoc[0, 2], atol=tol*mesh.h[2].min()
+        )
+
+    @property
+    def shape(self):
+        return (self.nOut * self.rxLoc.shape[0], self.nIn * len(self.actInd))
+
+    def _setGrid(self):
+        mesh = self.mesh
+        if not self.isGridded(mesh, self.rxLoc):
+            raise ValueError(
+                'The FFT operator requires a 3D TensorMesh, uniform in x and '
+                'y, and receivers on a grid of the cell centers at a '
+                'constant height'
+            )
+
+        self.dx, self.dy = mesh.hx[0], mesh.hy[0]
+        self.rx0 = self.rxLoc[:, :2].min(axis=0)
+
+        # lattice index of each receiver
+        self.rxInd = np.round(
+            (self.rxLoc[:, :2] - self.rx0) / np.r_[self.dx, self.dy]
+        ).astype(int)
+        self.nRxx, self.nRxy = self.rxInd.max(axis=0) + 1
+
+        # size of the FFT, every offset between a receiver and a cell
+        # appears once so the circular convolution is exact
+        self.nFx = mesh.nCx + self.nRxx - 1
+        self.nFy = mesh.nCy + self.nRxy - 1
+
+    def _setKernel(self, kernel):
+        mesh = self.mesh
+        sx = np.r_[np.arange(self.nRxx), np.arange(-mesh.nCx + 1, 0)]
+        sy = np.r_[np.arange(self.nRxy), np.arange(-mesh.nCy + 1, 0)]
+
+        # prisms seen from the first receiver of the lattice, for all the
+        # horizontal offsets (receiver - cell) and all the layers
+        xc = mesh.vectorCCx[0] - sx * self.dx
+        yc = mesh.vectorCCy[0] - sy * self.dy
+        X, Y, Z1 = np.meshgrid(xc, yc, mesh.vectorNz[:-1], indexing='ij')
+        Z2 = np.meshgrid(xc, yc, mesh.vectorNz[1:], indexing='ij')[2]
+
+        Xn = np.c_[mkvc(X) - self.dx/2., mkvc(X) + self.dx/2.]
+        Yn = np.c_[mkvc(Y) - self.dy/2., mkvc(Y) + self.dy/2.]
+        Zn = np.c_[mkvc(Z1), mkvc(Z2)]
+
+        xyzLoc = np.r_[self.rx0, self.rxLoc[0, 2]]
+        rows = np.asarray(kernel(Xn, Yn, Zn, xyzLoc), dtype=float)
+
+        # kernel of each layer, (nOut, nIn, nFx, nFy, nCz)
+        self.K = rows.reshape(
+            (self.nOut, self.nIn, mesh.nCz, self.nFy, self.nFx)
+        ).transpose((0, 1, 4, 3, 2))
+
+    @property
+    def Khat(self):
+        """Fourier transform of the kernels"""
+        if getattr(self, '_Khat', None) is None:
+            self._Khat = np.fft.rfft2(self.K, axes=(2, 3))
+        return self._Khat
+
+    @property
+    def K2hat(self):
+        """Fourier transform of the squared kernels"""
+        if getattr(self, '_K2hat', None) is None:
+            self._K2hat = np.fft.rfft2(self.K**2, axes=(2, 3))
+        return self._K2hat
+
+    def _toGrid(self, m):
+        """active model (nIn*nActive) to (nIn, nFx, nFy, nCz)"""
+        mesh = self.mesh
+        nAct = len(self.actInd)
+        grid = np.zeros((self.nIn, mesh.nC))
+        grid[:, self.actInd] = np.reshape(m, (self.nIn, nAct))
+        grid = grid.reshape(
+            (self.nIn, mesh.nCx, mesh.nCy, mesh.nCz), order='F'
+        )
+        padded = np.zeros((self.nIn, self.nFx, self.nFy, mesh.nCz))
+        padded[:, :mesh.nCx, :mesh.nCy, :] = grid
+        return padded
+
+    def _fromGrid(self, grid):
+        """(nIn, nFx, nFy, nCz) to the active model (nIn*nActive)"""
+        mesh = self.mesh
+        grid = grid[:, :mesh.nCx, :mesh.nCy, :].reshape(
+            (self.nIn, mesh.nC), order='F'
+        )
+        return grid[:, self.actInd].ravel()
+
+    def _dataToGrid(self, d):
+        """data (nOut*nRx) to (nOut, nFx, nFy)"""
+        d = np.reshape(d, (self.rxLoc.shape[0], self.nOut))
+        grid = np.zeros((self.nOut, self.nFx, self.nFy))
+        grid[:, self.rxInd[:, 0], self.rxInd[:, 1]] = d.T
+        return grid
+
+    def _convolve(self, Khat, m):
+        mhat = np.fft.rfft2(self._toGrid(m), axes=(1, 2))
+        dhat = np.einsum('oixyz,ixyz->oxy', Khat, mhat)
+        grid = np.fft.irfft2(dhat, s=(self.nFx, self.nFy), axes=(1, 2))
+        return grid[:, self.rxInd[:, 0], self.rxInd[:, 1]].T.ravel()
+
+    def _correlate(self, Khat, d):
+        dhat = np.fft.rfft2(self._dataToGrid(d), axes=(1, 2))
+        mhat = np.einsum('oixyz,oxy->ixyz', Khat.conj(), dhat)
+        grid = np.fft.irfft2(mhat, s=(self.nFx, self.nFy), axes=(1, 2))
+        return self._fromGrid(grid)
+
+    def dot(self, m):
+        """
+            Forward product G * m
+        """
+        return self._convolve(self.Khat, m)
+
+    def tdot(self, v):
+        """
+            Adjoint product G.T * v
+        """
+        return self._correlate(self.Khat, v)
+
+    def columnNorms(self, w=None):
+        """
+            Squared norms of the (weighted) columns of G,
+            :math:`\\text{diag}(\\mathbf{G^T W^T W G})` for a diagonal
+            weighting of the data :code:`w`.
+        """
+        if w is None:
+            w = np.ones(self.shape[0])
+        return self._correlate(self.K2hat, w**2)
+
+    def columnGram(self, C):
+        """
+            Products of the columns of the components of each cell of
+            :math:`\mathbf{C G}`, where the rows of C combine the outputs
+            of each receiver (e.g. the normalized fields of amplitude data):
+            row r of C G is :code:`sum_o C[r, o] * G[r*nOut + o, :]`.
+
+            :param numpy.ndarray C: coefficients of the outputs (nRx x nOut)
+            :rtype: numpy.ndarray
+            :return: (nIn x nIn x nActive), the diagonal of
+                :math:`\mathbf{G^T C^T C G}` is on the diagonal of the
+                first two axes
+        """
+        mesh = self.mesh
+        C = np.reshape(C, (self.rxLoc.shape[0], self.nOut))
+        gram = np.zeros((self.nIn, self.nIn, len(self.actInd)))
+        for o in range(self.nOut):
+            for p in range(o, self.nOut):
+                grid = np.zeros((self.nFx, self.nFy))
+                grid[self.rxInd[:, 0], self.rxInd[:, 1]] = C[:, o] * C[:, p]
+                dhat = np.fft.rfft2(grid)
+                for i in range(self.nIn):
+                    for j in range(self.nIn):
+                        # the pairs (o, p) and (p, o) of outputs
+                        KK = self.K[o, i] * self.K[p, j]
+                        if p != o:
+                            KK = KK + self.K[p, i] * self.K[o, j]
+                        Khat = np.fft.rfft2(KK, axes=(0, 1))
+                        prod = np.fft.irfft2(
+                            Khat.conj() * dhat[:, :, None],
+                            s=(self.nFx, self.nFy), axes=(0, 1)
+                        )
+                        gram[i, j] += mkvc(
+                            prod[:mesh.nCx, :mesh.nCy, :]
+                        )[self.actInd]
+        return gram
+
+    def __mul__(self, m):
+        return self.dot(m)
+
+    @property
+    def T(self):
+        return _Transpose(self)
+
+
+class _Transpose(object):
+
+    def __init__(self, op):
+        self.op = op
+
+    @property
+    def shape(self):
+        return self.op.shape[::-1]
+
+    def dot(self, v):
+        return self.op.tdot(v)
+
+    def __mul__(self, v):
+        return self.op.tdot(v)
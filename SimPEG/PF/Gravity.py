@@ -8,6 +8,7 @@ import scipy.constants as constants
 import os
 import time
 import numpy as np
+from .FFTOperator import FFTOperator
 
 class GravityIntegral(Problem.LinearProblem):
 
@@ -26,6 +27,7 @@ class GravityIntegral(Problem.LinearProblem):
     n_cpu = None
     progress_index = -1
     gtgdiag = None
+    useFFT = False  #: FFT products for receivers gridded above a TensorMesh
 
     aa = []
 
@@ -36,7 +38,11 @@ class GravityIntegral(Problem.LinearProblem):
 
         model = self.rhoMap*m
 
-        if self.forwardOnly:
+        if self.useFFT:
+
+            return self.FFTOp.dot(model)
+
+        elif self.forwardOnly:
 
             # Compute the linear operation without forming the full dense G
             fields = self.Intrgl_Fwr_Op(m=m)
@@ -48,13 +54,35 @@ class GravityIntegral(Problem.LinearProblem):
 
             return vec.astype(np.float64)
 
+    def dpred_batch(self, M, nProcesses=1):
+        """
+            Predicted data of an ensemble of models (nP x k), with a single
+            product of the stored G (model by model with FFTs or if G is not
+            stored)
+        """
+        if self.useFFT or self.forwardOnly:
+            return Problem.BaseProblem.dpred_batch(
+                self, M, nProcesses=nProcesses
+            )
+
+        M = Problem._mapColumns(self.rhoMap, M)
+        return np.dot(self.G, M.astype(np.float32)).astype(np.float64)
+
 
     def getJtJdiag(self, m, W=None):
         """
             Return the diagonal of JtJ
         """
 
-        if self.gtgdiag is None:
+        if self.gtgdiag is None and self.useFFT:
+
+            # Exact if each parameter is mapped to a single cell
+            dmudm = self.rhoMap.deriv(m)
+            self.gtgdiag = dmudm.power(2).T * self.FFTOp.columnNorms(
+                None if W is None else W.diagonal()
+            )
+
+        elif self.gtgdiag is None:
 
             if W is None:
                 w = np.ones(self.G.shape[1])
@@ -78,11 +106,43 @@ class GravityIntegral(Problem.LinearProblem):
 
     def Jvec(self, m, v, f=None):
         dmudm = self.rhoMap.deriv(m)
-        return self.G.dot(dmudm*v)
+        return self.Gop.dot(dmudm*v)
 
     def Jtvec(self, m, v, f=None):
         dmudm = self.rhoMap.deriv(m)
-        return dmudm.T * (self.G.T.dot(v))
+        return dmudm.T * (self.Gop.T.dot(v))
+
+    @property
+    def Gop(self):
+        """
+            Forward operator used for the products, the dense G or the
+            FFTOp if useFFT
+        """
+        if self.useFFT:
+            return self.FFTOp
+        return self.G
+
+    @property
+    def FFTOp(self):
+        """
+            Forward operator evaluated with FFTs, for receivers on a regular
+            grid at a constant height above a TensorMesh (see
+            :class:`SimPEG.PF.FFTOperator.FFTOperator`)
+        """
+        if not self.ispaired:
+            raise Exception('Need to pair!')
+
+        if getattr(self, '_FFTOp', None) is None:
+
+            def kernel(Xn, Yn, Zn, xyzLoc):
+                job = Forward(Xn=Xn, Yn=Yn, Zn=Zn, rx_type=self.rx_type)
+                return job.calcTrow(xyzLoc)
+
+            self._FFTOp = FFTOperator(
+                self.mesh, self.survey.srcField.rxList[0].locs, kernel,
+                actInd=self.actInd
+            )
+        return self._FFTOp
 
     @property
     def G(self):
@@ -139,12 +199,8 @@ class GravityIntegral(Problem.LinearProblem):
         # (lower and upper corners for each cell)
         if isinstance(self.mesh, Mesh.TreeMesh):
             # Get upper and lower corners of each cell
-            bsw = (self.mesh.gridCC -
-                   np.kron(self.mesh.vol.T**(1/3)/2,
-                           np.ones(3)).reshape((self.mesh.nC, 3)))
-            tne = (self.mesh.gridCC +
-                   np.kron(self.mesh.vol.T**(1/3)/2,
-                           np.ones(3)).reshape((self.mesh.nC, 3)))
+            bsw = (self.mesh.gridCC - self.mesh.h_gridded/2.)
+            tne = (self.mesh.gridCC + self.mesh.h_gridded/2.)
 
             xn1, xn2 = bsw[:, 0], tne[:, 0]
             yn1, yn2 = bsw[:, 1], tne[:, 1]
@@ -336,6 +392,9 @@ class Problem3D_Diff(Problem.BaseProblem):
         default=1.
     )
 
+    #: A does not depend on the model, its factorization is kept
+    Solver = Utils.SolverUtils.SolverLU
+
     solver = None
 
     def __init__(self, mesh, **kwargs):
@@ -382,6 +441,22 @@ class Problem3D_Diff(Problem.BaseProblem):
         """
         return -self._Div.T * self.Mfi * self._Div
 
+    @property
+    def Ainv(self):
+        """
+        Solver of the A matrix, built once: A does not depend on the model
+        """
+        if getattr(self, '_Ainv', None) is None:
+            if getattr(self, '_Mfi', None) is None:
+                self.makeMassMatrices(self.model)
+            if self.solver is not None:
+                self._Ainv = self.solver(self.getA(self.model))
+            else:
+                self._Ainv = self.Solver(
+                    self.getA(self.model), **self.solverOpts
+                )
+        return self._Ainv
+
     def fields(self, m):
         """
             Return gravity potential (u) and field (g)
@@ -391,20 +466,8 @@ class Problem3D_Diff(Problem.BaseProblem):
         """
         from scipy.constants import G as NewtG
 
-        self.makeMassMatrices(m)
-        A = self.getA(m)
         RHS = self.getRHS(m)
-
-        if self.solver is None:
-            m1 = sp.linalg.interface.aslinearoperator(
-                Utils.sdiag(1 / A.diagonal())
-            )
-            u, info = sp.linalg.bicgstab(A, RHS, tol=1e-6, maxiter=1000, M=m1)
-
-        else:
-            print("Solving with Paradiso")
-            Ainv = self.solver(A)
-            u = Ainv * RHS
+        u = mkvc(self.Ainv * RHS)
 
         gField = 4. * np.pi * NewtG * 1e+8 * self._Div * u
 
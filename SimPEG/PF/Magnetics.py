@@ -13,6 +13,7 @@ import multiprocessing
 import properties
 from SimPEG.Utils import mkvc, matutils, sdiag
 from . import BaseMag as MAG
+from .FFTOperator import FFTOperator
 from .MagAnalytics import spheremodel, CongruousMagBC
 
 
@@ -35,6 +36,7 @@ class MagneticIntegral(Problem.LinearProblem):
     memory_saving_mode = False
     n_cpu = None
     parallelized = False
+    useFFT = False  #: FFT products for receivers gridded above a TensorMesh
     coordinate_system = properties.StringChoice(
         "Type of coordinate system we are regularizing in",
         choices=['cartesian', 'spherical'],
@@ -59,7 +61,7 @@ class MagneticIntegral(Problem.LinearProblem):
         else:
             m = self.chiMap*(matutils.spherical2cartesian(m.reshape((int(len(m)/3), 3), order='F')))
 
-        if self.forwardOnly:
+        if self.forwardOnly and not self.useFFT:
             # Compute the linear operation without forming the full dense F
             fields = self.Intrgl_Fwr_Op(m=m)
 
@@ -67,10 +69,10 @@ class MagneticIntegral(Problem.LinearProblem):
 
             if getattr(self, '_Mxyz', None) is not None:
 
-                fields = np.dot(self.G, (self.Mxyz*m).astype(np.float32))
+                fields = self.Gop.dot((self.Mxyz*m).astype(np.float32))
 
             else:
-                fields = np.dot(self.G, m.astype(np.float32))
+                fields = self.Gop.dot(m.astype(np.float32))
 
             if self.modelType == 'amplitude':
 
@@ -78,6 +80,26 @@ class MagneticIntegral(Problem.LinearProblem):
 
         return fields.astype(np.float64)
 
+    def dpred_batch(self, M, nProcesses=1):
+        """
+            Predicted data of an ensemble of models (nP x k), with a
+            single product of the stored G for susceptibility and cartesian
+            vector models (model by model otherwise)
+        """
+        if (
+            self.forwardOnly or self.useFFT or
+            self.coordinate_system != 'cartesian' or
+            self.modelType == 'amplitude'
+        ):
+            return Problem.BaseProblem.dpred_batch(
+                self, M, nProcesses=nProcesses
+            )
+
+        M = Problem._mapColumns(self.chiMap, M)
+        if getattr(self, '_Mxyz', None) is not None:
+            M = self.Mxyz * M
+        return self.G.dot(M.astype(np.float32)).astype(np.float64)
+
     def calcAmpData(self, Bxyz):
         """
             Compute amplitude of the field
@@ -104,6 +126,75 @@ class MagneticIntegral(Problem.LinearProblem):
 
         return self._G
 
+    @property
+    def Gop(self):
+        """
+            Forward operator used for the products, the dense G or the
+            FFTOp if useFFT
+        """
+        if self.useFFT:
+            return self.FFTOp
+        return self.G
+
+    @property
+    def FFTOp(self):
+        """
+            Forward operator evaluated with FFTs, for receivers on a regular
+            grid at a constant height above a TensorMesh (see
+            :class:`SimPEG.PF.FFTOperator.FFTOperator`). The magnetization
+            must have the same direction in all the cells.
+        """
+        if not self.ispaired:
+            raise Exception('Need to pair!')
+
+        if getattr(self, '_FFTOp', None) is None:
+
+            if self.modelType == 'vector':
+                self.magType = 'full'
+
+            srcParam = self.survey.srcField.param
+            if self.magType == 'H0':
+                nIn = 1
+                if getattr(self, 'M', None) is None:
+                    M = matutils.dip_azimuth2cartesian(
+                        np.r_[srcParam[1]], np.r_[srcParam[2]]
+                    )
+                else:
+                    M = np.atleast_2d(self.M)
+                    if not np.allclose(M, M[0, :]):
+                        raise ValueError(
+                            'useFFT requires the same magnetization '
+                            'direction M in all the cells'
+                        )
+                M = mkvc(M[0, :]) * srcParam[0]
+            elif self.magType == 'full':
+                nIn = 3
+            else:
+                raise Exception('magType must be: "H0" or "full"')
+
+            def kernel(Xn, Yn, Zn, xyzLoc):
+                nK = Xn.shape[0]
+                if self.equiSourceLayer:
+                    Zn = np.c_[Zn[:, 0] - 1000., Zn[:, 1]]
+                if nIn == 1:
+                    Mxyz = sp.vstack(
+                        [sdiag(M[ii]*np.ones(nK)) for ii in range(3)]
+                    )
+                else:
+                    Mxyz = sp.identity(3*nK) * srcParam[0]
+                job = Forward(
+                    Xn=Xn, Yn=Yn, Zn=Zn, rx_type=self.rx_type, Mxyz=Mxyz,
+                    P=self.ProjTMI
+                )
+                return job.calcTrow(xyzLoc)
+
+            self._FFTOp = FFTOperator(
+                self.mesh, self.survey.srcField.rxList[0].locs, kernel,
+                nIn=nIn, nOut=3 if self.rx_type == 'xyz' else 1,
+                actInd=self.actInd
+            )
+        return self._FFTOp
+
     @property
     def nD(self):
         """
@@ -136,7 +227,16 @@ class MagneticIntegral(Problem.LinearProblem):
         self._dSdm = None
         self._dfdm = None
         self.model = m
-        if (self.gtgdiag is None) and (self.modelType != 'amplitude'):
+        if (
+            (self.gtgdiag is None) and (self.modelType != 'amplitude') and
+            self.useFFT
+        ):
+            # Exact if each parameter is mapped to a single cell
+            self.gtgdiag = dmudm.power(2).T * self.FFTOp.columnNorms(
+                None if W is None else W.diagonal()
+            )
+
+        elif (self.gtgdiag is None) and (self.modelType != 'amplitude'):
 
             if W is None:
                 w = np.ones(self.G.shape[1])
@@ -149,18 +249,44 @@ class MagneticIntegral(Problem.LinearProblem):
 
                 self.gtgdiag += (w[ii]*self.G[ii, :]*dmudm)**2.
 
+        if self.modelType == 'amplitude':
+            if self.coordinate_system == 'spherical':
+                dmudm = self.dSdm * dmudm
+            if W is None:
+                W = Utils.speye(self.survey.nD)
+            if self.useFFT:
+                return self._ampJtJdiagFFT(W.diagonal(), dmudm)
+            return np.sum((W * self.dfdm * self.G * dmudm)**2., axis=0)
+
         if self.coordinate_system == 'cartesian':
-            if self.modelType == 'amplitude':
-                return np.sum((W * self.dfdm * self.G * dmudm)**2., axis=0)
-            else:
-                return self.gtgdiag
+            return self.gtgdiag
 
         else:  # spherical
-            if self.modelType == 'amplitude':
-                return np.sum(((W * self.dfdm) * self.G * (self.dSdm * dmudm))**2., axis=0)
-            else:
-                Japprox = sdiag(mkvc(self.gtgdiag)**0.5*dmudm.T) * (self.dSdm * dmudm)
-                return mkvc(np.sum(Japprox.power(2), axis=0))
+            Japprox = sdiag(mkvc(self.gtgdiag)**0.5*dmudm.T) * (self.dSdm * dmudm)
+            return mkvc(np.sum(Japprox.power(2), axis=0))
+
+    def _ampJtJdiagFFT(self, w, dmudm):
+        """
+            Diagonal of JtJ of the amplitude data from the FFT products,
+            the rows of J combine the field components with the normalized
+            fields (dfdm). Exact if each parameter is mapped to a single
+            cell (any of its components).
+        """
+        dfdm = self.dfdm
+        C = w[:, None] * np.vstack(
+            [dfdm[:, o::3].diagonal() for o in range(3)]
+        ).T
+        gram = self.FFTOp.columnGram(C)
+
+        nIn, nAct = gram.shape[0], gram.shape[2]
+        dmudm = sp.csr_matrix(dmudm)
+        diag = np.zeros(dmudm.shape[1])
+        for i in range(nIn):
+            Pi = dmudm[i*nAct:(i+1)*nAct, :]
+            for j in range(nIn):
+                Pj = dmudm[j*nAct:(j+1)*nAct, :]
+                diag += mkvc(Pi.multiply(Pj).T * gram[i, j])
+        return diag
 
     def getJ(self, m, f=None):
         """
@@ -185,10 +311,10 @@ class MagneticIntegral(Problem.LinearProblem):
 
         if getattr(self, '_Mxyz', None) is not None:
 
-            vec = np.dot(self.G, (self.Mxyz*(dmudm*v)).astype(np.float32))
+            vec = self.Gop.dot((self.Mxyz*(dmudm*v)).astype(np.float32))
 
         else:
-            vec = np.dot(self.G, (dmudm*v).astype(np.float32))
+            vec = self.Gop.dot((dmudm*v).astype(np.float32))
 
         if self.modelType == 'amplitude':
             return self.dfdm*vec.astype(np.float64)
@@ -205,14 +331,14 @@ class MagneticIntegral(Problem.LinearProblem):
         if self.modelType == 'amplitude':
             if getattr(self, '_Mxyz', None) is not None:
 
-                vec = self.Mxyz.T*np.dot(self.G.T, (self.dfdm.T*v).astype(np.float32)).astype(np.float64)
+                vec = self.Mxyz.T*self.Gop.T.dot((self.dfdm.T*v).astype(np.float32)).astype(np.float64)
 
             else:
-                vec = np.dot(self.G.T, (self.dfdm.T*v).astype(np.float32))
+                vec = self.Gop.T.dot((self.dfdm.T*v).astype(np.float32))
 
         else:
 
-            vec = np.dot(self.G.T, v.astype(np.float32))
+            vec = self.Gop.T.dot(v.astype(np.float32))
 
         return dmudm.T * vec.astype(np.float64)
 
@@ -262,7 +388,7 @@ class MagneticIntegral(Problem.LinearProblem):
     def dfdm(self):
 
         if self.model is None:
-            self.model = np.zeros(self.G.shape[1])
+            self.model = np.zeros(self.Gop.shape[1])
 
         if getattr(self, '_dfdm', None) is None:
 
@@ -289,9 +415,9 @@ class MagneticIntegral(Problem.LinearProblem):
             m = matutils.atp2xyz(m)
 
         if getattr(self, '_Mxyz', None) is not None:
-            Bxyz = np.dot(self.G, (self.Mxyz*m).astype(np.float32))
+            Bxyz = self.Gop.dot((self.Mxyz*m).astype(np.float32))
         else:
-            Bxyz = np.dot(self.G, m.astype(np.float32))
+            Bxyz = self.Gop.dot(m.astype(np.float32))
 
         amp = self.calcAmpData(Bxyz.astype(np.float64))
         Bamp = sp.spdiags(1./amp, 0, self.nD, self.nD)
@@ -519,7 +645,20 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
 
     Props.Reciprocal(mu, mui)
 
+    clean_on_model_update = ['_Ainv']
+
     def __init__(self, mesh, **kwargs):
+        if 'Solver' not in kwargs:
+            # A is singular (Neumann boundary conditions), it is solved with
+            # preconditioned conjugate gradients: the preconditioner is kept
+            # for the next models and the solves start from the previous
+            # solutions
+            kwargs['Solver'] = Utils.SolverUtils.SolverKrylov(
+                'cg', preconditioner=(
+                    'jacobi' if Utils.SolverUtils.pyamg is None else 'amg'
+                ),
+                tol=1e-6, maxiter=1000, checkAccuracy=False
+            )
         Problem.BaseProblem.__init__(self, mesh, **kwargs)
 
         Pbc, Pin, self._Pout = \
@@ -539,6 +678,7 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
     def MfMu0(self): return self._MfMu0
 
     def makeMassMatrices(self, m):
+        self.model = m
         mu = self.muMap * m
         self._MfMui = self.mesh.getFaceInnerProduct(1. / mu) / self.mesh.dim
         # self._MfMui = self.mesh.getFaceInnerProduct(1./mu)
@@ -593,6 +733,17 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
         """
         return self._Div * self.MfMuI * self._Div.T
 
+    @property
+    def Ainv(self):
+        """
+        Solver of the A matrix of the current model, shared by the fields
+        and the sensitivities (A is symmetric, the adjoint solves use it
+        too)
+        """
+        if getattr(self, '_Ainv', None) is None:
+            self._Ainv = self.Solver(self.getA(self.model), **self.solverOpts)
+        return self._Ainv
+
     def fields(self, m):
         """
             Return magnetic potential (u) and flux (B)
@@ -607,12 +758,8 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
 
         """
         self.makeMassMatrices(m)
-        A = self.getA(m)
         rhs = self.getRHS(m)
-        m1 = sp.linalg.interface.aslinearoperator(
-            sdiag(1 / A.diagonal())
-        )
-        u, info = sp.linalg.bicgstab(A, rhs, tol=1e-6, maxiter=1000, M=m1)
+        u = mkvc(self.Ainv * rhs)
         B0 = self.getB0()
         B = self.MfMuI * self.MfMu0 * B0 - B0 - self.MfMuI * self._Div.T * u
 
@@ -715,7 +862,6 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
         # C(m,u) = A*m-rhs
         # dudm = -(dCdu)^(-1)dCdm
 
-        dCdu = self.getA(m)
         dCdm_A = Div * (sdiag(Div.T * u) * dMfMuI * dmudm)
         dCdm_RHS1 = Div * (sdiag(self.MfMu0 * B0) * dMfMuI)
         # temp1 = (Dface * (self._Pout.T * self.Bbc_const * self.Bbc))
@@ -726,15 +872,7 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
         dCdm_RHSv = dCdm_RHS1 * (dmudm * v)
         dCdm_v = dCdm_A * v - dCdm_RHSv
 
-        m1 = sp.linalg.interface.aslinearoperator(
-            sdiag(1 / dCdu.diagonal())
-        )
-        sol, info = sp.linalg.bicgstab(dCdu, dCdm_v,
-                                       tol=1e-6, maxiter=1000, M=m1)
-
-        if info > 0:
-            print("Iterative solver did not work well (Jvec)")
-            # raise Exception ("Iterative solver did not work well")
+        sol = mkvc(self.Ainv * dCdm_v)
 
         # B = self.MfMuI*self.MfMu0*B0-B0-self.MfMuI*self._Div.T*u
         # dBdm = d\mudm*dBd\mu
@@ -782,8 +920,8 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
             u = self.fields(m)
 
         B, u = u['B'], u['u']
-        mu = self.mapping * (m)
-        dmudm = self.mapping.deriv(m)
+        mu = self.muMap * (m)
+        dmudm = self.muDeriv
         # dchidmu = sdiag(1 / mu_0 * np.ones(self.mesh.nC))
 
         vol = self.mesh.vol
@@ -802,17 +940,9 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
         # C(m,u) = A*m-rhs
         # dudm = -(dCdu)^(-1)dCdm
 
-        dCdu = self.getA(m)
+        # dCdu = A is symmetric, the forward solver is reused
         s = Div * (self.MfMuI.T * (P.T * v))
-
-        m1 = sp.linalg.interface.aslinearoperator(
-            sdiag(1 / (dCdu.T).diagonal())
-        )
-        sol, info = sp.linalg.bicgstab(dCdu.T, s, tol=1e-6, maxiter=1000, M=m1)
-
-        if info > 0:
-            print("Iterative solver did not work well (Jtvec)")
-            # raise Exception ("Iterative solver did not work well")
+        sol = mkvc(self.Ainv * s)
 
         # dCdm_A = Div * ( sdiag( Div.T * u )* dMfMuI *dmudm  )
         # dCdm_Atsol = ( dMfMuI.T*( sdiag( Div.T * u ) * (Div.T * dmudm)) ) * sol
@@ -849,7 +979,7 @@ class Problem3D_DiffSecondary(Problem.BaseProblem):
 
         Atemp = sdiag(self.MfMu0 * B0) * (dMfMuI * (dmudm))
         Btemp = sdiag(Div.T * u) * (dMfMuI * (dmudm))
-        Jtv = Atemp.T * (P.T * v) - Btemp.T * (P.T * v) - Ctv
+        Jtv = Atemp.T * (P.T * v) - Btemp.T * (P.T * v) + Ctv
 
         return mkvc(Jtv)
 
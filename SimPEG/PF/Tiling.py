@@ -0,0 +1,214 @@
+from __future__ import print_function
+from __future__ import division
+
+import multiprocessing
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from SimPEG import Mesh, Maps, DataMisfit, ObjectiveFunction
+from SimPEG.Utils import mkvc
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # python 2 without the futures backport
+    ThreadPoolExecutor = None
+
+
+def tileSurveyPoints(locs, maxNpoints):
+    """
+        Split the receiver locations in spatial tiles of at most maxNpoints
+        locations, by bisecting the tiles along their longest horizontal side.
+
+        :param numpy.ndarray locs: receiver locations (nRx x 3)
+        :param int maxNpoints: maximum number of locations per tile
+        :rtype: list
+        :return: sorted indexes of the locations of each tile
+    """
+    tiles = []
+
+    def bisect(inds):
+        if len(inds) <= maxNpoints:
+            tiles.append(np.sort(inds))
+            return
+        xy = locs[inds, :2]
+        axis = np.argmax(xy.max(axis=0) - xy.min(axis=0))
+        inds = inds[np.argsort(xy[:, axis], kind='mergesort')]
+        bisect(inds[:len(inds)//2])
+        bisect(inds[len(inds)//2:])
+
+    bisect(np.arange(locs.shape[0]))
+    return tiles
+
+
+def createLocalMesh(mesh, locs, octreeLevels=[2, 4, 4]):
+    """
+        TreeMesh for a tile of receivers, with the smallest cells of the
+        global mesh near the receivers and coarser cells away from them.
+
+        The local mesh starts at the origin of the global mesh, with the same
+        smallest cells, and covers the global mesh, so that the cells of a
+        global TreeMesh are nested in its cells (see
+        :class:`SimPEG.Maps.TileMap`).
+
+        :param discretize.BaseMesh mesh: global mesh
+        :param numpy.ndarray locs: receiver locations of the tile (nRx x 3)
+        :param list octreeLevels: number of cells of each size (smallest
+            first) between the receivers and the coarser cells
+        :rtype: discretize.TreeMesh
+        :return: local mesh
+    """
+    hMin = np.r_[[h.min() for h in mesh.h]]
+    extent = np.r_[[h.sum() for h in mesh.h]]
+    nC = 2**np.ceil(np.log2(extent / hMin - 1e-8)).astype(int)
+    localMesh = Mesh.TreeMesh(
+        [np.ones(n)*h for n, h in zip(nC, hMin)], x0=mesh.x0
+    )
+
+    maxLevel = int(np.log2(nC.max()))
+    distances = np.cumsum([
+        n * hMin.max() * 2**i for i, n in enumerate(octreeLevels)
+    ])
+    tree = cKDTree(locs)
+
+    def level(cell):
+        dist = tree.query(cell.center)[0] - np.linalg.norm(cell.h)/2.
+        for i, d in enumerate(distances):
+            if dist < d:
+                return maxLevel - i
+        return 0
+
+    localMesh.refine(level)
+    return localMesh
+
+
+def _dataIndexes(survey, inds):
+    """
+        Indexes of the data of the receivers inds (the data of a receiver are
+        consecutive, e.g. the 3 components of 'xyz' data)
+    """
+    if survey.dobs is None:
+        return inds
+    nComp = len(survey.dobs) // survey.srcField.rxList[0].locs.shape[0]
+    return (inds[:, None] * nComp + np.arange(nComp)).ravel()
+
+
+def createLocalSurvey(survey, inds):
+    """
+        Survey of the receivers inds of a (Linear) potential field survey,
+        with the observed data and standard deviations of those receivers.
+    """
+    rx = survey.srcField.rxList[0]
+    localRx = rx.__class__(rx.locs[inds])
+    localSrc = survey.srcField.__class__(
+        [localRx], param=survey.srcField.param
+    )
+    localSurvey = survey.__class__(localSrc)
+
+    dataInds = _dataIndexes(survey, inds)
+    if survey.dobs is not None:
+        localSurvey.dobs = survey.dobs[dataInds]
+    if survey.std is not None:
+        localSurvey.std = (
+            survey.std[dataInds] if np.size(survey.std) > 1 else survey.std
+        )
+    localSurvey.eps = survey.eps
+    return localSurvey
+
+
+def createTiledMisfit(
+    survey, mesh, actInd, problemClass, maxNpoints=500,
+    octreeLevels=[2, 4, 4], modelMap=None, mapName=None, executor=None,
+    **kwargs
+):
+    """
+        Data misfit of a potential field survey split in tiles.
+
+        The receivers are split in spatial tiles (:func:`tileSurveyPoints`),
+        each tile has its own problem on a local mesh
+        (:func:`createLocalMesh`), coupled to the model of the active cells
+        of the global mesh by a :class:`SimPEG.Maps.TileMap`. The sensitivity
+        of a tile is nD_tile x nC_local instead of nD x nC_global.
+
+        .. code:: python
+
+            dmis = PF.Tiling.createTiledMisfit(
+                survey, mesh, actv, PF.Magnetics.MagneticIntegral,
+                maxNpoints=1000
+            )
+            invProb = InvProblem.BaseInvProblem(dmis, reg, opt)
+
+        The data misfits of the tiles are added in a
+        :class:`SimPEG.ObjectiveFunction.ComboObjectiveFunction` and
+        evaluated concurrently by the executor (a thread pool by default).
+
+        :param SimPEG.PF.BaseMag.LinearSurvey survey: survey with the data
+        :param discretize.BaseMesh mesh: global mesh
+        :param numpy.ndarray actInd: active cells of the global mesh
+        :param class problemClass: e.g. GravityIntegral or MagneticIntegral
+        :param int maxNpoints: maximum number of receivers per tile
+        :param list octreeLevels: see :func:`createLocalMesh`
+        :param SimPEG.Maps.IdentityMap modelMap: map from the inversion model
+            to the model of the active global cells (identity if None)
+        :param str mapName: map property of the problems (e.g. 'chiMap'),
+            found from the problem class if None
+        :param concurrent.futures.Executor executor: evaluates the tiles
+        :param kwargs: other properties of the problems
+        :rtype: SimPEG.ObjectiveFunction.ComboObjectiveFunction
+        :return: data misfit, with the :code:`tiles` (receiver indexes) and
+            the :code:`dataIndexes` of each tile
+    """
+    assert survey.dobs is not None, 'The survey must have observed data.'
+
+    if mapName is None:
+        mapNames = [
+            name for name in problemClass._props if name.endswith('Map')
+        ]
+        assert len(mapNames) == 1, (
+            'Give the mapName of the problem, one of {}'.format(mapNames)
+        )
+        mapName = mapNames[0]
+
+    if actInd is None:
+        actInd = np.ones(mesh.nC, dtype=bool)
+
+    # the floor and default std of the survey, not of each tile
+    eps = survey.eps
+    if eps is None:
+        eps = (
+            np.linalg.norm(mkvc(survey.dobs), 2) *
+            DataMisfit.l2_DataMisfit.eps_factor
+        )
+
+    locs = survey.srcField.rxList[0].locs
+    tiles = tileSurveyPoints(locs, maxNpoints)
+
+    dmisList = []
+    for inds in tiles:
+        localMesh = createLocalMesh(mesh, locs[inds], octreeLevels)
+        tileMap = Maps.TileMap(mesh, actInd, localMesh)
+
+        localSurvey = createLocalSurvey(survey, inds)
+        if localSurvey.std is None:
+            localSurvey.std = 0.05
+        localSurvey.eps = eps
+
+        props = dict(kwargs)
+        props[mapName] = (
+            tileMap if modelMap is None else tileMap * modelMap
+        )
+        prob = problemClass(localMesh, actInd=tileMap.localActive, **props)
+        localSurvey.pair(prob)
+        dmisList.append(DataMisfit.l2_DataMisfit(localSurvey))
+
+    if executor is None and ThreadPoolExecutor is not None and len(tiles) > 1:
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(tiles), multiprocessing.cpu_count())
+        )
+
+    dmis = ObjectiveFunction.ComboObjectiveFunction(
+        dmisList, executor=executor
+    )
+    dmis.tiles = tiles
+    dmis.dataIndexes = [_dataIndexes(survey, inds) for inds in tiles]
+    return dmis
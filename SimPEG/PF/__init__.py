@@ -6,3 +6,5 @@ from . import BaseGrav
 from . import Gravity
 from . import MagneticsDriver
 from . import GravityDriver
+from . import FFTOperator
+from . import Tiling
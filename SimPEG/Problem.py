@@ -3,6 +3,7 @@ from . import Utils
 from . import Survey
 from . import Models
 import numpy as np
+import multiprocessing
 from . import Maps
 from .Fields import Fields, TimeFields
 from . import Mesh
@@ -12,6 +13,29 @@ import properties
 
 Solver = Utils.SolverUtils.Solver
 
+#: Problem of the workers of :meth:`BaseProblem.dpred_batch` (inherited when
+#: the pool is forked)
+_batchProblem = None
+
+
+def _dpredColumns(M):
+    """
+    Predicted data of the models (columns of M), one after the other with
+    the problem of the worker
+    """
+    survey = _batchProblem.survey
+    return np.column_stack([survey.dpred(m) for m in M.T])
+
+
+def _mapColumns(mapping, M):
+    """
+    Apply a mapping to each model (column of M, a single model if M is 1D)
+    """
+    M = np.asarray(M)
+    if M.ndim == 1:
+        M = M[:, None]
+    return np.column_stack([mapping * m for m in M.T])
+
 
 class BaseProblem(Props.HasModel):
     """Problem is the base class for all geophysical forward problems
@@ -217,6 +241,55 @@ class BaseProblem(Props.HasModel):
         """
         raise NotImplementedError('fields is not yet implemented.')
 
+    @Utils.requires('survey')
+    def dpred_batch(self, M, nProcesses=1):
+        """dpred_batch(M, nProcesses=1)
+
+        Predicted data of an ensemble of models (e.g. the samples of a
+        Monte Carlo study).
+
+        The models are split in nProcesses contiguous chunks, each chunk is
+        evaluated by a forked copy of the problem, so that a worker keeps
+        what does not depend on the model (operators, preconditioners,
+        previous solutions) from a model to the next. Linear problems
+        override this with a single product of their sensitivity matrix.
+
+        :param numpy.array M: models (nP x k)
+        :param int nProcesses: number of processes, the models are
+            evaluated one after the other by this problem if 1 (or if
+            processes cannot be forked on this platform)
+        :rtype: numpy.array
+        :return: predicted data (nD x k)
+        """
+        global _batchProblem
+
+        M = np.asarray(M)
+        if M.ndim == 1:
+            M = M[:, None]
+        nProcesses = min(nProcesses, M.shape[1])
+        if (
+            nProcesses <= 1 or
+            'fork' not in multiprocessing.get_all_start_methods()
+        ):
+            _batchProblem = self
+            try:
+                return _dpredColumns(M)
+            finally:
+                _batchProblem = None
+
+        chunks = np.array_split(np.arange(M.shape[1]), nProcesses)
+        _batchProblem = self
+        try:
+            pool = multiprocessing.get_context('fork').Pool(nProcesses)
+            try:
+                D = pool.map(_dpredColumns, [M[:, inds] for inds in chunks])
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            _batchProblem = None
+        return np.hstack(D)
+
 
 class BaseTimeProblem(BaseProblem):
     """Sets up that basic needs of a time domain problem."""
@@ -305,6 +378,14 @@ class LinearProblem(BaseProblem):
     def fields(self, m):
         return self.G.dot(self.modelMap * m)
 
+    def dpred_batch(self, M, nProcesses=1):
+        """dpred_batch(M, nProcesses=1)
+
+        Predicted data of an ensemble of models (nP x k), with a single
+        product of G (nProcesses is not used).
+        """
+        return self.G.dot(_mapColumns(self.modelMap, M))
+
     def getJ(self, m, f=None):
         """
             Sensitivity matrix
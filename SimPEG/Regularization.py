@@ -585,6 +585,84 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
                     )
                 )
 
+    @properties.observer(['cell_weights', 'indActive', 'mapping', 'regmesh'])
+    def _clear_cache_on_update(self, change):
+        self.clearCache()
+
+    # Cached operators
+    def clearCache(self):
+        """
+        Delete the cached weighting operators. This is called by the
+        property observers, arrays that are modified in place need to be set
+        again (or the cache cleared) for the change to be seen.
+        """
+        cache = getattr(self, '_cache', None)
+        if cache:
+            cache.clear()
+            self.cacheStats['invalidations'] += 1
+
+    @property
+    def cacheStats(self):
+        """
+        Number of hits, misses and invalidations of the cached operators
+        """
+        if getattr(self, '_cacheStats', None) is None:
+            self._cacheStats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        return self._cacheStats
+
+    def _getCached(self, name, assemble):
+        if getattr(self, '_cache', None) is None:
+            self._cache = {}
+        if name in self._cache:
+            self.cacheStats['hits'] += 1
+            return self._cache[name]
+        self.cacheStats['misses'] += 1
+        value = assemble()
+        self._cache[name] = value
+        return value
+
+    def _assembleW(self):
+        raise NotImplementedError(
+            'The weighting matrix is not implemented for {}'.format(
+                self.__class__.__name__
+            )
+        )
+
+    @property
+    def W(self):
+        """
+        Weighting matrix, assembled once and cached until one of the
+        properties it depends on is updated
+        """
+        return self._getCached('W', self._assembleW)
+
+    @property
+    def WtW(self):
+        """
+        Cached :code:`W.T * W`
+        """
+        return self._getCached('WtW', lambda: self.W.T * self.W)
+
+    @property
+    def _fusable(self):
+        """
+        True if the term is the weighted l2 norm
+        :math:`\\frac{1}{2}\|\mathbf{W}\mathcal{M}(m - m_\\text{ref})\|^2`
+        of the base class, so a combo regularization can evaluate it together
+        with its other terms
+        """
+        return all(
+            getattr(type(self), name) is getattr(BaseRegularization, name)
+            for name in ['__call__', 'deriv', 'deriv2']
+        )
+
+    @property
+    def _fusedMref(self):
+        """
+        Reference model subtracted from the model before the mapping
+        """
+        return self.mref
+
     # Other properties and methods
     @property
     def nP(self):
@@ -680,9 +758,10 @@ class BaseRegularization(ObjectiveFunction.BaseObjectiveFunction):
         """
         mD = self.mapping.deriv(self._delta_m(m))
         if v is None:
-            return mD.T * self.W.T * self.W * mD
+            return mD.T * self.WtW * mD
 
-        return mD.T * (self.W.T * (self.W * (mD * v)))
+        W = self.W
+        return mD.T * (W.T * (W * (mD * v)))
 
 
 ###############################################################################
@@ -783,6 +862,246 @@ class BaseComboRegularization(ObjectiveFunction.ComboObjectiveFunction):
             return m
         return (-self.mref + m)  # in case self.mref is Zero, returns type m
 
+    def clearCache(self):
+        """
+        Delete the cached weighting operators of all the terms
+        """
+        for fct in self.objfcts:
+            fct.clearCache()
+
+    @property
+    def cacheStats(self):
+        """
+        Number of hits, misses and invalidations of the cached operators,
+        summed over the terms of the regularization
+        """
+        stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        for fct in self.objfcts:
+            for key, val in fct.cacheStats.items():
+                stats[key] += val
+        return stats
+
+    # Fused evaluation of the terms
+    @staticmethod
+    def _sameMref(mref1, mref2):
+        isZero = [
+            mref is None or isinstance(mref, Utils.Zero)
+            for mref in [mref1, mref2]
+        ]
+        if isZero[0] or isZero[1]:
+            return isZero[0] and isZero[1]
+        return mref1 is mref2 or (
+            np.shape(mref1) == np.shape(mref2) and
+            np.array_equal(mref1, mref2)
+        )
+
+    def _fusedOperator(self):
+        """
+        Stacked weighting matrices of the terms that are weighted l2 norms.
+
+        The terms are grouped by the (mapping, mref) pair they are applied to
+        and the weighting matrices are assembled in one block operator
+        (one block column per group), so the residuals of all the terms are
+        computed with a single sparse matrix-vector product. The operator is
+        rebuilt when the weighting matrix, the multiplier, the mapping or the
+        reference model of one of the terms changes.
+        """
+        terms = [
+            (i, mult, fct) for i, (mult, fct) in enumerate(self)
+            if mult != 0. and fct._fusable and sp.issparse(fct.W)
+        ]
+        token = [
+            (i, mult, fct.W, fct.mapping, fct._fusedMref)
+            for i, mult, fct in terms
+        ]
+
+        fused = getattr(self, '_fused', None)
+        if fused is not None and len(fused['token']) == len(token) and all(
+            t0[0] == t1[0] and t0[1] == t1[1] and
+            all(a is b for a, b in zip(t0[2:], t1[2:]))
+            for t0, t1 in zip(fused['token'], token)
+        ):
+            return fused
+
+        # group the terms that act on the same mapped model
+        groups, termGroup = [], []
+        for i, mult, fct in terms:
+            for ig, (mapping, mref) in enumerate(groups):
+                if (
+                    mapping is fct.mapping and
+                    self._sameMref(mref, fct._fusedMref)
+                ):
+                    break
+            else:
+                groups.append((fct.mapping, fct._fusedMref))
+                ig = len(groups) - 1
+            termGroup.append(ig)
+
+        W = None
+        rows, rowMult = [0], []
+        if len(terms) > 0:
+            blocks = [[None]*len(groups) for _ in terms]
+            for row, ((i, mult, fct), ig) in enumerate(zip(terms, termGroup)):
+                blocks[row][ig] = fct.W
+                rows.append(rows[-1] + fct.W.shape[0])
+                rowMult.append(mult * np.ones(fct.W.shape[0]))
+            W = sp.bmat(blocks, format='csr')
+
+        self._fused = {
+            'token': token, 'terms': [i for i, _, _ in terms],
+            'groups': groups, 'termGroup': termGroup, 'W': W, 'rows': rows,
+            'rowMult': np.hstack(rowMult) if rowMult else None,
+        }
+        return self._fused
+
+    def _fusedState(self, m):
+        """
+        Residuals of the fused terms for the model m. The last evaluation is
+        stored, so the value, the gradient and the Hessian share the
+        residuals and the derivatives of the mappings.
+        """
+        fused = self._fusedOperator()
+        state = getattr(self, '_fusedLast', None)
+        if (
+            state is not None and state['fused'] is fused and
+            state['m'].shape == np.shape(m) and np.array_equal(state['m'], m)
+        ):
+            return state
+
+        deltas = [
+            m if mref is None or isinstance(mref, Utils.Zero) else -mref + m
+            for _, mref in fused['groups']
+        ]
+        x = [mapping * delta for (mapping, _), delta in zip(
+            fused['groups'], deltas
+        )]
+        cols = np.r_[0, np.cumsum([len(xi) for xi in x])]
+        r = fused['W'] * np.hstack(x) if x else None
+
+        state = {
+            'm': np.array(m, copy=True), 'fused': fused, 'r': r,
+            'cols': cols,
+            'mD': [
+                mapping.deriv(delta)
+                for (mapping, _), delta in zip(fused['groups'], deltas)
+            ],
+        }
+        self._fusedLast = state
+        return state
+
+    def _fusedGradient(self, state, r):
+        """
+        Sum over the groups of mapping.deriv.T * W.T * (multipliers * r)
+        """
+        fused = state['fused']
+        gx = fused['W'].T * (fused['rowMult'] * r)
+        cols = state['cols']
+        g = Utils.Zero()
+        for ig, mD in enumerate(state['mD']):
+            g = g + mD.T * gx[cols[ig]:cols[ig+1]]
+        return g
+
+    def componentValues(self, m):
+        """
+        Values of the terms of the regularization, multiplied by their
+        alphas, in the order of objfcts
+
+        :param numpy.ndarray m: model
+        :rtype: list
+        """
+        state = self._fusedState(m)
+        fused = state['fused']
+        values = []
+        for i, (mult, fct) in enumerate(self):
+            if mult == 0.:
+                values.append(0.)
+            elif i in fused['terms']:
+                k = fused['terms'].index(i)
+                ri = state['r'][fused['rows'][k]:fused['rows'][k+1]]
+                values.append(mult * (0.5 * ri.dot(ri)))
+            else:
+                values.append(mult * fct(m))
+        return values
+
+    def evalFunction(self, m, return_g=True, return_H=True):
+        """evalFunction(m, return_g=True, return_H=True)
+
+        Value, gradient and Hessian (as a LinearOperator) of the
+        regularization. The residuals of all the weighted l2 terms are
+        computed together with one product with the stacked weighting
+        matrices; the other terms are evaluated on their own.
+        """
+        phi = 0.
+        for value in self.componentValues(m):
+            phi += value
+        out = (phi,)
+
+        if return_g:
+            out += (self.deriv(m),)
+
+        if return_H:
+            H = sp.linalg.LinearOperator(
+                (len(m), len(m)), lambda v: self.deriv2(m, v=v),
+                dtype=float
+            )
+            out += (H,)
+        return out if len(out) > 1 else out[0]
+
+    def __call__(self, m, f=None):
+        phi = 0.
+        for value in self.componentValues(m):
+            phi += value
+        return phi
+
+    def deriv(self, m, f=None):
+        """
+        Gradient of the regularization, the weighted l2 terms are fused
+        """
+        state = self._fusedState(m)
+        fused = state['fused']
+
+        g = Utils.Zero()
+        if fused['W'] is not None:
+            g = self._fusedGradient(state, state['r'])
+        for i, (mult, fct) in enumerate(self):
+            if mult == 0. or i in fused['terms']:
+                continue
+            g = g + mult * fct.deriv(m)
+        return g
+
+    def deriv2(self, m, v=None, f=None):
+        """
+        Hessian (or Hessian times v) of the regularization, the weighted l2
+        terms are fused
+        """
+        state = self._fusedState(m)
+        fused = state['fused']
+
+        H = Utils.Zero()
+        if fused['W'] is not None:
+            if fused.get('WtW', None) is None:
+                # block diagonal, the terms only act on their own group
+                fused['WtW'] = (
+                    fused['W'].T * Utils.sdiag(fused['rowMult']) * fused['W']
+                ).tocsr()
+            cols = state['cols']
+            if v is not None:
+                Hx = fused['WtW'] * np.hstack([mD * v for mD in state['mD']])
+                for ig, mD in enumerate(state['mD']):
+                    H = H + mD.T * Hx[cols[ig]:cols[ig+1]]
+            else:
+                for ig, mD in enumerate(state['mD']):
+                    WtW = fused['WtW'][
+                        cols[ig]:cols[ig+1], cols[ig]:cols[ig+1]
+                    ]
+                    H = H + mD.T * WtW * mD
+
+        for i, (mult, fct) in enumerate(self):
+            if mult == 0. or i in fused['terms']:
+                continue
+            H = H + mult * fct.deriv2(m, v)
+        return H
+
     @property
     def multipliers(self):
         """
@@ -913,8 +1232,7 @@ class SimpleSmall(BaseRegularization):
             mesh=mesh, **kwargs
         )
 
-    @property
-    def W(self):
+    def _assembleW(self):
         """
         Weighting matrix
         """
@@ -977,8 +1295,7 @@ class SimpleSmoothDeriv(BaseRegularization):
     def _multiplier_pair(self):
         return 'alpha_{orientation}'.format(orientation=self.orientation)
 
-    @property
-    def W(self):
+    def _assembleW(self):
         """
         Weighting matrix that takes the first spatial difference (no
         length scales considered) in the specified orientation
@@ -1118,8 +1435,7 @@ class Small(BaseRegularization):
             mesh=mesh, **kwargs
         )
 
-    @property
-    def W(self):
+    def _assembleW(self):
         """
         Weighting matrix
         """
@@ -1182,8 +1498,7 @@ class SmoothDeriv(BaseRegularization):
     def _multiplier_pair(self):
         return 'alpha_{orientation}'.format(orientation=self.orientation)
 
-    @property
-    def W(self):
+    def _assembleW(self):
         """
         Weighting matrix that constructs the first spatial derivative stencil
         in the specified orientation
@@ -1250,8 +1565,7 @@ class SmoothDeriv2(BaseRegularization):
             orientation=self.orientation
         )
 
-    @property
-    def W(self):
+    def _assembleW(self):
         """
         Weighting matrix that takes the second spatial derivative in the
         specified orientation
@@ -1389,6 +1703,13 @@ class BaseSparse(BaseRegularization):
                     )
                 )
 
+    @properties.observer([
+        'scale', 'model', 'epsilon', 'norm', 'space', 'gradientType',
+        'scaledIRLS'
+    ])
+    def _clear_sparse_cache_on_update(self, change):
+        self.clearCache()
+
     @property
     def stashedR(self):
         return self._stashedR
@@ -1396,6 +1717,7 @@ class BaseSparse(BaseRegularization):
     @stashedR.setter
     def stashedR(self, value):
         self._stashedR = value
+        self.clearCache()
 
 
 class SparseSmall(BaseSparse):
@@ -1425,8 +1747,7 @@ class SparseSmall(BaseSparse):
 
         return self.mapping * self._delta_m(self.model)
 
-    @property
-    def W(self):
+    def _assembleW(self):
         if getattr(self, 'model', None) is None:
             R = Utils.speye(self.mapping.shape[0])
         else:
@@ -1473,29 +1794,6 @@ class SparseSmall(BaseSparse):
         self.stashedR = r  # stash on the first calculation
         return r
 
-    @Utils.timeIt
-    def deriv(self, m):
-        """
-
-        The regularization is:
-
-        .. math::
-
-            R(m) = \\frac{1}{2}\mathbf{(m-m_\\text{ref})^\\top W^\\top
-                   W(m-m_\\text{ref})}
-
-        So the derivative is straight forward:
-
-        .. math::
-
-            R(m) = \mathbf{W^\\top W (m-m_\\text{ref})}
-
-        """
-
-        mD = self.mapping.deriv(self._delta_m(m))
-        r = self.W * (self.mapping * (self._delta_m(m)))
-        return mD.T * (self.W.T * r)
-
 
 class SparseDeriv(BaseSparse):
     """
@@ -1663,6 +1961,17 @@ class SparseDeriv(BaseSparse):
     def _multiplier_pair(self):
         return 'alpha_{orientation}'.format(orientation=self.orientation)
 
+    @property
+    def _fusable(self):
+        # the spherical gradients are not linear in the model
+        return self.space != 'spherical'
+
+    @property
+    def _fusedMref(self):
+        if self.mrefInSmooth:
+            return self.mref
+        return None
+
     @property
     def f_m(self):
 
@@ -1717,8 +2026,7 @@ class SparseDeriv(BaseSparse):
             self.regmesh, 'cellDiff{}Stencil'.format(self.orientation)
         )
 
-    @property
-    def W(self):
+    def _assembleW(self):
 
         Ave = getattr(self.regmesh, 'aveCC2F{}'.format(self.orientation))
 
@@ -97,6 +97,20 @@ class StraightRayProblem(Problem.LinearProblem):
         self.model = m
         return self.A * self.slowness
 
+    def dpred_batch(self, M, nProcesses=1):
+        """
+            Predicted data of an ensemble of models (nP x k), with a single
+            product of A
+        """
+        return self.A * Problem._mapColumns(self.slownessMap, M)
+
+    def getJ(self, m, f=None):
+        """
+            Sensitivity matrix
+        """
+        self.model = m
+        return self.A * self.slownessDeriv
+
     def Jvec(self, m, v, f=None):
         self.model = m
         # mt = self.model.transformDeriv
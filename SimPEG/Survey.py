@@ -418,6 +418,20 @@ class BaseSurvey(object):
             f = self.prob.fields(m)
         return Utils.mkvc(self.eval(f))
 
+    @Utils.requires('prob')
+    def dpred_batch(self, M, nProcesses=1):
+        """dpred_batch(M, nProcesses=1)
+
+            Predicted data of an ensemble of models (nP x k), see
+            :meth:`SimPEG.Problem.BaseProblem.dpred_batch`.
+
+            :param numpy.array M: models (nP x k)
+            :param int nProcesses: number of processes
+            :rtype: numpy.array
+            :return: predicted data (nD x k)
+        """
+        return self.prob.dpred_batch(M, nProcesses=nProcesses)
+
     @Utils.count
     def eval(self, f):
         """eval(f)
@@ -1,9 +1,18 @@
 from __future__ import print_function
 from six import string_types
+import os
+import json
 import time
+import threading
 import numpy as np
+from contextlib import contextmanager
 from functools import wraps
 
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = False
+
 
 class Counter(object):
     """
@@ -79,12 +88,331 @@ class Counter(object):
             print("  {0:<40}: {1:4.2e}, {2:4.2e}, {3:4d}x".format(prop, a.mean(), a.sum(), l))
 
 
+class TraceSpan(object):
+    """
+        A single timed region recorded by a :class:`Tracer`.
+
+        Spans are nested: *parent* is the index of the enclosing span in
+        :attr:`Tracer.spans` (or -1 for a root span). *counts* holds the
+        inclusive event counts (e.g. number of solves) that happened while
+        the span was open.
+    """
+
+    __slots__ = [
+        'name', 'index', 'parent', 'depth', 'thread', 'start', 'end',
+        'peakMemory', 'counts', 'attrs', '_memStart', '_memPeak'
+    ]
+
+    def __init__(self, name, index, parent, depth, thread, attrs):
+        self.name = name
+        self.index = index
+        self.parent = parent
+        self.depth = depth
+        self.thread = thread
+        self.attrs = attrs
+        self.counts = {}
+        self.start = time.time()
+        self.end = None
+        self.peakMemory = None
+        self._memStart = 0
+        self._memPeak = 0
+
+    @property
+    def duration(self):
+        """Wall time spent in the span (seconds)."""
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+
+class Tracer(object):
+    """
+        Hierarchical tracer that records nested spans, their wall time, the
+        peak memory allocated while they were open and event counts (e.g.
+        the number of solves).
+
+        The tracer is process-wide: once enabled with :func:`enableTracing`
+        every method decorated with *timeIt* or *count* and every solve done
+        through :mod:`SimPEG.Utils.SolverUtils` is recorded, regardless of
+        whether the object has a *counter*.
+
+        ::
+
+            tracer = Utils.enableTracing(trackMemory=True)
+            inv.run(m0)
+            Utils.disableTracing()
+
+            tracer.summary()
+            tracer.toChromeTrace('inversion.json')  # open in chrome://tracing
+            df = pandas.DataFrame(tracer.toRecords())
+
+        Peak memory is measured with :mod:`tracemalloc`, so only
+        allocations made through the python allocator (including numpy
+        arrays) are seen.
+    """
+
+    def __init__(self, trackMemory=False):
+        if trackMemory and not tracemalloc:
+            raise ImportError('trackMemory requires the tracemalloc module')
+        self.trackMemory = trackMemory
+        self.spans = []
+        self.counts = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._t0 = time.time()
+
+    @property
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, name, **attrs):
+        """
+            Open a span nested in the innermost open span of this thread.
+        """
+        stack = self._stack
+        parent = stack[-1] if len(stack) > 0 else None
+        with self._lock:
+            span = TraceSpan(
+                name, len(self.spans),
+                -1 if parent is None else parent.index,
+                len(stack), threading.current_thread().ident, attrs
+            )
+            self.spans.append(span)
+        if self.trackMemory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent._memPeak = max(parent._memPeak, peak)
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            span._memStart = span._memPeak = current
+        stack.append(span)
+        return span
+
+    def end(self, span):
+        """
+            Close *span* (and any span left open inside of it).
+        """
+        stack = self._stack
+        if span not in stack:
+            return
+        while len(stack) > 0:
+            top = stack.pop()
+            top.end = time.time()
+            parent = stack[-1] if len(stack) > 0 else None
+            if self.trackMemory and tracemalloc.is_tracing():
+                peak = tracemalloc.get_traced_memory()[1]
+                top._memPeak = max(top._memPeak, peak)
+                top.peakMemory = top._memPeak - top._memStart
+                if parent is not None:
+                    parent._memPeak = max(parent._memPeak, top._memPeak)
+                if hasattr(tracemalloc, 'reset_peak'):
+                    tracemalloc.reset_peak()
+            if top is span:
+                break
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+            Context manager that records the enclosed block as a span.
+        """
+        s = self.begin(name, **attrs)
+        try:
+            yield s
+        finally:
+            self.end(s)
+
+    def count(self, prop, n=1):
+        """
+            Increase the count of *prop* globally and for all open spans.
+        """
+        with self._lock:
+            self.counts[prop] = self.counts.get(prop, 0) + n
+        for span in self._stack:
+            span.counts[prop] = span.counts.get(prop, 0) + n
+
+    def clear(self):
+        """
+            Remove all recorded spans and counts.
+        """
+        with self._lock:
+            self.spans = []
+            self.counts = {}
+            self._t0 = time.time()
+
+    def toRecords(self):
+        """
+            List of dicts (one per span) that can be passed straight to
+            :class:`pandas.DataFrame`.
+
+            Each record contains *name*, *index*, *parent*, *depth*,
+            *thread*, *start* (seconds since the tracer started),
+            *duration*, *peakMemory* (bytes), one ``count_<prop>`` column per
+            counted property, plus any attributes given when the span was
+            opened.
+        """
+        props = sorted(set(
+            prop for span in self.spans for prop in span.counts
+        ))
+        records = []
+        for span in self.spans:
+            record = {
+                'name': span.name,
+                'index': span.index,
+                'parent': span.parent,
+                'depth': span.depth,
+                'thread': span.thread,
+                'start': span.start - self._t0,
+                'duration': span.duration,
+                'peakMemory': span.peakMemory,
+            }
+            for prop in props:
+                record['count_' + prop] = span.counts.get(prop, 0)
+            record.update(span.attrs)
+            records.append(record)
+        return records
+
+    def toDataFrame(self):
+        """
+            The recorded spans as a :class:`pandas.DataFrame`
+            (requires pandas).
+        """
+        import pandas
+        return pandas.DataFrame(self.toRecords())
+
+    def toChromeTrace(self, fname=None):
+        """
+            Export the spans in the Chrome trace-event format. Open the file
+            in chrome://tracing or https://ui.perfetto.dev.
+
+            :param str fname: if provided, the trace is written to this file
+            :rtype: dict
+            :return: the trace
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            if span.end is None:
+                continue
+            args = dict(span.attrs)
+            args.update(span.counts)
+            if span.peakMemory is not None:
+                args['peakMemory'] = span.peakMemory
+            events.append({
+                'name': span.name,
+                'ph': 'X',
+                'ts': (span.start - self._t0) * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': pid,
+                'tid': span.thread,
+                'args': args,
+            })
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if fname is not None:
+            with open(fname, 'w') as f:
+                json.dump(trace, f, default=str)
+        return trace
+
+    def summary(self):
+        """
+            Provides a text summary of the inclusive time spent in each span,
+            grouped by name.
+        """
+        names = {}
+        for span in self.spans:
+            if span.end is None:
+                continue
+            stats = names.setdefault(span.name, [0, 0., 0])
+            stats[0] += 1
+            stats[1] += span.duration
+            if span.peakMemory is not None:
+                stats[2] = max(stats[2], span.peakMemory)
+        print('Counters:')
+        for prop in sorted(self.counts):
+            print("  {0:<40}: {1:8d}".format(prop, self.counts[prop]))
+        print('\nSpans:'+' '*40+'sum    calls  peak memory')
+        for name in sorted(names, key=lambda n: -names[n][1]):
+            n, total, peak = names[name]
+            print("  {0:<40}: {1:4.2e}, {2:6d}x, {3:8.2e}".format(
+                name, total, n, peak
+            ))
+
+
+_tracer = None
+
+
+def enableTracing(trackMemory=False):
+    """
+        Turn on process-wide tracing and return the new :class:`Tracer`.
+
+        :param bool trackMemory: record the peak memory of each span
+                                 (uses tracemalloc, slows down execution)
+    """
+    global _tracer
+    tracer = Tracer(trackMemory=trackMemory)
+    if trackMemory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _tracer = tracer
+    return tracer
+
+
+def disableTracing():
+    """
+        Turn off process-wide tracing and return the tracer that was active.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and tracer.trackMemory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return tracer
+
+
+def getTracer():
+    """
+        The active :class:`Tracer`, or None if tracing is disabled.
+    """
+    return _tracer
+
+
+@contextmanager
+def traceSpan(name, **attrs):
+    """
+        Record the enclosed block as a span of the active tracer. Does
+        nothing if tracing is disabled.
+
+        ::
+
+            with Utils.traceSpan('my block', nSrc=10):
+                ...
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, **attrs) as span:
+        yield span
+
+
+def traceCount(prop, n=1):
+    """
+        Increase the count of *prop* on the active tracer (if any).
+    """
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(prop, n)
+
+
 def count(f):
     @wraps(f)
     def wrapper(self, *args, **kwargs):
         counter = getattr(self, 'counter', None)
         if type(counter) is Counter:
             counter.count(self.__class__.__name__+'.'+f.__name__)
+        tracer = _tracer
+        if tracer is not None:
+            tracer.count(self.__class__.__name__+'.'+f.__name__)
         out = f(self, *args, **kwargs)
         return out
     return wrapper
@@ -96,7 +424,15 @@ def timeIt(f):
         counter = getattr(self, 'counter', None)
         if type(counter) is Counter:
             counter.countTic(self.__class__.__name__+'.'+f.__name__)
-        out = f(self, *args, **kwargs)
+        tracer = _tracer
+        if tracer is None:
+            out = f(self, *args, **kwargs)
+        else:
+            span = tracer.begin(self.__class__.__name__+'.'+f.__name__)
+            try:
+                out = f(self, *args, **kwargs)
+            finally:
+                tracer.end(span)
         if type(counter) is Counter:
             counter.countToc(self.__class__.__name__+'.'+f.__name__)
         return out
@@ -1,9 +1,23 @@
 from __future__ import print_function
+from __future__ import division
+from collections import deque
 import numpy as np
 from scipy.sparse import linalg
-from .matutils import mkvc
+from .matutils import mkvc, sdiag
+from .CounterUtils import getTracer
 import warnings
 
+try:
+    import pyamg
+except ImportError:
+    pyamg = None
+
+try:
+    from inspect import signature
+    _rtol = 'rtol' if 'rtol' in signature(linalg.cg).parameters else 'tol'
+except ImportError:  # python 2
+    _rtol = 'tol'
+
 def _checkAccuracy(A, b, X, accuracyTol):
     nrm = np.linalg.norm(mkvc(A*X - b), np.inf)
     nrm_b = np.linalg.norm(mkvc(b), np.inf)
@@ -25,6 +39,18 @@ def SolverWrapD(fun, factorize=True, checkAccuracy=True, accuracyTol=1e-6, name=
         Solver   = SolverUtils.SolverWrapD(sp.linalg.spsolve, factorize=False)
         SolverLU = SolverUtils.SolverWrapD(sp.linalg.splu, factorize=True)
 
+    With :code:`mixedPrecision=True` (e.g. in the solverOpts of a problem)
+    the matrix is factored in single precision (float32 / complex64) and
+    the solutions are improved by iterative refinement against the double
+    precision matrix until the relative residual is below refineTol. If the
+    refinement stalls (the residual is not halved by a step) or needs more
+    than maxRefine steps, the matrix is factored in double precision and
+    used for all the following solves.
+
+    ::
+
+        prob.solverOpts = {'mixedPrecision': True}
+
     """
 
     def __init__(self, A, **kwargs):
@@ -34,48 +60,130 @@ def SolverWrapD(fun, factorize=True, checkAccuracy=True, accuracyTol=1e-6, name=
         if "checkAccuracy" in kwargs: del kwargs["checkAccuracy"]
         self.accuracyTol = kwargs.get("accuracyTol", accuracyTol)
         if "accuracyTol" in kwargs: del kwargs["accuracyTol"]
+        mixedPrecision = kwargs.get("mixedPrecision", False)
+        if "mixedPrecision" in kwargs: del kwargs["mixedPrecision"]
+        self.refineTol = kwargs.get("refineTol", 1e-10)
+        if "refineTol" in kwargs: del kwargs["refineTol"]
+        self.maxRefine = kwargs.get("maxRefine", 10)
+        if "maxRefine" in kwargs: del kwargs["maxRefine"]
 
         self.kwargs = kwargs
 
+        self.Alow = None
+        if mixedPrecision:
+            lowDtype = np.complex64 if np.iscomplexobj(self.A.data) else np.float32
+            self.Alow = self.A.astype(lowDtype)
+
         if factorize:
-            self.solver = fun(self.A, **kwargs)
+            if self.Alow is not None:
+                try:
+                    self._factor(self.Alow)
+                except RuntimeError:  # singular in single precision
+                    self.Alow = None
+            if self.Alow is None:
+                self._factor(self.A)
+
+    def _factor(self, A):
+        tracer = getTracer()
+        if tracer is None:
+            self.solver = fun(A, **self.kwargs)
+        else:
+            with tracer.span(
+                self.__class__.__name__+'.factor', n=A.shape[0], nnz=A.nnz,
+                dtype=str(A.dtype)
+            ):
+                self.solver = fun(A, **self.kwargs)
+            tracer.count('factorizations')
 
     def __mul__(self, b):
         if type(b) is not np.ndarray:
             raise TypeError('Can only multiply by a numpy array.')
 
+        tracer = getTracer()
+        if tracer is None:
+            return self._solve(b)
+        nrhs = 1 if len(b.shape) == 1 else b.shape[1]
+        with tracer.span(self.__class__.__name__+'.solve', nrhs=nrhs):
+            tracer.count('solves', nrhs)
+            return self._solve(b)
+
+    def _solve(self, b):
         if len(b.shape) == 1 or b.shape[1] == 1:
             b = b.flatten()
             # Just one RHS
 
             if b.dtype is np.dtype('O'):
                 b = b.astype(type(b[0]))
-
-            if factorize:
-                X = self.solver.solve(b, **self.kwargs)
-            else:
-                X = fun(self.A, b, **self.kwargs)
         else: # Multiple RHSs
             if b.dtype is np.dtype('O'):
                 b = b.astype(type(b[0,0]))
 
+        if self.Alow is None:
+            X = self._solveFactor(b, self.A)
+        else:
+            X = self._refine(b)
+
+        if self.checkAccuracy:
+            _checkAccuracy(self.A, b, X, self.accuracyTol)
+        return X
+
+    def _solveFactor(self, b, A):
+        if len(b.shape) == 1:
+            if factorize:
+                X = self.solver.solve(b, **self.kwargs)
+            else:
+                X = fun(A, b, **self.kwargs)
+        else:
             X = np.empty_like(b)
 
             for i in range(b.shape[1]):
                 if factorize:
                     X[:,i] = self.solver.solve(b[:,i])
                 else:
-                    X[:,i] = fun(self.A, b[:,i], **self.kwargs)
-
-        if self.checkAccuracy:
-            _checkAccuracy(self.A, b, X, self.accuracyTol)
+                    X[:,i] = fun(A, b[:,i], **self.kwargs)
         return X
 
+    def _refine(self, b):
+        dtype = np.result_type(self.A.dtype, b.dtype)
+        tracer = getTracer()
+
+        def solveLow(r):
+            # scale the residual, it would underflow in single precision
+            scale = np.atleast_1d(np.linalg.norm(r, axis=0))
+            scale[scale == 0] = 1.
+            x = self._solveFactor((r/scale).astype(self.Alow.dtype), self.Alow)
+            return x.astype(dtype)*scale
+
+        nrmb = np.atleast_1d(np.linalg.norm(b, axis=0))
+        nrmb[nrmb == 0] = 1.
+        X = solveLow(b)
+        err = np.inf
+        for i in range(self.maxRefine + 1):
+            r = b - self.A*X
+            newErr = np.max(np.linalg.norm(r, axis=0)/nrmb)
+            if newErr <= self.refineTol:
+                return X
+            if i == self.maxRefine or newErr > 0.5*err:
+                break
+            err = newErr
+            X = X + solveLow(r)
+            if tracer is not None:
+                tracer.count('refinements')
+
+        # the refinement stalled, use a double precision factor from now on
+        self.Alow = None
+        if tracer is not None:
+            tracer.count('refinementFallbacks')
+        if factorize:
+            self.clean()
+            self._factor(self.A)
+        return self._solveFactor(b, self.A)
+
     def clean(self):
         if factorize and hasattr(self.solver, 'clean'):
             return self.solver.clean()
 
-    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": __mul__})
+    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": __mul__, "_solve": _solve, "_factor": _factor, "_solveFactor": _solveFactor, "_refine": _refine})
 
 
 
@@ -104,6 +212,15 @@ def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None):
         if type(b) is not np.ndarray:
             raise TypeError('Can only multiply by a numpy array.')
 
+        tracer = getTracer()
+        if tracer is None:
+            return self._solve(b)
+        nrhs = 1 if len(b.shape) == 1 else b.shape[1]
+        with tracer.span(self.__class__.__name__+'.solve', nrhs=nrhs):
+            tracer.count('solves', nrhs)
+            return self._solve(b)
+
+    def _solve(self, b):
         if len(b.shape) == 1 or b.shape[1] == 1:
             b = b.flatten()
             # Just one RHS
@@ -132,7 +249,7 @@ def SolverWrapI(fun, checkAccuracy=True, accuracyTol=1e-5, name=None):
     def clean(self):
         pass
 
-    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": __mul__})
+    return type(name if name is not None else fun.__name__, (object,), {"__init__": __init__, "clean": clean, "__mul__": __mul__, "_solve": _solve})
 
 
 Solver   = SolverWrapD(linalg.spsolve, factorize=False, name="Solver")
@@ -151,6 +268,10 @@ class SolverDiag(object):
         assert rhs.size % n == 0, 'Incorrect shape of rhs.'
         nrhs = rhs.size // n
 
+        tracer = getTracer()
+        if tracer is not None:
+            tracer.count('solves', nrhs)
+
         if len(rhs.shape) == 1 or rhs.shape[1] == 1:
             x = self._solve1(rhs)
         else:
@@ -171,3 +292,333 @@ class SolverDiag(object):
 
     def clean(self):
         pass
+
+
+class SolverKrylov(object):
+    """
+    Preconditioned Krylov solver that keeps its preconditioners and its
+    last solutions between the matrices it is given.
+
+    An instance is used in place of a solver class, the problems call it with
+    every new system matrix::
+
+        prob.Solver = SolverKrylov('bicgstab', preconditioner='ilu')
+        Ainv = prob.Solver(A)
+        x = Ainv * b
+
+    The preconditioners are stored by sparsity pattern, so the matrix of a
+    nearby model (same pattern, new values) reuses the preconditioner built
+    for a previous one. The preconditioner whose matrix diagonal is the
+    closest is picked, a new one is built if the relative change of the
+    diagonal is above maxChange (e.g. another frequency or time step). A
+    preconditioner is rebuilt for the current matrix when a solve started
+    from zero needs more than rebuildRatio times the iterations it needed
+    after it was built, or when a solve does not converge.
+
+    Each right hand side (column of b) starts from the previous solution of
+    the same column, when it is a better guess than zero.
+
+    With the 'gcrotmk' method, a recycled subspace (the (c, u) vectors of
+    GCROT(m, k)) is kept per system matrix, so the sequence of solves with
+    one matrix (e.g. the Jvec / Jtvec calls of the CG iterations of a
+    Gauss-Newton step, for each frequency, ky or time step) deflates the
+    directions found by the previous solves. The subspaces are only kept
+    for the matrices of the current model: they are stored in slots of the
+    sparsity pattern matched by the matrix diagonal, like the
+    preconditioners, and the subspace of a slot is dropped when the values
+    of its matrix change (a new model). A matrix assembled again for the
+    same model finds its subspace.
+
+    :param str method: 'cg', 'bicgstab', 'gmres' or 'gcrotmk'
+    :param str preconditioner: 'ilu', 'amg' (requires pyamg), 'jacobi' or None
+    :param float tol: relative tolerance of the Krylov solver
+    :param int maxiter: maximum number of iterations
+    :param float rebuildRatio: increase of the number of iterations that
+        triggers a rebuild of the preconditioner
+    :param float maxChange: relative change of the matrix diagonal above
+        which a new preconditioner is built
+    :param int maxPreconditioners: preconditioners stored per pattern
+    :param bool warmStart: start from the previous solutions
+    :param dict preconditionerOpts: options of scipy.sparse.linalg.spilu or
+        pyamg.smoothed_aggregation_solver
+    :param int nRecycle: number of vectors recycled by gcrotmk
+    :param int maxSubspaces: recycled subspaces kept per pattern, i.e. the
+        distinct matrices of a model (frequencies, time steps)
+    :param int maxHistory: number of solves whose iterations are kept in
+        iterations
+    """
+
+    methods = {
+        'cg': linalg.cg, 'bicgstab': linalg.bicgstab, 'gmres': linalg.gmres,
+        'gcrotmk': linalg.gcrotmk
+    }
+
+    def __init__(
+        self, method='bicgstab', preconditioner='ilu', tol=1e-8,
+        maxiter=1000, rebuildRatio=2., maxChange=0.5, maxPreconditioners=4,
+        warmStart=True, checkAccuracy=True, accuracyTol=1e-5,
+        preconditionerOpts=None, nRecycle=20, maxSubspaces=4,
+        maxHistory=1000
+    ):
+        if method not in self.methods:
+            raise ValueError(
+                'method must be one of {}, not {}'.format(
+                    list(self.methods.keys()), method
+                )
+            )
+        if preconditioner not in ['ilu', 'amg', 'jacobi', None]:
+            raise ValueError(
+                "preconditioner must be 'ilu', 'amg', 'jacobi' or None, not "
+                "{}".format(preconditioner)
+            )
+        if preconditioner == 'amg' and pyamg is None:
+            raise ImportError(
+                'The amg preconditioner requires pyamg (pip install pyamg)'
+            )
+        self.method = method
+        self.preconditioner = preconditioner
+        self.tol = tol
+        self.maxiter = maxiter
+        self.rebuildRatio = rebuildRatio
+        self.maxChange = maxChange
+        self.maxPreconditioners = maxPreconditioners
+        self.warmStart = warmStart
+        self.checkAccuracy = checkAccuracy
+        self.accuracyTol = accuracyTol
+        self.preconditionerOpts = preconditionerOpts or {}
+        self.nRecycle = nRecycle
+        self.maxSubspaces = maxSubspaces
+
+        self.nBuilds = 0  #: number of preconditioners built
+        #: iterations of the last maxHistory solves
+        self.iterations = deque(maxlen=maxHistory)
+        self.clean()
+
+    def __call__(self, A, **kwargs):
+        return _KrylovSolve(self, A, **kwargs)
+
+    def clean(self):
+        """
+            Remove the stored preconditioners, solutions and subspaces.
+        """
+        self._preconditioners = {}
+        self._guesses = {}
+        self._subspaces = {}
+
+    @staticmethod
+    def _pattern(A):
+        return (
+            A.shape, A.nnz, A.dtype.kind, hash(A.indptr.tobytes()),
+            hash(A.indices.tobytes())
+        )
+
+    def _build(self, A):
+        tracer = getTracer()
+        if tracer is not None:
+            tracer.count('preconditioners')
+
+        opts = self.preconditionerOpts
+        if self.preconditioner == 'ilu':
+            opts = dict(dict(drop_tol=1e-3, fill_factor=3), **opts)
+            absDiag = sdiag(abs(A.diagonal()))
+            for shift in [0., 1e-3, 1e-2, 1e-1]:
+                # shift the diagonal if the incomplete factor is singular
+                try:
+                    ilu = linalg.spilu((A + shift*absDiag).tocsc(), **opts)
+                    break
+                except RuntimeError:
+                    if shift == 1e-1:
+                        raise
+            M = linalg.LinearOperator(A.shape, ilu.solve, dtype=A.dtype)
+        elif self.preconditioner == 'amg':
+            M = pyamg.smoothed_aggregation_solver(
+                A, **opts
+            ).aspreconditioner()
+        elif self.preconditioner == 'jacobi':
+            d = A.diagonal()
+            M = linalg.LinearOperator(
+                A.shape, lambda x: mkvc(x)/d, dtype=A.dtype
+            )
+        else:
+            M = None
+
+        self.nBuilds += 1
+        return {'M': M, 'diagonal': A.diagonal(), 'iterations': None}
+
+    def _preconditioner(self, A, pattern):
+        """
+            Stored preconditioner for the closest matrix of the same pattern,
+            a new one is built if none is close enough.
+        """
+        entries = self._preconditioners.setdefault(pattern, [])
+        d = A.diagonal()
+        nrm = np.linalg.norm(d)
+        best, change = None, np.inf
+        for entry in entries:
+            c = np.linalg.norm(entry['diagonal'] - d) / nrm
+            if c < change:
+                best, change = entry, c
+        if best is not None and change <= self.maxChange:
+            return best
+        entry = self._build(A)
+        entries.append(entry)
+        if len(entries) > self.maxPreconditioners:
+            entries.pop(0)
+        return entry
+
+    def _subspace(self, A, pattern):
+        """
+            Recycled subspace of the matrix A, a list of (c, u) vectors
+            updated in place by gcrotmk. The subspace of the slot of the
+            closest diagonal is reset if the values of the matrix changed.
+        """
+        slots = self._subspaces.setdefault(pattern, [])
+        values = hash(A.data.tobytes())
+        for slot in slots:
+            if slot['values'] == values:
+                return slot['CU']
+
+        d = A.diagonal()
+        nrm = np.linalg.norm(d)
+        best, change = None, np.inf
+        for slot in slots:
+            c = np.linalg.norm(slot['diagonal'] - d) / nrm
+            if c < change:
+                best, change = slot, c
+        if best is None or change > self.maxChange:
+            best = {}
+            slots.append(best)
+            if len(slots) > self.maxSubspaces:
+                slots.pop(0)
+        best.update(values=values, diagonal=d, CU=[])
+        return best['CU']
+
+    def _rebuild(self, A, pattern, entry):
+        entries = self._preconditioners.setdefault(pattern, [])
+        new = self._build(A)
+        if entry in entries:
+            entries[entries.index(entry)] = new
+        else:
+            entries.append(new)
+        return new
+
+
+class _KrylovSolve(object):
+    """
+        Solver of :class:`SolverKrylov` for one matrix.
+    """
+
+    def __init__(self, factory, A, **kwargs):
+        self.factory = factory
+        self.A = A.tocsr()
+        self.checkAccuracy = kwargs.pop('checkAccuracy', factory.checkAccuracy)
+        self.accuracyTol = kwargs.pop('accuracyTol', factory.accuracyTol)
+        self.kwargs = kwargs
+
+        self._pattern = factory._pattern(self.A)
+        self._entry = factory._preconditioner(self.A, self._pattern)
+        if factory.method == 'gcrotmk':
+            self._CU = factory._subspace(self.A, self._pattern)
+        self.iterations = []
+
+    def __mul__(self, b):
+        if type(b) is not np.ndarray:
+            raise TypeError('Can only multiply by a numpy array.')
+
+        tracer = getTracer()
+        if tracer is None:
+            return self._solve(b)
+        nrhs = 1 if len(b.shape) == 1 else b.shape[1]
+        with tracer.span(self.__class__.__name__+'.solve', nrhs=nrhs):
+            tracer.count('solves', nrhs)
+            return self._solve(b)
+
+    def _solveColumn(self, b, key):
+        factory = self.factory
+        fun = factory.methods[factory.method]
+
+        x0 = None
+        guess = factory._guesses.get(key) if factory.warmStart else None
+        if guess is not None and guess.shape == b.shape:
+            if np.linalg.norm(b - self.A*guess) < np.linalg.norm(b):
+                x0 = guess
+
+        for attempt in range(2):
+            count = [0]
+
+            def callback(*args):
+                count[0] += 1
+
+            opts = {
+                _rtol: factory.tol, 'atol': 0., 'maxiter': factory.maxiter,
+                'M': self._entry['M'], 'callback': callback
+            }
+            A = self.A
+            if factory.method == 'gmres':
+                opts['callback_type'] = 'pr_norm'
+            elif factory.method == 'gcrotmk':
+                # the callback is called once per outer iteration, count
+                # the products with A instead
+                def matvec(v):
+                    count[0] += 1
+                    return self.A*v
+                A = linalg.LinearOperator(
+                    self.A.shape, matvec, dtype=self.A.dtype
+                )
+                opts['callback'] = None
+                opts['CU'] = self._CU
+                opts['k'] = factory.nRecycle
+            opts.update(self.kwargs)
+            x, info = fun(A, b, x0=x0, **opts)
+
+            its = count[0]
+            self.iterations.append(its)
+            factory.iterations.append(its)
+            tracer = getTracer()
+            if tracer is not None:
+                tracer.count('krylovIterations', its)
+
+            # only the solves started from zero are compared
+            ref = self._entry['iterations']
+            cold = x0 is None
+            if info == 0 and cold and ref is None:
+                self._entry['iterations'] = its
+            slow = (
+                cold and ref is not None and
+                its > factory.rebuildRatio*max(ref, 1)
+            )
+            if info == 0 and not slow:
+                break
+            if attempt == 0:
+                # the preconditioner does not fit this matrix anymore
+                self._entry = factory._rebuild(
+                    self.A, self._pattern, self._entry
+                )
+            if info == 0:
+                break
+            x0 = x
+
+        self.info = info
+        if factory.warmStart:
+            factory._guesses[key] = x.copy()
+        return x
+
+    def _solve(self, b):
+        dtype = np.result_type(self.A.dtype, b.dtype)
+        if len(b.shape) == 1 or b.shape[1] == 1:
+            b = b.flatten().astype(dtype)
+            X = self._solveColumn(b, (self._pattern, 1, 0))
+        else:
+            b = b.astype(dtype)
+            X = np.empty_like(b)
+            for i in range(b.shape[1]):
+                X[:, i] = self._solveColumn(
+                    b[:, i], (self._pattern, b.shape[1], i)
+                )
+
+        if self.checkAccuracy:
+            _checkAccuracy(self.A, b, X, self.accuracyTol)
+        return X
+
+    def clean(self):
+        pass
@@ -16,10 +16,15 @@ from .codeutils import (
     asArray_N_x_Dim, requires
 )
 from .meshutils import (
-    exampleLrmGrid, meshTensor, closestPoints, ExtractCoreMesh
+    exampleLrmGrid, meshTensor, closestPoints, ExtractCoreMesh, coarsenMesh
 )
 from .curvutils import volTetra, faceInfo, indexCube
-from .CounterUtils import Counter, count, timeIt
+from .innerproductutils import InnerProductAssembler
+from .storageutils import DiskMatrix
+from .CounterUtils import (
+    Counter, count, timeIt, Tracer, enableTracing, disableTracing,
+    getTracer, traceSpan, traceCount
+)
 from . import ModelBuilder
 from . import SolverUtils
 from .coordutils import rotatePointsFromNormals, rotationMatrixFromNormals
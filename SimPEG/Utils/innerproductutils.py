@@ -0,0 +1,218 @@
+from __future__ import division
+
+import numpy as np
+import scipy.sparse as sp
+
+from .matutils import mkvc, sdiag
+
+
+class InnerProductAssembler(object):
+    """
+        Assembles face or edge inner product matrices of a mesh for changing
+        physical properties on a fixed sparsity pattern.
+
+        The inner product matrix is linear in the physical property, so the
+        non-zero values of :math:`\\mathbf{M}(\\sigma)` can be written as
+        :math:`\\mathbf{W}\\sigma` where :math:`\\mathbf{W}` is a sparse
+        (nnz x nC*nComponents) weight map that only depends on the mesh. The
+        weight map is computed once per tensor type (isotropic, diagonal
+        anisotropic, full anisotropic). For diagonal inner products it is the
+        derivative of the inner product, otherwise it is found by probing the
+        mesh inner product with groups of cells that do not share any edge
+        (or face). After that, a new model only requires a sparse
+        matrix-vector product to update the values, the index arrays are
+        shared between all the matrices built.
+
+        ::
+
+            Me = InnerProductAssembler(mesh, 'E')
+            MeSigma = Me(sigma)  # == mesh.getEdgeInnerProduct(sigma)
+            MeSigmaI = Me(sigma, invMat=True)
+
+        If the weight map can not be built for a mesh (or it does not
+        reproduce the mesh inner product) the assembler falls back to the
+        mesh methods.
+
+        :param discretize.BaseMesh mesh: the mesh
+        :param str projType: 'E' for edges or 'F' for faces
+    """
+
+    def __init__(self, mesh, projType):
+        assert projType in ['E', 'F'], (
+            "projType must be 'F' for faces or 'E' for edges"
+        )
+        self.mesh = mesh
+        self.projType = projType
+        self._weights = {}
+
+    @property
+    def n(self):
+        """Size of the inner product matrix."""
+        return self.mesh.nE if self.projType == 'E' else self.mesh.nF
+
+    def _innerProduct(self, prop, invMat=False):
+        if self.projType == 'E':
+            return self.mesh.getEdgeInnerProduct(prop, invMat=invMat)
+        return self.mesh.getFaceInnerProduct(prop, invMat=invMat)
+
+    def _innerProductDeriv(self, prop):
+        if self.projType == 'E':
+            return self.mesh.getEdgeInnerProductDeriv(prop)
+        return self.mesh.getFaceInnerProductDeriv(prop)
+
+    @property
+    def deriv(self):
+        """
+            Derivative of the inner product matrix with respect to an
+            isotropic property times a vector of ones, (n x nC). This does not
+            depend on the property for diagonal inner products, so it is only
+            computed once.
+        """
+        if getattr(self, '_deriv', None) is None:
+            self._deriv = self._innerProductDeriv(
+                np.ones(self.mesh.nC)
+            )(np.ones(self.n))
+        return self._deriv
+
+    def _propertyVector(self, prop):
+        nC = self.mesh.nC
+        prop = np.asarray(prop)
+        if prop.size == 1:
+            return float(prop) * np.ones(nC), 1
+        if prop.size % nC != 0:
+            raise ValueError(
+                'The property must have a multiple of nC={} entries, '
+                'not {}'.format(nC, prop.size)
+            )
+        if prop.ndim == 2 and prop.shape[0] == nC:
+            return mkvc(prop), prop.shape[1]
+        return mkvc(prop), prop.size // nC
+
+    def _cellColors(self, incidence):
+        """
+            Color the cells so that cells with the same color do not share
+            any degree of freedom of the inner product.
+        """
+        mesh = self.mesh
+        if getattr(mesh, '_meshType', None) == 'TENSOR':
+            ijk = np.unravel_index(
+                np.arange(mesh.nC), mesh.vnC, order='F'
+            )
+            return sum((2**i) * (ind % 2) for i, ind in enumerate(ijk))
+
+        adjacency = (incidence.T * incidence).tocsr()
+        colors = -np.ones(mesh.nC, dtype=int)
+        for k in range(mesh.nC):
+            neighbors = adjacency.indices[
+                adjacency.indptr[k]:adjacency.indptr[k+1]
+            ]
+            used = set(colors[neighbors])
+            color = 0
+            while color in used:
+                color += 1
+            colors[k] = color
+        return colors
+
+    def _buildWeights(self, nComp):
+        nC = self.mesh.nC
+        rand = np.random.RandomState(518936)
+
+        generic = rand.rand(nC * nComp) + 1.
+        pattern = self._innerProduct(generic).tocsr()
+        pattern.sum_duplicates()
+        pattern.sort_indices()
+        rows = np.repeat(np.arange(self.n), np.diff(pattern.indptr))
+        cols = pattern.indices
+
+        diagonal = len(rows) == self.n and np.all(rows == cols)
+        if diagonal:
+            # the derivative is the weight map of a diagonal inner product
+            if nComp == 1:
+                W = self.deriv.tocsr()
+            else:
+                W = self._innerProductDeriv(
+                    np.ones(nC * nComp)
+                )(np.ones(self.n)).tocsr()
+            if np.allclose(W * generic, pattern.data, rtol=1e-10, atol=0):
+                return self._weightMap(W, pattern, diagonal)
+
+        incidence = abs(
+            self._innerProductDeriv(np.ones(nC))(rand.rand(self.n) + 1.)
+        ).tocsc()
+        incidence.data[:] = 1.
+
+        colors = self._cellColors(incidence.tocsr())
+        I, J, V = [], [], []
+        for color in np.unique(colors):
+            cells = np.where(colors == color)[0]
+            # cell (of this color) that owns each degree of freedom
+            owner = incidence[:, cells].tocsr()
+            cellOf = -np.ones(self.n, dtype=int)
+            hasCell = np.diff(owner.indptr) > 0
+            cellOf[hasCell] = cells[owner.indices[owner.indptr[:-1][hasCell]]]
+            for comp in range(nComp):
+                probe = np.zeros(nC * nComp)
+                probe[comp*nC + cells] = 1.
+                vals = np.asarray(
+                    self._innerProduct(probe).tocsr()[rows, cols]
+                ).ravel()
+                nz = vals != 0
+                if np.any(cellOf[rows[nz]] < 0):
+                    return None
+                I.append(np.where(nz)[0])
+                J.append(comp*nC + cellOf[rows[nz]])
+                V.append(vals[nz])
+
+        W = sp.csr_matrix(
+            (np.hstack(V), (np.hstack(I), np.hstack(J))),
+            shape=(len(rows), nC * nComp)
+        )
+
+        # make sure that we reproduce the inner product of the mesh
+        if not np.allclose(W * generic, pattern.data, rtol=1e-10, atol=0):
+            return None
+        return self._weightMap(W, pattern, diagonal)
+
+    def _weightMap(self, W, pattern, diagonal):
+        # index arrays in the dtype chosen by scipy, so they are not copied
+        template = sp.csr_matrix(
+            (pattern.data, pattern.indices, pattern.indptr),
+            shape=(self.n, self.n)
+        )
+        return {
+            'W': W, 'indices': template.indices, 'indptr': template.indptr,
+            'diagonal': diagonal
+        }
+
+    def weights(self, nComp=1):
+        """
+            The cached weight map for a property with nComp components, or
+            None if it can not be built for this mesh.
+        """
+        if nComp not in self._weights:
+            try:
+                self._weights[nComp] = self._buildWeights(nComp)
+            except (NotImplementedError, AttributeError):
+                self._weights[nComp] = None
+        return self._weights[nComp]
+
+    def __call__(self, prop, invMat=False):
+        """
+            Inner product matrix for the physical property prop.
+
+            :param numpy.ndarray prop: physical property (nC, (1, 3 or 6))
+            :param bool invMat: inverts the matrix (diagonal matrices only)
+            :rtype: scipy.sparse.csr_matrix
+        """
+        propVec, nComp = self._propertyVector(prop)
+        weights = self.weights(nComp)
+        if weights is None or (invMat and not weights['diagonal']):
+            return self._innerProduct(prop, invMat=invMat)
+
+        data = weights['W'] * propVec
+        if invMat:
+            return sdiag(1./data)
+        return sp.csr_matrix(
+            (data, weights['indices'], weights['indptr']),
+            shape=(self.n, self.n)
+        )
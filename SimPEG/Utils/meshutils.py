@@ -1,3 +1,45 @@
+import numpy as np
+from discretize import TensorMesh, TreeMesh
 from discretize.utils import (
     exampleLrmGrid, meshTensor, closestPoints, ExtractCoreMesh
 )
+
+
+def coarsenMesh(mesh, nLevels=1):
+    """
+        Coarsened copy of a TensorMesh or a TreeMesh covering the same
+        domain.
+
+        Each level merges the cells of a TensorMesh two by two along each
+        dimension (the last cell of an odd number of cells is kept) and
+        makes the cells of a TreeMesh one level coarser (twice as large,
+        the base cells are kept).
+
+        :param discretize.BaseMesh mesh: TensorMesh or TreeMesh
+        :param int nLevels: number of coarsening levels
+        :rtype: discretize.BaseMesh
+        :return: coarsened mesh
+    """
+    for _ in range(nLevels):
+        if isinstance(mesh, TreeMesh):
+            hMin = np.r_[[h.min() for h in mesh.h]]
+            levels = mesh.max_level - np.round(
+                np.log2(mesh.h_gridded[:, 0] / hMin[0])
+            ).astype(int)
+            coarse = TreeMesh(mesh.h, x0=mesh.x0)
+            coarse.insert_cells(mesh.gridCC, np.maximum(levels - 1, 0))
+            mesh = coarse
+        elif isinstance(mesh, TensorMesh):
+            mesh = TensorMesh(
+                [
+                    np.r_[h[0:-1:2] + h[1::2], h[-1:] if len(h) % 2 else []]
+                    for h in mesh.h
+                ],
+                x0=mesh.x0
+            )
+        else:
+            raise TypeError(
+                'Only a TensorMesh or a TreeMesh can be coarsened, not a '
+                '{}'.format(type(mesh).__name__)
+            )
+    return mesh
@@ -0,0 +1,176 @@
+from __future__ import division
+
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # python 2 without the futures backport
+    ThreadPoolExecutor = None
+
+
+class DiskMatrix(object):
+    """
+        Dense matrix stored in a memory mapped file.
+
+        The matrix is written by blocks of rows (:code:`J[i0:i1] = rows`)
+        and the products :code:`J.dot(v)`, :code:`J.T.dot(v)` and the
+        (weighted) column norms are computed by streaming blocks of rows, so
+        the memory used does not depend on the number of rows. The values are
+        stored in single precision by default, the products are computed in
+        double precision.
+
+        ::
+
+            J = DiskMatrix((nD, nP))
+            J[0:10] = rows  # (10 x nP)
+            Jv = J.dot(v)
+            Jtw = J.T.dot(w)
+
+        :param tuple shape: (nRows, nColumns)
+        :param str fileName: file used to store the matrix, a temporary file
+            (deleted with the matrix) is created if it is not given
+        :param str directory: directory of the temporary file
+        :param numpy.dtype dtype: precision of the stored values
+        :param int blockRows: number of rows read at once, by default blocks
+            of about :code:`blockMemory` bytes
+        :param int nThreads: number of threads used for the products
+    """
+
+    blockMemory = 2**26  #: size (bytes) of the blocks of rows by default
+
+    def __init__(
+        self, shape, fileName=None, directory=None, dtype=np.float32,
+        blockRows=None, nThreads=1
+    ):
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.dtype = np.dtype(dtype)
+        self.nThreads = nThreads
+
+        self._ownsFile = fileName is None
+        if fileName is None:
+            fd, fileName = tempfile.mkstemp(suffix='.dat', dir=directory)
+            os.close(fd)
+        self.fileName = fileName
+        self._data = np.memmap(
+            fileName, dtype=self.dtype, mode='w+', shape=self.shape
+        )
+
+        if blockRows is None:
+            rowBytes = max(self.shape[1] * self.dtype.itemsize, 1)
+            blockRows = max(int(self.blockMemory // rowBytes), 1)
+        self.blockRows = blockRows
+
+    @property
+    def blocks(self):
+        """
+            (start, end) rows of the blocks
+        """
+        starts = range(0, self.shape[0], self.blockRows)
+        return [
+            (i0, min(i0 + self.blockRows, self.shape[0])) for i0 in starts
+        ]
+
+    def __setitem__(self, rows, values):
+        self._data[rows] = values
+
+    def __getitem__(self, rows):
+        return np.asarray(self._data[rows], dtype=float)
+
+    def _map(self, fun):
+        if self.nThreads > 1 and ThreadPoolExecutor is not None:
+            with ThreadPoolExecutor(max_workers=self.nThreads) as pool:
+                return list(pool.map(fun, self.blocks))
+        return [fun(block) for block in self.blocks]
+
+    def dot(self, v):
+        """
+            Product with a vector or a matrix, :code:`J * v`
+        """
+        v = np.asarray(v, dtype=float)
+        out = np.empty((self.shape[0],) + v.shape[1:])
+
+        def product(block):
+            i0, i1 = block
+            out[i0:i1] = self[i0:i1].dot(v)
+
+        self._map(product)
+        return out
+
+    def tdot(self, v):
+        """
+            Adjoint product with a vector or a matrix, :code:`J.T * v`
+        """
+        v = np.asarray(v, dtype=float)
+
+        def product(block):
+            i0, i1 = block
+            return self[i0:i1].T.dot(v[i0:i1])
+
+        out = np.zeros((self.shape[1],) + v.shape[1:])
+        for part in self._map(product):
+            out += part
+        return out
+
+    def columnNorms(self, w=None):
+        """
+            Squared norms of the columns of the matrix with the rows weighted
+            by w, :math:`\\text{diag}(\\mathbf{J^T W^T W J})` for
+            :code:`W = diag(w)`. If w is a matrix, the norms are computed for
+            each of its columns.
+        """
+        if w is None:
+            w = np.ones(self.shape[0])
+        w = np.asarray(w, dtype=float)
+
+        def norms(block):
+            i0, i1 = block
+            return (self[i0:i1]**2).T.dot(w[i0:i1]**2)
+
+        out = np.zeros((self.shape[1],) + w.shape[1:])
+        for part in self._map(norms):
+            out += part
+        return out
+
+    def __mul__(self, v):
+        return self.dot(v)
+
+    @property
+    def T(self):
+        return _DiskMatrixTranspose(self)
+
+    def clean(self):
+        """
+            Release the memory map, and delete the file if it is temporary
+        """
+        if getattr(self, '_data', None) is not None:
+            self._data = None
+            if self._ownsFile and os.path.exists(self.fileName):
+                try:
+                    os.remove(self.fileName)
+                except OSError:  # still mapped (windows)
+                    pass
+
+    def __del__(self):
+        try:
+            self.clean()
+        except Exception:
+            pass
+
+
+class _DiskMatrixTranspose(object):
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    @property
+    def shape(self):
+        return self.matrix.shape[::-1]
+
+    def dot(self, v):
+        return self.matrix.tdot(v)
+
+    def __mul__(self, v):
+        return self.matrix.tdot(v)
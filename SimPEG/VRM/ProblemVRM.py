@@ -630,6 +630,30 @@ class Problem_BaseVRM(Problem.BaseProblem):
 
         return np.matrix(G)
 
+    def _getDecayKeys(self):
+
+        """
+        Returns the distinct (waveform, times, fieldType) of the receivers,
+        which share their characteristic decays, and the index of the decay
+        of each receiver (in the order of the data)
+
+        """
+
+        keys = []
+        index = []
+        lookup = {}
+
+        for srcObj in self.survey.srcList:
+            for rxObj in srcObj.rxList:
+                times = np.asarray(rxObj.times, dtype=float)
+                key = (id(srcObj.waveform), times.tobytes(), rxObj.fieldType)
+                if key not in lookup:
+                    lookup[key] = len(keys)
+                    keys.append((srcObj.waveform, times, rxObj.fieldType))
+                index.append(lookup[key])
+
+        return keys, index
+
     def _getAMatricies(self):
 
         """Returns the full geometric operator"""
@@ -790,28 +814,37 @@ class Problem_Linear(Problem_BaseVRM):
 
             print('CREATING T MATRIX')
 
-            srcList = self.survey.srcList
-            nSrc = len(srcList)
-            T = []
-
-            for pp in range(0, nSrc):
-
-                rxList = srcList[pp].rxList
-                nRx = len(rxList)
-                waveObj = srcList[pp].waveform
-
-                for qq in range(0, nRx):
-
-                    times = rxList[qq].times
-                    nLoc = np.shape(rxList[qq].locs)[0]
-
-                    I = sp.diags(np.ones(nLoc))
-                    eta = waveObj.getCharDecay(rxList[qq].fieldType, times)
-                    eta = np.matrix(eta).T
-
-                    T.append(sp.kron(I, eta))
-
-            self._T = sp.block_diag(T)
+            # Decays shared by the receivers with the same waveform, times
+            # and field type
+            keys, index = self._getDecayKeys()
+            etas = [
+                waveObj.getCharDecay(fieldType, times)
+                for waveObj, times, fieldType in keys
+            ]
+
+            # Block diagonal matrix of the kron(I, eta) of all receivers
+            rows, cols, vals = [], [], []
+            nD = 0
+            nR = 0
+            rxList = [rx for src in self.survey.srcList for rx in src.rxList]
+
+            for rxObj, ii in zip(rxList, index):
+
+                eta = etas[ii]
+                nLoc = np.shape(rxObj.locs)[0]
+                nT = len(eta)
+
+                rows.append(nD + np.arange(nLoc*nT))
+                cols.append(nR + np.repeat(np.arange(nLoc), nT))
+                vals.append(np.tile(eta, nLoc))
+
+                nD += nLoc*nT
+                nR += nLoc
+
+            self._T = sp.csr_matrix(
+                (np.hstack(vals), (np.hstack(rows), np.hstack(cols))),
+                shape=(nD, nR)
+            )
             self._TisSet = True
 
             return self._T
@@ -836,6 +869,35 @@ class Problem_Linear(Problem_BaseVRM):
         # Must return as a numpy array
         return mkvc(sp.coo_matrix.dot(self.T, np.dot(self.A, m)))
 
+    def dpred_batch(self, M, nProcesses=1):
+
+        """Computes the active data d = T*A*m of an ensemble of models (nP x k)"""
+
+        if self.ispaired is False:
+            raise AssertionError("Problem must be paired with survey to generate A matrix")
+
+        # One product of A and T for all the models
+        XI = Problem._mapColumns(self.xiMap, M)
+        D = np.asarray(self.T.dot(np.dot(self.A, XI)))
+
+        return D[self.survey.t_active, :]
+
+    def getJ(self, m, f=None):
+
+        """Computes the sensitivity matrix Pd*T*A*dxidm"""
+
+        if self.ispaired is False:
+            raise AssertionError("Problem must be paired with survey to generate A matrix")
+
+        # Get active time rows of T
+        T = self.T.tocsr()[self.survey.t_active, :]
+
+        # Jacobian of xi wrt model
+        dxidm = self.xiMap.deriv(m)
+
+        # Must return an array
+        return np.asarray(dxidm.T * np.asarray(T.dot(self.A)).T).T
+
     def Jvec(self, m, v, f=None):
 
         """Compute Pd*T*A*dxidm*v"""
@@ -952,24 +1014,36 @@ class Problem_LogUniform(Problem_BaseVRM):
         if self.ispaired is False:
             AssertionError("Problem must be paired with survey to generate A matrix")
 
+        # Decays (nC X nT) shared by the receivers with the same waveform,
+        # times and field type, side by side
+        keys, index = self._getDecayKeys()
+        eta = [
+            waveObj.getLogUniformDecay(
+                fieldType, times, self.chi0, self.dchi, self.tau1, self.tau2
+            )
+            for waveObj, times, fieldType in keys
+        ]
+        cols = np.cumsum([0] + [np.shape(etaK)[1] for etaK in eta])
+        eta = np.hstack(eta)
+
         # Fields from each source
         srcList = self.survey.srcList
-        nSrc = len(srcList)
         f = []
+        ii = 0
 
-        for pp in range(0, nSrc):
+        for pp in range(0, len(srcList)):
 
-            rxList = srcList[pp].rxList
-            nRx = len(rxList)
-            waveObj = srcList[pp].waveform
+            # Fields of all receivers for all decays
+            F = np.asarray(self.A[pp].dot(eta))
+            row = 0
 
-            for qq in range(0, nRx):
+            for rxObj in srcList[pp].rxList:
 
-                times = rxList[qq].times
-                eta = waveObj.getLogUniformDecay(
-                    rxList[qq].fieldType, times, self.chi0, self.dchi, self.tau1, self.tau2
-                )
+                nLoc = np.shape(rxObj.locs)[0]
+                kk = index[ii]
+                f.append(F[row:row+nLoc, cols[kk]:cols[kk+1]].ravel())
 
-                f.append(mkvc((self.A[qq] * np.matrix(eta)).T))
+                row += nLoc
+                ii += 1
 
-        return np.array(np.hstack(f))
+        return np.hstack(f)
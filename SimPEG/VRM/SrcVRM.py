@@ -107,7 +107,7 @@ class MagDipole(BaseSrcVRM):
 
         """
 
-        refFlag = np.zeros(np.shape(xyzc)[0], dtype=np.int)
+        refFlag = np.zeros(np.shape(xyzc)[0], dtype=int)
 
         r = np.sqrt(
             (xyzc[:, 0] - self.loc[0])**2 +
@@ -223,7 +223,7 @@ class CircLoop(BaseSrcVRM):
 
         """
 
-        refFlag = np.zeros(np.shape(xyzc)[0], dtype=np.int)
+        refFlag = np.zeros(np.shape(xyzc)[0], dtype=int)
 
         r0 = self.loc
         a = self.radius
@@ -378,13 +378,13 @@ class LineCurrent(BaseSrcVRM):
 
         """
 
-        ref_flag = np.zeros(np.shape(xyzc)[0], dtype=np.int)
+        ref_flag = np.zeros(np.shape(xyzc)[0], dtype=int)
 
         nSeg = np.shape(self.loc)[0] - 1
 
         for tt in range(0, nSeg):
 
-            ref_flag_tt = np.zeros(np.shape(xyzc)[0], dtype=np.int)
+            ref_flag_tt = np.zeros(np.shape(xyzc)[0], dtype=int)
             tx0 = self.loc[tt, :]
             tx1 = self.loc[tt+1, :]
             a = (tx1[0] - tx0[0])**2 + (tx1[1] - tx0[1])**2 + (tx1[2] - tx0[2])**2
@@ -403,7 +403,7 @@ class LineCurrent(BaseSrcVRM):
                     (tx0[2] - xyzc[:, 2])**2 -
                     d**2
                 )
-                e = np.array(b**2 - 4*a*c, dtype=np.complex)
+                e = np.array(b**2 - 4*a*c, dtype=complex)
 
                 q_pos = (-b + np.sqrt(e))/(2*a)
                 q_neg = (-b - np.sqrt(e))/(2*a)
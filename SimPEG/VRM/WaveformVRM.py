@@ -2,6 +2,41 @@ import numpy as np
 import scipy.special as spec
 import properties
 
+
+def _getPiecewiseLinearDecay(fieldType, times, tvec, dt, g, maxChunkSize=1e6):
+
+    """
+    Characteristic decay function of a piecewise linear waveform, the sum of
+    the decays of its segments [tvec-dt, tvec] with currents g[:-1] and
+    g[1:] at their ends. The times are processed in chunks so that the arrays
+    have at most maxChunkSize entries.
+
+    """
+
+    times = np.asarray(times, dtype=float)
+    dg = g[1:] - g[0:-1]
+    chunk = max(1, int(maxChunkSize // len(tvec)))
+    eta = np.zeros(len(times))
+
+    for start in range(0, len(times), chunk):
+
+        tau = times[start:start+chunk, None] - tvec[None, :]
+
+        if fieldType in ["h", "b"]:
+            eta[start:start+chunk] = np.sum(
+                (g[1:] + dg*tau/dt)*np.log(1 + dt/tau) - g[1:] + g[0:-1],
+                axis=1
+            )
+        elif fieldType in ["dhdt", "dbdt"]:
+            eta[start:start+chunk] = np.sum(
+                (dg/dt)*np.log(1 + dt/tau) -
+                (g[1:] + dg*tau/dt)*(1/(tau + dt) - 1/tau),
+                axis=1
+            )
+
+    return eta
+
+
 ###################################################
 #           STEP OFF WAVEFORM
 ###################################################
@@ -90,11 +125,12 @@ class StepOff(properties.HasProperties):
         nC = len(dchi)
         t0 = self.t0
 
-        times = np.kron(np.ones((nC, 1)), times)
-        chi0 = np.kron(np.reshape(chi0, newshape=(nC, 1)), np.ones((1, nT)))
-        dchi = np.kron(np.reshape(dchi, newshape=(nC, 1)), np.ones((1, nT)))
-        tau1 = np.kron(np.reshape(tau1, newshape=(nC, 1)), np.ones((1, nT)))
-        tau2 = np.kron(np.reshape(tau2, newshape=(nC, 1)), np.ones((1, nT)))
+        # (nC, nT) arrays by broadcasting
+        times = np.reshape(times, (1, nT))
+        chi0 = np.reshape(chi0, (nC, 1))
+        dchi = np.reshape(dchi, (nC, 1))
+        tau1 = np.reshape(tau1, (nC, 1))
+        tau2 = np.reshape(tau2, (nC, 1))
 
         if fieldType is "h":
             eta = (
@@ -227,11 +263,12 @@ class SquarePulse(properties.HasProperties):
         t0 = self.t0
         delt = self.delt
 
-        times = np.kron(np.ones((nC, 1)), times)
-        chi0 = np.kron(np.reshape(chi0, newshape=(nC, 1)), np.ones((1, nT)))
-        dchi = np.kron(np.reshape(dchi, newshape=(nC, 1)), np.ones((1, nT)))
-        tau1 = np.kron(np.reshape(tau1, newshape=(nC, 1)), np.ones((1, nT)))
-        tau2 = np.kron(np.reshape(tau2, newshape=(nC, 1)), np.ones((1, nT)))
+        # (nC, nT) arrays by broadcasting
+        times = np.reshape(times, (1, nT))
+        chi0 = np.reshape(chi0, (nC, 1))
+        dchi = np.reshape(dchi, (nC, 1))
+        tau1 = np.reshape(tau1, (nC, 1))
+        tau2 = np.reshape(tau2, (nC, 1))
 
         if fieldType is "h":
             eta = (
@@ -363,21 +400,7 @@ class ArbitraryDiscrete(properties.HasProperties):
         g = np.r_[Iwave[0], np.interp(tvec[1:-1], twave, Iwave), Iwave[-1]]
         tvec = tvec[1:]
 
-        eta = np.zeros(len(times))
-
-        if fieldType in ["h", "b"]:
-            for tt in range(0, len(eta)):
-                eta[tt] = np.sum(
-                    (g[1:] + (g[1:]-g[0:-1])*(times[tt]-tvec)/dt) *
-                    np.log(1 + dt/(times[tt] - tvec)) - g[1:] + g[0:-1]
-                )
-        elif fieldType in ["dhdt", "dbdt"]:
-            for tt in range(0, len(eta)):
-                eta[tt] = np.sum(
-                    ((g[1:]-g[0:-1])/dt)*np.log(1 + dt/(times[tt] - tvec)) -
-                    (g[1:] + (g[1:]-g[0:-1])*(times[tt]-tvec)/dt) *
-                    (1/(times[tt] - tvec + dt) - 1/(times[tt] - tvec))
-                )
+        eta = _getPiecewiseLinearDecay(fieldType, times, tvec, dt, g)
 
         if fieldType in ["b", "dbdt"]:
             mu0 = 4*np.pi*1e-7
@@ -467,21 +490,7 @@ class ArbitraryPiecewise(properties.HasProperties):
         g = self.I_wave[j:k+1]/np.max(np.abs(self.I_wave[j:k+1]))
         tvec = tvec[1:]
 
-        eta = np.zeros(len(times))
-
-        if fieldType in ["h", "b"]:
-            for tt in range(0, len(eta)):
-                eta[tt] = np.sum(
-                    (g[1:] + (g[1:]-g[0:-1])*(times[tt]-tvec)/dt) *
-                    np.log(1 + dt/(times[tt] - tvec)) - g[1:] + g[0:-1]
-                )
-        elif fieldType in ["dhdt", "dbdt"]:
-            for tt in range(0, len(eta)):
-                eta[tt] = np.sum(
-                    ((g[1:]-g[0:-1])/dt)*np.log(1 + dt/(times[tt] - tvec)) -
-                    (g[1:] + (g[1:]-g[0:-1])*(times[tt]-tvec)/dt) *
-                    (1/(times[tt] - tvec + dt) - 1/(times[tt] - tvec))
-                )
+        eta = _getPiecewiseLinearDecay(fieldType, times, tvec, dt, g)
 
         if fieldType in ["b", "dbdt"]:
             mu0 = 4*np.pi*1e-7
@@ -14,6 +14,7 @@ from . import InvProblem
 from . import Optimization
 from . import Directives
 from . import Inversion
+from . import Distributed
 from . import Tests
 
 from . import Utils
@@ -21,7 +22,7 @@ from .Utils import mkvc
 from .Utils import versions
 from .Utils.SolverUtils import (
     _checkAccuracy, SolverWrapD, SolverWrapI,
-    Solver, SolverCG, SolverDiag, SolverLU, SolverBiCG,
+    Solver, SolverCG, SolverDiag, SolverLU, SolverBiCG, SolverKrylov
 )
 __version__   = '0.11.3'
 __author__    = 'SimPEG Team'
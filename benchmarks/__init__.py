@@ -0,0 +1,26 @@
+"""
+Performance benchmarks for SimPEG.
+
+The benchmarks follow the `airspeed velocity <https://asv.readthedocs.io>`_
+conventions (``setup``, ``params``, ``time_*`` and ``peakmem_*``) and can be
+run with asv from the root of the repository::
+
+    asv run
+    asv continuous master HEAD
+
+or, without asv, with the small offline runner that ships with them::
+
+    python -m benchmarks
+    python -m benchmarks bench_dc bench_pf
+
+Two problem-size configurations are available and selected with the
+``SIMPEG_BENCHMARK_CONFIG`` environment variable: ``laptop`` (default, runs
+in a few minutes) and ``nightly`` (larger meshes and surveys).
+
+Every problem benchmark times ``fields``, ``Jvec`` and ``Jtvec``. The
+assembly of the full sensitivity matrix (``time_getJ`` / ``peakmem_getJ``)
+is timed for the problems that implement ``getJ``: DC, the integral PF
+problems, Richards, the linear VRM problem, straight ray tomography and the
+stitched 1D EM and NSEM problems. The FDEM, TDEM and 3D (and 1D finite
+volume) NSEM problems have no ``getJ`` and only time the products.
+"""
@@ -0,0 +1,104 @@
+"""
+Minimal offline runner for the benchmarks, for when asv is not available::
+
+    python -m benchmarks [module ...] [-k pattern] [--repeat N]
+
+Timings are the best of ``--repeat`` calls, peak memory is the largest
+allocation made through the python allocator during the call (measured with
+tracemalloc) rather than the process RSS that asv reports.
+"""
+from __future__ import print_function
+from __future__ import division
+
+import argparse
+import importlib
+import inspect
+import itertools
+import pkgutil
+import time
+import tracemalloc
+
+from . import common
+
+
+def iter_benchmarks(modules, pattern):
+    package = importlib.import_module(__package__)
+    names = [
+        name for _, name, _ in pkgutil.iter_modules(package.__path__)
+        if name.startswith('bench_')
+    ]
+    for name in sorted(names):
+        if modules and name not in modules:
+            continue
+        module = importlib.import_module('{}.{}'.format(__package__, name))
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            methods = [
+                meth for meth in sorted(dir(cls))
+                if meth.startswith(('time_', 'peakmem_')) and (
+                    pattern is None or pattern in '{}.{}.{}'.format(
+                        name, cls.__name__, meth
+                    )
+                )
+            ]
+            if methods:
+                yield name, cls, methods
+
+
+def run(modules=None, pattern=None, repeat=1):
+    print('SimPEG benchmarks, configuration: {}'.format(common.CONFIG))
+    for name, cls, methods in iter_benchmarks(modules, pattern):
+        params = getattr(cls, 'params', [[]])
+        for p in itertools.product(*params):
+            bench = cls()
+            label = '{}.{}({})'.format(
+                name, cls.__name__,
+                ', '.join('{}={}'.format(*x) for x in zip(cls.param_names, p))
+            )
+            try:
+                bench.setup(*p)
+            except NotImplementedError:
+                print('{:<70} skipped'.format(label))
+                continue
+            for meth in methods:
+                fun = getattr(bench, meth)
+                if meth.startswith('time_'):
+                    best = min(_time(fun, p) for _ in range(repeat))
+                    print('{:<70} {:<16} {:10.4f} s'.format(label, meth, best))
+                else:
+                    peak = _peakmem(fun, p)
+                    print('{:<70} {:<16} {:10.2f} MB'.format(
+                        label, meth, peak / 1024.**2
+                    ))
+
+
+def _time(fun, p):
+    tic = time.time()
+    fun(*p)
+    return time.time() - tic
+
+
+def _peakmem(fun, p):
+    tracemalloc.start()
+    try:
+        fun(*p)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the SimPEG benchmarks')
+    parser.add_argument(
+        'modules', nargs='*', help='benchmark modules, e.g. bench_dc'
+    )
+    parser.add_argument(
+        '-k', dest='pattern', default=None,
+        help='only run benchmarks whose name contains this string'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=1, help='number of timing repeats'
+    )
+    args = parser.parse_args()
+    run(args.modules, args.pattern, args.repeat)
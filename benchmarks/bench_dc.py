@@ -0,0 +1,77 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps, Utils
+from SimPEG.EM.Static import DC
+
+from .common import BaseProblemBenchmark, GetJMixin, Solver, sizes
+
+
+def get_dipole_locations(nSrc, dim):
+    """
+        Pole-dipole line along x with nSrc sources and 10 dipoles each.
+    """
+    x = np.linspace(-100., 100., nSrc + 11)
+    if dim == 2:
+        pad = lambda xi: np.c_[xi, np.zeros_like(xi)]
+    else:
+        pad = lambda xi: np.c_[xi, np.zeros_like(xi), np.zeros_like(xi)]
+    return x, pad
+
+
+class DC3D(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[16, 24], [5, 20], ['CC', 'N']],
+        [[32, 48], [20, 80], ['CC', 'N']]
+    )
+    param_names = ['nCx', 'nSrc', 'formulation']
+
+    def setup_problem(self, nCx, nSrc, formulation):
+        cs = 200. / nCx
+        hx = [(cs, 4, -1.3), (cs, nCx), (cs, 4, 1.3)]
+        hz = [(cs, 4, -1.3), (cs, nCx // 2)]
+        mesh = Mesh.TensorMesh([hx, hx, hz], 'CCN')
+        x, pad = get_dipole_locations(nSrc, 3)
+        srcList = []
+        for i in range(nSrc):
+            rx = DC.Rx.Dipole(pad(x[i + 1:i + 11]), pad(x[i + 2:i + 12]))
+            srcList.append(DC.Src.Pole([rx], pad(x[i:i + 1])[0]))
+        survey = DC.Survey(srcList)
+        prob = getattr(DC, 'Problem3D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver
+        )
+        prob.pair(survey)
+        return prob, np.log(1e-2) * np.ones(mesh.nC)
+
+    def clear_J(self):
+        self.prob._Jmatrix = None
+
+
+class DC2D(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[32, 64], [5, 20], ['CC', 'N']],
+        [[128, 256], [20, 80], ['CC', 'N']]
+    )
+    param_names = ['nCx', 'nSrc', 'formulation']
+
+    def setup_problem(self, nCx, nSrc, formulation):
+        cs = 200. / nCx
+        hx = [(cs, 6, -1.3), (cs, nCx), (cs, 6, 1.3)]
+        hz = [(cs, 6, -1.3), (cs, nCx // 2)]
+        mesh = Mesh.TensorMesh([hx, hz], 'CN')
+        x, pad = get_dipole_locations(nSrc, 2)
+        srcList = []
+        for i in range(nSrc):
+            rx = DC.Rx.Dipole_ky(pad(x[i + 1:i + 11]), pad(x[i + 2:i + 12]))
+            srcList.append(DC.Src.Pole([rx], pad(x[i:i + 1])[0]))
+        survey = DC.Survey_ky(srcList)
+        prob = getattr(DC, 'Problem2D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver
+        )
+        prob.pair(survey)
+        return prob, np.log(1e-2) * np.ones(mesh.nC)
+
+    def clear_J(self):
+        self.prob._Jmatrix = None
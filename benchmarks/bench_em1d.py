@@ -0,0 +1,61 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps
+from SimPEG.EM import EM1D
+
+from .common import BaseProblemBenchmark, GetJMixin, sizes
+
+
+def _layers():
+    return Mesh.TensorMesh([[(10., 10, 1.2), (5., 20)]], x0='N')
+
+
+class FDEM1DStitched(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[10, 100]],
+        [[1000, 5000]]
+    )
+    param_names = ['nStation']
+
+    def setup_problem(self, nStation):
+        layers = _layers()
+        locs = np.c_[np.arange(nStation) * 20., np.zeros(nStation)]
+        survey = EM1D.SurveyFDEM1D(
+            locs, [400., 1800., 8200., 40000., 140000.], srcHeight=30.,
+            offset=7.86
+        )
+        prob = EM1D.ProblemFDEM1D(
+            layers, sigmaMap=Maps.ExpMap(nP=nStation * layers.nC)
+        )
+        prob.pair(survey)
+        return prob, np.log(1e-2) * np.ones(nStation * layers.nC)
+
+    def clear_J(self):
+        self.prob._Jblocks = None
+
+
+class TDEM1DStitched(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[10, 50]],
+        [[500, 1000]]
+    )
+    param_names = ['nStation']
+
+    def setup_problem(self, nStation):
+        layers = _layers()
+        locs = np.c_[np.arange(nStation) * 20., np.zeros(nStation)]
+        survey = EM1D.SurveyTDEM1D(
+            locs, np.logspace(-5, -2, 20), srcHeight=30.,
+            srcType='CircularLoop', radius=13.
+        )
+        prob = EM1D.ProblemTDEM1D(
+            layers, sigmaMap=Maps.ExpMap(nP=nStation * layers.nC)
+        )
+        prob.pair(survey)
+        return prob, np.log(1e-2) * np.ones(nStation * layers.nC)
+
+    def clear_J(self):
+        self.prob._Jblocks = None
@@ -0,0 +1,40 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps, Utils
+from SimPEG.EM import FDEM
+
+from .common import BaseProblemBenchmark, Solver, sizes
+
+
+class FDEM3D(BaseProblemBenchmark):
+    params = sizes(
+        [[8, 16], [1, 4], ['e', 'b', 'h', 'j']],
+        [[24, 40], [4, 16], ['e', 'b', 'h', 'j']]
+    )
+    param_names = ['nCx', 'nFreq', 'formulation']
+
+    def setup_problem(self, nCx, nFreq, formulation):
+        cs = 10.
+        h = [(cs, 6, -1.3), (cs, nCx), (cs, 6, 1.3)]
+        mesh = Mesh.TensorMesh([h, h, h], 'CCC')
+        x = np.linspace(-cs * nCx / 4., cs * nCx / 4., 5)
+        locs = Utils.ndgrid(x, x, np.r_[cs / 2.])
+        rxList = [
+            FDEM.Rx.Point_b(locs, 'z', 'real'),
+            FDEM.Rx.Point_b(locs, 'z', 'imag'),
+        ]
+        srcList = [
+            FDEM.Src.MagDipole(rxList, freq=freq, loc=np.r_[0., 0., cs])
+            for freq in np.logspace(0, 3, nFreq)
+        ]
+        survey = FDEM.Survey(srcList)
+        prob = getattr(FDEM, 'Problem3D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver
+        )
+        prob.pair(survey)
+        m = np.log(1e-2) * np.ones(mesh.nC)
+        m[mesh.gridCC[:, 2] > 0.] = np.log(1e-8)
+        return prob, m
@@ -0,0 +1,47 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps
+from SimPEG.FLOW import Richards
+
+from .common import BaseProblemBenchmark, Solver, sizes
+
+
+class Richards1D(BaseProblemBenchmark):
+    params = sizes(
+        [[20, 80], [6, 12]],
+        [[200, 800], [30, 60]]
+    )
+    param_names = ['nC', 'nTimeSteps']
+
+    def setup_problem(self, nC, nTimeSteps):
+        mesh = Mesh.TensorMesh([np.ones(nC) * 20. / nC])
+        mesh.setCellGradBC('dirichlet')
+        params = Richards.Empirical.HaverkampParams().celia1990
+        k_fun, theta_fun = Richards.Empirical.haverkamp(mesh, **params)
+        k_fun.KsMap = Maps.ExpMap(nP=mesh.nC)
+        bc = np.array([-61.5, -20.7])
+        h = np.zeros(mesh.nC) + bc[0]
+        prob = Richards.RichardsProblem(
+            mesh, hydraulic_conductivity=k_fun, water_retention=theta_fun,
+            root_finder_tol=1e-6, debug=False, boundary_conditions=bc,
+            initial_conditions=h, do_newton=False, method='mixed'
+        )
+        prob.timeSteps = [(40, nTimeSteps // 2), (60, nTimeSteps // 2)]
+        prob.Solver = Solver
+        locs = np.linspace(2., 18., 5)
+        times = prob.times[1:]
+        survey = Richards.RichardsSurvey([
+            Richards.SaturationRx(locs, times),
+            Richards.PressureRx(locs, times)
+        ])
+        prob.pair(survey)
+        return prob, np.log(params['Ks'] * np.ones(mesh.nC))
+
+    def time_getJ(self, nC, nTimeSteps):
+        self.prob.Jfull(self.m, f=self.f)
+
+    def peakmem_getJ(self, nC, nTimeSteps):
+        self.prob.Jfull(self.m, f=self.f)
@@ -0,0 +1,105 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps, Utils
+from SimPEG.EM import NSEM
+
+from .common import BaseProblemBenchmark, GetJMixin, Solver, sizes
+
+
+class NSEM1D(BaseProblemBenchmark):
+    params = sizes(
+        [[100, 400], [10, 40]],
+        [[1000, 4000], [40, 100]]
+    )
+    param_names = ['nC', 'nFreq']
+
+    def setup_problem(self, nC, nFreq):
+        mesh = Mesh.TensorMesh(
+            [[(50., 10, -1.3), (50., nC), (50., 10, 1.3)]],
+            x0=[-50. * (nC + 1)]
+        )
+        sigma = np.ones(mesh.nC) * 1e-2
+        sigma[mesh.gridCC > 0] = 1e-8
+        rxList = [
+            NSEM.Rx.Point_impedance1D(np.array([[0.]]), 'real'),
+            NSEM.Rx.Point_impedance1D(np.array([[0.]]), 'imag'),
+        ]
+        srcList = [
+            NSEM.Src.Planewave_xy_1Dprimary(rxList, freq)
+            for freq in np.logspace(3, -3, nFreq)
+        ]
+        survey = NSEM.Survey(srcList)
+        prob = NSEM.Problem1D_ePrimSec(
+            mesh, sigmaPrimary=sigma, sigmaMap=Maps.IdentityMap(mesh),
+            Solver=Solver
+        )
+        prob.pair(survey)
+        return prob, sigma
+
+
+class NSEM3D(BaseProblemBenchmark):
+    params = sizes(
+        [[4, 8], [2, 4]],
+        [[16, 24], [4, 8]]
+    )
+    param_names = ['nCx', 'nFreq']
+
+    def setup_problem(self, nCx, nFreq):
+        cs = 200.
+        h = [(cs, 6, -1.5), (cs, nCx), (cs, 6, 1.5)]
+        hz = [(cs, 8, -1.5), (cs, 2 * nCx), (cs, 8, 1.5)]
+        mesh = Mesh.TensorMesh([h, h, hz], 'CCC')
+        sigma = np.ones(mesh.nC) * 1e-2
+        sigma[mesh.gridCC[:, 2] > 0] = 1e-8
+        x = np.linspace(-cs * nCx / 4., cs * nCx / 4., 3)
+        locs = Utils.ndgrid(x, x, np.r_[0.])
+        rxList = []
+        for rx_orientation in ['xx', 'xy', 'yx', 'yy']:
+            rxList.append(
+                NSEM.Rx.Point_impedance3D(locs, rx_orientation, 'real')
+            )
+            rxList.append(
+                NSEM.Rx.Point_impedance3D(locs, rx_orientation, 'imag')
+            )
+        for rx_orientation in ['zx', 'zy']:
+            rxList.append(NSEM.Rx.Point_tipper3D(locs, rx_orientation, 'real'))
+            rxList.append(NSEM.Rx.Point_tipper3D(locs, rx_orientation, 'imag'))
+        srcList = [
+            NSEM.Src.Planewave_xy_1Dprimary(rxList, freq)
+            for freq in np.logspace(1, -2, nFreq)
+        ]
+        survey = NSEM.Survey(srcList)
+        sigma1d = mesh.r(sigma, 'CC', 'CC', 'M')[0, 0, :]
+        prob = NSEM.Problem3D_ePrimSec(
+            mesh, sigmaPrimary=sigma1d, sigmaMap=Maps.IdentityMap(mesh),
+            Solver=Solver
+        )
+        prob.pair(survey)
+        return prob, sigma
+
+
+class NSEM1DStitched(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[100, 1000], [10, 40]],
+        [[1000, 10000], [40, 100]]
+    )
+    param_names = ['nStation', 'nFreq']
+
+    def setup_problem(self, nStation, nFreq):
+        layers = Mesh.TensorMesh([[(50., 10, 1.3), (50., 20)]], x0='N')
+        locs = np.c_[np.arange(nStation) * 100., np.zeros(nStation)]
+        survey = NSEM.Survey1D_Stitched(
+            locs, np.logspace(3, -3, nFreq), components=['real', 'imag']
+        )
+        prob = NSEM.Problem1D_Stitched(
+            layers, sigmaMap=Maps.IdentityMap(nP=nStation * layers.nC)
+        )
+        prob.pair(survey)
+        return prob, np.ones(nStation * layers.nC) * 1e-2
+
+    def clear_J(self):
+        self.prob._Jblocks = None
+        self.prob._impedancesDeriv = None
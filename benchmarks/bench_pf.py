@@ -0,0 +1,83 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps, Utils, PF
+
+from .common import BaseProblemBenchmark, GetJMixin, sizes
+
+
+def get_pf_setup(nCx, nRx):
+    """
+        Tensor mesh of nCx x nCx x nCx/2 cells below a nRx x nRx grid of
+        receivers.
+    """
+    mesh = Mesh.TensorMesh(
+        [np.ones(nCx) * 5., np.ones(nCx) * 5., np.ones(nCx // 2) * 5.], 'CCN'
+    )
+    xr = np.linspace(-nCx * 2., nCx * 2., nRx)
+    X, Y = np.meshgrid(xr, xr)
+    locs = np.c_[Utils.mkvc(X), Utils.mkvc(Y), np.ones(X.size) * 5.]
+    actv = np.ones(mesh.nC, dtype=bool)
+    model = Utils.ModelBuilder.addBlock(
+        mesh.gridCC, np.zeros(mesh.nC), np.r_[-20., -20., -40.],
+        np.r_[20., 20., -10.], 0.01
+    )
+    return mesh, locs, actv, model
+
+
+class MagneticIntegral(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[16, 24], [10, 20]],
+        [[32, 48], [40, 80]]
+    )
+    param_names = ['nCx', 'nRx']
+
+    def setup_problem(self, nCx, nRx):
+        mesh, locs, actv, model = get_pf_setup(nCx, nRx)
+        rx = PF.BaseMag.RxObs(locs)
+        srcField = PF.BaseMag.SrcField([rx], param=(50000., 90., 0.))
+        survey = PF.BaseMag.LinearSurvey(srcField)
+        prob = PF.Magnetics.MagneticIntegral(
+            mesh, chiMap=Maps.IdentityMap(nP=int(actv.sum())), actInd=actv,
+            silent=True
+        )
+        prob.pair(survey)
+        return prob, model[actv]
+
+    def time_G(self, nCx, nRx):
+        self.prob._G = None
+        self.prob.G
+
+    def peakmem_G(self, nCx, nRx):
+        self.prob._G = None
+        self.prob.G
+
+
+class GravityIntegral(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[16, 24], [10, 20]],
+        [[32, 48], [40, 80]]
+    )
+    param_names = ['nCx', 'nRx']
+
+    def setup_problem(self, nCx, nRx):
+        mesh, locs, actv, model = get_pf_setup(nCx, nRx)
+        rx = PF.BaseGrav.RxObs(locs)
+        srcField = PF.BaseGrav.SrcField([rx])
+        survey = PF.BaseGrav.LinearSurvey(srcField)
+        prob = PF.Gravity.GravityIntegral(
+            mesh, rhoMap=Maps.IdentityMap(nP=int(actv.sum())), actInd=actv,
+            silent=True
+        )
+        prob.pair(survey)
+        return prob, model[actv]
+
+    def time_G(self, nCx, nRx):
+        self.prob._G = None
+        self.prob.G
+
+    def peakmem_G(self, nCx, nRx):
+        self.prob._G = None
+        self.prob.G
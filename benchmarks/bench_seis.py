@@ -0,0 +1,34 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps
+from SimPEG.SEIS import StraightRay
+
+from .common import BaseProblemBenchmark, GetJMixin, sizes
+
+
+class StraightRayTomography(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[20, 40], [10, 20]],
+        [[100, 200], [50, 100]]
+    )
+    param_names = ['nCx', 'nSrc']
+
+    def setup_problem(self, nCx, nSrc):
+        mesh = Mesh.TensorMesh([nCx, nCx])
+        y = np.linspace(0., 1., nSrc)
+        rx = StraightRay.Rx(np.c_[y * 0 + mesh.vectorCCx[-1], y], None)
+        srcList = [
+            StraightRay.Src(loc=np.r_[mesh.vectorCCx[0], yi], rxList=[rx])
+            for yi in y
+        ]
+        survey = StraightRay.Survey(srcList)
+        prob = StraightRay.Problem(mesh, slownessMap=Maps.IdentityMap(mesh))
+        prob.pair(survey)
+        return prob, np.ones(mesh.nC)
+
+    def time_A(self, nCx, nSrc):
+        self.prob._A = None
+        self.prob.A
@@ -0,0 +1,122 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps, Utils, SolverKrylov
+from SimPEG.Utils import SolverUtils
+from SimPEG.EM import FDEM
+from SimPEG.EM.Static import DC
+
+from .common import Solver, sizes
+
+
+def get_solver(solver):
+    if solver == 'direct':
+        return Solver
+    if solver == 'amg' and SolverUtils.pyamg is None:
+        raise NotImplementedError('pyamg is not installed')
+    if solver == 'recycle':
+        return SolverKrylov('gcrotmk', preconditioner='ilu')
+    return SolverKrylov('bicgstab', preconditioner=solver)
+
+
+class BaseSolverBenchmark(object):
+    """
+        Compares the direct solver with the preconditioned Krylov solvers.
+
+        :meth:`time_fields` solves for a new problem and
+        :meth:`time_fields_update` for a model close to the one solved in
+        :meth:`setup` (the Krylov solvers reuse their preconditioner and start
+        from the previous solutions). :meth:`time_Jvec_Jtvec` repeats the
+        products with the same matrices, as in the CG iterations of a
+        Gauss-Newton step ('recycle' keeps a GCROT subspace per matrix).
+    """
+
+    timeout = 600
+    number = 1
+    repeat = (1, 3, 30.)
+
+    def setup(self, *params):
+        np.random.seed(518936)
+        self.prob, self.m = self.setup_problem(*params)
+        self.prob.fields(self.m)
+        self.dm = 0.01 * np.random.randn(len(self.m))
+        self.v = np.random.randn(len(self.m))
+
+    def time_fields(self, *params):
+        self.prob, self.m = self.setup_problem(*params)
+        self.prob.fields(self.m)
+
+    def time_fields_update(self, *params):
+        self.prob.fields(self.m + self.dm)
+
+    def time_Jvec_Jtvec(self, *params):
+        f = self.prob.fields(self.m)
+        v = self.v
+        for i in range(5):
+            v = self.prob.Jtvec(self.m, self.prob.Jvec(self.m, v, f=f), f=f)
+            v /= np.linalg.norm(v)
+
+    def peakmem_fields(self, *params):
+        self.prob.fields(self.m + self.dm)
+
+
+class DC3DSolvers(BaseSolverBenchmark):
+    params = sizes(
+        [[16, 24], ['direct', 'ilu', 'jacobi', 'recycle']],
+        [[32, 64], ['direct', 'ilu', 'amg', 'recycle']]
+    )
+    param_names = ['nCx', 'solver']
+
+    def setup_problem(self, nCx, solver):
+        cs = 200. / nCx
+        hx = [(cs, 4, -1.3), (cs, nCx), (cs, 4, 1.3)]
+        hz = [(cs, 4, -1.3), (cs, nCx // 2)]
+        mesh = Mesh.TensorMesh([hx, hx, hz], 'CCN')
+        x = np.linspace(-100., 100., 16)
+        srcList = []
+        for i in range(5):
+            M = Utils.ndgrid(x[i + 1:i + 11], np.r_[0.], np.r_[0.])
+            N = Utils.ndgrid(x[i + 2:i + 12], np.r_[0.], np.r_[0.])
+            srcList.append(
+                DC.Src.Pole([DC.Rx.Dipole(M, N)], np.r_[x[i], 0., 0.])
+            )
+        prob = DC.Problem3D_CC(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=get_solver(solver)
+        )
+        prob.pair(DC.Survey(srcList))
+        return prob, np.log(1e-2) * np.ones(mesh.nC)
+
+
+class FDEM3DSolvers(BaseSolverBenchmark):
+    """
+        Conductive whole space at high frequencies. With a resistive air
+        layer the curl-curl null space makes ILU preconditioned BiCGStab
+        stall, this needs a preconditioner built for edge elements.
+    """
+    params = sizes(
+        [[8, 16], ['direct', 'ilu', 'recycle']],
+        [[24, 40], ['direct', 'ilu', 'amg', 'recycle']]
+    )
+    param_names = ['nCx', 'solver']
+
+    def setup_problem(self, nCx, solver):
+        cs = 10.
+        h = [(cs, 6, -1.3), (cs, nCx), (cs, 6, 1.3)]
+        mesh = Mesh.TensorMesh([h, h, h], 'CCC')
+        x = np.linspace(-cs * nCx / 4., cs * nCx / 4., 5)
+        locs = Utils.ndgrid(x, x, np.r_[cs / 2.])
+        rxList = [
+            FDEM.Rx.Point_b(locs, 'z', 'real'),
+            FDEM.Rx.Point_b(locs, 'z', 'imag'),
+        ]
+        srcList = [
+            FDEM.Src.MagDipole(rxList, freq=freq, loc=np.r_[0., 0., cs])
+            for freq in [1e3, 1e4]
+        ]
+        prob = FDEM.Problem3D_e(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=get_solver(solver)
+        )
+        prob.pair(FDEM.Survey(srcList))
+        return prob, np.zeros(mesh.nC)
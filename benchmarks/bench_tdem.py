@@ -0,0 +1,98 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Maps, Utils
+from SimPEG.EM import TDEM
+
+from .common import BaseProblemBenchmark, Solver, sizes
+
+
+class TDEM3D(BaseProblemBenchmark):
+    params = sizes(
+        [[8, 12], [10, 20], ['b', 'e']],
+        [[24, 32], [30, 60], ['b', 'e']]
+    )
+    param_names = ['nCx', 'nTimeSteps', 'formulation']
+
+    def setup_problem(self, nCx, nTimeSteps, formulation):
+        cs = 10.
+        h = [(cs, 5, -1.3), (cs, nCx), (cs, 5, 1.3)]
+        mesh = Mesh.TensorMesh([h, h, h], 'CCC')
+        n = nTimeSteps // 2
+        timeSteps = [(1e-5, n), (1e-4, nTimeSteps - n)]
+        times = np.logspace(-4.5, -3.2, 10)
+        x = np.linspace(-cs * nCx / 4., cs * nCx / 4., 3)
+        locs = Utils.ndgrid(x, x, np.r_[cs / 2.])
+        if formulation == 'b':
+            rx = TDEM.Rx.Point_b(locs, times, 'z')
+        else:
+            rx = TDEM.Rx.Point_e(locs, times, 'x')
+        src = TDEM.Src.MagDipole([rx], loc=np.r_[0., 0., cs])
+        survey = TDEM.Survey([src])
+        prob = getattr(TDEM, 'Problem3D_{}'.format(formulation))(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver,
+            timeSteps=timeSteps
+        )
+        prob.pair(survey)
+        m = np.log(1e-2) * np.ones(mesh.nC)
+        m[mesh.gridCC[:, 2] > 0.] = np.log(1e-8)
+        return prob, m
+
+
+class TDEM3DWaveforms(BaseProblemBenchmark):
+    """
+        Data of a dual moment system (trapezoid waveforms), from the
+        time stepping of the waveforms or from the convolutions of one step
+        off response.
+    """
+    params = sizes(
+        [[8, 12], [False, True]],
+        [[24, 32], [False, True]]
+    )
+    param_names = ['nCx', 'stepResponse']
+
+    def setup_problem(self, nCx, stepResponse):
+        cs = 10.
+        h = [(cs, 5, -1.3), (cs, nCx), (cs, 5, 1.3)]
+        mesh = Mesh.TensorMesh([h, h, h], 'CCC')
+        times = np.logspace(-4.5, -3.2, 10)
+        locs = np.r_[0., 0., cs / 2.][None, :]
+        waveforms = [
+            TDEM.Src.TrapezoidWaveform(
+                ramp_on=np.r_[-2e-3, -1.8e-3], ramp_off=np.r_[-2e-4, 0.]
+            ),
+            TDEM.Src.TrapezoidWaveform(
+                ramp_on=np.r_[-1e-3, -9e-4], ramp_off=np.r_[-1e-5, 0.]
+            )
+        ]
+        if stepResponse:
+            rxList = [TDEM.Rx.Point_b(locs, times, 'z') for _ in waveforms]
+            for rx, waveform in zip(rxList, waveforms):
+                rx.waveform = waveform
+            srcList = [TDEM.Src.MagDipole(rxList, loc=np.r_[0., 0., cs])]
+            # the step off response spans the waveforms and the times
+            t0 = 0.
+            timeSteps = [(1e-6, 10), (1e-5, 10), (1e-4, 10), (3e-4, 6)]
+        else:
+            srcList = [
+                TDEM.Src.MagDipole(
+                    [TDEM.Rx.Point_b(locs, times, 'z')], waveform=waveform,
+                    loc=np.r_[0., 0., cs]
+                ) for waveform in waveforms
+            ]
+            t0 = -2e-3
+            timeSteps = [
+                (1e-4, 18), (1e-5, 19), (1e-6, 10), (1e-5, 10), (1e-4, 10)
+            ]
+        survey = TDEM.Survey(srcList)
+        prob = TDEM.Problem3D_b(
+            mesh, sigmaMap=Maps.ExpMap(mesh), Solver=Solver,
+            timeSteps=timeSteps, stepResponse=stepResponse
+        )
+        prob.t0 = t0
+        prob.pair(survey)
+        m = np.log(1e-2) * np.ones(mesh.nC)
+        m[mesh.gridCC[:, 2] > 0.] = np.log(1e-8)
+        return prob, m
@@ -0,0 +1,94 @@
+from __future__ import print_function
+from __future__ import division
+
+import numpy as np
+
+from SimPEG import Mesh, Utils, VRM
+
+from .common import BaseProblemBenchmark, GetJMixin, sizes
+
+
+class VRMLinear(GetJMixin, BaseProblemBenchmark):
+    params = sizes(
+        [[10, 20], [8, 16]],
+        [[30, 40], [24, 40]]
+    )
+    param_names = ['nCx', 'nRx']
+
+    def setup_problem(self, nCx, nRx):
+        mesh = Mesh.TensorMesh(
+            [[(2., nCx)], [(2., nCx)], [(2., nCx // 2)]], x0='CCN'
+        )
+        x = np.linspace(-nCx / 2., nCx / 2., nRx)
+        X, Y = np.meshgrid(x, x)
+        locs = np.c_[Utils.mkvc(X), Utils.mkvc(Y), 0.5 * np.ones(X.size)]
+        times = np.logspace(-4, -2, 5)
+        rxList = [
+            VRM.Rx.Point(locs, times=times, fieldType='dbdt', fieldComp='z')
+        ]
+        L = nCx + 4.
+        txNodes = np.array([
+            [-L, -L, 0.001], [L, -L, 0.001], [L, L, 0.001], [-L, L, 0.001],
+            [-L, -L, 0.001]
+        ])
+        waveform = VRM.WaveformVRM.SquarePulse(delt=0.02)
+        srcList = [VRM.Src.LineCurrent(rxList, txNodes, 1., waveform)]
+        survey = VRM.Survey(srcList)
+        prob = VRM.Problem_Linear(mesh, ref_factor=1)
+        prob.pair(survey)
+        return prob, 1e-4 * np.ones(mesh.nC)
+
+    def time_A(self, nCx, nRx):
+        self.prob._AisSet = False
+        self.prob.A
+
+
+class VRMLogUniform(object):
+    """
+        Times the forward simulation of log-uniform models, with several
+        sources sharing their waveform and times.
+    """
+
+    timeout = 600
+    number = 1
+    repeat = (1, 3, 30.)
+
+    params = sizes(
+        [[10, 20], [4, 8]],
+        [[30, 40], [8, 16]]
+    )
+    param_names = ['nCx', 'nSrc']
+
+    def setup(self, nCx, nSrc):
+        mesh = Mesh.TensorMesh(
+            [[(2., nCx)], [(2., nCx)], [(2., nCx // 2)]], x0='CCN'
+        )
+        x = np.linspace(-nCx / 2., nCx / 2., 8)
+        X, Y = np.meshgrid(x, x)
+        locs = np.c_[Utils.mkvc(X), Utils.mkvc(Y), 0.5 * np.ones(X.size)]
+        times = np.logspace(-4, -2, 5)
+        waveform = VRM.WaveformVRM.SquarePulse(delt=0.02)
+        srcList = []
+        for xs in np.linspace(-nCx / 2., nCx / 2., nSrc):
+            rxList = [
+                VRM.Rx.Point(
+                    locs, times=times, fieldType='dbdt', fieldComp=comp
+                ) for comp in ['x', 'y', 'z']
+            ]
+            srcList.append(
+                VRM.Src.MagDipole(rxList, [xs, 0., 1.], [0., 0., 1.], waveform)
+            )
+        survey = VRM.Survey(srcList)
+        nC = mesh.nC
+        self.prob = VRM.Problem_LogUniform(
+            mesh, ref_factor=1, chi0=np.zeros(nC), dchi=0.01 * np.ones(nC),
+            tau1=1e-8 * np.ones(nC), tau2=np.ones(nC)
+        )
+        self.prob.pair(survey)
+        self.prob.A
+
+    def time_fields(self, nCx, nSrc):
+        self.prob.fields()
+
+    def peakmem_fields(self, nCx, nSrc):
+        self.prob.fields()
@@ -0,0 +1,89 @@
+from __future__ import print_function
+from __future__ import division
+
+import os
+import numpy as np
+
+try:
+    from pymatsolver import Pardiso as Solver
+except ImportError:
+    from SimPEG import SolverLU as Solver
+
+
+#: Name of the problem-size configuration: 'laptop' or 'nightly'
+CONFIG = os.environ.get('SIMPEG_BENCHMARK_CONFIG', 'laptop')
+
+if CONFIG not in ['laptop', 'nightly']:
+    raise ValueError(
+        'SIMPEG_BENCHMARK_CONFIG must be "laptop" or "nightly", not '
+        '{}'.format(CONFIG)
+    )
+
+
+def sizes(laptop, nightly):
+    """
+        Pick the parameter list of the active configuration.
+    """
+    if CONFIG == 'nightly':
+        return nightly
+    return laptop
+
+
+class BaseProblemBenchmark(object):
+    """
+        Times the forward simulation and the sensitivity products of a
+        problem.
+
+        Subclasses set *params* / *param_names* and implement
+        :meth:`setup_problem`, which returns the paired problem and the model
+        at which the products are evaluated. The fields are computed once in
+        :meth:`setup` so that *Jvec* and *Jtvec* only time the products.
+    """
+
+    timeout = 600
+    number = 1
+    repeat = (1, 3, 30.)
+
+    def setup_problem(self, *params):
+        raise NotImplementedError(
+            'setup_problem has not been implemented for {}'.format(
+                self.__class__.__name__
+            )
+        )
+
+    def setup(self, *params):
+        np.random.seed(518936)
+        self.prob, self.m = self.setup_problem(*params)
+        self.survey = self.prob.survey
+        self.f = self.prob.fields(self.m)
+        self.v = np.random.rand(len(self.m))
+        self.w = np.random.rand(self.survey.nD)
+
+    def time_fields(self, *params):
+        self.prob.fields(self.m)
+
+    def time_Jvec(self, *params):
+        self.prob.Jvec(self.m, self.v, f=self.f)
+
+    def time_Jtvec(self, *params):
+        self.prob.Jtvec(self.m, self.w, f=self.f)
+
+    def peakmem_fields(self, *params):
+        self.prob.fields(self.m)
+
+
+class GetJMixin(object):
+    """
+        Adds a benchmark of the assembly of the full sensitivity matrix.
+    """
+
+    def clear_J(self):
+        pass
+
+    def time_getJ(self, *params):
+        self.clear_J()
+        self.prob.getJ(self.m, f=self.f)
+
+    def peakmem_getJ(self, *params):
+        self.clear_J()
+        self.prob.getJ(self.m, f=self.f)
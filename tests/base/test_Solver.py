@@ -1,5 +1,7 @@
 import unittest
-from SimPEG import Mesh, Solver, SolverDiag, SolverCG, SolverLU, Utils
+from SimPEG import (
+    Mesh, Solver, SolverDiag, SolverCG, SolverLU, SolverKrylov, Utils
+)
 from discretize import TensorMesh
 from SimPEG.Utils import sdiag
 import numpy as np
@@ -54,6 +56,147 @@ class TestSolver(unittest.TestCase):
     def test_iterative_cg_1(self): self.assertLess(dotest(SolverCG, False),TOLI)
     def test_iterative_cg_M(self): self.assertLess(dotest(SolverCG, True),TOLI)
 
+    def test_mixed_splu_1(self): self.assertLess(dotest(SolverLU, False, mixedPrecision=True),TOLD)
+    def test_mixed_splu_M(self): self.assertLess(dotest(SolverLU, True, mixedPrecision=True),TOLD)
+    def test_mixed_spsolve_M(self): self.assertLess(dotest(Solver, True, mixedPrecision=True),TOLD)
+
+    def test_krylov_ilu_1(self): self.assertLess(dotest(SolverKrylov('bicgstab', 'ilu'), False),TOLI)
+    def test_krylov_ilu_M(self): self.assertLess(dotest(SolverKrylov('bicgstab', 'ilu'), True),TOLI)
+    def test_krylov_jacobi_1(self): self.assertLess(dotest(SolverKrylov('cg', 'jacobi'), False),TOLI)
+    def test_krylov_gmres_M(self): self.assertLess(dotest(SolverKrylov('gmres', 'ilu'), True),TOLI)
+    def test_krylov_gcrotmk_M(self): self.assertLess(dotest(SolverKrylov('gcrotmk', 'ilu'), True),TOLI)
+
+
+class TestMixedPrecision(unittest.TestCase):
+
+    def setUp(self):
+        M = TensorMesh([np.ones(8)]*3)
+        self.M = M
+        self.Me = M.getEdgeInnerProduct()
+        self.CtC = M.edgeCurl.T*M.getFaceInnerProduct()*M.edgeCurl
+        self.rhs = np.random.rand(M.nE, 2)
+
+    def test_refinement(self):
+        A = self.CtC + 1j*self.Me
+        Ainv = SolverLU(A, mixedPrecision=True)
+        self.assertEqual(Ainv.solver.L.dtype, np.complex64)
+        x = Ainv * self.rhs
+        self.assertLess(
+            np.linalg.norm(A*x - self.rhs)/np.linalg.norm(self.rhs), 1e-10
+        )
+        self.assertEqual(Ainv.Alow.dtype, np.complex64)
+
+    def test_fallback(self):
+        # the single precision factor is too poor for the refinement, or
+        # singular
+        for eps in [1e-6, 1e-9]:
+            A = self.CtC + eps*self.Me
+            Ainv = SolverLU(A, mixedPrecision=True, checkAccuracy=False)
+            x = Ainv * self.rhs[:, 0]
+            self.assertTrue(Ainv.Alow is None)
+            self.assertEqual(Ainv.solver.L.dtype, np.float64)
+            self.assertTrue(np.allclose(x, SolverLU(A) * self.rhs[:, 0]))
+
+
+class TestSolverKrylov(unittest.TestCase):
+
+    def setUp(self):
+        M = TensorMesh([np.ones(12)]*3)
+        self.M = M
+        self.rhs = np.random.rand(M.nC, 3)
+
+        def getA(sigma):
+            A = M.faceDiv*M.getFaceInnerProduct(sigma)*M.faceDiv.T
+            return A + Utils.sdiag(1e-3*M.vol)
+        self.getA = getA
+
+    def test_reuse(self):
+        Ainv = SolverKrylov('bicgstab', 'ilu', tol=1e-10)
+        sigma = np.random.rand(self.M.nC) + 1.
+
+        A = self.getA(sigma)
+        x = Ainv(A) * self.rhs
+        self.assertLess(np.linalg.norm(A*x - self.rhs)/np.linalg.norm(self.rhs), 1e-8)
+        self.assertEqual(Ainv.nBuilds, 1)
+        first = list(Ainv.iterations)[-3:]
+
+        # a nearby model reuses the preconditioner and the solutions
+        A = self.getA(sigma*1.01)
+        x = Ainv(A) * self.rhs
+        self.assertLess(np.linalg.norm(A*x - self.rhs)/np.linalg.norm(self.rhs), 1e-8)
+        self.assertEqual(Ainv.nBuilds, 1)
+        self.assertLess(sum(list(Ainv.iterations)[-3:]), sum(first))
+
+        # a model far away gets a new one
+        A = self.getA(sigma*100.)
+        Ainv(A) * self.rhs
+        self.assertEqual(Ainv.nBuilds, 2)
+
+    def test_rebuild(self):
+        # the preconditioner is rebuilt if the convergence slows down
+        Ainv = SolverKrylov(
+            'bicgstab', 'ilu', maxChange=np.inf, warmStart=False,
+            preconditionerOpts={'drop_tol': 0.}
+        )
+        sigma = np.ones(self.M.nC)
+        Ainv(self.getA(sigma)) * self.rhs[:, 0]
+        self.assertEqual(Ainv.nBuilds, 1)
+
+        sigma = np.exp(3*np.random.randn(self.M.nC))
+        A = self.getA(sigma)
+        x = Ainv(A) * self.rhs[:, 0]
+        self.assertLess(np.linalg.norm(A*x - self.rhs[:, 0])/np.linalg.norm(self.rhs[:, 0]), 1e-6)
+        self.assertEqual(Ainv.nBuilds, 2)
+
+    def test_recycle(self):
+        Ainv = SolverKrylov(
+            'gcrotmk', 'jacobi', warmStart=False, maxSubspaces=2
+        )
+        rand = np.random.RandomState(3)
+        sigma = rand.rand(self.M.nC) + 1.
+        A = self.getA(sigma)
+        b = self.rhs[:, 0]
+        for i in range(6):
+            # the matrix is assembled again, as in the FDEM Jvec
+            rhs = b + 0.1*rand.randn(self.M.nC)
+            x = Ainv(self.getA(sigma)) * rhs
+            self.assertLess(np.linalg.norm(A*x - rhs)/np.linalg.norm(rhs), 1e-7)
+        slots = Ainv._subspaces[Ainv._pattern(A)]
+        self.assertEqual(len(slots), 1)
+        self.assertLess(Ainv.iterations[-1], 0.9*Ainv.iterations[0])
+
+        # a new model replaces the subspace of the slot of its matrix
+        CU = slots[0]['CU']
+        Ainv(self.getA(1.01*sigma)) * b
+        self.assertEqual(len(slots), 1)
+        self.assertFalse(slots[0]['CU'] is CU)
+
+        # matrices far apart (e.g. frequencies) get their own slots, at most
+        # maxSubspaces of them
+        Ainv(self.getA(10*sigma)) * b
+        self.assertEqual(len(slots), 2)
+        Ainv(self.getA(100*sigma)) * b
+        self.assertEqual(len(slots), 2)
+
+    def test_history(self):
+        # only the iterations of the last solves are kept
+        Ainv = SolverKrylov('cg', 'jacobi', maxHistory=4)
+        A = self.getA(np.ones(self.M.nC))
+        for i in range(3):
+            Ainv(A) * self.rhs
+        self.assertEqual(len(Ainv.iterations), 4)
+
+    def test_tracer(self):
+        tracer = Utils.enableTracing()
+        try:
+            Ainv = SolverKrylov('bicgstab', 'jacobi')
+            Ainv(self.getA(np.ones(self.M.nC))) * self.rhs
+        finally:
+            Utils.disableTracing()
+        self.assertEqual(tracer.counts['preconditioners'], 1)
+        self.assertEqual(tracer.counts['solves'], 3)
+        self.assertEqual(tracer.counts['krylovIterations'], sum(Ainv.iterations))
+
 
 
 if __name__ == '__main__':
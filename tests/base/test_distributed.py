@@ -0,0 +1,169 @@
+from __future__ import print_function
+
+import unittest
+
+import numpy as np
+
+from SimPEG import (
+    Mesh, DataMisfit, Maps, Utils, Regularization, InvProblem, Optimization,
+    Distributed
+)
+from SimPEG.EM.Static import DC
+
+
+def getMesh():
+    return Mesh.TensorMesh([20, 20], x0=[-0.5, -1.])
+
+
+def setupDC(srcList):
+    mesh = getMesh()
+    prob = DC.Problem3D_CC(mesh, rhoMap=Maps.ExpMap(mesh))
+    prob.pair(DC.Survey(srcList))
+    return prob
+
+
+def setupFails(srcList):
+    raise ValueError('no mesh')
+
+
+class DistributedDataMisfitTest(unittest.TestCase):
+
+    transport = Distributed.SocketTransport()
+
+    def setUp(self):
+        mesh = getMesh()
+        rng = np.random.RandomState(42)
+        self.model = np.log(rng.rand(mesh.nC) + 0.5)
+        self.mesh = mesh
+
+        top = mesh.vectorCCy.max()
+        rx = DC.Rx.Pole(Utils.ndgrid([mesh.vectorCCx, np.r_[top]]))
+        srcList = [
+            DC.Src.Dipole([rx], np.r_[x, top], np.r_[x + 0.1, top])
+            for x in [-0.4, -0.2, 0., 0.2, 0.3]
+        ]
+        prob = setupDC(srcList)
+        self.survey = prob.survey
+        self.survey.dobs = self.survey.dpred(self.model)
+        self.survey.std = 0.05*np.ones(self.survey.nD)
+        self.dmis = DataMisfit.l2_DataMisfit(self.survey)
+
+        self.dmisDistributed = Distributed.DistributedDataMisfit(
+            self.survey, setupDC, groups=[[0, 3], [1], [2, 4]],
+            transport=self.transport
+        )
+
+    def tearDown(self):
+        self.dmisDistributed.close()
+
+    def test_misfit(self):
+        dmis = self.dmisDistributed
+        self.assertEqual(len(dmis.objfcts), 3)
+        self.assertEqual(dmis.nD, self.survey.nD)
+
+        m = self.model + 0.1
+        v = np.random.RandomState(1).rand(self.mesh.nC)
+
+        self.assertTrue(np.allclose(dmis(m), self.dmis(m), rtol=1e-10))
+        self.assertTrue(np.allclose(
+            dmis.deriv(m), self.dmis.deriv(m), rtol=1e-8, atol=1e-12
+        ))
+        self.assertTrue(np.allclose(
+            dmis.deriv2(m, v), self.dmis.deriv2(m, v), rtol=1e-8, atol=1e-12
+        ))
+
+        # the data of the groups are in the order of the groups
+        dpred = self.survey.dpred(m)
+        nRx = self.survey.srcList[0].nD
+        order = np.hstack([
+            np.arange(i*nRx, (i+1)*nRx) for i in [0, 3, 1, 2, 4]
+        ])
+        self.assertTrue(np.allclose(dmis.dpred(m), dpred[order]))
+
+        # the results do not change
+        self.assertEqual(dmis(m), dmis(m))
+        self.assertTrue(np.all(dmis.deriv(m) == dmis.deriv(m)))
+
+    def test_sensitivity(self):
+        dmis = self.dmisDistributed
+        rng = np.random.RandomState(2)
+        v = rng.rand(self.mesh.nC)
+        w = rng.rand(dmis.nD)
+        prob = self.survey.prob
+
+        nRx = self.survey.srcList[0].nD
+        order = np.hstack([
+            np.arange(i*nRx, (i+1)*nRx) for i in [0, 3, 1, 2, 4]
+        ])
+        wSurvey = np.zeros(dmis.nD)
+        wSurvey[order] = w
+
+        self.assertTrue(np.allclose(
+            dmis.Jvec(self.model, v), prob.Jvec(self.model, v)[order],
+            rtol=1e-10
+        ))
+        self.assertTrue(np.allclose(
+            dmis.Jtvec(self.model, w), prob.Jtvec(self.model, wSurvey),
+            rtol=1e-10
+        ))
+
+    def test_deriv(self):
+        self.dmisDistributed.test(x=self.model)
+
+    def test_invProblem(self):
+        reg = Regularization.Tikhonov(self.mesh)
+        opt = Optimization.InexactGaussNewton(maxIter=2)
+        invProb = InvProblem.BaseInvProblem(self.dmisDistributed, reg, opt)
+        invProb.startup(self.model)
+        m = self.model + 0.1
+
+        phi, g, H = invProb.evalFunction(m)
+        self.assertEqual(len(invProb.dpred), 3)
+
+        invProb1 = InvProblem.BaseInvProblem(self.dmis, reg, opt)
+        invProb1.startup(self.model)
+        invProb1.beta = invProb.beta
+        phi1, g1, H1 = invProb1.evalFunction(m)
+        self.assertTrue(np.allclose(phi, phi1, rtol=1e-10))
+        self.assertTrue(np.allclose(g, g1, rtol=1e-8, atol=1e-12))
+
+    def test_close(self):
+        dmis = self.dmisDistributed
+        dmis.close()
+        self.assertTrue(dmis.closed)
+        self.assertIsNone(dmis.executor)
+        self.assertEqual(dmis.workers, [])
+        m = self.model
+        for fun in [dmis, dmis.deriv, dmis.dpred]:
+            with self.assertRaises(RuntimeError):
+                fun(m)
+        with self.assertRaises(RuntimeError):
+            dmis.Jvec(m, m)
+        dmis.close()  # closing twice is fine
+
+    def test_setupError(self):
+        with self.assertRaises(Exception):
+            Distributed.DistributedDataMisfit(
+                self.survey, setupFails, groups=2, transport=self.transport
+            )
+
+
+class SocketTransportTest(unittest.TestCase):
+
+    def test_authkey(self):
+        # each transport authenticates its workers with its own random key
+        keys = [Distributed.SocketTransport().authkey for _ in range(2)]
+        self.assertEqual(len(keys[0]), 32)
+        self.assertNotEqual(keys[0], keys[1])
+        self.assertEqual(
+            Distributed.SocketTransport(authkey=b'secret').authkey, b'secret'
+        )
+
+
+class DistributedDataMisfitProcessTest(DistributedDataMisfitTest):
+
+    transport = Distributed.ProcessTransport()
+
+
+if __name__ == '__main__':
+    unittest.main()
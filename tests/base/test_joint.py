@@ -78,6 +78,34 @@ class DataMisfitTest(unittest.TestCase):
 
         mrec = inv.run(m0)
 
+    def test_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        reg = Regularization.Tikhonov(self.mesh)
+        opt = Optimization.InexactGaussNewton(maxIter=10)
+        invProb = InvProblem.BaseInvProblem(self.dmiscobmo, reg, opt)
+        m = self.model + 0.1*np.random.randn(self.mesh.nC)
+        v = np.random.rand(self.mesh.nC)
+        invProb.startup(m)
+
+        phi, g, H = invProb.evalFunction(m)
+        Hv = H*v
+
+        self.dmiscobmo.executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            f = invProb.getFields(m)
+            self.assertEqual(len(f), 2)
+            self.assertTrue(f[0].survey is self.survey0)
+            self.assertTrue(f[1].survey is self.survey1)
+
+            phi1, g1, H1 = invProb.evalFunction(m)
+            self.assertEqual(phi, phi1)
+            self.assertTrue(np.all(g == g1))
+            self.assertTrue(np.all(Hv == H1*v))
+        finally:
+            self.dmiscobmo.executor.shutdown()
+            self.dmiscobmo.executor = None
+
     def test_inv_mref_setting(self):
         reg1 = Regularization.Tikhonov(self.mesh)
         reg2 = Regularization.Tikhonov(self.mesh)
@@ -11,7 +11,7 @@ np.random.seed(121)
 MAPS_TO_EXCLUDE_2D = [
     "ComboMap", "ActiveCells", "InjectActiveCells",
     "LogMap", "ReciprocalMap",
-    "Surject2Dto3D", "Map2Dto3D", "Mesh2Mesh",
+    "Surject2Dto3D", "Map2Dto3D", "Mesh2Mesh", "TileMap",
     "ParametricPolyMap", "PolyMap", "ParametricSplineMap",
     "SplineMap", "BaseParametric", "ParametricBlock", "ParametricEllipsoid",
     "ParametricCasingAndLayer",
@@ -22,7 +22,7 @@ MAPS_TO_EXCLUDE_2D = [
 MAPS_TO_EXCLUDE_3D = [
     "ComboMap", "ActiveCells", "InjectActiveCells",
     "LogMap", "ReciprocalMap",
-    "CircleMap", "ParametricCircleMap", "Mesh2Mesh",
+    "CircleMap", "ParametricCircleMap", "Mesh2Mesh", "TileMap",
     "BaseParametric", "ParametricBlock", "ParametricEllipsoid",
     "ParametricPolyMap", "PolyMap", "ParametricSplineMap",
     "SplineMap", "ParametricCasingAndLayer",
@@ -217,6 +217,44 @@ class MapTests(unittest.TestCase):
         self.assertRaises(ValueError, lambda: expMap * actMap * vertMap)
         self.assertRaises(ValueError, lambda: actMap * vertMap * expMap)
 
+    def test_comboMapLazyDeriv(self):
+        M = Mesh.TensorMesh([4, 6], '0C')
+        M2 = Mesh.TensorMesh([2, 3], '0C')
+        actMap = Maps.InjectActiveCells(
+            M2, M2.vectorCCy <= 0, np.log(1e-8), nC=M2.nCy
+        )
+        combo = (
+            Maps.ExpMap(M) * Maps.Mesh2Mesh([M, M2]) *
+            Maps.SurjectVertical1D(M2) * actMap
+        )
+        m = np.random.rand(combo.nP)
+        v = np.random.rand(combo.nP)
+        w = np.random.rand(M.nC)
+
+        J = combo.deriv(m)
+        self.assertLess(np.linalg.norm(combo.deriv(m, v) - J * v), 1e-12)
+
+        # the signatures of the derivatives are inspected once per class
+        for mapping in combo.maps:
+            self.assertTrue(
+                type(mapping).deriv in Maps._derivTakesV
+            )
+        self.assertTrue(combo.testVec(m, plotIt=False))
+
+        combo.lazyDeriv = True
+        J_lazy = combo.deriv(m)
+        self.assertEqual(J_lazy.shape, J.shape)
+        self.assertLess(np.linalg.norm(J_lazy * v - J * v), 1e-12)
+        self.assertLess(np.linalg.norm(J_lazy.T * w - J.T * w), 1e-12)
+        self.assertTrue(combo.test(m, plotIt=False))
+
+        # intermediate models are stored for the last model
+        models = combo._intermediateModels(m)
+        self.assertTrue(models is combo._intermediateModels(m.copy()))
+        models2 = combo._intermediateModels(2*m)
+        self.assertFalse(models is models2)
+        self.assertLess(np.linalg.norm(models2[-1] - combo * (2*m)), 1e-12)
+
     def test_map2Dto3D_x(self):
         M2 = Mesh.TensorMesh([2, 4])
         M3 = Mesh.TensorMesh([3, 2, 4])
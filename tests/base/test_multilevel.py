@@ -0,0 +1,137 @@
+from __future__ import print_function
+import unittest
+import numpy as np
+
+from SimPEG import (
+    Mesh, Maps, Utils, Problem, Survey, DataMisfit, Directives,
+    Optimization, Regularization, InvProblem, Inversion
+)
+
+nk = 20
+jk = np.linspace(1., 60., nk)
+
+
+def get_G(mesh):
+    # kernels integrated over the cells, the data do not depend on the mesh
+    x = mesh.vectorCCx
+    return (
+        np.exp(-0.25 * jk[:, None] * x) *
+        np.cos(np.pi * 0.25 * jk[:, None] * x) * mesh.hx
+    )
+
+
+def get_IRLS(inv):
+    for directive in inv.directiveList.dList:
+        if isinstance(directive, Directives.Update_IRLS):
+            return directive
+
+
+class CoarsenMeshTest(unittest.TestCase):
+
+    def test_tensor(self):
+        mesh = Mesh.TensorMesh([[(1., 5, -1.3), (1., 11)], 8], x0='CN')
+        coarse = Utils.coarsenMesh(mesh)
+        self.assertTrue(np.all(coarse.vnC == [8, 4]))
+        self.assertTrue(np.allclose(coarse.x0, mesh.x0))
+        self.assertTrue(np.allclose(coarse.vol.sum(), mesh.vol.sum()))
+        self.assertTrue(np.allclose(coarse.vectorNx, mesh.vectorNx[::2]))
+
+    def test_tree(self):
+        mesh = Mesh.TreeMesh([16, 16, 16])
+        mesh.insert_cells(np.array([[0.3, 0.3, 0.3]]), [4])
+        coarse = Utils.coarsenMesh(mesh)
+        self.assertTrue(coarse.nC < mesh.nC)
+        self.assertTrue(np.allclose(
+            coarse.h_gridded.min(), 2 * mesh.h_gridded.min()
+        ))
+        self.assertTrue(np.allclose(coarse.vol.sum(), mesh.vol.sum()))
+
+    def test_prolongation(self):
+        mesh = Mesh.TensorMesh([16, 16])
+        coarse = Utils.coarsenMesh(mesh)
+        active = mesh.gridCC[:, 1] < 0.7
+        activeCoarse = coarse.gridCC[:, 1] < 0.7
+        P = Inversion.prolongation(mesh, coarse, active, activeCoarse)
+        self.assertTrue(P.shape == (active.sum(), activeCoarse.sum()))
+        # constants are preserved, linear models inside the domain
+        self.assertTrue(np.allclose(P * np.ones(P.shape[1]), 1.))
+        x = coarse.gridCC[activeCoarse, 0]
+        xFine = mesh.gridCC[active, 0]
+        inside = (xFine > x.min()) & (xFine < x.max())
+        self.assertTrue(np.allclose((P * x)[inside], xFine[inside]))
+
+
+class MultilevelInversionTest(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        self.mesh = Mesh.TensorMesh([64])
+        x = self.mesh.vectorCCx
+        mtrue = np.zeros(self.mesh.nC)
+        mtrue[x > 0.3] = 1.
+        mtrue[x > 0.45] = -0.5
+        mtrue[x > 0.6] = 0
+        self.dobs = get_G(self.mesh).dot(mtrue)
+        self.dobs += 1e-3 * np.random.randn(nk)
+
+    def setup(self, mesh):
+        prob = Problem.LinearProblem(mesh, G=get_G(mesh))
+        survey = Survey.LinearSurvey()
+        survey.pair(prob)
+        survey.dobs = self.dobs
+
+        dmis = DataMisfit.l2_DataMisfit(survey)
+        dmis.W = 1e3 * np.ones(nk)
+
+        reg = Regularization.Sparse(
+            mesh, mapping=Maps.IdentityMap(nP=mesh.nC)
+        )
+        reg.norms = np.c_[0., 0., 2., 2.]
+        reg.mref = 0.1 * np.ones(mesh.nC)
+
+        opt = Optimization.ProjectedGNCG(
+            maxIter=20, lower=-2., upper=2., maxIterCG=10, tolCG=1e-3
+        )
+        invProb = InvProblem.BaseInvProblem(dmis, reg, opt)
+        return invProb, [
+            Directives.BetaEstimate_ByEig(beta0_ratio=1e0),
+            Directives.Update_IRLS(maxIRLSiter=10, f_min_change=1e-4),
+            Directives.UpdatePreconditioner()
+        ]
+
+    def test_run(self):
+        meshes = [Utils.coarsenMesh(self.mesh, 2), self.mesh]
+        inv = Inversion.MultilevelInversion(meshes, self.setup, maxIter=[20])
+        m0 = 1e-4 * np.ones(meshes[0].nC)
+        mrec = inv.run(m0)
+
+        self.assertTrue(len(mrec) == self.mesh.nC)
+        self.assertTrue(len(inv.levelTimes) == 2)
+        coarse, fine = inv.inversions
+
+        # beta is estimated at the coarsest level only
+        self.assertTrue(any(
+            isinstance(d, Directives.BetaEstimate_ByEig)
+            for d in coarse.directiveList.dList
+        ))
+        self.assertFalse(any(
+            isinstance(d, Directives.BetaEstimate_ByEig)
+            for d in fine.directiveList.dList
+        ))
+
+        # the reference model is prolonged, the IRLS goes on from where it
+        # stopped on the coarse mesh
+        self.assertTrue(np.allclose(fine.invProb.reg.mref, 0.1))
+        irlsCoarse = get_IRLS(coarse)
+        irls = get_IRLS(fine)
+        self.assertTrue(irlsCoarse.mode == 2 and irls.mode == 2)
+        self.assertTrue(irls.IRLSiter > irlsCoarse.IRLSiter)
+        self.assertTrue(
+            fine.invProb.reg.eps_p <= coarse.invProb.reg.eps_p
+        )
+        self.assertTrue(len(fine.invProb.l2model) == self.mesh.nC)
+        self.assertTrue(fine.invProb.dmisfit(mrec) < 2 * irls.target)
+
+
+if __name__ == '__main__':
+    unittest.main()
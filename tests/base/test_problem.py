@@ -1,5 +1,5 @@
 import unittest
-from SimPEG import Mesh, Problem, Maps
+from SimPEG import Mesh, Problem, Maps, Survey
 import numpy as np
 
 
@@ -34,5 +34,41 @@ class TestTimeProblem(unittest.TestCase):
             self.prob.mapping = Maps.IdentityMap(self.mesh)
 
 
+class TestDpredBatch(unittest.TestCase):
+
+    def setUp(self):
+        mesh = Mesh.TensorMesh([20])
+        self.prob = Problem.LinearProblem(mesh, modelMap=Maps.ExpMap(mesh))
+        self.prob.G = np.random.randn(7, mesh.nC)
+        self.survey = Survey.LinearSurvey()
+        self.survey.pair(self.prob)
+        self.M = np.random.randn(mesh.nC, 5)
+
+    def dpred_loop(self):
+        return np.column_stack([self.survey.dpred(m) for m in self.M.T])
+
+    def test_linear(self):
+        D = self.survey.dpred_batch(self.M)
+        self.assertEqual(D.shape, (7, 5))
+        self.assertTrue(np.allclose(D, self.dpred_loop()))
+
+    def test_single_model(self):
+        # a 1D model is a batch of one model
+        m = self.M[:, 0]
+        D = self.survey.dpred_batch(m)
+        self.assertEqual(D.shape, (7, 1))
+        self.assertTrue(np.allclose(D[:, 0], self.survey.dpred(m)))
+        self.assertTrue(np.allclose(
+            D, Problem.BaseProblem.dpred_batch(self.prob, m)
+        ))
+
+    def test_processes(self):
+        # the models one after the other, in forked workers
+        D = Problem.BaseProblem.dpred_batch(self.prob, self.M)
+        self.assertTrue(np.allclose(D, self.dpred_loop()))
+        D = Problem.BaseProblem.dpred_batch(self.prob, self.M, nProcesses=2)
+        self.assertTrue(np.allclose(D, self.dpred_loop()))
+
+
 if __name__ == '__main__':
     unittest.main()
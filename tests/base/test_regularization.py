@@ -5,7 +5,10 @@ from __future__ import unicode_literals
 
 import numpy as np
 import unittest
-from SimPEG import Mesh, Maps, Regularization, Utils, Tests, ObjectiveFunction
+from SimPEG import (
+    Mesh, Maps, Regularization, Utils, Tests, ObjectiveFunction, Problem,
+    Survey, DataMisfit, InvProblem, Optimization
+)
 from scipy.sparse.linalg import dsolve
 import inspect
 
@@ -315,6 +318,131 @@ class RegularizationTests(unittest.TestCase):
         self.assertTrue(np.all(reg.objfcts[2].norm == 1.*np.ones(mesh.nFy)))
         self.assertTrue(np.all(reg.objfcts[3].norm == 1.*np.ones(mesh.nFz)))
 
+    def test_cached_weights(self):
+        mesh = Mesh.TensorMesh([8, 7, 6])
+        m = np.random.rand(mesh.nC)
+        v = np.random.rand(mesh.nC)
+
+        reg = Regularization.Tikhonov(mesh)
+        W = [fct.W for fct in reg.objfcts]
+        reg.deriv2(m, v=v)
+        reg.deriv2(m, v=v)
+        [self.assertTrue(fct.W is Wi) for fct, Wi in zip(reg.objfcts, W)]
+        self.assertTrue(reg.cacheStats['hits'] > 0)
+        self.assertEqual(reg.cacheStats['misses'], len(reg.objfcts))
+
+        # the cache is cleared when the cell weights are updated
+        cell_weights = np.random.rand(mesh.nC)
+        reg.cell_weights = cell_weights
+        self.assertEqual(reg.cacheStats['invalidations'], len(reg.objfcts))
+        self.assertTrue(np.allclose(
+            reg.objfcts[0].W.diagonal(),
+            np.sqrt(mesh.vol * cell_weights)
+        ))
+        WtW = reg.objfcts[1].WtW
+        self.assertTrue(np.allclose(
+            (WtW - reg.objfcts[1].W.T * reg.objfcts[1].W).data, 0.
+        ))
+
+        # sparse weights are updated with the stashed IRLS weights
+        reg = Regularization.Sparse(mesh, mapping=Maps.IdentityMap(mesh))
+        reg.norms = np.c_[0., 1., 1., 1.]
+        reg.model = m
+        W = reg.objfcts[0].W
+        self.assertTrue(reg.objfcts[0].W is W)
+        reg.objfcts[0].stashedR = None
+        reg.model = 2*m
+        W2 = reg.objfcts[0].W
+        self.assertFalse(W2 is W)
+        self.assertTrue(np.allclose(
+            W2.diagonal(),
+            np.sqrt(reg.objfcts[0].scale * mesh.vol) *
+            reg.objfcts[0].R(reg.objfcts[0].f_m)
+        ))
+
+    def test_fused_evaluation(self):
+        mesh = Mesh.TensorMesh([8, 7, 6])
+        m = np.random.rand(mesh.nC)
+        v = np.random.rand(mesh.nC)
+        mref = np.random.rand(mesh.nC)
+
+        for regType in ['Tikhonov', 'Sparse', 'Simple']:
+            reg = getattr(Regularization, regType)(
+                mesh, mref=mref, mapping=Maps.IdentityMap(mesh)
+            )
+            if regType == 'Sparse':
+                reg.norms = np.c_[0., 1., 1., 1.]
+                reg.model = np.random.rand(mesh.nC)
+
+            # same thing, term by term
+            objfct = ObjectiveFunction.ComboObjectiveFunction(
+                reg.objfcts, reg.multipliers
+            )
+
+            phi, g, H = reg.evalFunction(m)
+            self.assertTrue(np.allclose(phi, objfct(m)))
+            self.assertTrue(np.allclose(g, objfct.deriv(m)))
+            self.assertTrue(np.allclose(H * v, objfct.deriv2(m, v=v)))
+            self.assertTrue(np.allclose(
+                (reg.deriv2(m) - objfct.deriv2(m)).data, 0.
+            ))
+            self.assertTrue(np.allclose(
+                reg.componentValues(m),
+                [mult * fct(m) for mult, fct in objfct]
+            ))
+
+            # the residuals are reused for the same model
+            state = reg._fusedState(m)
+            reg(m)
+            reg.deriv(m)
+            self.assertTrue(reg._fusedState(m) is state)
+
+            # and updated with the weights
+            reg.cell_weights = np.random.rand(mesh.nC)
+            self.assertFalse(reg._fusedState(m) is state)
+            self.assertTrue(np.allclose(reg(m), objfct(m)))
+
+    def test_fused_invProblem(self):
+        # the inverse problem evaluates the regularization with evalFunction
+        mesh = Mesh.TensorMesh([8, 7])
+        rng = np.random.RandomState(5)
+        m = rng.rand(mesh.nC)
+        v = rng.rand(mesh.nC)
+
+        prob = Problem.LinearProblem(mesh, G=rng.randn(10, mesh.nC))
+        survey = Survey.LinearSurvey()
+        survey.pair(prob)
+        survey.dobs = rng.randn(10)
+        dmis = DataMisfit.l2_DataMisfit(survey)
+
+        reg = Regularization.Tikhonov(mesh, mref=rng.rand(mesh.nC))
+        evals = []
+        evalFunction = reg.evalFunction
+
+        def countEvals(*args, **kwargs):
+            evals.append(kwargs)
+            return evalFunction(*args, **kwargs)
+        reg.evalFunction = countEvals
+
+        objfct = ObjectiveFunction.ComboObjectiveFunction(
+            reg.objfcts, reg.multipliers
+        )
+        opt = Optimization.InexactGaussNewton(maxIter=1)
+        invProb = InvProblem.BaseInvProblem(dmis, reg, opt, beta=2.)
+        invProb1 = InvProblem.BaseInvProblem(dmis, objfct, opt, beta=2.)
+        invProb.startup(m)
+        invProb1.startup(m)
+
+        phi, g, H = invProb.evalFunction(m)
+        phi1, g1, H1 = invProb1.evalFunction(m)
+        self.assertEqual(len(evals), 1)
+        self.assertTrue(np.allclose(phi, phi1))
+        self.assertTrue(np.allclose(g, g1))
+        self.assertTrue(np.allclose(H * v, H1 * v))
+        self.assertTrue(np.allclose(invProb.evalFunction(
+            m, return_g=False, return_H=False
+        ), phi1))
+
     def test_linked_properties(self):
         mesh = Mesh.TensorMesh([8, 7, 6])
         reg = Regularization.Tikhonov(mesh)
@@ -8,8 +8,10 @@ from SimPEG.Utils import (
     sdiag, sub2ind, ndgrid, mkvc, inv2X2BlockDiagonal,
     inv3X3BlockDiagonal, invPropertyTensor, makePropertyTensor, indexCube,
     ind2sub, asArray_N_x_Dim, TensorType, diagEst, count, timeIt, Counter,
-    download, surface2ind_topo
+    download, surface2ind_topo, enableTracing, disableTracing, traceSpan,
+    InnerProductAssembler, DiskMatrix
 )
+from SimPEG.Utils.SolverUtils import SolverLU
 from SimPEG import Mesh
 from discretize.Tests import checkDerivative
 
@@ -63,6 +65,170 @@ class TestCounter(unittest.TestCase):
         self.assertTrue(True)
 
 
+class TestTracer(unittest.TestCase):
+
+    def tearDown(self):
+        disableTracing()
+
+    def test_nested_spans(self):
+        class MyClass(object):
+
+            @timeIt
+            def outer(self):
+                self.inner()
+                with traceSpan('block', size=3):
+                    A = sp.eye(3).tocsc()
+                    SolverLU(A) * np.ones((3, 2))
+
+            @timeIt
+            def inner(self):
+                pass
+
+            @count
+            def counted(self):
+                pass
+
+        c = MyClass()
+        c.outer()  # not recorded
+        tracer = enableTracing(trackMemory=True)
+        c.outer()
+        c.counted()
+        disableTracing()
+        c.outer()  # not recorded
+
+        names = [span.name for span in tracer.spans]
+        self.assertEqual(
+            names, [
+                'MyClass.outer', 'MyClass.inner', 'block', 'SolverLU.factor',
+                'SolverLU.solve'
+            ]
+        )
+        self.assertEqual(
+            [span.parent for span in tracer.spans], [-1, 0, 0, 2, 2]
+        )
+        self.assertEqual(tracer.counts['solves'], 2)
+        self.assertEqual(tracer.counts['MyClass.counted'], 1)
+        self.assertEqual(tracer.spans[0].counts['solves'], 2)
+        self.assertTrue(all(span.peakMemory >= 0 for span in tracer.spans))
+
+        records = tracer.toRecords()
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[2]['size'], 3)
+        self.assertEqual(records[0]['count_solves'], 2)
+
+        trace = tracer.toChromeTrace()
+        self.assertEqual(len(trace['traceEvents']), 5)
+        outer, inner = trace['traceEvents'][:2]
+        self.assertTrue(outer['ts'] <= inner['ts'])
+        self.assertTrue(outer['dur'] >= inner['dur'])
+
+
+class TestInnerProductAssembler(unittest.TestCase):
+
+    def setUp(self):
+        h = np.ones(4)
+        self.meshes = [
+            Mesh.TensorMesh([h, 2*h]),
+            Mesh.TensorMesh([h, 2*h, h], 'CCN'),
+            Mesh.CylMesh([h, 1, h]),
+        ]
+        tree = Mesh.TreeMesh([np.ones(8), np.ones(8)])
+        tree.refine(
+            lambda cell: 3 if np.r_[cell.center][0] < 4. else 2
+        )
+        self.meshes.append(tree)
+
+    def test_inner_products(self):
+        for mesh in self.meshes:
+            for projType in ['E', 'F']:
+                if mesh._meshType == 'CYL' and projType == 'E':
+                    continue
+                assembler = InnerProductAssembler(mesh, projType)
+                nComps = [1]
+                if mesh._meshType != 'CYL':
+                    nComps += [mesh.dim, 3*(mesh.dim-1)]
+                for nComp in nComps:
+                    prop = np.random.rand(mesh.nC*nComp) + 1.
+                    M = mesh._getInnerProduct(projType, prop)
+                    self.assertIsNotNone(assembler.weights(nComp))
+                    self.assertTrue(
+                        np.allclose(assembler(prop).A, M.A, rtol=1e-10)
+                    )
+                    # a second model reuses the pattern
+                    A1, A2 = assembler(prop), assembler(2*prop)
+                    self.assertTrue(np.shares_memory(A1.indices, A2.indices))
+                    self.assertTrue(np.allclose(A2.A, 2*M.A, rtol=1e-10))
+
+                prop = np.random.rand(mesh.nC) + 1.
+                MI = mesh._getInnerProduct(projType, prop, invMat=True)
+                self.assertTrue(np.allclose(
+                    assembler(prop, invMat=True).A, MI.A, rtol=1e-10
+                ))
+
+                deriv = mesh._getInnerProductDeriv(
+                    np.ones(mesh.nC), projType
+                )(np.ones(assembler.n))
+                self.assertTrue(np.allclose(assembler.deriv.A, deriv.A))
+
+    def test_em_mass_matrices(self):
+        from SimPEG import Maps
+        from SimPEG.EM.Base import BaseEMProblem
+
+        mesh = self.meshes[1]
+        m = np.random.rand(mesh.nC)
+        prob = BaseEMProblem(mesh, sigmaMap=Maps.ExpMap(mesh))
+        for model in [m, 2*m]:
+            prob.model = model
+            sigma = np.exp(model)
+            self.assertTrue(np.allclose(
+                prob.MeSigma.A, mesh.getEdgeInnerProduct(sigma).A
+            ))
+            self.assertTrue(np.allclose(
+                prob.MeSigmaI.A,
+                mesh.getEdgeInnerProduct(sigma, invMat=True).A
+            ))
+            self.assertTrue(np.allclose(
+                prob.MfRho.A, mesh.getFaceInnerProduct(1./sigma).A
+            ))
+
+        u = np.random.rand(mesh.nE)
+
+        def fun(x):
+            prob.model = x
+            return prob.MeSigma * u, lambda v: prob.MeSigmaDeriv(u, v)
+        self.assertTrue(checkDerivative(fun, m, num=3, plotIt=False))
+
+
+class TestDiskMatrix(unittest.TestCase):
+
+    def test_products(self):
+        rand = np.random.RandomState(11)
+        A = rand.randn(53, 7)
+        for nThreads in [1, 3]:
+            J = DiskMatrix(A.shape, blockRows=10, nThreads=nThreads)
+            for i0 in range(0, A.shape[0], 4):
+                J[i0:i0+4] = A[i0:i0+4]
+            self.assertEqual(len(J.blocks), 6)
+
+            v, w = rand.randn(7), rand.randn(53)
+            V, W = rand.randn(7, 3), rand.randn(53, 3)
+            self.assertTrue(np.allclose(J.dot(v), A.dot(v), rtol=1e-5))
+            self.assertTrue(np.allclose(J * V, A.dot(V), rtol=1e-5))
+            self.assertTrue(np.allclose(J.T.dot(w), A.T.dot(w), rtol=1e-5))
+            self.assertTrue(np.allclose(J.T * W, A.T.dot(W), rtol=1e-5))
+            self.assertTrue(
+                np.allclose(J.columnNorms(), (A**2).sum(axis=0), rtol=1e-5)
+            )
+            self.assertTrue(np.allclose(
+                J.columnNorms(W), (A**2).T.dot(W**2), rtol=1e-5
+            ))
+
+            fileName = J.fileName
+            self.assertTrue(os.path.exists(fileName))
+            J.clean()
+            self.assertFalse(os.path.exists(fileName))
+
+
 class TestSequenceFunctions(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,154 @@
+from __future__ import print_function
+from __future__ import division
+
+import unittest
+import numpy as np
+from scipy.constants import mu_0
+from scipy.integrate import quad
+
+from SimPEG import Mesh, Maps, Tests
+from SimPEG.EM import EM1D, Analytics
+
+TOL = 1e-10
+
+
+class EM1DAnalyticTests(unittest.TestCase):
+
+    def setUp(self):
+        # layers of the same conductivity, a halfspace
+        self.layers = Mesh.TensorMesh([[(10., 20)]], x0='N')
+        self.sigma = 1e-1 * np.ones(self.layers.nC)
+
+    def test_VMD(self):
+        freqs = np.logspace(1, 5, 9)
+        for offset in [10., 100.]:
+            survey = EM1D.SurveyFDEM1D(np.zeros((1, 2)), freqs, offset=offset)
+            prob = EM1D.ProblemFDEM1D(self.layers, sigma=self.sigma)
+            prob.pair(survey)
+            bz = prob.fields()[0]
+            ana = mu_0 * Analytics.hzAnalyticDipoleF(
+                offset, freqs, 1e-1
+            ).ravel()
+            self.assertTrue(np.all(np.abs(bz - ana) < 1e-5 * np.abs(ana)))
+
+    def test_CircularLoop(self):
+        times = np.logspace(-5, -2, 13)
+        ana = mu_0 * Analytics.hzAnalyticCentLoopT(13., times, 1e-1)
+        survey = EM1D.SurveyTDEM1D(
+            np.zeros((1, 2)), times, srcType='CircularLoop', radius=13.
+        )
+        prob = EM1D.ProblemTDEM1D(self.layers, sigma=self.sigma)
+        prob.pair(survey)
+        bz = prob.fields()[0]
+        self.assertTrue(np.all(np.abs(bz - ana) < 1e-3 * np.abs(ana)))
+
+        dt = 1e-4 * times
+        ana = mu_0 * (
+            Analytics.hzAnalyticCentLoopT(13., times + dt, 1e-1) -
+            Analytics.hzAnalyticCentLoopT(13., times - dt, 1e-1)
+        ) / (2 * dt)
+        survey = EM1D.SurveyTDEM1D(
+            np.zeros((1, 2)), times, srcType='CircularLoop', radius=13.,
+            rxType='dbdt'
+        )
+        prob = EM1D.ProblemTDEM1D(self.layers, sigma=self.sigma)
+        prob.pair(survey)
+        dbzdt = prob.fields()[0]
+        self.assertTrue(np.all(np.abs(dbzdt - ana) < 1e-2 * np.abs(ana)))
+
+    def test_Waveform(self):
+        # linear ramp on and off: averages of the step off response
+        times = np.logspace(-4, -2, 7)
+        t0, ramp = 1e-2, 1e-4
+        survey = EM1D.SurveyTDEM1D(
+            np.zeros((1, 2)), times, srcType='CircularLoop', radius=13.,
+            waveformTimes=np.r_[-t0, -ramp, 0.],
+            waveformCurrent=np.r_[0., 1., 0.]
+        )
+        prob = EM1D.ProblemTDEM1D(self.layers, sigma=self.sigma)
+        prob.pair(survey)
+        bz = prob.fields()[0]
+
+        def average(t1, t2):
+            return quad(
+                lambda s: Analytics.hzAnalyticCentLoopT(13., s, 1e-1), t1, t2
+            )[0] / (t2 - t1)
+
+        ana = mu_0 * np.r_[[
+            average(t, t + ramp) - average(t + ramp, t + t0) for t in times
+        ]]
+        self.assertTrue(np.all(np.abs(bz - ana) < 1e-3 * np.abs(ana)))
+
+
+class EM1DDerivTests(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(11)
+        self.layers = Mesh.TensorMesh([[(10., 4, 1.3), (5., 6)]], x0='N')
+        nS = 5
+        self.locs = np.c_[np.arange(nS) * 20., np.zeros(nS)]
+        self.heights = 30. + np.random.rand(nS)
+        self.m = np.log(10**np.random.uniform(-3, -1, nS * self.layers.nC))
+
+    def setUpFDEM(self, **kwargs):
+        survey = EM1D.SurveyFDEM1D(
+            self.locs, [400., 1800., 8200., 40000.], srcHeight=self.heights,
+            offset=7.86, **kwargs
+        )
+        prob = EM1D.ProblemFDEM1D(
+            self.layers, sigmaMap=Maps.ExpMap(nP=len(self.m))
+        )
+        prob.pair(survey)
+        return survey, prob
+
+    def setUpTDEM(self, **kwargs):
+        survey = EM1D.SurveyTDEM1D(
+            self.locs, np.logspace(-5, -3, 6), srcHeight=self.heights,
+            srcType='CircularLoop', radius=13., **kwargs
+        )
+        prob = EM1D.ProblemTDEM1D(
+            self.layers, sigmaMap=Maps.ExpMap(nP=len(self.m))
+        )
+        prob.pair(survey)
+        return survey, prob
+
+    def test_chunks(self):
+        survey, prob = self.setUpFDEM()
+        d = survey.dpred(self.m)
+        prob.maxChunkSize = 1
+        prob.model = self.m + 1.
+        self.assertTrue(np.allclose(survey.dpred(self.m), d, rtol=TOL))
+
+    def _test_deriv(self, survey, prob):
+        def fun(x):
+            return survey.dpred(x), lambda v: prob.Jvec(x, v)
+        self.assertTrue(Tests.checkDerivative(fun, self.m, num=3, plotIt=False))
+
+    def _test_adjoint(self, survey, prob):
+        v = np.random.rand(survey.nD)
+        w = np.random.rand(len(self.m))
+        vJw = v.dot(prob.Jvec(self.m, w))
+        wJtv = w.dot(prob.Jtvec(self.m, v))
+        self.assertTrue(np.abs(vJw - wJtv) < TOL * np.abs(vJw))
+
+    def test_FDEM(self):
+        survey, prob = self.setUpFDEM()
+        self._test_deriv(survey, prob)
+        self._test_adjoint(survey, prob)
+
+        J = prob.getJ(self.m)
+        self.assertEqual(J.nnz, survey.nD * self.layers.nC)
+
+    def test_FDEM_radial(self):
+        survey, prob = self.setUpFDEM(rxOrientation='r', components=['imag'])
+        self._test_deriv(survey, prob)
+
+    def test_TDEM(self):
+        for rxType in ['b', 'dbdt']:
+            survey, prob = self.setUpTDEM(rxType=rxType)
+            self._test_deriv(survey, prob)
+            self._test_adjoint(survey, prob)
+
+
+if __name__ == '__main__':
+    unittest.main()
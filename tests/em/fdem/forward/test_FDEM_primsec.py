@@ -213,6 +213,40 @@ class PrimSecFDEMSrcTest_Cyl2Cart_EB_EB(unittest.TestCase, PrimSecFDEMTest):
     def test_Jadjoint_EB(self):
         self.AdjointTest()
 
+    def test_primaryCache_EB(self):
+        src = self.secondarySrc
+        prob = self.secondaryProblem
+        cache = src._primaryCache
+
+        # shared by the sources with the same primary problem
+        src2 = FDEM.Src.PrimSecMappedSigma(
+            self.rxlist, freq, self.primaryProblem, self.primarySurvey,
+            primaryMap2Meshs
+        )
+        self.assertTrue(src2._primaryCache is cache)
+
+        prob.model = model
+        f = src._primaryFields(prob)
+        self.assertTrue(src2._primaryFields(prob) is f)
+        self.assertTrue(np.all(cache.model == model))
+        self.assertTrue(
+            src._ProjPrimary(prob, 'E', 'E') is
+            src2._ProjPrimary(prob, 'E', 'E')
+        )
+
+        v = np.random.rand(len(model))
+        prob.Jvec(model, v, f=self.fields_primsec)
+        Ainv = cache.Ainv[freq]
+        prob.Jvec(model, v, f=self.fields_primsec)
+        self.assertTrue(cache.Ainv[freq] is Ainv)
+
+        # a new model clears the primary fields and factorizations
+        m = model + 0.1
+        prob.model = m
+        self.assertFalse(src._primaryFields(prob) is f)
+        self.assertEqual(len(cache.Ainv), 0)
+        prob.model = model
+
 
 class PrimSecFDEMSrcTest_Cyl2Cart_HJ_EB(unittest.TestCase, PrimSecFDEMTest):
 
@@ -0,0 +1,99 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import unittest
+import numpy as np
+
+from SimPEG import Mesh, Maps, mkvc
+from SimPEG.EM import NSEM
+
+TOL = 1e-10
+
+
+def setupProblem():
+    mesh = Mesh.TensorMesh(
+        [[(100., 4, -1.5), (100., 4), (100., 4, 1.5)]] * 2 +
+        [[(100., 6, -1.5), (100., 4), (100., 6, 1.5)]], x0='CCC'
+    )
+    x = np.linspace(-150., 150., 4)
+    rx_loc = np.c_[np.repeat(x, 4), np.tile(x, 4), np.zeros(16)]
+    rxList = []
+    for orientation in ['xx', 'xy', 'yx', 'yy']:
+        for component in ['real', 'imag']:
+            rxList.append(
+                NSEM.Rx.Point_impedance3D(rx_loc, orientation, component)
+            )
+    for orientation in ['zx', 'zy']:
+        for component in ['real', 'imag']:
+            rxList.append(
+                NSEM.Rx.Point_tipper3D(rx_loc[::2], orientation, component)
+            )
+    src = NSEM.Src.Planewave_xy_1Dprimary(rxList, 10.)
+    survey = NSEM.Survey([src])
+    sigma = 1e-2 * np.ones(mesh.nC)
+    prob = NSEM.Problem3D_ePrimSec(
+        mesh, sigmaPrimary=mesh.r(sigma, 'CC', 'CC', 'M')[0, 0, :],
+        sigmaMap=Maps.IdentityMap(mesh)
+    )
+    prob.model = sigma
+    prob.pair(survey)
+    return survey, prob, src
+
+
+class NSEM_RxBatchTests(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1983)
+        self.survey, self.prob, self.src = setupProblem()
+        mesh = self.prob.mesh
+        self.f = self.prob.fieldsPair(mesh, self.survey)
+        for sol in ['e_pxSolution', 'e_pySolution']:
+            self.f[self.src, sol] = mkvc(
+                np.random.randn(mesh.nE) + 1j * np.random.randn(mesh.nE), 2
+            )
+        self.batch = self.survey.getRxBatch(self.src)
+        self.du = (
+            np.random.randn(2 * mesh.nE) + 1j * np.random.randn(2 * mesh.nE)
+        )
+
+    def test_eval(self):
+        # same data as the receivers evaluated one at a time
+        mesh, src = self.prob.mesh, self.src
+        d = self.batch.eval(src, mesh, self.f)
+        for rx, d_rx in zip(src.rxList, d):
+            d0 = mkvc(rx.eval(src, mesh, self.f))
+            self.assertTrue(
+                np.linalg.norm(d_rx - d0) < TOL * np.linalg.norm(d0)
+            )
+
+    def test_evalDeriv(self):
+        mesh, src = self.prob.mesh, self.src
+        Jv = self.batch.evalDeriv(src, mesh, self.f, self.du)
+        for rx, Jv_rx in zip(src.rxList, Jv):
+            Jv0 = mkvc(rx.evalDeriv(src, mesh, self.f, self.du))
+            self.assertTrue(
+                np.linalg.norm(Jv_rx - Jv0) < TOL * np.linalg.norm(Jv0)
+            )
+
+    def test_evalDeriv_adjoint(self):
+        # the adjoint gives the real part of the sensitivities of the data
+        mesh, src = self.prob.mesh, self.src
+        w = np.random.rand(self.survey.nD)
+        Jv = np.hstack(self.batch.evalDeriv(src, mesh, self.f, self.du))
+        PTw = self.batch.evalDeriv(src, mesh, self.f, w, adjoint=True)
+        wJv = w.dot(Jv)
+        PTwv = mkvc(PTw).dot(self.du).real
+        print(' wJv: {}, PTwv: {}'.format(wJv, PTwv))
+        self.assertTrue(np.abs(wJv - PTwv) < TOL * np.abs(wJv))
+
+    def test_getRxBatch(self):
+        self.assertTrue(self.survey.getRxBatch(self.src) is self.batch)
+        src = NSEM.Src.Planewave_xy_1Dprimary(
+            [NSEM.Rx.Point_impedance1D(np.zeros((1, 3)), 'real')], 10.
+        )
+        self.assertTrue(NSEM.Survey([src]).getRxBatch(src) is None)
+
+
+if __name__ == '__main__':
+    unittest.main()
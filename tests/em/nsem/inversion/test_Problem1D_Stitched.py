@@ -0,0 +1,108 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import unittest
+import numpy as np
+
+from SimPEG import Mesh, Maps, Tests, Regularization
+from SimPEG.EM import NSEM
+
+TOL = 1e-10
+
+
+class Problem1DStitchedTests(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1983)
+        self.layers = Mesh.TensorMesh(
+            [[(100., 5, 1.3), (50., 10)]], x0='N'
+        )
+        x = np.linspace(0., 1000., 4)
+        self.locs = np.c_[np.repeat(x, 3), np.tile(x[:3], 4)]
+        self.freqs = np.logspace(-2, 3, 6)
+        nP = self.locs.shape[0] * self.layers.nC
+        self.m = np.log(10**np.random.uniform(-3, -1, nP))
+
+    def setUpProblem(self, components):
+        survey = NSEM.Survey1D_Stitched(
+            self.locs, self.freqs, components=components
+        )
+        prob = NSEM.Problem1D_Stitched(
+            self.layers, sigmaMap=Maps.ExpMap(nP=len(self.m))
+        )
+        prob.pair(survey)
+        return survey, prob
+
+    def test_impedances(self):
+        survey, prob = self.setUpProblem(['real', 'imag'])
+        Z = prob.fields(self.m)
+        self.assertEqual(Z.shape, (survey.nStation, survey.nFreq))
+        sigma = np.exp(self.m).reshape(survey.nStation, self.layers.nC)
+        for Zs, sig in zip(Z, sigma):
+            Zr = NSEM.Utils.getImpedance(self.layers, sig, self.freqs)
+            self.assertTrue(np.allclose(Zs, Zr, rtol=TOL, atol=0.))
+
+        d = survey.dpred(self.m).reshape(survey.nStation, survey.nFreq, 2)
+        self.assertTrue(np.all(d[:, :, 0] == Z.real))
+        self.assertTrue(np.all(d[:, :, 1] == Z.imag))
+
+    def test_appResPhs(self):
+        survey, prob = self.setUpProblem(['app_res', 'phase'])
+        d = survey.dpred(self.m).reshape(survey.nStation, survey.nFreq, 2)
+        Z = prob.fields(self.m)
+        for i in range(survey.nStation):
+            res, phs = NSEM.Utils.appResPhs(self.freqs, Z[i])
+            self.assertTrue(np.allclose(d[i, :, 0], res))
+            self.assertTrue(np.allclose(d[i, :, 1], phs))
+
+    def test_Jvec(self):
+        for components in [['real', 'imag'], ['app_res', 'phase']]:
+            survey, prob = self.setUpProblem(components)
+
+            def fun(x):
+                return survey.dpred(x), lambda v: prob.Jvec(x, v)
+            self.assertTrue(
+                Tests.checkDerivative(fun, self.m, num=3, plotIt=False)
+            )
+
+    def test_Jtvec(self):
+        survey, prob = self.setUpProblem(['real', 'imag', 'app_res', 'phase'])
+        v = np.random.rand(survey.nD)
+        w = np.random.rand(len(self.m))
+        vJw = v.dot(prob.Jvec(self.m, w))
+        wJtv = w.dot(prob.Jtvec(self.m, v))
+        self.assertTrue(np.abs(vJw - wJtv) < TOL * np.abs(vJw))
+
+    def test_getJ(self):
+        survey, prob = self.setUpProblem(['real', 'phase'])
+        J = prob.getJ(self.m)
+        self.assertEqual(J.shape, (survey.nD, len(self.m)))
+        # block diagonal: the data of a station only see its layers
+        self.assertEqual(
+            J.nnz, survey.nD * self.layers.nC
+        )
+        v = np.random.rand(len(self.m))
+        self.assertTrue(np.allclose(J * v, prob.Jvec(self.m, v)))
+        self.assertTrue(np.allclose(
+            prob.getJtJdiag(self.m), (J.toarray()**2).sum(axis=0)
+        ))
+
+    def test_regularization(self):
+        survey, prob = self.setUpProblem(['real', 'imag'])
+        regMesh = prob.regularizationMesh
+        self.assertEqual(regMesh.nC, len(self.m))
+
+        lateral = prob.lateralSmoothness(nNeighbours=2)
+        self.assertEqual(lateral.nP, len(self.m))
+        # a laterally constant model is not penalized
+        m1d = np.random.rand(self.layers.nC)
+        self.assertTrue(lateral(np.tile(m1d, survey.nStation)) < TOL)
+        self.assertTrue(lateral(self.m) > 0.)
+
+        reg = Regularization.Simple(regMesh, alpha_y=0.) + lateral
+        self.assertTrue(reg.test(self.m))
+
+
+if __name__ == '__main__':
+    unittest.main()
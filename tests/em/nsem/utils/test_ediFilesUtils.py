@@ -0,0 +1,157 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from SimPEG.EM.NSEM.Utils import ediFilesUtils
+
+TOL = 1e-10
+
+comps = [
+    'ZXXR', 'ZXYR', 'ZYXR', 'ZYYR',
+    'ZXXI', 'ZXYI', 'ZYXI', 'ZYYI',
+    'ZXX.VAR', 'ZXY.VAR', 'ZYX.VAR', 'ZYY.VAR'
+]
+
+
+def writeEDI(fileName, lat, lon, elev, freqs, data, missing=[]):
+    lines = [
+        '>HEAD', '  DATAID="{}"'.format(os.path.basename(fileName)),
+        '  LAT={}'.format(lat), '  LONG={}'.format(lon),
+        '  ELEV={}'.format(elev), '', '>=MTSECT', '  NFREQ={}'.format(len(freqs)),
+        ''
+    ]
+    for name, values in [('FREQ', freqs)] + list(zip(comps, data)):
+        if name in missing:
+            continue
+        lines.append('>{} ROT=ZROT //{}'.format(name, len(values)))
+        for i in range(0, len(values), 5):
+            lines.append(' '.join(
+                '{:.6E}'.format(v) for v in values[i:i + 5]
+            ))
+    lines.append('>END')
+    with open(fileName, 'w') as fid:
+        fid.write('\n'.join(lines) + '\n')
+
+
+class LocalEDIimporter(ediFilesUtils.EDIimporter):
+    # keep the geographic coordinates (no projection library needed)
+    def _transfromPoints(self, longD, latD):
+        return longD, latD, 0.
+
+
+class EDIimporterTests(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(66)
+        self.tmpDir = tempfile.mkdtemp()
+        self.files = []
+        for i in range(4):
+            fileName = os.path.join(self.tmpDir, 'sta{}.edi'.format(i))
+            freqs = np.logspace(-2, 3, 7 + i)
+            data = np.random.randn(len(comps), len(freqs))
+            writeEDI(
+                fileName, '-{}:30:00'.format(20 + i), '134:{}:30'.format(i),
+                100. + i, freqs, data, missing=['ZYY.VAR'] if i == 2 else []
+            )
+            self.files.append(fileName)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpDir)
+
+    def test_readEDIfile(self):
+        # single pass reader vs the search of the lines
+        for i, fileName in enumerate(self.files):
+            with open(fileName, 'r') as fid:
+                EDIlines = fid.readlines()
+            latD, longD, elevM, freq, compData = ediFilesUtils._readEDIfile(
+                fileName, comps
+            )
+            self.assertEqual(
+                (latD, longD, elevM[0]),
+                ediFilesUtils._findLatLong(EDIlines)[:2] + (100. + i,)
+            )
+            self.assertTrue(np.all(
+                freq == ediFilesUtils._findEDIcomp('>FREQ', EDIlines)
+            ))
+            for comp, values in zip(comps, compData):
+                if i == 2 and comp == 'ZYY.VAR':
+                    self.assertTrue(np.all(np.isnan(values)))
+                else:
+                    self.assertTrue(np.all(
+                        values == ediFilesUtils._findEDIcomp(
+                            '>' + comp, EDIlines
+                        )
+                    ))
+
+    def test_importFiles(self):
+        importer = LocalEDIimporter(self.files)
+        importer.importFiles()
+        data = importer()
+        self.assertEqual(len(data), sum(7 + i for i in range(4)))
+
+        # rotated and converted impedances of a station
+        with open(self.files[1], 'r') as fid:
+            EDIlines = fid.readlines()
+        rows = slice(7, 15)
+        self.assertTrue(np.allclose(
+            data['zyxr'][rows].data,
+            ediFilesUtils._findEDIcomp('>ZXYR', EDIlines) *
+            importer._impUnitEDI2SI, rtol=TOL
+        ))
+        self.assertTrue(np.all(data['z'][rows] == 101.))
+        self.assertTrue(np.all(data['zxxvar'][15:24].mask))
+        self.assertFalse(np.any(data['zxyr'].mask))
+
+        # parallel import
+        importer = LocalEDIimporter(self.files)
+        importer.importFiles(nProcesses=2)
+        for name in data.dtype.names:
+            self.assertTrue(np.allclose(
+                importer()[name], data[name], rtol=TOL, equal_nan=True
+            ))
+
+        # Data object
+        nsemData = importer.toData()
+        self.assertEqual(
+            len(nsemData.survey.freqs), len(np.unique(data['freq']))
+        )
+
+    def test_cache(self):
+        cacheFile = os.path.join(self.tmpDir, 'cache.npz')
+        importer = LocalEDIimporter(self.files)
+        importer.importFiles(cacheFile=cacheFile)
+        data = importer()
+
+        # loaded from the cache (the files are not read again)
+        stat = os.stat(self.files[0])
+        with open(self.files[0], 'w') as fid:
+            fid.write('')
+        os.utime(self.files[0], (stat.st_atime, stat.st_mtime))
+        importer = LocalEDIimporter(self.files)
+        importer.importFiles(cacheFile=cacheFile)
+        self.assertTrue(np.all(importer()['zxyi'] == data['zxyi']))
+        self.assertTrue(np.all(
+            importer().mask['zyyvar'] == data.mask['zyyvar']
+        ))
+
+        # a file is modified: imported again
+        writeEDI(
+            self.files[0], '-20:30:00', '134:0:30', 100., np.logspace(-2, 3, 7),
+            np.zeros((len(comps), 7))
+        )
+        stat = os.stat(self.files[0])
+        os.utime(self.files[0], (stat.st_atime, stat.st_mtime + 10.))
+        importer = LocalEDIimporter(self.files)
+        importer.importFiles(cacheFile=cacheFile)
+        self.assertTrue(np.all(importer()['zxyi'][:7] == 0.))
+        self.assertTrue(np.all(importer()['zxyi'][7:] == data['zxyi'][7:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -300,6 +300,77 @@ class DCProblemTestsCC_storeJ(unittest.TestCase):
         self.assertTrue(passed)
 
 
+class DCProblemTestsCC_storeJOnDisk(unittest.TestCase):
+
+    def setUp(self):
+
+        cs = 12.5
+        hx = [(cs, 4, -1.3), (cs, 8), (cs, 4, 1.3)]
+        hy = [(cs, 4, -1.3), (cs, 4), (cs, 4, 1.3)]
+        hz = [(cs, 4, -1.3), (cs, 4)]
+        mesh = Mesh.TensorMesh([hx, hy, hz], 'CCN')
+
+        x = np.linspace(-40., 40., 6)
+        M = Utils.ndgrid(x - 12.5, np.r_[0.], np.r_[0.])
+        N = Utils.ndgrid(x + 12.5, np.r_[0.], np.r_[0.])
+        rx = DC.Rx.Dipole(M, N)
+        srcList = [
+            DC.Src.Dipole([rx], np.r_[-50., 0., 0.], np.r_[-25., 0., 0.]),
+            DC.Src.Pole([rx], np.r_[50., 0., 0.])
+        ]
+
+        self.mesh = mesh
+        self.srcList = srcList
+        self.m0 = np.log(np.random.rand(mesh.nC) + 1e-2)
+
+    def getProblem(self, **kwargs):
+        survey = DC.Survey(self.srcList)
+        problem = DC.Problem3D_CC(
+            self.mesh, rhoMap=Maps.ExpMap(self.mesh), storeJ=True, **kwargs
+        )
+        problem.Solver = Pardiso
+        problem.pair(survey)
+        return problem
+
+    def test_storeJOnDisk(self):
+        problem = self.getProblem()
+        problemDisk = self.getProblem(storeJOnDisk=True, JThreads=2)
+
+        J = problemDisk.getJ(self.m0)
+        self.assertTrue(isinstance(J, Utils.DiskMatrix))
+        self.assertEqual(J.shape, (problem.survey.nD, self.mesh.nC))
+
+        def err(a, b):
+            return np.linalg.norm(a - b) / np.linalg.norm(a)
+
+        v = np.random.rand(self.mesh.nC)
+        w = np.random.rand(problem.survey.nD)
+        W = Utils.sdiag(w)
+        self.assertLess(
+            err(problem.Jvec(self.m0, v), problemDisk.Jvec(self.m0, v)),
+            1e-5
+        )
+        self.assertLess(
+            err(problem.Jtvec(self.m0, w), problemDisk.Jtvec(self.m0, w)),
+            1e-5
+        )
+        self.assertLess(
+            err(
+                problem.getJtJdiag(self.m0, W),
+                problemDisk.getJtJdiag(self.m0, W)
+            ),
+            1e-5
+        )
+
+        # the sensitivity is kept for a new model if fix_Jmatrix is set
+        problemDisk.fix_Jmatrix = True
+        problemDisk.model = self.m0 + 0.1
+        self.assertTrue(problemDisk.getJ(self.m0 + 0.1) is J)
+        problemDisk.fix_Jmatrix = False
+        problemDisk.model = self.m0
+        self.assertTrue(getattr(problemDisk, '_Jmatrix', None) is None)
+
+
 class DCProblemTestsN_storeJ(unittest.TestCase):
 
     def setUp(self):
@@ -317,5 +317,131 @@ class IPProblemTestsN_air(unittest.TestCase):
         )
         self.assertTrue(passed)
 
+class SIPSolvesTests(unittest.TestCase):
+
+    def test_one_solve_per_source(self):
+        # without storeJ the time channels are solved together
+        cs = 25.
+        hx = [(cs, 2, -1.3), (cs, 11), (cs, 2, 1.3)]
+        hz = [(cs, 2, -1.3), (cs, 10)]
+        mesh = Mesh.TensorMesh([hx, hx, hz], x0="CCN")
+
+        sigma = np.ones(mesh.nC)*1e-2
+        eta = 0.1*np.random.rand(mesh.nC)
+        tau = 0.05 + 0.1*np.random.rand(mesh.nC)
+
+        x = mesh.vectorCCx[(mesh.vectorCCx > -100.) & (mesh.vectorCCx < 100.)]
+        M = Utils.ndgrid(x-25., x, np.r_[0.])
+        N = Utils.ndgrid(x+25., x, np.r_[0.])
+        times = np.arange(5)*1e-3 + 1e-3
+
+        srcs = [
+            SIP.Src.Dipole(
+                [SIP.Rx.Dipole(M, N, times), SIP.Rx.Pole(M, times[::2])],
+                np.r_[-150., 0., 0.], np.r_[150., dy, 0.]
+            )
+            for dy in [0., 50.]
+        ]
+        survey = SIP.Survey(srcs)
+        wires = Maps.Wires(('eta', mesh.nC), ('taui', mesh.nC))
+        problem = SIP.Problem3D_CC(
+            mesh, rho=1./sigma, etaMap=wires.eta, tauiMap=wires.taui,
+            storeJ=False
+        )
+        problem.Solver = Solver
+        problem.pair(survey)
+
+        m0 = np.r_[eta, 1./tau]
+        passed = Tests.checkDerivative(
+            lambda m: [survey.dpred(m), lambda mx: problem.Jvec(m0, mx)],
+            m0, plotIt=False, num=3
+        )
+        self.assertTrue(passed)
+
+        class CountSolves(object):
+            def __init__(self, Ainv):
+                self.Ainv, self.count = Ainv, 0
+
+            def __mul__(self, rhs):
+                self.count += 1
+                return self.Ainv * rhs
+
+        problem.Ainv = CountSolves(problem.Ainv)
+        v = np.random.rand(m0.size)
+        problem.Jvec(m0, v)
+        self.assertEqual(problem.Ainv.count, len(srcs))
+        problem.Jtvec(m0, np.random.rand(survey.nD))
+        self.assertEqual(problem.Ainv.count, 2*len(srcs))
+
+
+class SIPJtJdiagTests(unittest.TestCase):
+
+    def test_JtJdiag(self):
+        cs = 25.
+        hx = [(cs, 2, -1.3), (cs, 7), (cs, 2, 1.3)]
+        hz = [(cs, 2, -1.3), (cs, 4), (cs, 2, 1.3)]
+        mesh = Mesh.TensorMesh([hx, hx, hz], x0="CCC")
+        actinds = mesh.gridCC[:, 2] < 0.
+        nP = int(actinds.sum())
+
+        sigma = np.ones(mesh.nC)*1e-2
+        sigma[~actinds] = 1e-8
+        rand = np.random.RandomState(7)
+        m0 = np.r_[
+            0.1*rand.rand(nP), 1./(0.05 + 0.1*rand.rand(nP)),
+            0.5 + 0.2*rand.rand(nP)
+        ]
+
+        x = mesh.vectorCCx[(mesh.vectorCCx > -80.) & (mesh.vectorCCx < 80.)]
+        M = Utils.ndgrid(x-25., x, np.r_[0.])
+        N = Utils.ndgrid(x+25., x, np.r_[0.])
+        times = np.arange(3)*1e-3 + 1e-3
+
+        wires = Maps.Wires(('eta', nP), ('taui', nP), ('c', nP))
+        kwargs = dict(
+            sigma=sigma, actinds=actinds, storeJ=True,
+            etaMap=Maps.InjectActiveCells(mesh, actinds, 0.)*wires.eta,
+            tauiMap=Maps.InjectActiveCells(mesh, actinds, 1.)*wires.taui,
+            cMap=Maps.InjectActiveCells(mesh, actinds, 1.)*wires.c,
+        )
+
+        def getProblem(**extra):
+            rx = SIP.Rx.Dipole(M, N, times)
+            survey = SIP.Survey([
+                SIP.Src.Dipole([rx], np.r_[-150., 0., 0.], np.r_[150., 0., 0.])
+            ])
+            problem = SIP.Problem3D_CC(mesh, **dict(kwargs, **extra))
+            problem.Solver = Solver
+            problem.pair(survey)
+            return problem
+
+        problem = getProblem()
+        w = rand.rand(problem.survey.nD) + 0.5
+        W = Utils.sdiag(w)
+        JtJdiag = problem.getJtJdiag(m0, W)
+
+        # columns of the sensitivity for a few parameters of each wire
+        for ind in rand.permutation(nP)[:4][:, None] + np.r_[0, nP, 2*nP]:
+            for i in ind:
+                e = np.zeros(m0.size)
+                e[i] = 1.
+                self.assertTrue(np.allclose(
+                    JtJdiag[i], np.sum((w*problem.Jvec(m0, e))**2),
+                    rtol=1e-6
+                ))
+
+        problemDisk = getProblem(storeJOnDisk=True)
+        self.assertTrue(
+            isinstance(problemDisk.getJ(m0), Utils.DiskMatrix)
+        )
+        self.assertTrue(np.allclose(
+            problemDisk.getJtJdiag(m0, W), JtJdiag, rtol=1e-4
+        ))
+        v = rand.rand(m0.size)
+        self.assertTrue(np.allclose(
+            problemDisk.Jvec(m0, v), problem.Jvec(m0, v), rtol=1e-4,
+            atol=1e-6*np.abs(problem.Jvec(m0, v)).max()
+        ))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,174 @@
+from __future__ import division, print_function
+import unittest
+import numpy as np
+from SimPEG import Mesh, Maps, Tests
+from SimPEG import EM
+from pymatsolver import Pardiso as Solver
+
+TOL = 1e-10
+TOL_ADJ = 1e-8
+np.random.seed(44)
+
+sigma = 1e-1
+rxTimes = np.logspace(-5, -3, 9)
+
+# log spaced time steps of the step off responses
+timeSteps = [
+    (1e-7, 30), (3e-7, 30), (1e-6, 30), (3e-6, 30), (1e-5, 30), (3e-5, 30),
+    (1e-4, 30), (3e-4, 10)
+]
+
+
+def get_mesh():
+    cs, ncx, ncz, npad = 5., 25, 20, 14
+    hx = [(cs, ncx), (cs, npad, 1.3)]
+    hz = [(cs, npad, -1.3), (cs, ncz), (cs, npad, 1.3)]
+    return Mesh.CylMesh([hx, 1, hz], '00C')
+
+
+def get_mapping(mesh):
+    active = mesh.vectorCCz < 0.
+    activeMap = Maps.InjectActiveCells(
+        mesh, active, np.log(1e-8), nC=mesh.nCz
+    )
+    return Maps.ExpMap(mesh) * Maps.SurjectVertical1D(mesh) * activeMap
+
+
+def get_trapezoid():
+    return EM.TDEM.Src.TrapezoidWaveform(
+        ramp_on=np.r_[-2e-3, -1.5e-3], ramp_off=np.r_[-2e-4, 0.]
+    )
+
+
+def get_prob(mesh, mapping, stepResponse):
+    prob = EM.TDEM.Problem3D_b(
+        mesh, sigmaMap=mapping, stepResponse=stepResponse
+    )
+    prob.timeSteps = timeSteps
+    prob.Solver = Solver
+    return prob
+
+
+def get_survey(rxTypes, waveform, rxWaveform=None):
+    rxList = []
+    for rxType in rxTypes:
+        rx = getattr(EM.TDEM.Rx, 'Point_{}'.format(rxType))(
+            np.array([[0., 0., 0.]]), rxTimes, 'z'
+        )
+        rx.waveform = rxWaveform
+        rxList.append(rx)
+    src = EM.TDEM.Src.CircularLoop(
+        rxList, waveform=waveform, loc=np.r_[0., 0., 0.], radius=13.
+    )
+    return EM.TDEM.Survey([src])
+
+
+def get_em1d(rxType, waveformTimes=None, waveformCurrent=None):
+    layers = Mesh.TensorMesh([np.r_[10.]], x0='N')
+    survey = EM.EM1D.SurveyTDEM1D(
+        np.zeros((1, 2)), rxTimes, srcType='CircularLoop', radius=13.,
+        rxType=rxType, srcHeight=1e-3, waveformTimes=waveformTimes,
+        waveformCurrent=waveformCurrent
+    )
+    prob = EM.EM1D.ProblemTDEM1D(layers, sigma=np.r_[sigma])
+    prob.pair(survey)
+    return survey.dpred(np.r_[sigma])
+
+
+class TDEM_StepResponseTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        self.mesh = get_mesh()
+        self.mapping = get_mapping(self.mesh)
+        self.m = np.log(sigma) * np.ones(self.mapping.nP)
+
+    def dpred(self, stepResponse, waveform, rxTypes=['b', 'dbdt'], **kwargs):
+        prob = get_prob(self.mesh, self.mapping, stepResponse)
+        survey = get_survey(rxTypes, waveform, **kwargs)
+        prob.pair(survey)
+        return survey.dpred(self.m)
+
+    def test_stepOff(self):
+        # the convolution of a step off is the step off response
+        d = self.dpred(False, EM.TDEM.Src.StepOffWaveform())
+        dStep = self.dpred(True, EM.TDEM.Src.StepOffWaveform())
+        self.assertTrue(
+            np.linalg.norm(dStep - d) < TOL * np.linalg.norm(d)
+        )
+
+    def test_waveform(self):
+        # ratios of the data of the trapezoid and of the step off, with the
+        # semi-analytic solution (most of the error of the mesh cancels)
+        wt, wc = np.r_[-2e-3, -1.5e-3, -2e-4, 0.], np.r_[0., 1., 1., 0.]
+        dStepOff = self.dpred(True, EM.TDEM.Src.StepOffWaveform())
+        d = self.dpred(True, get_trapezoid())
+        for i, rxType in enumerate(['b', 'dbdt']):
+            inds = slice(i * len(rxTimes), (i+1) * len(rxTimes))
+            ratio = d[inds] / dStepOff[inds]
+            ratio1D = get_em1d(rxType, wt, wc) / get_em1d(rxType)
+            err = np.abs(ratio / ratio1D - 1.)
+            print(' {}: max relative error {:e}'.format(rxType, err.max()))
+            self.assertTrue(err.max() < 0.05)
+
+    def test_rxWaveform(self):
+        # one step response for the waveforms of the receivers
+        d = self.dpred(True, get_trapezoid(), rxTypes=['b'])
+        dRx = self.dpred(
+            True, EM.TDEM.Src.StepOffWaveform(), rxTypes=['b'],
+            rxWaveform=get_trapezoid()
+        )
+        self.assertTrue(np.linalg.norm(dRx - d) < TOL * np.linalg.norm(d))
+
+    def test_shortTimeMesh(self):
+        # the time mesh must span the lags of the convolution
+        prob = get_prob(self.mesh, self.mapping, True)
+        prob.timeSteps = [(1e-5, 10)]
+        survey = get_survey(['b'], get_trapezoid())
+        prob.pair(survey)
+        with self.assertRaises(ValueError):
+            survey.dpred(self.m)
+
+
+class TDEM_StepResponseDerivTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(self):
+        cs, ncx, ncz, npad = 10., 8, 8, 6
+        hx = [(cs, ncx), (cs, npad, 1.3)]
+        hz = [(cs, npad, -1.3), (cs, ncz), (cs, npad, 1.3)]
+        mesh = Mesh.CylMesh([hx, 1, hz], '00C')
+        self.prob = EM.TDEM.Problem3D_b(
+            mesh, sigmaMap=get_mapping(mesh), stepResponse=True
+        )
+        self.prob.timeSteps = [(1e-5, 10), (1e-4, 10), (1e-3, 5)]
+        self.prob.Solver = Solver
+        self.survey = get_survey(['b', 'dbdt'], get_trapezoid())
+        self.prob.pair(self.survey)
+        self.m = (
+            np.log(sigma) +
+            np.random.randn(self.prob.sigmaMap.nP) * 0.1
+        )
+        self.fields = self.prob.fields(self.m)
+
+    def test_Jvec(self):
+        def fun(x):
+            return [
+                self.survey.dpred(x),
+                lambda v: self.prob.Jvec(self.m, v, f=self.fields)
+            ]
+        self.assertTrue(
+            Tests.checkDerivative(fun, self.m, num=3, plotIt=False)
+        )
+
+    def test_Jtvec(self):
+        v = np.random.rand(self.prob.sigmaMap.nP)
+        w = np.random.rand(self.survey.nD)
+        vJw = v.dot(self.prob.Jtvec(self.m, w, f=self.fields))
+        wJtv = w.dot(self.prob.Jvec(self.m, v, f=self.fields))
+        print(' vJw: {}, wJtv: {}'.format(vJw, wJtv))
+        self.assertTrue(np.abs(vJw - wJtv) < TOL_ADJ * np.abs(vJw))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -398,5 +398,108 @@ class VRM_fwd_tests(unittest.TestCase):
 
         self.assertTrue(Test)
 
+    def test_multiple_receivers_loguniform(self):
+        """
+        Test to make sure linear vs loguniform match for surveys with
+        several sources, receivers, locations and times
+        """
+
+        h1 = [(2, 4)]
+        meshObj = Mesh.TensorMesh((h1, h1, h1), x0='000')
+
+        chi0 = 0.
+        dchi = 0.01
+        tau1 = 1e-8
+        tau2 = 1e0
+
+        mod = (dchi/np.log(tau2/tau1))*np.ones(meshObj.nC)
+
+        times1 = np.logspace(-4, -2, 3)
+        times2 = np.array([1e-3, 2e-3])
+        waveObj = VRM.WaveformVRM.SquarePulse(delt=0.02)
+
+        loc_rx = np.c_[[4., 2., 6.], [4., 6., 2.], [8.25, 8.5, 8.75]]
+
+        txList = []
+        for loc_tx in [np.r_[4., 4., 8.25], np.r_[2., 3., 9.]]:
+            rxList = [VRM.Rx.Point(loc_rx, times=times1, fieldType='dhdt', fieldComp='z')]
+            rxList.append(VRM.Rx.Point(loc_rx[:2], times=times2, fieldType='dhdt', fieldComp='x'))
+            rxList.append(VRM.Rx.Point(loc_rx[1:], times=times1, fieldType='dhdt', fieldComp='y'))
+            txList.append(VRM.Src.MagDipole(rxList, loc_tx, [0., 0., 1.], waveObj))
+
+        Survey1 = VRM.Survey(txList)
+        Survey2 = VRM.Survey(txList)
+        Problem1 = VRM.Problem_Linear(meshObj, ref_factor=1)
+        Problem2 = VRM.Problem_LogUniform(
+            meshObj, ref_factor=1, chi0=chi0*np.ones(meshObj.nC),
+            dchi=dchi*np.ones(meshObj.nC), tau1=tau1*np.ones(meshObj.nC),
+            tau2=tau2*np.ones(meshObj.nC)
+            )
+        Problem1.pair(Survey1)
+        Problem2.pair(Survey2)
+        Fields1 = Problem1.fields(mod)
+        Fields2 = Problem2.fields()
+
+        Err = np.abs((Fields1-Fields2)/np.abs(Fields1).max())
+
+        self.assertTrue(len(Fields2) == Survey2.nD and np.all(Err < 0.01))
+
+    def test_dpred_batch(self):
+        """
+        The data of an ensemble of models are the data of each model.
+        """
+
+        np.random.seed(self.seed)
+
+        h = [0.5, 0.5]
+        meshObj = Mesh.TensorMesh((h, h, h), x0='CCC')
+
+        times = np.logspace(-4, -2, 3)
+        waveObj = VRM.WaveformVRM.SquarePulse(delt=0.02)
+        rxList = [VRM.Rx.Point(np.c_[0., 0., 2.], times=times, fieldType='dhdt', fieldComp='z')]
+        txList = [VRM.Src.MagDipole(rxList, np.r_[0., 0., 3.], [0., 0., 0.01], waveObj)]
+
+        Survey = VRM.Survey(txList)
+        Survey.set_active_interval(1e-4, 5e-3)
+        Problem = VRM.Problem_Linear(meshObj, ref_factor=1)
+        Problem.pair(Survey)
+
+        M = 1e-3*np.random.rand(meshObj.nC, 4)
+        D = Survey.dpred_batch(M)
+        Dloop = np.column_stack([Survey.dpred(m) for m in M.T])
+
+        self.assertTrue(D.shape == (Survey.t_active.sum(), 4) and np.allclose(D, Dloop))
+
+    def test_getJ(self):
+        """
+        The sensitivity matrix gives the products with the sensitivities.
+        """
+
+        np.random.seed(self.seed)
+
+        h = [0.5, 0.5]
+        meshObj = Mesh.TensorMesh((h, h, h), x0='CCC')
+
+        times = np.logspace(-4, -2, 3)
+        waveObj = VRM.WaveformVRM.SquarePulse(delt=0.02)
+        rxList = [VRM.Rx.Point(np.c_[0., 0., 2.], times=times, fieldType='dhdt', fieldComp='z')]
+        txList = [VRM.Src.MagDipole(rxList, np.r_[0., 0., 3.], [0., 0., 0.01], waveObj)]
+
+        Survey = VRM.Survey(txList)
+        Survey.set_active_interval(1e-4, 5e-3)
+        Problem = VRM.Problem_Linear(meshObj, ref_factor=1)
+        Problem.pair(Survey)
+
+        m = 1e-3*np.random.rand(meshObj.nC)
+        v = np.random.rand(meshObj.nC)
+        w = np.random.rand(Survey.t_active.sum())
+        J = Problem.getJ(m)
+
+        self.assertTrue(
+            np.allclose(J.dot(v), Problem.Jvec(m, v)) and
+            np.allclose(J.T.dot(w), Problem.Jtvec(m, w))
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
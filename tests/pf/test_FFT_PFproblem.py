@@ -0,0 +1,110 @@
+import unittest
+from SimPEG import Mesh, Utils, PF, Maps
+import numpy as np
+
+
+class FFTProblemTests(unittest.TestCase):
+
+    def setUp(self):
+
+        # local random state, the other tests rely on the global seed
+        self.rand = np.random.RandomState(43)
+
+        # Mesh uniform in x and y, padded in z
+        mesh = Mesh.TensorMesh(
+            [[(1., 10)], [(1., 8)], [(0.5, 2), (1., 3, 1.3)]], 'CCN'
+        )
+        mesh.x0 = mesh.x0 + np.r_[0.3, -0.2, 0.]
+        self.mesh = mesh
+        self.actInd = mesh.gridCC[:, 2] < -0.6
+        self.nC = int(self.actInd.sum())
+
+        # Receivers every second cell in x, in random order with a few
+        # missing stations
+        X, Y = np.meshgrid(
+            np.arange(-6, 7)*2. + 0.1, np.arange(-3, 5) + 0.4
+        )
+        locs = np.c_[Utils.mkvc(X), Utils.mkvc(Y), 1.5*np.ones(X.size)]
+        self.locs = locs[self.rand.permutation(X.size)][:-5]
+
+    def compare(self, prob, probFFT, survey, nP):
+        m = self.rand.rand(nP)
+
+        # the amplitude sensitivities use the model of the problem
+        survey.pair(prob)
+        prob.model = m
+        d = prob.fields(m)
+        v = self.rand.randn(d.size)
+        Jtv = prob.Jtvec(m, v)
+        JtJdiag = prob.getJtJdiag(m)
+
+        survey.unpair()
+        survey.pair(probFFT)
+        probFFT.model = m
+        self.assertTrue(getattr(probFFT, '_G', None) is None)
+
+        def err(a, b):
+            return np.linalg.norm(a - b) / np.linalg.norm(a)
+
+        self.assertLess(err(d, probFFT.fields(m)), 1e-5)
+        self.assertLess(err(Jtv, probFFT.Jtvec(m, v)), 1e-5)
+        self.assertLess(err(JtJdiag, probFFT.getJtJdiag(m)), 1e-5)
+        self.assertTrue(getattr(probFFT, '_G', None) is None)
+
+        # adjoint test
+        w = self.rand.rand(nP)
+        self.assertLess(
+            abs(v.dot(probFFT.Jvec(m, w)) - w.dot(probFFT.Jtvec(m, v))),
+            1e-8 * np.linalg.norm(v) * np.linalg.norm(d)
+        )
+
+    def test_gravity(self):
+        for rx_type in ['x', 'y', 'z']:
+            survey = PF.BaseGrav.LinearSurvey(
+                PF.BaseGrav.SrcField([PF.BaseGrav.RxObs(self.locs)])
+            )
+            kwargs = dict(
+                rhoMap=Maps.IdentityMap(nP=self.nC), actInd=self.actInd,
+                rx_type=rx_type
+            )
+            self.compare(
+                PF.Gravity.GravityIntegral(self.mesh, **kwargs),
+                PF.Gravity.GravityIntegral(self.mesh, useFFT=True, **kwargs),
+                survey, self.nC
+            )
+
+    def test_magnetics(self):
+        for rx_type, modelType in [
+            ('tmi', 'susceptibility'), ('xyz', 'susceptibility'),
+            ('tmi', 'vector'), ('xyz', 'amplitude')
+        ]:
+            srcField = PF.BaseMag.SrcField(
+                [PF.BaseMag.RxObs(self.locs)], param=(50000., 60., 20.)
+            )
+            survey = PF.BaseMag.LinearSurvey(srcField)
+            nP = self.nC * (3 if modelType == 'vector' else 1)
+            kwargs = dict(
+                chiMap=Maps.IdentityMap(nP=nP), actInd=self.actInd,
+                rx_type=rx_type, modelType=modelType, silent=True
+            )
+            self.compare(
+                PF.Magnetics.MagneticIntegral(self.mesh, **kwargs),
+                PF.Magnetics.MagneticIntegral(
+                    self.mesh, useFFT=True, **kwargs
+                ),
+                survey, nP
+            )
+
+    def test_not_gridded(self):
+        self.assertTrue(
+            PF.FFTOperator.FFTOperator.isGridded(self.mesh, self.locs)
+        )
+        locs = self.locs.copy()
+        locs[0, 0] += 0.3
+        self.assertFalse(
+            PF.FFTOperator.FFTOperator.isGridded(self.mesh, locs)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+from __future__ import print_function
+import unittest
+import numpy as np
+from SimPEG import Mesh, Maps, Utils, PF, Tests
+
+TOL_ADJ = 1e-6
+np.random.seed(7)
+
+
+def get_mesh():
+    cs = 25.
+    h = [(cs, 4, -1.3), (cs/2.0, 16), (cs, 4, 1.3)]
+    return Mesh.TensorMesh([h, h, h], 'CCC')
+
+
+class MagDiffSecondarySensitivityTests(unittest.TestCase):
+
+    def setUp(self):
+        mesh = get_mesh()
+        chi = np.zeros(mesh.nC)
+        chi[PF.MagAnalytics.spheremodel(mesh, 0., 0., 0., 50)] = 0.05
+
+        survey = PF.BaseMag.BaseMagSurvey()
+        survey.setBackgroundField(45., 45., 51000)
+        xr = np.linspace(-75, 75, 5)
+        X, Y = np.meshgrid(xr, xr)
+        survey.rxLoc = np.c_[
+            Utils.mkvc(X), Utils.mkvc(Y), 70 * np.ones(X.size)
+        ]
+
+        prob = PF.Magnetics.Problem3D_DiffSecondary(
+            mesh, muMap=PF.BaseMag.BaseMagMap(mesh)
+        )
+        prob.Solver.tol = 1e-10
+        prob.pair(survey)
+
+        self.prob = prob
+        self.survey = survey
+        self.chi = chi
+        self.fields = prob.fields(chi)
+
+    def dpred(self, m):
+        return self.survey.projectFields(self.prob.fields(m))
+
+    def test_Jvec(self):
+        fields = self.fields
+
+        def fun(m):
+            d = self.dpred(m)
+            return d, lambda v: self.prob.Jvec(self.chi, v, fields)
+
+        passed = Tests.checkDerivative(
+            fun, self.chi, num=3, dx=np.random.randn(len(self.chi)) * 1e-2,
+            plotIt=False
+        )
+        self.assertTrue(passed)
+
+    def test_Jtvec_adjoint(self):
+        v = np.random.randn(len(self.chi))
+        w = np.random.randn(self.survey.rxLoc.shape[0])
+        vJtw = v.dot(self.prob.Jtvec(self.chi, w, self.fields))
+        wJv = w.dot(self.prob.Jvec(self.chi, v, self.fields))
+        print(' vJtw: {}, wJv: {}'.format(vJtw, wJv))
+        self.assertTrue(np.abs(vJtw - wJv) < TOL_ADJ * np.abs(vJtw))
+
+    def test_solver_reuse(self):
+        # a new model gets a new solver, that starts from the previous
+        # solution, and the sensitivities use the solver of the fields
+        Ainv = self.prob.Ainv
+        self.prob.fields(1.01 * self.chi)
+        self.assertTrue(self.prob.Ainv is not Ainv)
+        self.assertTrue(
+            self.prob.Ainv.iterations[0] < Ainv.iterations[0]
+        )
+
+        Ainv = self.prob.Ainv
+        self.prob.Jvec(1.01 * self.chi, np.ones(len(self.chi)))
+        self.assertTrue(self.prob.Ainv is Ainv)
+
+
+class GravDiffTests(unittest.TestCase):
+
+    def test_solver_reuse(self):
+        mesh = get_mesh()
+        prob = PF.Gravity.Problem3D_Diff(mesh, rhoMap=Maps.IdentityMap(mesh))
+        rho = np.zeros(mesh.nC)
+        rho[PF.MagAnalytics.spheremodel(mesh, 0., 0., 0., 50)] = 0.2
+
+        u = prob.fields(rho)['u']
+        A = prob.getA(rho)
+        rhs = prob.getRHS(rho)
+        self.assertTrue(
+            np.linalg.norm(A * u - rhs) < 1e-10 * np.linalg.norm(rhs)
+        )
+
+        # A does not depend on the model: the factorization is kept
+        Ainv = prob.Ainv
+        u = prob.fields(2. * rho)['u']
+        self.assertTrue(prob.Ainv is Ainv)
+        self.assertTrue(
+            np.linalg.norm(A * u - 2. * rhs) < 1e-10 * np.linalg.norm(rhs)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -87,6 +87,19 @@ class GravFwdProblemTests(unittest.TestCase):
 
         self.assertTrue(err_x < 0.005 and err_y < 0.005 and err_z < 0.005)
 
+    def test_dpred_batch(self):
+
+        # The stored G gives the data of all the models at once
+        prob = PF.Gravity.GravityIntegral(
+            self.prob_z.mesh, rhoMap=self.prob_z.rhoMap,
+            actInd=self.prob_z.actInd, rx_type='z', silent=True
+        )
+        self.survey.pair(prob)
+        M = np.c_[self.model, 2.*self.model, -self.model]
+        D = self.survey.dpred_batch(M)
+        for i in range(M.shape[1]):
+            self.assertTrue(np.allclose(D[:, i], prob.fields(M[:, i])))
+
 
 if __name__ == '__main__':
     unittest.main()
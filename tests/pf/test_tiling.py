@@ -0,0 +1,129 @@
+from __future__ import print_function
+import unittest
+
+import numpy as np
+
+from SimPEG import Mesh, Maps, Utils, DataMisfit, PF
+
+
+class TileMapTests(unittest.TestCase):
+
+    def setUp(self):
+        self.mesh = Mesh.TensorMesh(
+            [[(10., 16)], [(10., 16)], [(10., 8)]], x0=[-80., -80., -80.]
+        )
+        self.actv = self.mesh.gridCC[:, 2] < -5.
+        self.locs = Utils.ndgrid(
+            np.linspace(-20., 20., 3), np.linspace(-20., 20., 3), np.r_[5.]
+        )
+        self.localMesh = PF.Tiling.createLocalMesh(
+            self.mesh, self.locs, octreeLevels=[1, 1]
+        )
+
+    def test_localMesh(self):
+        localMesh = self.localMesh
+        self.assertTrue(localMesh.nC < self.mesh.nC)
+        self.assertTrue(np.allclose(localMesh.x0, self.mesh.x0))
+        # smallest cells near the receivers
+        near = localMesh.point2index(self.locs - np.r_[0., 0., 10.])
+        self.assertTrue(np.allclose(localMesh.h_gridded[near], 10.))
+
+    def test_massPreserved(self):
+        tileMap = Maps.TileMap(self.mesh, self.actv, self.localMesh)
+        self.assertEqual(tileMap.shape, (
+            tileMap.localActive.sum(), self.actv.sum()
+        ))
+        vol = self.localMesh.vol[tileMap.localActive]
+        self.assertTrue(np.allclose(
+            tileMap.P.T * vol, self.mesh.vol[self.actv]
+        ))
+
+        # the cells fully below the surface are averages of active cells
+        m = np.ones(self.actv.sum())
+        below = (
+            self.localMesh.gridCC[tileMap.localActive, 2] +
+            self.localMesh.h_gridded[tileMap.localActive, 2]/2. < -10.
+        )
+        self.assertTrue(np.allclose((tileMap * m)[below], 1.))
+
+    def test_sameMesh(self):
+        tileMap = Maps.TileMap(self.mesh, self.actv, self.mesh)
+        self.assertTrue(np.all(tileMap.localActive == self.actv))
+        m = np.random.rand(self.actv.sum())
+        self.assertTrue(np.allclose(tileMap * m, m))
+
+    def test_deriv(self):
+        tileMap = Maps.TileMap(self.mesh, self.actv, self.localMesh)
+        self.assertTrue(tileMap.test(np.random.rand(self.actv.sum())))
+
+
+class TiledGravityTests(unittest.TestCase):
+
+    def setUp(self):
+        mesh = Mesh.TensorMesh(
+            [[(10., 32)], [(10., 32)], [(10., 16)]], x0=[-160., -160., -160.]
+        )
+        actv = np.ones(mesh.nC, dtype=bool)
+        model = Utils.ModelBuilder.addBlock(
+            mesh.gridCC, np.zeros(mesh.nC),
+            np.r_[-30., -30., -60.], np.r_[30., 30., -20.], 0.2
+        )
+
+        locs = Utils.ndgrid(
+            np.linspace(-100., 100., 10), np.linspace(-100., 100., 10),
+            np.r_[5.]
+        )
+        rxLoc = PF.BaseGrav.RxObs(locs)
+        srcField = PF.BaseGrav.SrcField([rxLoc])
+        survey = PF.BaseGrav.LinearSurvey(srcField)
+        prob = PF.Gravity.GravityIntegral(
+            mesh, rhoMap=Maps.IdentityMap(nP=mesh.nC), actInd=actv,
+            silent=True
+        )
+        survey.pair(prob)
+        survey.dobs = prob.fields(model)
+        survey.std = 0.01*np.ones(survey.nD)
+
+        self.mesh = mesh
+        self.model = model
+        self.survey = survey
+        self.dmisGlobal = DataMisfit.l2_DataMisfit(survey)
+        self.dmis = PF.Tiling.createTiledMisfit(
+            survey, mesh, actv, PF.Gravity.GravityIntegral, maxNpoints=25,
+            octreeLevels=[4, 2, 2], silent=True
+        )
+
+    def tearDown(self):
+        self.dmis.executor.shutdown()
+
+    def test_tiles(self):
+        tiles = self.dmis.tiles
+        self.assertEqual(len(tiles), 4)
+        self.assertTrue(all(len(tile) <= 25 for tile in tiles))
+        self.assertTrue(np.all(
+            np.sort(np.hstack(tiles)) == np.arange(self.survey.nD)
+        ))
+
+    def test_dpred(self):
+        dpred = np.zeros(self.survey.nD)
+        nG = 0
+        for inds, (_, dmis) in zip(self.dmis.dataIndexes, self.dmis):
+            dpred[inds] = dmis.survey.dpred(self.model)
+            nG += dmis.prob.G.size
+        dobs = self.survey.dobs
+        self.assertTrue(
+            np.linalg.norm(dpred - dobs) < 0.02*np.linalg.norm(dobs)
+        )
+        # the sensitivities of the tiles are smaller than the global one
+        self.assertTrue(nG < self.survey.prob.G.size)
+
+    def test_misfit(self):
+        m = self.model + 0.01
+        phi = self.dmis(m)
+        self.assertTrue(np.abs(phi - self.dmisGlobal(m)) < 0.05*phi)
+        # G is stored in single precision, only the gradient is checked
+        self.assertTrue(self.dmis._test_deriv(x=self.model))
+
+
+if __name__ == '__main__':
+    unittest.main()
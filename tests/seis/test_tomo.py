@@ -15,7 +15,7 @@ class TomoTest(unittest.TestCase):
 
         nC = 20
         M = Mesh.TensorMesh([nC, nC])
-        y = np.linspace(0., 1., nC/2)
+        y = np.linspace(0., 1., nC//2)
         rlocs = np.c_[y*0+M.vectorCCx[-1], y]
         rx = StraightRay.Rx(rlocs, None)
 
@@ -39,6 +39,18 @@ class TomoTest(unittest.TestCase):
             return self.survey.dpred(x), lambda x: self.problem.Jvec(s, x)
         return Tests.checkDerivative(fun, s, num=4, plotIt=False, eps=FLR)
 
+    def test_dpred_batch(self):
+        S = np.random.rand(self.M.nC, 3) + 1.
+        D = self.survey.dpred_batch(S)
+        for i in range(S.shape[1]):
+            self.assertTrue(np.allclose(D[:, i], self.survey.dpred(S[:, i])))
+
+    def test_getJ(self):
+        m = np.random.rand(self.M.nC) + 1.
+        v = np.random.rand(self.M.nC)
+        J = self.problem.getJ(m)
+        self.assertTrue(np.allclose(J * v, self.problem.Jvec(m, v)))
+
 if __name__ == '__main__':
     unittest.main()
 